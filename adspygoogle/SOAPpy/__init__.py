@@ -0,0 +1,15 @@
+
+ident = '$Id: __init__.py 541 2004-01-31 04:20:06Z warnes $'
+from version import __version__
+
+from Client      import *
+from Config      import *
+from Errors      import *
+from NS          import *
+from Parser      import *
+from SOAPBuilder import *
+from Server      import *
+from Types       import *
+from Utilities     import *
+import wstools
+import WSDL
@@ -34,7 +34,7 @@ from adspygoogle.common import Utils
 from adspygoogle.common.Client import Client
 from adspygoogle.common.Errors import AuthTokenError
 from adspygoogle.common.Errors import ValidationError
-from adspygoogle.common.Logger import Logger
+from adspygoogle.common.Logger import GetLoggerFromConfig
 
 
 class AdWordsClient(Client):
@@ -192,7 +192,7 @@ class AdWordsClient(Client):
     self.__is_mcc = False
 
     # Initialize logger.
-    self.__logger = Logger(LIB_SIG, self._config['log_home'])
+    self.__logger = GetLoggerFromConfig(LIB_SIG, self._config)
 
   def __LoadAuthCredentials(self):
     """Load existing authentication credentials from adwords_api_auth.pkl.
@@ -368,6 +368,24 @@ class AdWordsClient(Client):
 
     return new_headers
 
+  def __GetService(self, service_name, headers, op_config):
+    """Return a service from this client's registry, creating it if needed.
+
+    Args:
+      service_name: str Name of the service.
+      headers: dict Authentication credentials the service should use.
+      op_config: dict Dictionary object with additional configuration values for
+                 the service.
+
+    Returns:
+      GenericAdWordsService The service.
+    """
+    return self._GetRegisteredService(
+        service_name, headers, op_config,
+        lambda: GenericAdWordsService(headers, self._config, op_config,
+                                      self.__lock, self.__logger,
+                                      service_name))
+
   def CallRawMethod(self, soap_message, url, server, http_proxy):
     """Call API method directly, using raw SOAP message.
 
@@ -418,8 +436,7 @@ class AdWordsClient(Client):
         'default_group': 'cm',
         'http_proxy': http_proxy
     }
-    return GenericAdWordsService(headers, self._config, op_config, self.__lock,
-                                 self.__logger, 'AdExtensionOverrideService')
+    return self.__GetService('AdExtensionOverrideService', headers, op_config)
 
   def GetAdGroupAdService(self, server='https://adwords.google.com',
                           version=None, http_proxy=None):
@@ -450,8 +467,7 @@ class AdWordsClient(Client):
         'default_group': 'cm',
         'http_proxy': http_proxy
     }
-    return GenericAdWordsService(headers, self._config, op_config, self.__lock,
-                                 self.__logger, 'AdGroupAdService')
+    return self.__GetService('AdGroupAdService', headers, op_config)
 
   def GetAdGroupBidModifierService(self, server='https://adwords.google.com',
                                    version=None, http_proxy=None):
@@ -482,8 +498,7 @@ class AdWordsClient(Client):
         'default_group': 'cm',
         'http_proxy': http_proxy
     }
-    return GenericAdWordsService(headers, self._config, op_config, self.__lock,
-                                 self.__logger, 'AdGroupBidModifierService')
+    return self.__GetService('AdGroupBidModifierService', headers, op_config)
 
   def GetAdGroupCriterionService(self, server='https://adwords.google.com',
                                  version=None, http_proxy=None):
@@ -514,8 +529,7 @@ class AdWordsClient(Client):
         'default_group': 'cm',
         'http_proxy': http_proxy
     }
-    return GenericAdWordsService(headers, self._config, op_config, self.__lock,
-                                 self.__logger, 'AdGroupCriterionService')
+    return self.__GetService('AdGroupCriterionService', headers, op_config)
 
   def GetAdGroupFeedService(self, server='https://adwords.google.com',
                             version=None, http_proxy=None):
@@ -546,8 +560,7 @@ class AdWordsClient(Client):
         'default_group': 'cm',
         'http_proxy': http_proxy
     }
-    return GenericAdWordsService(headers, self._config, op_config, self.__lock,
-                                 self.__logger, 'AdGroupFeedService')
+    return self.__GetService('AdGroupFeedService', headers, op_config)
 
   def GetAdGroupService(self, server='https://adwords.google.com',
                         version=None, http_proxy=None):
@@ -578,8 +591,7 @@ class AdWordsClient(Client):
         'default_group': 'cm',
         'http_proxy': http_proxy
     }
-    return GenericAdWordsService(headers, self._config, op_config, self.__lock,
-                                 self.__logger, 'AdGroupService')
+    return self.__GetService('AdGroupService', headers, op_config)
 
   def GetAdParamService(self, server='https://adwords.google.com',
                         version=None, http_proxy=None):
@@ -610,8 +622,7 @@ class AdWordsClient(Client):
         'default_group': 'cm',
         'http_proxy': http_proxy
     }
-    return GenericAdWordsService(headers, self._config, op_config, self.__lock,
-                                 self.__logger, 'AdParamService')
+    return self.__GetService('AdParamService', headers, op_config)
 
   def GetAdwordsUserListService(self, server='https://adwords.google.com',
                                 version=None, http_proxy=None):
@@ -642,8 +653,7 @@ class AdWordsClient(Client):
         'default_group': 'rm',
         'http_proxy': http_proxy
     }
-    return GenericAdWordsService(headers, self._config, op_config, self.__lock,
-                                 self.__logger, 'AdwordsUserListService')
+    return self.__GetService('AdwordsUserListService', headers, op_config)
 
   def GetAlertService(self, server='https://adwords.google.com', version=None,
                       http_proxy=None):
@@ -674,8 +684,7 @@ class AdWordsClient(Client):
         'default_group': 'cm',
         'http_proxy': http_proxy
     }
-    return GenericAdWordsService(headers, self._config, op_config, self.__lock,
-                                 self.__logger, 'AlertService')
+    return self.__GetService('AlertService', headers, op_config)
 
   def GetBiddingStrategyService(self, server='https://adwords.google.com',
                                 version=None, http_proxy=None):
@@ -706,8 +715,7 @@ class AdWordsClient(Client):
         'default_group': 'cm',
         'http_proxy': http_proxy
     }
-    return GenericAdWordsService(headers, self._config, op_config, self.__lock,
-                                 self.__logger, 'BiddingStrategyService')
+    return self.__GetService('BiddingStrategyService', headers, op_config)
 
   def GetBudgetService(self, server='https://adwords.google.com',
                        version=None, http_proxy=None):
@@ -738,8 +746,7 @@ class AdWordsClient(Client):
         'default_group': 'cm',
         'http_proxy': http_proxy
     }
-    return GenericAdWordsService(headers, self._config, op_config, self.__lock,
-                                 self.__logger, 'BudgetService')
+    return self.__GetService('BudgetService', headers, op_config)
 
   def GetBudgetOrderService(self, server='https://adwords.google.com',
                             version=None, http_proxy=None):
@@ -770,8 +777,7 @@ class AdWordsClient(Client):
         'default_group': 'billing',
         'http_proxy': http_proxy
     }
-    return GenericAdWordsService(headers, self._config, op_config, self.__lock,
-                                 self.__logger, 'BudgetOrderService')
+    return self.__GetService('BudgetOrderService', headers, op_config)
 
   def GetMutateJobService(self, server='https://adwords.google.com',
                               version=None, http_proxy=None):
@@ -802,8 +808,7 @@ class AdWordsClient(Client):
         'default_group': 'cm',
         'http_proxy': http_proxy
     }
-    return GenericAdWordsService(headers, self._config, op_config, self.__lock,
-                                 self.__logger, 'MutateJobService')
+    return self.__GetService('MutateJobService', headers, op_config)
 
   def GetCampaignAdExtensionService(self, server='https://adwords.google.com',
                                     version=None, http_proxy=None):
@@ -834,8 +839,7 @@ class AdWordsClient(Client):
         'default_group': 'cm',
         'http_proxy': http_proxy
     }
-    return GenericAdWordsService(headers, self._config, op_config, self.__lock,
-                                 self.__logger, 'CampaignAdExtensionService')
+    return self.__GetService('CampaignAdExtensionService', headers, op_config)
 
   def GetCampaignCriterionService(self, server='https://adwords.google.com',
                                   version=None, http_proxy=None):
@@ -866,8 +870,7 @@ class AdWordsClient(Client):
         'default_group': 'cm',
         'http_proxy': http_proxy
     }
-    return GenericAdWordsService(headers, self._config, op_config, self.__lock,
-                                 self.__logger, 'CampaignCriterionService')
+    return self.__GetService('CampaignCriterionService', headers, op_config)
 
   def GetCampaignFeedService(self, server='https://adwords.google.com',
                              version=None, http_proxy=None):
@@ -898,8 +901,7 @@ class AdWordsClient(Client):
         'default_group': 'cm',
         'http_proxy': http_proxy
     }
-    return GenericAdWordsService(headers, self._config, op_config, self.__lock,
-                                 self.__logger, 'CampaignFeedService')
+    return self.__GetService('CampaignFeedService', headers, op_config)
 
   def GetCampaignSharedSetService(self, server='https://adwords.google.com',
                                   version=None, http_proxy=None):
@@ -930,8 +932,7 @@ class AdWordsClient(Client):
         'default_group': 'cm',
         'http_proxy': http_proxy
     }
-    return GenericAdWordsService(headers, self._config, op_config, self.__lock,
-                                 self.__logger, 'CampaignSharedSetService')
+    return self.__GetService('CampaignSharedSetService', headers, op_config)
 
   def GetCampaignService(self, server='https://adwords.google.com',
                          version=None, http_proxy=None):
@@ -962,8 +963,7 @@ class AdWordsClient(Client):
         'default_group': 'cm',
         'http_proxy': http_proxy
     }
-    return GenericAdWordsService(headers, self._config, op_config, self.__lock,
-                                 self.__logger, 'CampaignService')
+    return self.__GetService('CampaignService', headers, op_config)
 
   def GetConstantDataService(self, server='https://adwords.google.com',
                              version=None, http_proxy=None):
@@ -994,8 +994,7 @@ class AdWordsClient(Client):
         'default_group': 'cm',
         'http_proxy': http_proxy
     }
-    return GenericAdWordsService(headers, self._config, op_config, self.__lock,
-                                 self.__logger, 'ConstantDataService')
+    return self.__GetService('ConstantDataService', headers, op_config)
 
   def GetCustomerService(self, server='https://adwords.google.com',
                          version=None, http_proxy=None):
@@ -1026,8 +1025,7 @@ class AdWordsClient(Client):
         'default_group': 'cm',
         'http_proxy': http_proxy
     }
-    return GenericAdWordsService(headers, self._config, op_config, self.__lock,
-                                 self.__logger, 'CustomerService')
+    return self.__GetService('CustomerService', headers, op_config)
 
   def GetCustomerSyncService(self, server='https://adwords.google.com',
                              version=None, http_proxy=None):
@@ -1058,8 +1056,7 @@ class AdWordsClient(Client):
         'default_group': 'cm',
         'http_proxy': http_proxy
     }
-    return GenericAdWordsService(headers, self._config, op_config, self.__lock,
-                                 self.__logger, 'CustomerSyncService')
+    return self.__GetService('CustomerSyncService', headers, op_config)
 
   def GetExperimentService(self, server='https://adwords.google.com',
                            version=None, http_proxy=None):
@@ -1090,8 +1087,7 @@ class AdWordsClient(Client):
         'default_group': 'cm',
         'http_proxy': http_proxy
     }
-    return GenericAdWordsService(headers, self._config, op_config, self.__lock,
-                                 self.__logger, 'ExperimentService')
+    return self.__GetService('ExperimentService', headers, op_config)
 
   def GetFeedItemService(self, server='https://adwords.google.com',
                          version=None, http_proxy=None):
@@ -1122,8 +1118,7 @@ class AdWordsClient(Client):
         'default_group': 'cm',
         'http_proxy': http_proxy
     }
-    return GenericAdWordsService(headers, self._config, op_config, self.__lock,
-                                 self.__logger, 'FeedItemService')
+    return self.__GetService('FeedItemService', headers, op_config)
 
   def GetFeedMappingService(self, server='https://adwords.google.com',
                             version=None, http_proxy=None):
@@ -1154,8 +1149,7 @@ class AdWordsClient(Client):
         'default_group': 'cm',
         'http_proxy': http_proxy
     }
-    return GenericAdWordsService(headers, self._config, op_config, self.__lock,
-                                 self.__logger, 'FeedMappingService')
+    return self.__GetService('FeedMappingService', headers, op_config)
 
   def GetFeedService(self, server='https://adwords.google.com',
                      version=None, http_proxy=None):
@@ -1186,8 +1180,7 @@ class AdWordsClient(Client):
         'default_group': 'cm',
         'http_proxy': http_proxy
     }
-    return GenericAdWordsService(headers, self._config, op_config, self.__lock,
-                                 self.__logger, 'FeedService')
+    return self.__GetService('FeedService', headers, op_config)
 
   def GetGeoLocationService(self, server='https://adwords.google.com',
                             version=None, http_proxy=None):
@@ -1218,8 +1211,7 @@ class AdWordsClient(Client):
         'default_group': 'cm',
         'http_proxy': http_proxy
     }
-    return GenericAdWordsService(headers, self._config, op_config, self.__lock,
-                                 self.__logger, 'GeoLocationService')
+    return self.__GetService('GeoLocationService', headers, op_config)
 
   def GetLocationCriterionService(self, server='https://adwords.google.com',
                                   version=None, http_proxy=None):
@@ -1250,8 +1242,7 @@ class AdWordsClient(Client):
         'default_group': 'cm',
         'http_proxy': http_proxy
     }
-    return GenericAdWordsService(headers, self._config, op_config, self.__lock,
-                                 self.__logger, 'LocationCriterionService')
+    return self.__GetService('LocationCriterionService', headers, op_config)
 
   def GetManagedCustomerService(self, server='https://adwords.google.com',
                                 version=None, http_proxy=None):
@@ -1282,8 +1273,7 @@ class AdWordsClient(Client):
         'default_group': 'cm',
         'http_proxy': http_proxy
     }
-    return GenericAdWordsService(headers, self._config, op_config, self.__lock,
-                                 self.__logger, 'ManagedCustomerService')
+    return self.__GetService('ManagedCustomerService', headers, op_config)
 
   def GetMediaService(self, server='https://adwords.google.com', version=None,
                       http_proxy=None):
@@ -1314,8 +1304,7 @@ class AdWordsClient(Client):
         'default_group': 'cm',
         'http_proxy': http_proxy
     }
-    return GenericAdWordsService(headers, self._config, op_config, self.__lock,
-                                 self.__logger, 'MediaService')
+    return self.__GetService('MediaService', headers, op_config)
 
   def GetOfflineConversionFeedService(self, server='https://adwords.google.com',
                                       version=None, http_proxy=None):
@@ -1346,8 +1335,7 @@ class AdWordsClient(Client):
         'default_group': 'cm',
         'http_proxy': http_proxy
     }
-    return GenericAdWordsService(headers, self._config, op_config, self.__lock,
-                                 self.__logger, 'OfflineConversionFeedService')
+    return self.__GetService('OfflineConversionFeedService', headers, op_config)
 
   def GetReportDefinitionService(self, server='https://adwords.google.com',
                                  version=None, http_proxy=None):
@@ -1378,8 +1366,7 @@ class AdWordsClient(Client):
         'default_group': 'cm',
         'http_proxy': http_proxy
     }
-    return GenericAdWordsService(headers, self._config, op_config, self.__lock,
-                                 self.__logger, 'ReportDefinitionService')
+    return self.__GetService('ReportDefinitionService', headers, op_config)
 
   def GetReportDownloader(self, server='https://adwords.google.com',
                           version=None, http_proxy=None):
@@ -1441,8 +1428,7 @@ class AdWordsClient(Client):
         'default_group': 'cm',
         'http_proxy': http_proxy
     }
-    return GenericAdWordsService(headers, self._config, op_config, self.__lock,
-                                 self.__logger, 'SharedCriterionService')
+    return self.__GetService('SharedCriterionService', headers, op_config)
 
   def GetSharedSetService(self, server='https://adwords.google.com',
                           version=None, http_proxy=None):
@@ -1473,8 +1459,7 @@ class AdWordsClient(Client):
         'default_group': 'cm',
         'http_proxy': http_proxy
     }
-    return GenericAdWordsService(headers, self._config, op_config, self.__lock,
-                                 self.__logger, 'SharedSetService')
+    return self.__GetService('SharedSetService', headers, op_config)
 
   def GetTargetingIdeaService(self, server='https://adwords.google.com',
                               version=None, http_proxy=None):
@@ -1505,8 +1490,7 @@ class AdWordsClient(Client):
         'default_group': 'cm',
         'http_proxy': http_proxy
     }
-    return GenericAdWordsService(headers, self._config, op_config, self.__lock,
-                                 self.__logger, 'TargetingIdeaService')
+    return self.__GetService('TargetingIdeaService', headers, op_config)
 
   def GetTrafficEstimatorService(self, server='https://adwords.google.com',
                                  version=None, http_proxy=None):
@@ -1537,8 +1521,7 @@ class AdWordsClient(Client):
         'default_group': 'cm',
         'http_proxy': http_proxy
     }
-    return GenericAdWordsService(headers, self._config, op_config, self.__lock,
-                                 self.__logger, 'TrafficEstimatorService')
+    return self.__GetService('TrafficEstimatorService', headers, op_config)
 
   def GetUserListService(self, server='https://adwords.google.com',
                          version=None, http_proxy=None):
@@ -1570,8 +1553,7 @@ class AdWordsClient(Client):
         'default_group': 'cm',
         'http_proxy': http_proxy
     }
-    return GenericAdWordsService(headers, self._config, op_config, self.__lock,
-                                 self.__logger, 'UserListService')
+    return self.__GetService('UserListService', headers, op_config)
 
   def GetConversionTrackerService(self, server='https://adwords.google.com',
                                   version=None, http_proxy=None):
@@ -1602,8 +1584,7 @@ class AdWordsClient(Client):
         'default_group': 'cm',
         'http_proxy': http_proxy
     }
-    return GenericAdWordsService(headers, self._config, op_config, self.__lock,
-                                 self.__logger, 'ConversionTrackerService')
+    return self.__GetService('ConversionTrackerService', headers, op_config)
 
   def GetDataService(self, server='https://adwords.google.com',
                      version=None, http_proxy=None):
@@ -1634,5 +1615,4 @@ class AdWordsClient(Client):
         'default_group': 'cm',
         'http_proxy': http_proxy
     }
-    return GenericAdWordsService(headers, self._config, op_config, self.__lock,
-                                 self.__logger, 'DataService')
+    return self.__GetService('DataService', headers, op_config)
@@ -48,14 +48,6 @@ class AdWordsSoapBuffer(SoapBuffer):
     """
     return super(AdWordsSoapBuffer, self)._GetXmlOut()
 
-  def __GetXmlIn(self):
-    """Remove banners from incoming SOAP XML and construct XML object.
-
-    Returns:
-      Document/Element Object generated from string, representing XML message.
-    """
-    return super(AdWordsSoapBuffer, self)._GetXmlIn()
-
   def __GetXmlValueByName(self, xml_obj, names, get_all=False):
     """Get XML object value from a given tag name.
 
@@ -81,9 +73,7 @@ class AdWordsSoapBuffer(SoapBuffer):
     Returns:
       str responseTime header value.
     """
-    return self.__GetXmlValueByName(self._GetXmlIn(),
-        ['responseTime', 'Header/ResponseHeader/responseTime',
-         'ns2:responseTime'])
+    return self._GetResponseHeader().get('responseTime')
 
   def GetCallRequestId(self):
     """Get value for requestId header.
@@ -91,8 +81,7 @@ class AdWordsSoapBuffer(SoapBuffer):
     Returns:
       str requestId header value.
     """
-    return self.__GetXmlValueByName(self._GetXmlIn(),
-        ['requestId', 'Header/ResponseHeader/requestId', 'ns2:requestId'])
+    return self._GetResponseHeader().get('requestId')
 
   def GetOperatorName(self):
     """Get name of the operator that was used in the API call.
@@ -128,8 +117,7 @@ class AdWordsSoapBuffer(SoapBuffer):
     Returns:
       str Operations header value.
     """
-    return self.__GetXmlValueByName(self.__GetXmlIn(),
-        ['operations', 'Header/ResponseHeader/operations', 'ns2:operations'])
+    return self._GetResponseHeader().get('operations')
 
   def GetCallUnits(self):
     """Get value for units header.
@@ -137,5 +125,4 @@ class AdWordsSoapBuffer(SoapBuffer):
     Returns:
       str Units header value.
     """
-    return self.__GetXmlValueByName(self.__GetXmlIn(),
-        ['units', 'Header/ResponseHeader/units', 'ns2:units'])
+    return self._GetResponseHeader().get('units')
@@ -115,3 +115,37 @@ def ExtractGroupNameFromUrl(url):
     string The group this AdWords service belongs to.
   """
   return url.split('/')[-2]
+
+
+def GetClientCustomerIds(managed_customer_service, page_size=500):
+  """Gets the IDs of all client accounts below the MCC of a service.
+
+  Manager accounts are left out, since reports can only be downloaded for
+  client accounts.
+
+  Args:
+    managed_customer_service: GenericAdWordsService ManagedCustomerService, of
+                              a client using the MCC.
+    [optional]
+    page_size: int Number of accounts to get per request.
+
+  Returns:
+    list The customer IDs of the client accounts.
+  """
+  customer_ids = []
+  offset = 0
+  while True:
+    selector = {
+        'fields': ['CustomerId', 'CanManageClients'],
+        'paging': {
+            'startIndex': str(offset),
+            'numberResults': str(page_size)
+        }
+    }
+    page = managed_customer_service.Get(selector)[0]
+    for account in page.get('entries') or []:
+      if not Utils.BoolTypeConvert(account.get('canManageClients', False)):
+        customer_ids.append(account['customerId'])
+    offset += page_size
+    if offset >= int(page.get('totalNumEntries', 0)):
+      return customer_ids
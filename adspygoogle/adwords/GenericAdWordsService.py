@@ -113,7 +113,24 @@ class GenericAdWordsService(GenericApiService):
           LIB_SIG, self._config['proxy'])
       self._config['auth_token_epoch'] = time.time()
 
-    # Apply headers to the SOAPpy service.
+    # Apply headers to the SOAPpy service, building them only if any of the
+    # values they depend on changed since the last request.
+    use_oauth2 = bool(self._headers.get('oauth2credentials'))
+    key = [self._op_config['version'], use_oauth2]
+    for header in GenericAdWordsService._POSSIBLE_ADWORDS_REQUEST_HEADERS:
+      key.append(self._headers.get(header))
+    self._ApplySoapHeaders(tuple(key),
+                           lambda: self._BuildSoapHeaders(use_oauth2))
+
+  def _BuildSoapHeaders(self, use_oauth2):
+    """Builds the SOAP headers for this service's requests.
+
+    Args:
+      use_oauth2: bool Whether requests are authorized with OAuth2 credentials.
+
+    Returns:
+      SOAPpy.Types.headerType The SOAP headers.
+    """
     header_attrs = {
         'xmlns': self._namespace,
         'xmlns:cm': ('https://adwords.google.com/api/adwords/cm/' +
@@ -122,8 +139,7 @@ class GenericAdWordsService(GenericApiService):
     soap_headers = SOAPpy.Types.headerType(attrs=header_attrs)
     request_header_data = {}
     for key in GenericAdWordsService._POSSIBLE_ADWORDS_REQUEST_HEADERS:
-      if (key in GenericAdWordsService._OAUTH_IGNORE_HEADERS
-          and self._headers.get('oauth2credentials')):
+      if key in GenericAdWordsService._OAUTH_IGNORE_HEADERS and use_oauth2:
         continue
       if key in self._headers and self._headers[key]:
         value = self._headers[key]
@@ -136,7 +152,7 @@ class GenericAdWordsService(GenericApiService):
     request_header = SOAPpy.Types.structType(
         data=request_header_data, name='RequestHeader', typed=0)
     soap_headers.RequestHeader = request_header
-    self._soappyservice.soapproxy.header = soap_headers
+    return soap_headers
 
   def _GetMethodInfo(self, method_name):
     """Pulls all of the relevant data about a method from a SOAPpy service.
@@ -255,6 +271,16 @@ class GenericAdWordsService(GenericApiService):
     Returns:
       list Log handlers for the AdWords library.
     """
+    def GetRequestInfo():
+      """Returns the request log message, built only if it is written."""
+      return str('host=%s service=%s method=%s operator=%s '
+                 'responseTime=%s operations=%s units=%s requestId=%s'
+                 % (Utils.GetNetLocFromUrl(self._service_url),
+                    self._service_name, buf.GetCallName(),
+                    buf.GetOperatorName(), buf.GetCallResponseTime(),
+                    buf.GetCallOperations(), buf.GetCallUnits(),
+                    buf.GetCallRequestId()))
+
     return [
         {
             'tag': 'xml_log',
@@ -264,13 +290,7 @@ class GenericAdWordsService(GenericApiService):
         {
             'tag': 'request_log',
             'name': 'request_info',
-            'data': str('host=%s service=%s method=%s operator=%s '
-                        'responseTime=%s operations=%s units=%s requestId=%s'
-                        % (Utils.GetNetLocFromUrl(self._service_url),
-                           self._service_name, buf.GetCallName(),
-                           buf.GetOperatorName(), buf.GetCallResponseTime(),
-                           buf.GetCallOperations(), buf.GetCallUnits(),
-                           buf.GetCallRequestId()))
+            'data': GetRequestInfo
         },
         {
             'tag': '',
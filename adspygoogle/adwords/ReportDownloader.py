@@ -18,10 +18,17 @@
 
 __author__ = 'api.kwinter@gmail.com (Kevin Winter)'
 
+import copy
+import csv
 import datetime
 import gzip
+import httplib
+import os
 import re
+import shutil
+import socket
 import StringIO
+import tempfile
 import time
 import urllib
 import urllib2
@@ -33,6 +40,9 @@ from adspygoogle.adwords import LIB_SIG
 from adspygoogle.adwords.AdWordsErrors import AdWordsError
 from adspygoogle.adwords.AdWordsErrors import AdWordsReportError
 from adspygoogle.adwords.util import XsdToWsdl
+from adspygoogle.common import BatchExecutor
+from adspygoogle.common import ConnectionPool
+from adspygoogle.common import GzipStream
 from adspygoogle.common import MessageHandler
 from adspygoogle.common import SanityCheck
 from adspygoogle.common import Utils
@@ -48,12 +58,132 @@ ATTRIBUTES_REGEX = r'( )?[\w:-]+="[\w:\[\]-]+"'
 ERROR_TYPE_REGEX = r'(?s)<type>(.*?)</type>'
 ERROR_TRIGGER_REGEX = r'(?s)<trigger>(.*?)</trigger>'
 ERROR_FIELD_PATH_REGEX = r'(?s)<fieldPath>(.*?)</fieldPath>'
-BUF_SIZE = 4096
+DURING_DATES_REGEX = r'(?i)\bDURING\s+(\d{8})\s*,\s*(\d{8})'
+SELECT_FIELDS_REGEX = r'(?is)^\s*SELECT\s+(.+?)\s+FROM\s'
+BUF_SIZE = 65536
+# Field delimiters of the download formats whose rows can be read.
+_ROW_DELIMITERS = {'CSV': ',', 'TSV': '\t'}
+# Values of report columns which have none.
+_NO_VALUES = ('', '--', ' --')
+# Number of attempts at each download of a report fanned out over accounts.
+DEFAULT_ATTEMPTS = 3
+# Seconds to wait before retrying a download, doubled after each attempt.
+DEFAULT_BACKOFF = 1.0
+# Number of days of each shard of a report downloaded in shards.
+DEFAULT_SHARD_DAYS = 31
+# Date segments which keep the rows of a report downloaded in shards apart,
+# most detailed first.
+_SHARD_SEGMENTS = ('Date', 'Week', 'Month')
+# File name extensions of the download formats, when not the format itself.
+_FILE_EXTENSIONS = {
+    'CSVFOREXCEL': 'csv',
+    'GZIPPED_CSV': 'csv.gz',
+    'GZIPPED_XML': 'xml.gz'
+}
 # We will refresh an OAuth 2.0 credential _OAUTH2_REFRESH_MINUTES_IN_ADVANCE
 # minutes in advance of it's expiration.
 _OAUTH2_REFRESH_MINUTES_IN_ADVANCE = 5
 
 
+def ParseReportDate(value):
+  """Converts a date from a report into a datetime.date.
+
+  Args:
+    value: str Date as it appears in reports, such as 2013-10-31.
+
+  Returns:
+    datetime.date The date.
+  """
+  return datetime.date(*time.strptime(value, '%Y-%m-%d')[:3])
+
+
+def _GetShardSegment(report_query):
+  """Returns the date segment a query selects that sharding can rely on.
+
+  Args:
+    report_query: str AWQL for the report.
+
+  Returns:
+    str The most detailed of the Date, Week and Month fields the query
+    selects, None if it selects none of them.
+  """
+  match = re.search(SELECT_FIELDS_REGEX, report_query)
+  if not match:
+    return None
+  fields = [name.strip() for name in match.group(1).split(',')]
+  for segment in _SHARD_SEGMENTS:
+    if segment in fields:
+      return segment
+  return None
+
+
+def _GetShardEnd(start, shard_days, segment):
+  """Returns the last day of a shard, aligned to the report's date segment.
+
+  Args:
+    start: datetime.date First day of the shard.
+    shard_days: int Minimum number of days of the shard.
+    segment: str Date segment of the report, Date, Week or Month.
+
+  Returns:
+    datetime.date The last day of the shard: shard_days days on, stretched to
+    a Sunday for weekly reports and to the end of a month for monthly ones.
+  """
+  end = start + datetime.timedelta(days=shard_days - 1)
+  if segment == 'Week':
+    end += datetime.timedelta(days=6 - end.weekday())
+  elif segment == 'Month':
+    next_month = datetime.date(end.year + end.month / 12, end.month % 12 + 1, 1)
+    end = next_month - datetime.timedelta(days=1)
+  return end
+
+
+def _IsTransientError(error):
+  """Returns whether a failed download is worth retrying.
+
+  Args:
+    error: Exception The error the download raised.
+
+  Returns:
+    bool Whether the error was a 5xx response, exceeding the rate limit or a
+    network error, rather than caused by the request or its credentials.
+  """
+  if (isinstance(error, AdWordsReportError) and
+      'RateExceeded' in str(error.type)):
+    return True
+  http_code = getattr(error, 'http_code', None)
+  if http_code is not None:
+    try:
+      return int(http_code) >= 500
+    except (TypeError, ValueError):
+      return False
+  if isinstance(error, AdWordsError):
+    # Failures to reach the server are raised with the error behind them.
+    error = getattr(error, 'cause', None)
+  return isinstance(error, (urllib2.URLError, socket.error,
+                            httplib.HTTPException))
+
+
+class ReportHeader(object):
+
+  """Title and column names of a report whose rows are read.
+
+  Attributes:
+    title: str Title of the report, with its name and date range.
+    columns: tuple Display names of the report's columns, in order.
+  """
+
+  def __init__(self, title, columns):
+    """Inits ReportHeader.
+
+    Args:
+      title: str Title of the report.
+      columns: tuple Display names of the report's columns.
+    """
+    self.title = title
+    self.columns = columns
+
+
 class ReportDownloader(object):
 
   """Utility class that downloads reports."""
@@ -80,6 +210,7 @@ class ReportDownloader(object):
                                                self._op_config['version'])
     self._soappyservice = XsdToWsdl.CreateWsdlFromXsdUrl(xsd_url)
     self._logger = logger
+    self._connection_pool = ConnectionPool.GetConnectionPoolFromConfig(config)
 
   def DownloadReport(self, report_definition_or_id, return_micros=False,
                      file_path=None, fileobj=None):
@@ -88,7 +219,8 @@ class ReportDownloader(object):
     Args:
       report_definition_or_id: dict or str Report or reportDefinitionId.
       return_micros: bool Whether to return currency in micros (optional).
-      file_path: str File path to download to (optional).
+      file_path: str File path to download to (optional). A path ending in
+                 '.gz' gets the report gzip compressed.
       fileobj: file An already-open file-like object that supports write()
                (optional).
 
@@ -96,15 +228,14 @@ class ReportDownloader(object):
       str Report data if file_path and fileobj are None, None if fileobj is
           not None and file_path otherwise.
     """
-    if not fileobj and file_path:
-      fileobj = open(file_path, 'w+')
+    fileobj, gzip_output = self.__OpenOutput(file_path, fileobj)
 
     if isinstance(report_definition_or_id, dict):
       return self.__DownloadAdHocReport(report_definition_or_id, return_micros,
-                                        fileobj) or file_path
+                                        fileobj, gzip_output) or file_path
     else:
       return self.__DownloadReportById(report_definition_or_id, return_micros,
-                                       fileobj) or file_path
+                                       fileobj, gzip_output) or file_path
 
   def DownloadReportWithAwql(self, report_query, download_format,
                              return_micros=False, file_path=None, fileobj=None):
@@ -114,7 +245,8 @@ class ReportDownloader(object):
       report_query: str AWQL for the report.
       download_format: str Download format. E.g. CSV, TSV, XML.
       return_micros: bool Whether to return currency in micros (optional).
-      file_path: str File path to download to (optional).
+      file_path: str File path to download to (optional). A path ending in
+                 '.gz' gets the report gzip compressed.
       fileobj: file An already-open file-like object that supports write()
                (optional).
 
@@ -122,22 +254,511 @@ class ReportDownloader(object):
       str Report data if file_path and fileobj are None, None if fileobj is
           not None and file_path otherwise.
     """
-    if not fileobj and file_path:
-      fileobj = open(file_path, 'w+')
+    fileobj, gzip_output = self.__OpenOutput(file_path, fileobj)
 
     return self.__DownloadAdHocReportWithAwql(report_query,
                                               download_format,
                                               return_micros,
-                                              fileobj) or file_path
+                                              fileobj, gzip_output) or file_path
+
+  def IterReportRowsWithAwql(self, report_query, download_format='CSV',
+                             return_micros=False, converters=None):
+    """Downloads a report with AWQL, yielding its rows as they arrive.
+
+    The report is parsed while it downloads, so reports of any size are read in
+    constant memory. A ReportHeader with the report's title and column names is
+    yielded first, then a tuple for each row. The title line and the totals
+    row ending the report are not yielded as rows. The request is logged once
+    the report starts arriving.
+
+    Args:
+      report_query: str AWQL for the report.
+      [optional]
+      download_format: str Download format, either CSV or TSV.
+      return_micros: bool Whether to return currency in micros.
+      converters: dict Functions converting the values of some columns, keyed
+                  by column name or index. For example int for money in
+                  micros, or ParseReportDate for dates. Columns without a value
+                  ('--') are converted to None.
+
+    Returns:
+      generator The ReportHeader, then a tuple of values for each row.
+
+    Raises:
+      ValidationError: if the download format is neither CSV nor TSV.
+    """
+    if download_format not in _ROW_DELIMITERS:
+      raise ValidationError('Rows can only be read from CSV or TSV reports, '
+                            'not \'%s\'.' % download_format)
+    query_params = {
+        '__fmt': download_format,
+        '__rdquery': report_query
+    }
+    response = self.__DownloadReport(urllib.urlencode(query_params),
+                                     return_micros, stream=True)
+    return self.__IterRows(response, _ROW_DELIMITERS[download_format],
+                           converters or {})
+
+  def DownloadReportColumnsWithAwql(self, report_query, report_fields=None,
+                                    download_format='CSV',
+                                    return_micros=False):
+    """Downloads a report with AWQL into columns of NumPy arrays.
+
+    Rows are converted a chunk at a time as the report arrives, so memory is
+    about the size of the resulting columns. Numeric, date and boolean columns
+    are typed from report_fields, enums are stored as codes into their
+    categories, and other columns as byte strings. See the ReportColumns
+    module for details. Needs NumPy.
+
+    Args:
+      report_query: str AWQL for the report.
+      [optional]
+      report_fields: list Fields of the report type, as returned by
+                     ReportDefinitionService.getReportFields. Without them,
+                     every column is read as strings.
+      download_format: str Download format, either CSV or TSV.
+      return_micros: bool Whether to return currency in micros.
+
+    Returns:
+      ReportColumns.ColumnarReport The report's columns, which can be saved as
+      .npz or as memory-mappable .npy files.
+
+    Raises:
+      AdWordsError: if NumPy is not installed.
+      ValidationError: if the download format is neither CSV nor TSV.
+    """
+    try:
+      from adspygoogle.adwords.util import ReportColumns
+    except ImportError, e:
+      raise AdWordsError('Reading reports into columns requires NumPy: %s' % e)
+    rows = self.IterReportRowsWithAwql(report_query, download_format,
+                                       return_micros)
+    return ReportColumns.ReadReport(
+        rows, ReportColumns.GetQueryFieldNames(report_query), report_fields,
+        return_micros)
+
+  def DownloadReportForAccountsWithAwql(self, report_query, download_format,
+                                        customer_ids, return_micros=False,
+                                        output_dir=None, fileobj=None,
+                                        max_workers=None,
+                                        attempts=DEFAULT_ATTEMPTS,
+                                        backoff=DEFAULT_BACKOFF):
+    """Downloads the same AWQL report for many client accounts concurrently.
+
+    Accounts are downloaded on up to max_workers threads, all sharing this
+    downloader's parsed XSD and pooled connections. Downloads failing on a
+    server or network error are retried, waiting backoff seconds and twice as
+    long after each further failure. An account whose download still fails
+    does not stop the others: its result records the error.
+
+    Args:
+      report_query: str AWQL for the report.
+      download_format: str Download format. E.g. CSV, TSV, XML.
+      customer_ids: list IDs of the client accounts, such as the ones returned
+                    by AdWordsUtils.GetClientCustomerIds.
+      [optional]
+      return_micros: bool Whether to return currency in micros.
+      output_dir: str Directory to write a report per account to, named after
+                  the customer ID and the format, e.g. 123-456-7890.csv.
+      fileobj: file File-like object to write the reports of all accounts to,
+               one after the other in customer_ids order. Only for CSV and TSV
+               reports: the title and column names are written once, and the
+               totals row of each account is left out.
+      max_workers: int Maximum number of downloads in flight. Defaults to the
+                   "batch_max_workers" config value.
+      attempts: int Maximum number of attempts at each account's download.
+      backoff: float Seconds to wait before the first retry.
+
+    Returns:
+      BatchExecutor.BatchResults A BatchResult for every account, in
+      customer_ids order. Each holds the path of the account's report if
+      output_dir is given, None if fileobj is, and the report data otherwise,
+      or the error which made the account's download fail.
+
+    Raises:
+      ValidationError: if reports of a format other than CSV or TSV are to be
+                       written to fileobj.
+    """
+    if fileobj is not None and download_format not in _ROW_DELIMITERS:
+      raise ValidationError('Only CSV or TSV reports can be merged, not '
+                            '\'%s\'.' % download_format)
+    payload = urllib.urlencode({
+        '__fmt': download_format,
+        '__rdquery': report_query
+    })
+    work_dir = None
+    if fileobj is not None:
+      work_dir = tempfile.mkdtemp()
+      output_dir = work_dir
+    elif output_dir and not os.path.isdir(output_dir):
+      os.makedirs(output_dir)
+    try:
+      file_paths = []
+      for customer_id in customer_ids:
+        file_path = None
+        if output_dir:
+          file_path = os.path.join(output_dir, '%s.%s' % (
+              customer_id, _FILE_EXTENSIONS.get(download_format,
+                                                download_format.lower())))
+        file_paths.append(file_path)
+      results = self.__DownloadParts(
+          [(self.__GetAccountDownloader(customer_id),
+            (payload, return_micros, file_path, attempts, backoff))
+           for customer_id, file_path in zip(customer_ids, file_paths)],
+          max_workers)
+      if fileobj is not None:
+        self.__MergeParts([file_path for file_path, result
+                           in zip(file_paths, results) if result.Succeeded()],
+                          fileobj, _ROW_DELIMITERS[download_format])
+        for result in results:
+          result.result = None
+      return results
+    finally:
+      if work_dir:
+        shutil.rmtree(work_dir, True)
+
+  def DownloadShardedReportWithAwql(self, report_query, download_format,
+                                    shard_days=DEFAULT_SHARD_DAYS,
+                                    return_micros=False, file_path=None,
+                                    fileobj=None, max_workers=None,
+                                    attempts=DEFAULT_ATTEMPTS,
+                                    backoff=DEFAULT_BACKOFF):
+    """Downloads a report over a long date range as concurrent shards.
+
+    The date range of the query's DURING clause is split into windows of
+    shard_days days, which are downloaded concurrently on up to max_workers
+    threads and then written out in date order as a single report: the title,
+    spanning the whole range, and the column names once, without totals rows.
+    A shard failing on a server or network error is retried on its own, with
+    the same backoff as DownloadReportForAccountsWithAwql.
+
+    The query must select the Date, Week or Month segment. Each row then
+    covers a single day, week or month, which no two shards share, so the
+    shards add up to the report over the whole range. Without one, every
+    shard would have its own row per keyword, ad or campaign, with metrics,
+    ratios such as Ctr included, over that shard only. With Week or Month but
+    not Date, windows are stretched to end on a Sunday or on the last day of a
+    month.
+
+    Args:
+      report_query: str AWQL for the report, with an explicit date range such
+                    as DURING 20130101,20131231, selecting the Date, Week or
+                    Month segment.
+      download_format: str Download format, either CSV or TSV.
+      [optional]
+      shard_days: int Number of days of each shard.
+      return_micros: bool Whether to return currency in micros.
+      file_path: str File path to download to. A path ending in '.gz' gets the
+                 report gzip compressed.
+      fileobj: file An already-open file-like object that supports write().
+      max_workers: int Maximum number of shards downloaded at a time. Defaults
+                   to the "batch_max_workers" config value.
+      attempts: int Maximum number of attempts at each shard.
+      backoff: float Seconds to wait before the first retry of a shard.
+
+    Returns:
+      str Report data if file_path and fileobj are None, None if fileobj is
+      not None and file_path otherwise.
+
+    Raises:
+      ValidationError: if the format is neither CSV nor TSV, or the query has
+                       no explicit date range or selects no date segment.
+      AdWordsError: the error of the first shard which could not be
+                    downloaded. Nothing is written then.
+    """
+    if download_format not in _ROW_DELIMITERS:
+      raise ValidationError('Only CSV or TSV reports can be sharded, not '
+                            '\'%s\'.' % download_format)
+    match = re.search(DURING_DATES_REGEX, report_query)
+    if not match:
+      raise ValidationError('Sharded reports need an explicit date range, '
+                            'such as DURING 20130101,20131231.')
+    segment = _GetShardSegment(report_query)
+    if segment is None:
+      raise ValidationError('Sharded reports must select one of the %s '
+                            'segments, so that no row spans two shards.'
+                            % ', '.join(_SHARD_SEGMENTS))
+    start = datetime.date(*time.strptime(match.group(1), '%Y%m%d')[:3])
+    end = datetime.date(*time.strptime(match.group(2), '%Y%m%d')[:3])
+    shard_days = max(int(shard_days), 1)
+
+    work_dir = tempfile.mkdtemp()
+    try:
+      parts = []
+      file_paths = []
+      while start <= end:
+        shard_end = min(_GetShardEnd(start, shard_days, segment), end)
+        shard_query = '%sDURING %s,%s%s' % (
+            report_query[:match.start()], start.strftime('%Y%m%d'),
+            shard_end.strftime('%Y%m%d'), report_query[match.end():])
+        shard_path = os.path.join(work_dir, '%s.%s' % (
+            start.strftime('%Y%m%d'), download_format.lower()))
+        payload = urllib.urlencode({
+            '__fmt': download_format,
+            '__rdquery': shard_query
+        })
+        parts.append((self, (payload, return_micros, shard_path, attempts,
+                             backoff)))
+        file_paths.append(shard_path)
+        start = shard_end + datetime.timedelta(days=1)
+
+      errors = self.__DownloadParts(parts, max_workers).GetErrors()
+      if errors:
+        raise errors[0][1]
+
+      title = self.__GetSpanningTitle(file_paths[0], file_paths[-1])
+      output, gzip_output = self.__OpenOutput(file_path, fileobj)
+      if output is None:
+        output = StringIO.StringIO()
+      target = output
+      if gzip_output:
+        target = gzip.GzipFile(mode='wb', fileobj=output)
+      try:
+        self.__MergeParts(file_paths, target, _ROW_DELIMITERS[download_format],
+                          title)
+      finally:
+        if gzip_output:
+          target.close()
+        if file_path and not fileobj:
+          output.close()
+      if fileobj:
+        return None
+      if file_path:
+        return file_path
+      return output.getvalue()
+    finally:
+      shutil.rmtree(work_dir, True)
+
+  def __GetSpanningTitle(self, first_path, last_path):
+    """Returns a title spanning the date ranges of two reports.
+
+    Args:
+      first_path: str Path of the report with the earliest dates.
+      last_path: str Path of the report with the latest dates.
+
+    Returns:
+      str Title line of the first report, ending with the end date of the
+      last one. None if either has no date range.
+    """
+    first = open(first_path, 'rb')
+    try:
+      first_title = first.readline()
+    finally:
+      first.close()
+    last = open(last_path, 'rb')
+    try:
+      last_title = last.readline()
+    finally:
+      last.close()
+    # Titles end with their date range, e.g. (Jan 1, 2013-Jan 31, 2013).
+    if '-' not in first_title or '-' not in last_title:
+      return None
+    return '%s-%s' % (first_title.rsplit('-', 1)[0],
+                      last_title.rsplit('-', 1)[1])
+
+  def _DownloadWithRetries(self, payload, return_micros, file_path, attempts,
+                           backoff):
+    """Downloads a report, retrying it on server and network errors.
+
+    Args:
+      payload: str Report payload to POST to the server.
+      return_micros: bool Whether to return currency in micros.
+      file_path: str File path to download to, None to return the report.
+      attempts: int Maximum number of attempts.
+      backoff: float Seconds to wait before the first retry, doubled after
+               each further failure.
+
+    Returns:
+      str The file path if given, the report data otherwise.
+    """
+    attempt = 1
+    while True:
+      try:
+        if file_path is None:
+          return self.__DownloadReport(payload, return_micros)
+        fileobj = open(file_path, 'wb')
+        try:
+          self.__DownloadReport(payload, return_micros, fileobj)
+        finally:
+          fileobj.close()
+        return file_path
+      except Exception, e:
+        if attempt >= attempts or not _IsTransientError(e):
+          raise
+      time.sleep(backoff * 2 ** (attempt - 1))
+      attempt += 1
+
+  def __GetAccountDownloader(self, customer_id):
+    """Returns a downloader for a client account, sharing this one's state.
+
+    Args:
+      customer_id: str ID of the client account.
+
+    Returns:
+      ReportDownloader A copy of this downloader, with its own headers.
+    """
+    downloader = copy.copy(self)
+    downloader._headers = self._headers.copy()
+    downloader._headers['clientCustomerId'] = str(customer_id)
+    return downloader
+
+  def __DownloadParts(self, parts, max_workers=None):
+    """Downloads parts of a report concurrently.
+
+    Args:
+      parts: list (downloader, args) tuples, with the args of
+             _DownloadWithRetries.
+      [optional]
+      max_workers: int Maximum number of downloads in flight. Defaults to the
+                   "batch_max_workers" config value.
+
+    Returns:
+      BatchExecutor.BatchResults A BatchResult for every part, in order.
+    """
+    if max_workers is None:
+      max_workers = self._config.get('batch_max_workers',
+                                     BatchExecutor.DEFAULT_MAX_WORKERS)
+    # Credentials are refreshed once up front rather than by every thread.
+    self._CheckAuthentication()
+    # All parts go to the same server, so only max_workers limits them.
+    return BatchExecutor.BatchExecutor(max_workers, max_workers).Execute(
+        [(downloader, '_DownloadWithRetries', args)
+         for downloader, args in parts])
+
+  def __MergeParts(self, file_paths, fileobj, delimiter, title=None):
+    """Writes CSV or TSV reports one after the other, as a single report.
+
+    The title and column names are taken from the first report. Totals rows
+    are left out.
+
+    Args:
+      file_paths: list Paths of the reports, in order.
+      fileobj: file File-like object to write to.
+      delimiter: str Field delimiter of the reports.
+      title: str Title line to write instead of the first report's (optional).
+    """
+    totals = 'Total' + delimiter
+    header_written = False
+    for file_path in file_paths:
+      part = open(file_path, 'rb')
+      try:
+        lines = GzipStream.IterLines(part, BUF_SIZE)
+        header = []
+        for line in lines:
+          header.append(line)
+          if len(header) == 2:
+            break
+        if not header_written:
+          if title and header:
+            header[0] = title
+          fileobj.write(''.join(header))
+          header_written = True
+        # Rows are written one behind, to leave out the totals row at the end.
+        previous = None
+        for line in lines:
+          if not line.strip():
+            continue
+          if previous is not None:
+            fileobj.write(previous)
+          previous = line
+        if previous is not None and not previous.startswith(totals):
+          fileobj.write(previous)
+      finally:
+        part.close()
+
+  def __IterRows(self, response, delimiter, converters):
+    """Yields the header and rows of a report as they are read.
+
+    Args:
+      response: file The report's response body.
+      delimiter: str Delimiter of the fields in the report.
+      converters: dict Functions converting values, by column name or index.
+
+    Returns:
+      generator The ReportHeader, then a tuple for each row.
+    """
+    try:
+      reader = csv.reader(GzipStream.IterLines(response, BUF_SIZE),
+                          delimiter=delimiter)
+      title = ''
+      columns = ()
+      for row in reader:
+        if not title:
+          title = ''.join(row)
+        else:
+          columns = tuple(row)
+          break
+      yield ReportHeader(title, columns)
+
+      column_converters = [converters.get(columns[i], converters.get(i))
+                           for i in range(len(columns))]
+      if not [converter for converter in column_converters if converter]:
+        column_converters = None
+      # Rows are yielded one behind, to leave out the totals row at the end.
+      previous = None
+      for row in reader:
+        if not row:
+          continue
+        if previous is not None:
+          yield self.__ConvertRow(previous, column_converters)
+        previous = row
+      if previous is not None and previous[0] != 'Total':
+        yield self.__ConvertRow(previous, column_converters)
+    except Exception:
+      response.close()
+      raise
+    response.close()
+
+  def __ConvertRow(self, row, column_converters):
+    """Returns the values of a row, converted by the columns' converters.
+
+    Args:
+      row: list The row's values, as read.
+      column_converters: list The converter of each column, or None, or None
+                         if no column is converted.
+
+    Returns:
+      tuple The row's values.
+    """
+    if column_converters is None:
+      return tuple(row)
+    values = []
+    for i in range(len(row)):
+      value = row[i]
+      if i < len(column_converters) and column_converters[i]:
+        if value in _NO_VALUES:
+          value = None
+        else:
+          value = column_converters[i](value)
+      values.append(value)
+    return tuple(values)
+
+  def __OpenOutput(self, file_path, fileobj):
+    """Opens the file a report is downloaded to, if given a path.
+
+    Args:
+      file_path: str File path to download to, or None.
+      fileobj: file An already-open file-like object, or None.
+
+    Returns:
+      tuple The file to write the report to, None if the report is returned,
+      and whether it should be written gzip compressed.
+    """
+    if fileobj or not file_path:
+      return fileobj, False
+    if file_path.endswith('.gz'):
+      return open(file_path, 'wb'), True
+    return open(file_path, 'w+'), False
 
   def __DownloadAdHocReport(self, report_definition, return_micros=False,
-                            fileobj=None):
+                            fileobj=None, gzip_output=False):
     """Downloads an AdHoc report.
 
     Args:
       report_definition: dict Report to download.
       return_micros: bool Whether to return currency in micros (optional).
       fileobj: file File to write to (optional).
+      gzip_output: bool Whether to write the report gzip compressed (optional).
 
     Returns:
       str Report data if no fileobj, otherwise None.
@@ -146,13 +767,14 @@ class ReportDownloader(object):
     query_params = {'__rdxml': report_xml}
 
     payload = urllib.urlencode(query_params)
-    return self.__DownloadReport(payload, return_micros, fileobj)
+    return self.__DownloadReport(payload, return_micros, fileobj, gzip_output)
 
   def __DownloadAdHocReportWithAwql(self,
                                     report_query,
                                     download_format,
                                     return_micros=False,
-                                    fileobj=None):
+                                    fileobj=None,
+                                    gzip_output=False):
     """Downloads an AdHoc report with AWQL.
 
     Args:
@@ -160,6 +782,7 @@ class ReportDownloader(object):
       download_format: str Format of the report download.
       return_micros: bool Whether to return currency in micros (optional).
       fileobj: file File to write to (optional).
+      gzip_output: bool Whether to write the report gzip compressed (optional).
 
     Returns:
       str Report data if no fileobj, otherwise None.
@@ -170,25 +793,30 @@ class ReportDownloader(object):
     }
 
     payload = urllib.urlencode(query_params)
-    return self.__DownloadReport(payload, return_micros, fileobj)
+    return self.__DownloadReport(payload, return_micros, fileobj, gzip_output)
 
-  def __DownloadReport(self, report_payload, return_micros=False, fileobj=None):
+  def __DownloadReport(self, report_payload, return_micros=False, fileobj=None,
+                       gzip_output=False, stream=False):
     """Downloads an AdHoc report for the specified payload.
 
     Args:
       report_payload: str Report payload to POST to the server.
       return_micros: bool Whether to return currency in micros (optional).
       fileobj: file File to write to (optional).
+      gzip_output: bool Whether to write the report gzip compressed (optional).
+      stream: bool Whether to return the response to read the report from
+              (optional).
 
     Returns:
-      str Report data if no fileobj, otherwise None.
+      str Report data if no fileobj, otherwise None. The response, if stream.
     """
     url = self.__GenerateUrl()
     self._CheckAuthentication()
     headers = self.__GenerateHeaders(return_micros)
     headers['Content-Type'] = 'application/x-www-form-urlencoded'
     headers['Content-Length'] = str(len(report_payload))
-    return self.__MakeRequest(url, headers, fileobj, payload=report_payload)
+    return self.__MakeRequest(url, headers, fileobj, payload=report_payload,
+                              gzip_output=gzip_output, stream=stream)
 
   def __GetReportXml(self, report):
     """Transforms the report object into xml.
@@ -237,13 +865,14 @@ class ReportDownloader(object):
     return re.sub(ATTRIBUTES_REGEX, '', report_xml).strip()
 
   def __DownloadReportById(self, report_definition_id, return_micros=False,
-                           fileobj=None):
+                           fileobj=None, gzip_output=False):
     """Download report and return raw data.
 
     Args:
       report_definition_id: str Id of the report definition to download.
       return_micros: bool Whether to return currency in micros.
       fileobj: str Path to download file to.
+      gzip_output: bool Whether to write the report gzip compressed.
 
     Returns:
       str Report data if no fileobj, otherwise None.
@@ -251,7 +880,7 @@ class ReportDownloader(object):
     self._CheckAuthentication()
     url = self.__GenerateUrl(report_definition_id)
     headers = self.__GenerateHeaders(return_micros)
-    return self.__MakeRequest(url, headers, fileobj)
+    return self.__MakeRequest(url, headers, fileobj, gzip_output=gzip_output)
 
   def __GenerateUrl(self, report_definition_id=None):
     """Generates the URL to get a report from.
@@ -298,27 +927,33 @@ class ReportDownloader(object):
       headers['Content-Encoding'] = 'gzip'
     return headers
 
-  def __MakeRequest(self, url, headers=None, fileobj=None, payload=None):
+  def __MakeRequest(self, url, headers=None, fileobj=None, payload=None,
+                    gzip_output=False, stream=False):
     """Performs an HTTPS request and slightly processes the response.
 
     If fileobj is provided, saves the body to file instead of including it
-    in the return value.
+    in the return value. A compressed body is decompressed as it arrives,
+    unless it is saved compressed.
 
     Args:
       url: str Resource for the request line.
       headers: dict Headers to send along with the request.
       fileobj: file File to save to (optional).
       payload: str Xml to POST (optional).
+      gzip_output: bool Whether to save the body gzip compressed (optional).
+      stream: bool Whether to return the response for the caller to read the
+              body from (optional).
 
     Returns:
-      str Report data as a string if fileobj=None, otherwise None
+      str Report data as a string if fileobj=None, otherwise None. A file-like
+      object reading the decompressed body if stream.
     """
     headers = headers or {}
     request_url = self._op_config['server'] + url
 
     orig_payload = payload
 
-    if Utils.BoolTypeConvert(self._config['compress']):
+    if payload is not None and Utils.BoolTypeConvert(self._config['compress']):
       buffer = StringIO.StringIO()
       gzip_file = gzip.GzipFile(mode='wb', fileobj=buffer)
       gzip_file.write(payload)
@@ -327,40 +962,65 @@ class ReportDownloader(object):
       headers['Content-Length'] = str(len(payload))
 
     start_time = time.strftime('%Y-%m-%d %H:%M:%S')
+    start = time.time()
     request = urllib2.Request(request_url, payload, headers)
+    is_fault = True
     try:
       response_code = '---'
       response_headers = []
       try:
-        response = urllib2.urlopen(request)
+        if self._connection_pool is None:
+          response = urllib2.urlopen(request)
+        else:
+          response = self._connection_pool.OpenUrl(request)
         response_code = response.code
         response_headers = response.info().headers
-        if response.info().get('Content-Encoding') == 'gzip':
-          response = gzip.GzipFile(fileobj=StringIO.StringIO(response.read()),
-                                   mode='rb')
+        compressed = response.info().get('Content-Encoding') == 'gzip'
         if fileobj:
-          self.__DumpToFile(response, fileobj)
+          if gzip_output and not compressed:
+            gzip_file = gzip.GzipFile(mode='wb', fileobj=fileobj)
+            self.__DumpToFile(response, gzip_file)
+            gzip_file.close()
+          elif compressed and not gzip_output:
+            self.__DumpToFile(GzipStream.GzipReader(response), fileobj)
+          else:
+            self.__DumpToFile(response, fileobj)
+          is_fault = False
           return None
         else:
-          return response.read()
+          if compressed:
+            response = GzipStream.GzipReader(response)
+          if stream:
+            is_fault = False
+            return response
+          report = response.read()
+          is_fault = False
+          return report
       except urllib2.HTTPError, e:
         response = e
         response_code = response.code
         response_headers = response.info().headers
         if response.info().get('Content-Encoding') == 'gzip':
-          response = gzip.GzipFile(fileobj=StringIO.StringIO(response.read()),
-                                   mode='rb')
+          response = GzipStream.GzipReader(response)
         error = response.read()
         self.__CheckForXmlError(response_code, error)
-        raise AdWordsError('%s %s' % (str(e), error))
+        error = AdWordsError('%s %s' % (str(e), error))
+        error.http_code = response_code
+        raise error
       except urllib2.URLError, e:
-        raise AdWordsError(str(e))
+        error = AdWordsError(str(e))
+        error.cause = e
+        raise error
     finally:
       end_time = time.strftime('%Y-%m-%d %H:%M:%S')
-      xml_log_data = self.__CreateXmlLogData(start_time, end_time, request_url,
-                                             headers, orig_payload,
-                                             response_code, response_headers)
-      self.__LogRequest(xml_log_data)
+      elapsed_time = time.time() - start
+
+      def GetXmlLogData():
+        """Returns the SOAP XML log message, built only if it is written."""
+        return self.__CreateXmlLogData(start_time, end_time, request_url,
+                                       headers, orig_payload, response_code,
+                                       response_headers)
+      self.__LogRequest(GetXmlLogData, is_fault, elapsed_time)
 
   def __CheckForXmlError(self, response_code, response):
     if 'reportDownloadError' in response:
@@ -417,39 +1077,39 @@ class ReportDownloader(object):
      Returns:
       number Number of bytes written.
     """
-    byteswritten = 0
-    while True:
-      buf = response.read(BUF_SIZE)
-      if buf:
-        fileobj.write(buf)
-        byteswritten += len(buf)
-      else:
-        break
-    return byteswritten
-
-  def __LogRequest(self, xml_log_data):
+    return GzipStream.CopyStream(response, fileobj, BUF_SIZE)
+
+  def __LogRequest(self, get_xml_log_data, is_fault, elapsed_time):
     """Logs the Report Download request.
 
     Args:
-      xml_log_data: str Data to log for this request.
+      get_xml_log_data: function Function returning the data to log for this
+                        request, called only if the data is written.
+      is_fault: bool Whether the request failed.
+      elapsed_time: float Number of seconds the request took.
     """
     log_handlers = self.__GetLogHandlers()
     for handler in log_handlers:
       handler['target'] = Logger.NONE
-      if handler['tag'] == 'xml_log':
-        handler['data'] += xml_log_data
-    for handler in log_handlers:
+      # Only a sample of the requests may have their XML written to file.
       if (handler['tag'] and
-          Utils.BoolTypeConvert(self._config[handler['tag']])):
+          Utils.BoolTypeConvert(self._config[handler['tag']]) and
+          (handler['tag'] != 'xml_log' or
+           self._logger.IsCallSampled(is_fault, elapsed_time))):
         handler['target'] = Logger.FILE
       # If debugging is On, raise handler's target two levels,
       #   NONE -> CONSOLE
       #   FILE -> FILE_AND_CONSOLE.
       if Utils.BoolTypeConvert(self._config['debug']):
         handler['target'] += 2
+      if handler['target'] == Logger.NONE:
+        continue
 
-      if (handler['target'] != Logger.NONE and handler['data'] and
-          handler['data'] != 'None' and handler['data'] != 'DEBUG: '):
+      if handler['tag'] == 'xml_log':
+        # Built by the logger's LogWriter, if it has one.
+        self._logger.Log(handler['name'], get_xml_log_data,
+                         log_level=Logger.DEBUG, log_handler=handler['target'])
+      elif handler['data'] and handler['data'] != 'None':
         self._logger.Log(handler['name'], handler['data'],
                          log_level=Logger.DEBUG, log_handler=handler['target'])
 
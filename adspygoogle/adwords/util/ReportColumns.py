@@ -0,0 +1,457 @@
+#!/usr/bin/python
+#
+# Copyright 2013 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Reads reports into columns of NumPy arrays.
+
+Rows are taken from ReportDownloader.IterReportRowsWithAwql a chunk at a time,
+and each chunk is converted column by column with NumPy rather than value by
+value, so a report ends up taking about the memory of its packed columns. The
+type of each column comes from the report fields returned by
+ReportDefinitionService.getReportFields:
+
+  Long, Integer     int64, or float64 with NaN if some rows have no value.
+  Money, Bid        int64 in micros when they are returned in micros, float64
+                    otherwise, with the same treatment of missing values.
+  Double            float64, NaN for missing values. Percentages such as
+                    2.50% read as 2.5.
+  Date              datetime64[D], NaT for missing values.
+  Boolean           bool.
+  Enums             Codes into the column's categories, the distinct values
+                    found in the column, as the smallest unsigned integers
+                    that fit.
+  Others            Fixed width byte strings.
+
+Columns without a known type are read as strings. A ColumnarReport can be saved
+as a single .npz file, or as a directory of .npy files which Load() maps into
+memory instead of reading.
+
+This module needs NumPy 1.7 or later.
+"""
+
+__author__ = 'agent@local (agent)'
+
+import itertools
+import os
+import re
+
+import numpy
+
+
+# Number of rows converted at a time.
+CHUNK_ROWS = 65536
+# Field types of getReportFields, by the kind of column they are read into.
+_INTEGER_TYPES = ('Long', 'Integer')
+_MONEY_TYPES = ('Money', 'Bid')
+_FLOAT_TYPES = ('Double',)
+_DATE_TYPES = ('Date',)
+_BOOLEAN_TYPES = ('Boolean',)
+_STRING_TYPES = ('String', 'DateTime')
+# Values of report columns which have none.
+_MISSING_VALUES = ('', '--', ' --')
+# Characters around numbers, as in '2.50%' or '< 10%'.
+_NUMBER_DECORATIONS = '<>% '
+# Names of the arrays holding a saved report's metadata.
+_TITLE_KEY = '_title'
+_NAMES_KEY = '_names'
+_DISPLAY_NAMES_KEY = '_display_names'
+_CATEGORIES_SUFFIX = '.categories'
+_SELECT_REGEX = re.compile(r'^\s*SELECT\s+(.+?)\s+FROM\s', re.I | re.S)
+
+
+def GetQueryFieldNames(report_query):
+  """Returns the names of the fields an AWQL query selects, in order.
+
+  Args:
+    report_query: str AWQL for the report.
+
+  Returns:
+    list The field names, empty if the query could not be parsed.
+  """
+  match = _SELECT_REGEX.match(report_query)
+  if not match:
+    return []
+  return [name.strip() for name in match.group(1).split(',')]
+
+
+def _GetMissing(chunk):
+  """Returns a boolean array telling which values of a chunk are missing."""
+  missing = chunk == _MISSING_VALUES[0]
+  for value in _MISSING_VALUES[1:]:
+    missing |= chunk == value
+  return missing
+
+
+class _NumberColumn(object):
+
+  """Column of integers or floats."""
+
+  def __init__(self, dtype):
+    """Inits _NumberColumn.
+
+    Args:
+      dtype: numpy.dtype Type of the column's values.
+    """
+    self.__dtype = numpy.dtype(dtype)
+    self.__chunks = []
+    self.__missing = []
+
+  def Add(self, values):
+    """Converts and adds a chunk of values.
+
+    Args:
+      values: tuple The values, as read from the report.
+    """
+    chunk = numpy.array(values, dtype=numpy.string_)
+    missing = _GetMissing(chunk)
+    if missing.any():
+      chunk[missing] = '0'
+      self.__missing.append((len(self.__chunks), missing))
+    try:
+      self.__chunks.append(chunk.astype(self.__dtype))
+    except ValueError:
+      chunk = numpy.char.strip(numpy.char.replace(chunk, ',', ''),
+                               _NUMBER_DECORATIONS)
+      self.__chunks.append(chunk.astype(self.__dtype))
+
+  def GetArray(self):
+    """Returns the whole column as a single array."""
+    dtype = self.__dtype
+    if self.__missing and dtype.kind != 'f':
+      dtype = numpy.dtype(numpy.float64)
+      self.__chunks = [chunk.astype(dtype) for chunk in self.__chunks]
+    for i, missing in self.__missing:
+      self.__chunks[i][missing] = numpy.nan
+    return _Concatenate(self.__chunks, dtype)
+
+
+class _DateColumn(object):
+
+  """Column of dates."""
+
+  def __init__(self):
+    """Inits _DateColumn."""
+    self.__chunks = []
+
+  def Add(self, values):
+    """Converts and adds a chunk of values.
+
+    Args:
+      values: tuple The values, as read from the report.
+    """
+    chunk = numpy.array(values, dtype=numpy.string_)
+    chunk[_GetMissing(chunk)] = 'NaT'
+    self.__chunks.append(chunk.astype('datetime64[D]'))
+
+  def GetArray(self):
+    """Returns the whole column as a single array."""
+    return _Concatenate(self.__chunks, 'datetime64[D]')
+
+
+class _BooleanColumn(object):
+
+  """Column of booleans."""
+
+  def __init__(self):
+    """Inits _BooleanColumn."""
+    self.__chunks = []
+
+  def Add(self, values):
+    """Converts and adds a chunk of values.
+
+    Args:
+      values: tuple The values, as read from the report.
+    """
+    self.__chunks.append(numpy.array(values, dtype=numpy.string_) == 'true')
+
+  def GetArray(self):
+    """Returns the whole column as a single array."""
+    return _Concatenate(self.__chunks, numpy.bool_)
+
+
+class _EnumColumn(object):
+
+  """Column of values from a small set, stored as codes into categories."""
+
+  def __init__(self):
+    """Inits _EnumColumn."""
+    self.__chunks = []
+    self.__codes = {}
+    self.categories = []
+
+  def Add(self, values):
+    """Converts and adds a chunk of values.
+
+    Args:
+      values: tuple The values, as read from the report.
+    """
+    uniques, inverse = numpy.unique(numpy.array(values, dtype=numpy.string_),
+                                    return_inverse=True)
+    codes = numpy.empty(len(uniques), dtype=numpy.uint32)
+    for i in range(len(uniques)):
+      value = intern(str(uniques[i]))
+      code = self.__codes.get(value)
+      if code is None:
+        code = self.__codes[value] = len(self.categories)
+        self.categories.append(value)
+      codes[i] = code
+    self.__chunks.append(codes[inverse])
+
+  def GetArray(self):
+    """Returns the codes of the whole column as a single array."""
+    for dtype in (numpy.uint8, numpy.uint16):
+      if len(self.categories) <= numpy.iinfo(dtype).max + 1:
+        break
+    else:
+      dtype = numpy.uint32
+    return _Concatenate(self.__chunks, dtype)
+
+
+class _StringColumn(object):
+
+  """Column of byte strings."""
+
+  def __init__(self):
+    """Inits _StringColumn."""
+    self.__chunks = []
+
+  def Add(self, values):
+    """Adds a chunk of values.
+
+    Args:
+      values: tuple The values, as read from the report.
+    """
+    self.__chunks.append(numpy.array(values, dtype=numpy.string_))
+
+  def GetArray(self):
+    """Returns the whole column as a single array."""
+    return _Concatenate(self.__chunks, numpy.string_)
+
+
+def _Concatenate(chunks, dtype):
+  """Returns chunks as a single array of the given type."""
+  if not chunks:
+    return numpy.array([], dtype=dtype)
+  if len(chunks) == 1:
+    return chunks[0].astype(dtype, copy=False)
+  return numpy.concatenate(chunks).astype(dtype, copy=False)
+
+
+def _CreateColumn(field, return_micros):
+  """Returns the column to read the values of a report field into.
+
+  Args:
+    field: dict The field as returned by getReportFields, or None.
+    return_micros: bool Whether money is returned in micros.
+
+  Returns:
+    object The column.
+  """
+  if not field:
+    return _StringColumn()
+  field_type = field.get('fieldType')
+  if field_type in _INTEGER_TYPES:
+    return _NumberColumn(numpy.int64)
+  if field_type in _MONEY_TYPES:
+    if return_micros:
+      return _NumberColumn(numpy.int64)
+    return _NumberColumn(numpy.float64)
+  if field_type in _FLOAT_TYPES:
+    return _NumberColumn(numpy.float64)
+  if field_type in _DATE_TYPES:
+    return _DateColumn()
+  if field_type in _BOOLEAN_TYPES:
+    return _BooleanColumn()
+  if field.get('enumValues') or field_type not in _STRING_TYPES:
+    return _EnumColumn()
+  return _StringColumn()
+
+
+class ColumnarReport(object):
+
+  """Columns of a report, held in NumPy arrays.
+
+  Attributes:
+    title: str Title of the report, with its name and date range.
+    names: list Field names of the columns, in order.
+    display_names: list Names of the columns in the downloaded report.
+    columns: dict Array of each column, by field name. Enum columns hold codes
+             into their categories.
+    categories: dict Values of each enum column, indexed by code, by field
+                name.
+  """
+
+  def __init__(self, title, names, display_names, columns, categories=None):
+    """Inits ColumnarReport.
+
+    Args:
+      title: str Title of the report.
+      names: list Field names of the columns.
+      display_names: list Names of the columns in the downloaded report.
+      columns: dict Array of each column, by field name.
+      [optional]
+      categories: dict Values of each enum column, by field name.
+    """
+    self.title = title
+    self.names = names
+    self.display_names = display_names
+    self.columns = columns
+    self.categories = categories or {}
+
+  def __len__(self):
+    """Returns the number of rows of the report."""
+    if not self.names:
+      return 0
+    return len(self.columns[self.names[0]])
+
+  def GetValues(self, name):
+    """Returns the values of a column, with enum codes turned into values.
+
+    Args:
+      name: str Field name of the column.
+
+    Returns:
+      numpy.ndarray The column's values.
+    """
+    if name in self.categories:
+      return numpy.array(self.categories[name],
+                         dtype=numpy.string_)[self.columns[name]]
+    return self.columns[name]
+
+  def __GetArrays(self):
+    """Returns every array to save, by name."""
+    arrays = {
+        _TITLE_KEY: numpy.array(self.title, dtype=numpy.string_),
+        _NAMES_KEY: numpy.array(self.names, dtype=numpy.string_),
+        _DISPLAY_NAMES_KEY: numpy.array(self.display_names,
+                                        dtype=numpy.string_)
+    }
+    arrays.update(self.columns)
+    for name, categories in self.categories.iteritems():
+      arrays[name + _CATEGORIES_SUFFIX] = numpy.array(categories,
+                                                      dtype=numpy.string_)
+    return arrays
+
+  def SaveNpz(self, file_path, compress=False):
+    """Saves the report as a single .npz file.
+
+    Args:
+      file_path: str Path of the file.
+      [optional]
+      compress: bool Whether to compress the file.
+    """
+    if compress:
+      numpy.savez_compressed(file_path, **self.__GetArrays())
+    else:
+      numpy.savez(file_path, **self.__GetArrays())
+
+  def SaveColumns(self, directory):
+    """Saves the report as a directory of .npy files, which can be mapped.
+
+    Args:
+      directory: str Path of the directory, created if needed.
+    """
+    if not os.path.isdir(directory):
+      os.makedirs(directory)
+    for name, array in self.__GetArrays().iteritems():
+      numpy.save(os.path.join(directory, name + '.npy'), array)
+
+
+def Load(path, mmap=True):
+  """Loads a report saved by ColumnarReport.SaveNpz or SaveColumns.
+
+  Args:
+    path: str Path of the .npz file or of the directory.
+    [optional]
+    mmap: bool Whether to map the columns of a directory into memory, read-only,
+          rather than read them.
+
+  Returns:
+    ColumnarReport The report.
+  """
+  if os.path.isdir(path):
+    mmap_mode = None
+    if mmap:
+      mmap_mode = 'r'
+    arrays = {}
+    for file_name in os.listdir(path):
+      if file_name.endswith('.npy'):
+        arrays[file_name[:-len('.npy')]] = numpy.load(
+            os.path.join(path, file_name), mmap_mode=mmap_mode)
+  else:
+    npz_file = numpy.load(path)
+    arrays = dict([(name, npz_file[name]) for name in npz_file.files])
+    npz_file.close()
+
+  names = [str(name) for name in arrays[_NAMES_KEY]]
+  categories = {}
+  for name in names:
+    if name + _CATEGORIES_SUFFIX in arrays:
+      categories[name] = [str(value) for value in
+                          arrays[name + _CATEGORIES_SUFFIX]]
+  return ColumnarReport(
+      str(arrays[_TITLE_KEY]), names,
+      [str(name) for name in arrays[_DISPLAY_NAMES_KEY]],
+      dict([(name, arrays[name]) for name in names]), categories)
+
+
+def ReadReport(rows, field_names=None, report_fields=None, return_micros=False,
+               chunk_rows=CHUNK_ROWS):
+  """Reads the rows of a report into columns.
+
+  Args:
+    rows: iterator A ReportHeader followed by a tuple of strings per row, as
+          yielded by ReportDownloader.IterReportRowsWithAwql.
+    [optional]
+    field_names: list Field names of the report's columns, in order. Defaults
+                 to the column names of the report.
+    report_fields: list Fields of the report, as returned by getReportFields.
+                   Columns whose field is not among them are read as strings.
+    return_micros: bool Whether money is returned in micros.
+    chunk_rows: int Number of rows converted at a time.
+
+  Returns:
+    ColumnarReport The report.
+  """
+  header = rows.next()
+  display_names = list(header.columns)
+  if not field_names or len(field_names) != len(display_names):
+    field_names = display_names
+  fields = {}
+  for field in report_fields or []:
+    fields[field.get('displayFieldName')] = field
+  for field in report_fields or []:
+    fields[field.get('fieldName')] = field
+
+  columns = [_CreateColumn(fields.get(field_names[i],
+                                      fields.get(display_names[i])),
+                           return_micros)
+             for i in range(len(field_names))]
+  while True:
+    chunk = list(itertools.islice(rows, chunk_rows))
+    if not chunk:
+      break
+    for column, values in zip(columns, zip(*chunk)):
+      column.Add(values)
+    chunk = None
+
+  arrays = {}
+  categories = {}
+  for name, column in zip(field_names, columns):
+    arrays[name] = column.GetArray()
+    if isinstance(column, _EnumColumn):
+      categories[name] = column.categories
+  return ColumnarReport(header.title, field_names, display_names, arrays,
+                        categories)
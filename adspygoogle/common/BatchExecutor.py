@@ -0,0 +1,270 @@
+#!/usr/bin/python
+#
+# Copyright 2013 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Runs many service calls concurrently over a bounded set of threads.
+
+A batch is a list of (service, method name, args) items, where each service is
+a GenericApiService such as the ones returned by client.GetCampaignService()
+or client.GetService('LineItemService'). Only a tuple args is taken as the
+method's positional arguments; anything else, a list of operations included,
+is passed as its only argument. Items run in their given order on up
+to max_workers threads, with at most max_per_host calls in flight against any
+one API server. A failing item does not stop the batch: its result records the
+exception instead.
+"""
+
+__author__ = 'agent@local (agent)'
+
+import threading
+import time
+
+from adspygoogle.common import Utils
+
+
+# Number of threads a batch runs on when none is given.
+DEFAULT_MAX_WORKERS = 8
+# Number of calls in flight per API server when no limit is given.
+DEFAULT_MAX_PER_HOST = 4
+
+
+class BatchResult(object):
+
+  """Outcome of a single batch item.
+
+  Attributes:
+    result: mixed Value returned by the call, None if it failed.
+    error: Exception Exception raised by the call, None if it succeeded.
+    elapsed: float Number of seconds the call took.
+  """
+
+  def __init__(self, result=None, error=None, elapsed=0.0):
+    """Inits BatchResult.
+
+    Args:
+      [optional]
+      result: mixed Value returned by the call.
+      error: Exception Exception raised by the call.
+      elapsed: float Number of seconds the call took.
+    """
+    self.result = result
+    self.error = error
+    self.elapsed = elapsed
+
+  def Succeeded(self):
+    """Return whether the call returned without raising an exception."""
+    return self.error is None
+
+  def GetResult(self):
+    """Return the value returned by the call.
+
+    Returns:
+      mixed Value returned by the call.
+
+    Raises:
+      Exception: the exception raised by the call, if it failed.
+    """
+    if self.error is not None:
+      raise self.error
+    return self.result
+
+
+class BatchResults(list):
+
+  """BatchResult objects of a batch, in item order, with aggregate timings.
+
+  Attributes:
+    elapsed: float Number of seconds the whole batch took.
+    call_time: float Sum of the number of seconds each call took.
+  """
+
+  def __init__(self, results, elapsed):
+    """Inits BatchResults.
+
+    Args:
+      results: list BatchResult for every item, in item order.
+      elapsed: float Number of seconds the whole batch took.
+    """
+    list.__init__(self, results)
+    self.elapsed = elapsed
+    self.call_time = sum([result.elapsed for result in results])
+
+  def GetErrors(self):
+    """Return the items which failed.
+
+    Returns:
+      list (index, exception) tuples, in item order.
+    """
+    return [(index, result.error) for index, result in enumerate(self)
+            if result.error is not None]
+
+  def GetTimings(self):
+    """Return aggregate timings of the batch.
+
+    Returns:
+      dict The number of calls, failed calls, wall clock seconds of the batch,
+      and total, mean and maximum seconds per call.
+    """
+    count = len(self)
+    timings = {
+        'calls': count,
+        'errors': len(self.GetErrors()),
+        'elapsed': self.elapsed,
+        'call_time': self.call_time,
+        'mean_call_time': 0.0,
+        'max_call_time': 0.0
+    }
+    if count:
+      timings['mean_call_time'] = self.call_time / count
+      timings['max_call_time'] = max([result.elapsed for result in self])
+    return timings
+
+
+class BatchExecutor(object):
+
+  """Runs batches of service calls concurrently.
+
+  Items are started in order, each on the first free thread whose API server
+  has fewer than max_per_host calls in flight. Services can be shared between
+  items; calls on a single service run concurrently, as described under
+  "Concurrent Requests" in README.Common.
+  """
+
+  def __init__(self, max_workers=DEFAULT_MAX_WORKERS,
+               max_per_host=DEFAULT_MAX_PER_HOST):
+    """Inits BatchExecutor.
+
+    Args:
+      [optional]
+      max_workers: int Maximum number of calls in flight.
+      max_per_host: int Maximum number of calls in flight per API server.
+    """
+    self.__max_workers = max(int(max_workers), 1)
+    self.__max_per_host = max(int(max_per_host), 1)
+
+  def Execute(self, items):
+    """Run a batch of service calls and wait for all of them to finish.
+
+    Args:
+      items: list (service, method_name, args) tuples. The service is a
+             GenericApiService, method_name the name of one of its methods,
+             and args a tuple of positional arguments for the method. Any
+             other args, such as a list of operations, is passed as the
+             method's only argument.
+
+    Returns:
+      BatchResults A BatchResult for every item, in item order.
+    """
+    items = [self.__PrepareItem(item) for item in items]
+    batch = _Batch(items, self.__max_per_host)
+    start = time.time()
+    workers = [threading.Thread(target=batch.Work)
+               for unused_i in range(min(self.__max_workers, len(items)))]
+    for worker in workers:
+      worker.setDaemon(True)
+      worker.start()
+    for worker in workers:
+      worker.join()
+    return BatchResults(batch.results, time.time() - start)
+
+  def __PrepareItem(self, item):
+    """Check a batch item and look up the API server it calls.
+
+    Args:
+      item: tuple (service, method_name, args).
+
+    Returns:
+      tuple The host of the service's API server, the service, the method name
+      and the args.
+
+    Raises:
+      ValueError: if the item is not a (service, method_name, args) tuple.
+    """
+    if len(item) != 3:
+      raise ValueError('Batch items must be (service, method_name, args) '
+                       'tuples, got %s.' % (item,))
+    service, method_name, args = item
+    if not isinstance(args, tuple):
+      args = (args,)
+    host = Utils.GetNetLocFromUrl(service._op_config['server'])
+    return host, service, method_name, args
+
+
+class _Batch(object):
+
+  """Work shared by the threads running a single batch."""
+
+  def __init__(self, items, max_per_host):
+    """Inits _Batch.
+
+    Args:
+      items: list (host, service, method_name, args) tuples.
+      max_per_host: int Maximum number of calls in flight per API server.
+    """
+    self.results = [None] * len(items)
+    self.__items = items
+    self.__max_per_host = max_per_host
+    # Indexes of the items not started yet, in order.
+    self.__pending = range(len(items))
+    self.__in_flight = {}
+    self.__condition = threading.Condition()
+
+  def Work(self):
+    """Run items until none are left to start."""
+    while True:
+      index = self.__Take()
+      if index is None:
+        return
+      host, service, method_name, args = self.__items[index]
+      start = time.time()
+      try:
+        try:
+          self.results[index] = BatchResult(
+              result=getattr(service, method_name)(*args))
+        except Exception, e:
+          self.results[index] = BatchResult(error=e)
+      finally:
+        if self.results[index] is not None:
+          self.results[index].elapsed = time.time() - start
+        self.__Release(host)
+
+  def __Take(self):
+    """Wait for an item whose API server has capacity, and mark it started.
+
+    Returns:
+      int Index of the item to run, None if all items have been started.
+    """
+    self.__condition.acquire()
+    try:
+      while self.__pending:
+        for position, index in enumerate(self.__pending):
+          host = self.__items[index][0]
+          if self.__in_flight.get(host, 0) < self.__max_per_host:
+            del self.__pending[position]
+            self.__in_flight[host] = self.__in_flight.get(host, 0) + 1
+            return index
+        self.__condition.wait()
+      return None
+    finally:
+      self.__condition.release()
+
+  def __Release(self, host):
+    """Mark a call against a given API server as finished."""
+    self.__condition.acquire()
+    try:
+      self.__in_flight[host] -= 1
+      self.__condition.notifyAll()
+    finally:
+      self.__condition.release()
@@ -24,11 +24,16 @@ class Buffer(object):
   """Implements a Buffer.
 
   Placeholder for temporarily storing data (i.e. sys.stdout, SOAP messages).
+  Writes are kept as a list of chunks, which is only joined when the content
+  is read.
   """
 
   def __init__(self):
     """Inits Buffer."""
-    self._buffer = ''
+    self.__chunks = []
+    self.__size = 0
+    # Content joined into a single string, until the next write.
+    self.__joined = None
 
   def write(self, str_in):
     """Append given string to a buffer.
@@ -36,15 +41,34 @@ class Buffer(object):
     Args:
       str_in: str String to append to a buffer.
     """
-    self._buffer += str(str_in)
+    str_in = str(str_in)
+    if not str_in:
+      return
+    self.__size += len(str_in)
+    self.__joined = None
+    self.__chunks.append(str_in)
 
   def flush(self):
     pass
 
+  def GetSize(self):
+    """Return the number of bytes written to the buffer.
+
+    Returns:
+      int Size of the content.
+    """
+    return self.__size
+
   def GetBufferAsStr(self):
     """Return buffer as string.
 
+    The string is built once and reused until the next write.
+
     Returns:
       str Buffer.
     """
-    return str(self._buffer)
+    if self.__joined is None:
+      self.__joined = ''.join(self.__chunks)
+      # Keep the joined copy only, so the chunks can be freed.
+      self.__chunks = [self.__joined]
+    return self.__joined
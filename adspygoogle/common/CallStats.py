@@ -0,0 +1,337 @@
+#!/usr/bin/python
+#
+# Copyright 2013 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Times the phases of service calls and keeps statistics about them.
+
+A CallTimer follows a single call. Each time the call finishes a phase, such as
+waiting for the client's lock or sending the request over the network, Mark()
+adds the time since the previous mark to that phase. Once the call is done, the
+timer is handed to a CallRecorder, which passes it on to a statistics registry
+and a callback. CallStatsRegistry is the registry clients use by default; any
+object with a Record(timer) method can take its place.
+
+Calls made while no registry or callback is set use NULL_TIMER, whose marks do
+nothing.
+"""
+
+__author__ = 'agent@local (agent)'
+
+import bisect
+import sys
+import threading
+import time
+import traceback
+
+
+# Phases of a call, in the order they happen.
+LOCK_WAIT = 'lock_wait'
+OAUTH_REFRESH = 'oauth_refresh'
+HEADER_BUILD = 'header_build'
+VALIDATION = 'validation'
+PACKING = 'packing'
+SERIALIZATION = 'serialization'
+NETWORK = 'network'
+RESPONSE_PARSE = 'response_parse'
+UNPACK = 'unpack'
+LOGGING = 'logging'
+PHASES = (LOCK_WAIT, OAUTH_REFRESH, HEADER_BUILD, VALIDATION, PACKING,
+          SERIALIZATION, NETWORK, RESPONSE_PARSE, UNPACK, LOGGING)
+
+# Upper bounds of the histogram buckets, in seconds: from 0.1 ms, doubling up
+# to about 105 s. Longer times fall into a last, unbounded bucket.
+_BUCKET_BOUNDS = [0.0001 * 2 ** i for i in range(21)]
+# Percentiles reported for every histogram.
+_PERCENTILES = (('p50', 0.5), ('p90', 0.9), ('p99', 0.99))
+
+_current = threading.local()
+
+
+class CallTimer(object):
+
+  """Times the phases of a single call.
+
+  Attributes:
+    service_name: str Name of the service called.
+    method_name: str Name of the method called.
+    phases: dict Number of seconds spent in each phase the call went through.
+    elapsed: float Number of seconds the whole call took, once it is stopped.
+    failed: bool Whether the call failed, once it is stopped.
+  """
+
+  def __init__(self, service_name, method_name):
+    """Inits CallTimer, starting the clock.
+
+    Args:
+      service_name: str Name of the service called.
+      method_name: str Name of the method called.
+    """
+    self.service_name = service_name
+    self.method_name = method_name
+    self.phases = {}
+    self.elapsed = None
+    self.failed = False
+    self.__start = self.__last = time.time()
+
+  def Mark(self, phase):
+    """Adds the time since the previous mark to a phase.
+
+    Args:
+      phase: str The phase which just finished.
+    """
+    now = time.time()
+    self.phases[phase] = self.phases.get(phase, 0.0) + now - self.__last
+    self.__last = now
+
+  def Stop(self, failed=False):
+    """Stops the clock.
+
+    Args:
+      [optional]
+      failed: bool Whether the call failed.
+    """
+    self.elapsed = time.time() - self.__start
+    self.failed = failed
+
+
+class _NullTimer(object):
+
+  """Stands in for a CallTimer when calls are not timed."""
+
+  def Mark(self, unused_phase):
+    """Does nothing."""
+    pass
+
+
+NULL_TIMER = _NullTimer()
+
+
+def SetCallTimer(timer):
+  """Sets the timer of the call running on the current thread.
+
+  Args:
+    timer: CallTimer The call's timer, or None once the call is done.
+
+  Returns:
+    CallTimer The timer previously set for the current thread, or None.
+  """
+  previous = getattr(_current, 'timer', None)
+  _current.timer = timer
+  return previous
+
+
+def GetCallTimer():
+  """Returns the timer of the call running on the current thread.
+
+  Returns:
+    CallTimer The call's timer, NULL_TIMER if the call is not timed.
+  """
+  return getattr(_current, 'timer', None) or NULL_TIMER
+
+
+class Histogram(object):
+
+  """Counts values in buckets growing exponentially, to estimate percentiles."""
+
+  def __init__(self):
+    """Inits Histogram."""
+    self.__buckets = [0] * (len(_BUCKET_BOUNDS) + 1)
+    self.__count = 0
+    self.__total = 0.0
+    self.__min = None
+    self.__max = None
+
+  def Add(self, value):
+    """Adds a value.
+
+    Args:
+      value: float The value to add, in seconds.
+    """
+    self.__buckets[bisect.bisect_left(_BUCKET_BOUNDS, value)] += 1
+    self.__count += 1
+    self.__total += value
+    if self.__min is None or value < self.__min:
+      self.__min = value
+    if self.__max is None or value > self.__max:
+      self.__max = value
+
+  def GetStats(self):
+    """Returns a summary of the values added.
+
+    Percentiles are estimated as the upper bound of the bucket they fall in,
+    and never exceed the largest value.
+
+    Returns:
+      dict The count, total, mean, min and max of the values, and their
+      p50, p90 and p99 percentiles.
+    """
+    stats = {'count': self.__count, 'total': self.__total,
+             'mean': None, 'min': self.__min, 'max': self.__max}
+    for name, unused_fraction in _PERCENTILES:
+      stats[name] = None
+    if not self.__count:
+      return stats
+    stats['mean'] = self.__total / self.__count
+    for name, fraction in _PERCENTILES:
+      rank = fraction * self.__count
+      seen = 0
+      for i in range(len(self.__buckets)):
+        seen += self.__buckets[i]
+        if seen >= rank:
+          break
+      if i < len(_BUCKET_BOUNDS):
+        stats[name] = min(_BUCKET_BOUNDS[i], self.__max)
+      else:
+        stats[name] = self.__max
+    return stats
+
+
+class _MethodStats(object):
+
+  """Statistics about the calls made to one method of a service."""
+
+  def __init__(self):
+    """Inits _MethodStats."""
+    self.calls = 0
+    self.errors = 0
+    self.elapsed = Histogram()
+    self.phases = {}
+
+  def Add(self, timer):
+    """Adds a finished call.
+
+    Args:
+      timer: CallTimer The call's timer.
+    """
+    self.calls += 1
+    if timer.failed:
+      self.errors += 1
+    if timer.elapsed is not None:
+      self.elapsed.Add(timer.elapsed)
+    for phase, seconds in timer.phases.iteritems():
+      histogram = self.phases.get(phase)
+      if histogram is None:
+        histogram = self.phases[phase] = Histogram()
+      histogram.Add(seconds)
+
+  def GetStats(self):
+    """Returns the statistics as a dictionary."""
+    phases = {}
+    for phase, histogram in self.phases.iteritems():
+      phases[phase] = histogram.GetStats()
+    return {'calls': self.calls, 'errors': self.errors,
+            'elapsed': self.elapsed.GetStats(), 'phases': phases}
+
+
+class CallStatsRegistry(object):
+
+  """Keeps counters and histograms of calls, per service and method."""
+
+  def __init__(self):
+    """Inits CallStatsRegistry."""
+    self.__lock = threading.Lock()
+    self.__methods = {}
+
+  def Record(self, timer):
+    """Adds a finished call.
+
+    Args:
+      timer: CallTimer The call's timer.
+    """
+    key = (timer.service_name, timer.method_name)
+    self.__lock.acquire()
+    try:
+      method_stats = self.__methods.get(key)
+      if method_stats is None:
+        method_stats = self.__methods[key] = _MethodStats()
+      method_stats.Add(timer)
+    finally:
+      self.__lock.release()
+
+  def GetStats(self):
+    """Returns the statistics of every method called.
+
+    Returns:
+      dict Keyed by service name, then method name. Each method has the number
+      of calls and of failed calls, a summary of the calls' elapsed time and
+      one of the time spent in each phase, as returned by
+      Histogram.GetStats().
+    """
+    self.__lock.acquire()
+    try:
+      stats = {}
+      for (service_name, method_name), method_stats in (
+          self.__methods.iteritems()):
+        stats.setdefault(service_name, {})[method_name] = (
+            method_stats.GetStats())
+      return stats
+    finally:
+      self.__lock.release()
+
+  def Clear(self):
+    """Forgets every call recorded so far."""
+    self.__lock.acquire()
+    try:
+      self.__methods = {}
+    finally:
+      self.__lock.release()
+
+
+class CallRecorder(object):
+
+  """Hands finished calls to a statistics registry and a callback.
+
+  Attributes:
+    registry: object Registry with a Record(timer) method, such as a
+              CallStatsRegistry, or None.
+    callback: function Function called with the CallTimer of every finished
+              call, or None.
+  """
+
+  def __init__(self, registry=None, callback=None):
+    """Inits CallRecorder.
+
+    Args:
+      [optional]
+      registry: object Registry with a Record(timer) method.
+      callback: function Function called with the CallTimer of every call.
+    """
+    self.registry = registry
+    self.callback = callback
+
+  def IsEnabled(self):
+    """Returns whether calls should be timed at all."""
+    return self.registry is not None or self.callback is not None
+
+  def Record(self, timer):
+    """Hands a finished call to the registry and the callback.
+
+    A failing registry or callback does not fail the call, which has already
+    completed; the error is reported on stderr instead.
+
+    Args:
+      timer: CallTimer The call's timer.
+    """
+    if self.registry is not None:
+      self.__Call(self.registry.Record, timer)
+    if self.callback is not None:
+      self.__Call(self.callback, timer)
+
+  def __Call(self, function, timer):
+    """Calls a function with a timer, reporting any error it raises."""
+    try:
+      function(timer)
+    except Exception:
+      traceback.print_exc(None, sys.stderr)
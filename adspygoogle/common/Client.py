@@ -23,10 +23,13 @@ import os
 import pickle
 import warnings
 
+from adspygoogle.common import BatchExecutor
+from adspygoogle.common import CallStats
 from adspygoogle.common import PYXML
 from adspygoogle.common import SanityCheck
 from adspygoogle.common import Utils
 from adspygoogle.common.Errors import ValidationError
+from adspygoogle.common.ServiceRegistry import ServiceRegistry
 
 
 # The values in _DEFAULT_CONFIG will be used to populate a user's configuration
@@ -45,7 +48,25 @@ _DEFAULT_CONFIG = {
     'pretty_xml': 'y',
     'compress': 'y',
     'access': '',
-    'wrap_in_tuple': 'y'
+    'wrap_in_tuple': 'y',
+    'wsdl_cache_dir': None,
+    'wsdl_cache_ttl': 86400,
+    'schema_snapshot_dir': None,
+    'service_registry_size': 64,
+    'connection_pool_size': 0,
+    'connection_idle_timeout': 30,
+    'batch_max_workers': 8,
+    'batch_max_per_host': 4,
+    'response_parser': 'soappy',
+    'shared_schema': 'y',
+    'async_log': 'n',
+    'log_queue_size': 1000,
+    'log_queue_policy': 'block',
+    'log_max_bytes': 0,
+    'log_backup_count': 5,
+    'xml_log_sample_rate': 1,
+    'xml_log_slow_call_time': None,
+    'call_stats': 'n'
 }
 
 # The _OAUTH_2_AUTH_KEYS are the keys in the authentication dictionary that are
@@ -78,6 +99,8 @@ class Client(object):
     """
     self._headers = headers or {}
     self._config = config or self._SetMissingDefaultConfigValues()
+    self._service_registry = None
+    self._call_recorder = None
 
   def _LoadAuthCredentials(self):
     """Load existing authentication credentials from auth.pkl.
@@ -163,6 +186,126 @@ class Client(object):
         config[key] = _DEFAULT_CONFIG[key]
     return config
 
+  def _GetRegisteredService(self, service_name, headers, op_config, factory):
+    """Return a service from this client's registry, creating it if needed.
+
+    Args:
+      service_name: str Name of the service.
+      headers: dict Authentication credentials the service should use.
+      op_config: dict Dictionary object with additional configuration values for
+                 the service.
+      factory: function Function taking no arguments which creates the service.
+
+    Returns:
+      GenericApiService The service, using the given headers.
+    """
+    if self._service_registry is None:
+      self._service_registry = ServiceRegistry(
+          self._config.get('service_registry_size', 0))
+    key = self._service_registry.GetKey(service_name, op_config)
+    service = self._service_registry.Get(key)
+    if service is None:
+      service = factory()
+      service._call_recorder = self._GetCallRecorder()
+    else:
+      service = service._WithHeaders(headers)
+    self._service_registry.Put(key, service)
+    return service
+
+  def _GetCallRecorder(self):
+    """Return the recorder this client's services hand their timed calls to.
+
+    Returns:
+      CallRecorder The recorder, with a CallStatsRegistry if the "call_stats"
+      config value is on.
+    """
+    if self._call_recorder is None:
+      registry = None
+      if Utils.BoolTypeConvert(self._config.get('call_stats', 'n')):
+        registry = CallStats.CallStatsRegistry()
+      self._call_recorder = CallStats.CallRecorder(registry)
+    return self._call_recorder
+
+  def GetCallStats(self):
+    """Return statistics about the calls made through this client's services.
+
+    Returns:
+      dict Keyed by service name, then method name. Each method has the number
+      of calls and of failed calls, and the count, total, mean, min, max and
+      p50, p90 and p99 percentiles of the calls' elapsed time and of the time
+      spent in each of their phases, in seconds. Empty if statistics are not
+      kept, or are kept by a registry without a GetStats() method.
+    """
+    registry = self._GetCallRecorder().registry
+    if registry is None or not hasattr(registry, 'GetStats'):
+      return {}
+    return registry.GetStats()
+
+  def SetCallStatsRegistry(self, registry):
+    """Set the registry that keeps statistics about this client's calls.
+
+    Args:
+      registry: object A CallStatsRegistry, or any object with a Record(timer)
+                method taking a CallStats.CallTimer. None stops keeping
+                statistics.
+    """
+    self._GetCallRecorder().registry = registry
+
+  def SetCallCallback(self, callback):
+    """Set a function to call after each call made through this client.
+
+    Args:
+      callback: function Function taking the CallStats.CallTimer of each
+                finished call, which holds its service and method names, its
+                elapsed time, whether it failed and the time spent in each
+                phase. None removes the callback.
+    """
+    self._GetCallRecorder().callback = callback
+
+  def EvictServices(self, service_name=None):
+    """Discard services kept by this client, so the next request rebuilds them.
+
+    Args:
+      [optional]
+      service_name: str Name of the service to discard. If not given, all
+                    services are discarded.
+
+    Returns:
+      int Number of services discarded.
+    """
+    if self._service_registry is None:
+      return 0
+    return self._service_registry.Evict(service_name)
+
+  def ExecuteBatch(self, items, max_workers=None, max_per_host=None):
+    """Run many service calls concurrently and return all their results.
+
+    Args:
+      items: list (service, method_name, args) tuples. The service is one
+             returned by this client, method_name the name of one of its
+             methods, and args a tuple of positional arguments for the method.
+             Any other args, lists included, is passed as the method's only
+             argument, so (service, 'Mutate', operations) calls
+             service.Mutate(operations).
+      [optional]
+      max_workers: int Maximum number of calls in flight. Defaults to the
+                   "batch_max_workers" config value.
+      max_per_host: int Maximum number of calls in flight per API server.
+                    Defaults to the "batch_max_per_host" config value.
+
+    Returns:
+      BatchResults A BatchResult for every item, in item order. Each holds
+      either the call's return value or the exception it raised.
+    """
+    if max_workers is None:
+      max_workers = self._config.get('batch_max_workers',
+                                     BatchExecutor.DEFAULT_MAX_WORKERS)
+    if max_per_host is None:
+      max_per_host = self._config.get('batch_max_per_host',
+                                      BatchExecutor.DEFAULT_MAX_PER_HOST)
+    return BatchExecutor.BatchExecutor(max_workers, max_per_host).Execute(
+        items)
+
   def GetAuthCredentials(self):
     """Return authentication credentials.
 
@@ -0,0 +1,622 @@
+#!/usr/bin/python
+#
+# Copyright 2013 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Shared pool of keep-alive HTTP connections.
+
+Without a pool, every request opens a new connection to the API server and,
+for HTTPS, goes through a full TLS handshake. A ConnectionPool keeps
+connections open once their response has been read and hands them to the next
+request for the same server, so a series of requests pays for the handshake
+once.
+
+Connections are keyed by scheme, host, port and HTTP proxy, along with the
+trusted certificates file set through adspygoogle.common.https at the time
+they were opened. Turning SSL certificate validation on or off therefore never
+reuses a connection opened under the previous setting.
+"""
+
+__author__ = 'agent@local (agent)'
+
+import httplib
+import select
+import socket
+import StringIO
+import threading
+import time
+import urllib
+import urllib2
+
+from adspygoogle.common.https import Https
+
+
+# Number of idle connections kept per server when no size is configured.
+DEFAULT_MAX_IDLE_PER_HOST = 4
+# Seconds an idle connection is kept when no timeout is configured.
+DEFAULT_IDLE_TIMEOUT = 30
+_DEFAULT_PORTS = {'http': httplib.HTTP_PORT, 'https': httplib.HTTPS_PORT}
+# Number of bytes PooledResponse.readline reads at a time.
+_READ_SIZE = 8192
+
+# Pools shared by all clients, keyed by their size and idle timeout.
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class ConnectionPool(object):
+
+  """Thread-safe pool of idle keep-alive connections.
+
+  At most max_idle_per_host idle connections are kept for each server. This
+  does not limit the number of connections in use: requests made while all
+  kept connections are busy open additional ones, which are closed instead of
+  kept once their response has been read. Idle connections
+  are closed after idle_timeout seconds, and checked for having been closed by
+  the server before they are reused.
+  """
+
+  def __init__(self, max_idle_per_host=DEFAULT_MAX_IDLE_PER_HOST,
+               idle_timeout=DEFAULT_IDLE_TIMEOUT):
+    """Inits ConnectionPool.
+
+    Args:
+      [optional]
+      max_idle_per_host: int Maximum number of idle connections to keep per
+                         server. A size of 0 keeps no connections.
+      idle_timeout: float Number of seconds to keep an idle connection.
+    """
+    self.__max_idle_per_host = max(int(max_idle_per_host), 0)
+    self.__idle_timeout = float(idle_timeout)
+    # Idle connections per key, as (connection, release time) pairs ordered
+    # from least to most recently released.
+    self.__idle = {}
+    self.__lock = threading.Lock()
+    self.__opener = urllib2.build_opener(ConnectionPoolHandler(self))
+
+  def GetKey(self, scheme, address, proxy=None):
+    """Return the pool key for the connections to a given server.
+
+    Args:
+      scheme: str Scheme of the connections, 'http' or 'https'.
+      address: str Host name of the server, optionally followed by ':port'.
+      [optional]
+      proxy: str Address of the HTTP proxy requests are sent through.
+
+    Returns:
+      tuple Key identifying the server's connections in the pool.
+    """
+    host, port = urllib.splitport(address)
+    if port:
+      port = int(port)
+    else:
+      port = _DEFAULT_PORTS[scheme]
+    return (scheme, host.lower(), port, proxy or None,
+            Https.GetCurrentCertsFile())
+
+  def Acquire(self, scheme, address, proxy=None, timeout=None):
+    """Return a connection to a server, reusing an idle one if possible.
+
+    Args:
+      scheme: str Scheme of the connection, 'http' or 'https'.
+      address: str Host name of the server, optionally followed by ':port'.
+      [optional]
+      proxy: str Address of the HTTP proxy to send the request through.
+      timeout: float Socket timeout, in seconds, of a new connection.
+
+    Returns:
+      PooledConnection Connection for a single request. It goes back to the
+      pool once the response has been read.
+    """
+    key = self.GetKey(scheme, address, proxy)
+    connection = self._CheckOut(key)
+    if connection is None:
+      return PooledConnection(self, key, self._Open(key, timeout), False,
+                              timeout)
+    return PooledConnection(self, key, connection, True, timeout)
+
+  def OpenUrl(self, url, data=None):
+    """Open a URL like urllib2.urlopen, sending the request over the pool.
+
+    Requests through an HTTP proxy are left to urllib2's own handlers.
+
+    Args:
+      url: str or urllib2.Request The URL to open.
+      [optional]
+      data: str Data to POST.
+
+    Returns:
+      file File-like response object, as returned by urllib2.urlopen.
+
+    Raises:
+      urllib2.HTTPError: if the server returns an HTTP error.
+      urllib2.URLError: if the request fails.
+    """
+    return self.__opener.open(url, data)
+
+  def Clear(self):
+    """Close all idle connections.
+
+    Returns:
+      int Number of connections closed.
+    """
+    self.__lock.acquire()
+    try:
+      idle = self.__idle
+      self.__idle = {}
+    finally:
+      self.__lock.release()
+    closed = 0
+    for connections in idle.itervalues():
+      for connection, unused_released in connections:
+        connection.close()
+        closed += 1
+    return closed
+
+  def __len__(self):
+    """Return the number of idle connections in the pool."""
+    self.__lock.acquire()
+    try:
+      return sum([len(connections) for connections in self.__idle.values()])
+    finally:
+      self.__lock.release()
+
+  def _Open(self, key, timeout=None):
+    """Open a new connection for a given key.
+
+    Args:
+      key: tuple Key as returned by GetKey.
+      [optional]
+      timeout: float Socket timeout of the connection, in seconds.
+
+    Returns:
+      httplib.HTTPConnection The new connection, not connected yet.
+    """
+    scheme, host, port, proxy = key[:4]
+    if proxy:
+      host, port = proxy, None
+    if scheme == 'https':
+      connection = Https.CreateHttpsConnection(host, port)
+    else:
+      connection = httplib.HTTPConnection(host, port)
+    if timeout is not None:
+      connection.timeout = timeout
+    return connection
+
+  def _CheckOut(self, key):
+    """Take the most recently used healthy idle connection for a given key.
+
+    Idle connections which timed out, or were closed by the server, are closed
+    and dropped on the way.
+
+    Args:
+      key: tuple Key as returned by GetKey.
+
+    Returns:
+      httplib.HTTPConnection An idle connection, None if there is none.
+    """
+    stale = []
+    self.__lock.acquire()
+    try:
+      deadline = time.time() - self.__idle_timeout
+      for idle_key, connections in self.__idle.items():
+        while connections and connections[0][1] < deadline:
+          stale.append(connections.pop(0)[0])
+        if not connections:
+          del self.__idle[idle_key]
+      connections = self.__idle.get(key, [])
+      connection = None
+      while connections and connection is None:
+        connection = connections.pop()[0]
+        if not _IsAlive(connection):
+          stale.append(connection)
+          connection = None
+    finally:
+      self.__lock.release()
+    for stale_connection in stale:
+      stale_connection.close()
+    return connection
+
+  def _CheckIn(self, key, connection):
+    """Keep a connection whose response has been read for later requests.
+
+    Args:
+      key: tuple Key as returned by GetKey.
+      connection: httplib.HTTPConnection The connection, ready for another
+                  request.
+    """
+    self.__lock.acquire()
+    try:
+      connections = self.__idle.setdefault(key, [])
+      if len(connections) < self.__max_idle_per_host:
+        connections.append((connection, time.time()))
+        return
+      if not connections:
+        del self.__idle[key]
+    finally:
+      self.__lock.release()
+    connection.close()
+
+
+class PooledConnection(object):
+
+  """A single request on a pooled connection.
+
+  Supports the calls SOAPpy and GenericApiService make on httplib.HTTPS
+  objects, putrequest, putheader, endheaders and send followed by getreply and
+  getfile, as well as a streaming getresponse. Callers send their own Host
+  header.
+
+  If a reused connection turns out to have been closed by the server while it
+  was idle, the request is sent again on a new connection. That is the case
+  when writing the request fails, or when the server closes the connection
+  without sending a single byte of response. Any other failure, a timeout in
+  particular, may come after the server acted on the request, and is raised
+  instead.
+  """
+
+  _http_vsn_str = 'HTTP/1.1'
+
+  def __init__(self, pool, key, connection, reused, timeout=None):
+    """Inits PooledConnection.
+
+    Args:
+      pool: ConnectionPool The pool the connection belongs to.
+      key: tuple The connection's key in the pool.
+      connection: httplib.HTTPConnection The connection to send the request on.
+      reused: bool Whether the connection was taken from the idle connections.
+      [optional]
+      timeout: float Socket timeout of a replacement connection, in seconds.
+    """
+    self.__pool = pool
+    self.__key = key
+    self.__connection = connection
+    self.__reused = reused
+    self.__timeout = timeout
+    # Calls made so far, so the request can be sent again on a new connection.
+    self.__calls = []
+    self.__body = None
+
+  def putrequest(self, method, url):
+    """Start the request, as httplib.HTTPConnection.putrequest.
+
+    Args:
+      method: str HTTP method of the request.
+      url: str Path, or full URL when sent through a proxy, of the request.
+    """
+    # The callers send their own Host and Accept-Encoding headers.
+    self.__Send('putrequest', method, url, True, True)
+
+  def putheader(self, header, *values):
+    """Send a request header, as httplib.HTTPConnection.putheader."""
+    self.__Send('putheader', header, *values)
+
+  def endheaders(self):
+    """End the request headers, as httplib.HTTPConnection.endheaders."""
+    self.__Send('endheaders')
+    # The body goes out in a separate write. On a kept-alive connection,
+    # Nagle's algorithm would hold it back until the server acknowledges the
+    # headers, which servers delay by up to 40 ms.
+    _DisableNagle(self.__connection)
+
+  def send(self, data):
+    """Send the request body, as httplib.HTTPConnection.send."""
+    self.__Send('send', data)
+
+  def getresponse(self):
+    """Return the response once its headers have arrived.
+
+    Returns:
+      PooledResponse The response. The connection goes back to the pool once
+      the response body has been read to the end.
+    """
+    return PooledResponse(self, self.__Invoke(
+        lambda connection: connection.getresponse(), _IsUnanswered))
+
+  def getreply(self):
+    """Read the whole response, as httplib.HTTP.getreply.
+
+    Returns:
+      tuple The status code, reason and headers (httplib.HTTPMessage) of the
+      response. The body is available through getfile.
+    """
+    response = self.getresponse()
+    self.__body = response.read()
+    return response.status, response.reason, response.msg
+
+  def getfile(self):
+    """Return the body read by getreply as a file-like object."""
+    return StringIO.StringIO(self.__body)
+
+  def close(self):
+    """Close the connection, unless it has already gone back to the pool."""
+    self._Finish(False)
+
+  def _Finish(self, reusable):
+    """Hand the connection back to the pool, or close it.
+
+    Args:
+      reusable: bool Whether the response has been read in full and the
+                server allows another request on the connection.
+    """
+    connection = self.__connection
+    if connection is None:
+      return
+    self.__connection = None
+    if reusable:
+      self.__pool._CheckIn(self.__key, connection)
+    else:
+      connection.close()
+
+  def __Send(self, name, *args):
+    """Call a method of the connection, and record the call for a resend."""
+    self.__Invoke(lambda connection: getattr(connection, name)(*args),
+                  _IsUnsent)
+    self.__calls.append((name, args))
+
+  def __Invoke(self, function, is_stale):
+    """Apply a function to the connection, replacing a stale reused one.
+
+    Args:
+      function: function Function taking the httplib.HTTPConnection.
+      is_stale: function Function telling, from the exception the function
+                raised, whether the server closed the connection before
+                acting on the request.
+
+    Returns:
+      mixed Whatever the function returns.
+    """
+    try:
+      return function(self.__connection)
+    except (socket.error, httplib.HTTPException), e:
+      self.__connection.close()
+      if not self.__reused or not is_stale(e):
+        self.__connection = None
+        raise
+    # The server closed the connection while it was idle, so the request never
+    # reached it. Send it again on a new connection.
+    self.__connection = self.__pool._Open(self.__key, self.__timeout)
+    self.__reused = False
+    try:
+      for name, args in self.__calls:
+        getattr(self.__connection, name)(*args)
+      return function(self.__connection)
+    except (socket.error, httplib.HTTPException):
+      self.__connection.close()
+      self.__connection = None
+      raise
+
+
+class PooledResponse(object):
+
+  """File-like response read from a PooledConnection.
+
+  Once the body has been read to the end, the connection goes back to the
+  pool. Closing the response before that closes the connection.
+  """
+
+  def __init__(self, connection, response):
+    """Inits PooledResponse.
+
+    Args:
+      connection: PooledConnection The connection the response arrives on.
+      response: httplib.HTTPResponse The response.
+    """
+    self.__connection = connection
+    self.__response = response
+    self.__pending = ''
+    self.status = response.status
+    self.reason = response.reason
+    self.msg = response.msg
+
+  def read(self, amt=None):
+    """Read up to amt bytes of the body, or all of it if amt is None."""
+    pending = self.__pending
+    if amt is None:
+      self.__pending = ''
+      return pending + self.__Read(None)
+    if len(pending) >= amt:
+      self.__pending = pending[amt:]
+      return pending[:amt]
+    self.__pending = ''
+    return pending + self.__Read(amt - len(pending))
+
+  def readline(self, size=-1):
+    """Read a line of the body, up to size bytes if size is not negative."""
+    while ('\n' not in self.__pending and
+           (size < 0 or len(self.__pending) < size)):
+      data = self.__Read(_READ_SIZE)
+      if not data:
+        break
+      self.__pending += data
+    end = self.__pending.find('\n') + 1 or len(self.__pending)
+    if size >= 0:
+      end = min(end, size)
+    line = self.__pending[:end]
+    self.__pending = self.__pending[end:]
+    return line
+
+  def close(self):
+    """Close the response, and the connection if the body was not all read."""
+    self.__connection._Finish(False)
+
+  def __Read(self, amt):
+    """Read from the response, handing back the connection at the end."""
+    response = self.__response
+    if response.isclosed():
+      return ''
+    try:
+      data = response.read(amt)
+    except (socket.error, httplib.HTTPException):
+      self.__connection._Finish(False)
+      raise
+    if response.isclosed():
+      self.__connection._Finish(not response.will_close)
+    return data
+
+
+class ConnectionPoolHandler(urllib2.BaseHandler):
+
+  """urllib2 handler sending HTTP and HTTPS requests over a ConnectionPool.
+
+  Requests through an HTTP proxy are left to urllib2's own handlers.
+  """
+
+  # Run ahead of urllib2's own HTTP and HTTPS handlers.
+  handler_order = 450
+
+  def __init__(self, pool):
+    """Inits ConnectionPoolHandler.
+
+    Args:
+      pool: ConnectionPool The pool to send requests over.
+    """
+    self.__pool = pool
+
+  def http_open(self, request):
+    return self.__Open('http', request)
+
+  def https_open(self, request):
+    return self.__Open('https', request)
+
+  def __Open(self, scheme, request):
+    """Send a request and return urllib2's file-like response object.
+
+    Args:
+      scheme: str Scheme of the request, 'http' or 'https'.
+      request: urllib2.Request The request, after urllib2's preprocessing.
+
+    Returns:
+      urllib.addinfourl The response, None if the request is proxied.
+
+    Raises:
+      urllib2.URLError: if the request fails.
+    """
+    if request.has_proxy():
+      return None
+    headers = dict(request.unredirected_hdrs)
+    headers.update(request.headers)
+    try:
+      connection = self.__pool.Acquire(scheme, request.get_host(),
+                                       timeout=request.timeout)
+      connection.putrequest(request.get_method(), request.get_selector())
+      for header, value in headers.iteritems():
+        connection.putheader(header.title(), value)
+      connection.endheaders()
+      if request.has_data():
+        connection.send(request.get_data())
+      response = connection.getresponse()
+    except socket.error, e:
+      raise urllib2.URLError(e)
+    result = urllib.addinfourl(response, response.msg, request.get_full_url())
+    result.code = response.status
+    result.msg = response.reason
+    return result
+
+
+def _DisableNagle(connection):
+  """Send the small writes made on a connection without waiting.
+
+  Args:
+    connection: httplib.HTTPConnection The connected connection.
+  """
+  try:
+    connection.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+  except (AttributeError, socket.error):
+    pass
+
+
+def _IsUnsent(error):
+  """Check that a request failed to go out on a reused connection.
+
+  A timeout may hit a request the server is still working on, so it does not
+  count.
+
+  Args:
+    error: Exception The exception raised while writing the request.
+
+  Returns:
+    bool Whether the request can be sent again on a new connection.
+  """
+  return (isinstance(error, socket.error) and
+          not isinstance(error, socket.timeout))
+
+
+def _IsUnanswered(error):
+  """Check that a reused connection was closed before any response arrived.
+
+  Args:
+    error: Exception The exception raised while waiting for the response.
+
+  Returns:
+    bool Whether the server closed the connection without a single byte of
+    response, so the request can be sent again on a new connection.
+  """
+  if not isinstance(error, httplib.BadStatusLine):
+    return False
+  # Depending on the Python version, an empty status line is reported as is,
+  # as its repr, or with a message of its own.
+  return (error.line in ('', repr('')) or
+          error.line.startswith('No status line received'))
+
+
+def _IsAlive(connection):
+  """Check that the server has not closed an idle connection.
+
+  Nothing is expected to arrive on an idle connection. If its socket is
+  readable, the server either closed the connection or sent data nobody asked
+  for, and the connection can not be reused.
+
+  Args:
+    connection: httplib.HTTPConnection The idle connection.
+
+  Returns:
+    bool Whether the connection can be reused.
+  """
+  sock = connection.sock
+  if sock is None:
+    return False
+  try:
+    return not select.select([sock], [], [], 0)[0]
+  except (select.error, socket.error, ValueError):
+    return False
+
+
+def GetConnectionPoolFromConfig(config):
+  """Return the shared connection pool described by a configuration, if any.
+
+  Clients configured with the same pool size and idle timeout share a pool.
+
+  Args:
+    config: dict Dictionary object with populated configuration values.
+
+  Returns:
+    ConnectionPool The pool to use, None if connection pooling is disabled.
+  """
+  max_idle_per_host = int(config.get('connection_pool_size') or 0)
+  if max_idle_per_host <= 0:
+    return None
+  idle_timeout = config.get('connection_idle_timeout')
+  if idle_timeout is None:
+    idle_timeout = DEFAULT_IDLE_TIMEOUT
+  key = (max_idle_per_host, float(idle_timeout))
+  _pools_lock.acquire()
+  try:
+    pool = _pools.get(key)
+    if pool is None:
+      pool = ConnectionPool(*key)
+      _pools[key] = pool
+    return pool
+  finally:
+    _pools_lock.release()
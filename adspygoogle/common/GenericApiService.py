@@ -18,23 +18,29 @@
 
 __author__ = 'api.jdilallo@gmail.com (Joseph DiLallo)'
 
+import copy
 import datetime
 import httplib
-import sys
 import time
-import threading
+import weakref
 
 from adspygoogle import SOAPpy
+from adspygoogle.common import CallStats
+from adspygoogle.common import ConnectionPool
 from adspygoogle.common import MessageHandler
 from adspygoogle.common import SanityCheck
 from adspygoogle.common import Utils
+from adspygoogle.common import WsdlCache
 from adspygoogle.common.Errors import AuthTokenError
 from adspygoogle.common.Errors import Error
 from adspygoogle.common.Errors import ValidationError
 from adspygoogle.common.Logger import Logger
+from adspygoogle.common.soappy import CapturingTransport
+from adspygoogle.common.soappy import RequestSerializer
+from adspygoogle.common.soappy import ResponseParser
+from adspygoogle.common.soappy import SchemaSnapshot
 from adspygoogle.SOAPpy.wstools.WSDLTools import WSDLError
 
-sys_stdout_monkey_lock = threading.Lock()
 # We will refresh an OAuth 2.0 credential _OAUTH2_REFRESH_MINUTES_IN_ADVANCE
 # minutes in advance of it's expiration.
 _OAUTH2_REFRESH_MINUTES_IN_ADVANCE = 5
@@ -108,17 +114,123 @@ class GenericApiService(object):
     self._namespace = namespace
     self._namespace_extractor = namespace_extractor
     self._method_proxies = {}
-
-    wsdl_url = service_url + '?wsdl'
-    try:
-      self._soappyservice = SOAPpy.WSDL.Proxy(
-          wsdl_url, noroot=1, http_proxy=self._op_config['http_proxy'],
+    self._call_plans = {}
+    self._config_flags = None
+    self._soap_headers_key = None
+    self._soap_headers = None
+    # Set by the client that hands out this service.
+    self._call_recorder = None
+    self._connection_pool = ConnectionPool.GetConnectionPoolFromConfig(
+        self._config)
+
+    snapshot_store = SchemaSnapshot.GetSnapshotStoreFromConfig(self._config)
+    snapshot = None
+    if snapshot_store:
+      snapshot = snapshot_store.Get(*self._GetWsdlCacheKey())
+
+    if snapshot:
+      self._soappyservice = SchemaSnapshot.SnapshotProxy(
+          snapshot, noroot=1, http_proxy=self._op_config['http_proxy'],
           config=self._GetSoapConfig())
-    except WSDLError:
-      raise Error('Unable to locate WSDL at path \'%s\'' % wsdl_url)
     else:
-      for method_key in self._soappyservice.methods:
-        self._soappyservice.methods[method_key].location = service_url
+      wsdl_url = service_url + '?wsdl'
+      wsdl_source = self._GetCachedWsdl(wsdl_url)
+      try:
+        self._soappyservice = SOAPpy.WSDL.Proxy(
+            wsdl_source, noroot=1, http_proxy=self._op_config['http_proxy'],
+            config=self._GetSoapConfig())
+      except WSDLError:
+        self._InvalidateCachedWsdl()
+        raise Error('Unable to locate WSDL at path \'%s\'' % wsdl_url)
+      except Exception:
+        self._InvalidateCachedWsdl()
+        raise
+      shared_schema = Utils.BoolTypeConvert(
+          self._config.get('shared_schema', 'y'))
+      if snapshot_store or shared_schema:
+        snapshot = SchemaSnapshot.CreateSnapshot(self._soappyservice)
+      if snapshot_store:
+        snapshot_store.Put(*(self._GetWsdlCacheKey() + (snapshot,)))
+      if shared_schema:
+        # Drop the parsed WSDL in favor of definitions shared with other
+        # services.
+        self._soappyservice = SchemaSnapshot.SnapshotProxy(
+            snapshot, noroot=1, http_proxy=self._op_config['http_proxy'],
+            config=self._GetSoapConfig())
+
+    for method_key in self._soappyservice.methods:
+      self._soappyservice.methods[method_key].location = service_url
+    # Capture each call's messages into its own buffer.
+    self._soappyservice.soapproxy.transport = (
+        CapturingTransport.CapturingHTTPTransport())
+    self._soappyservice.soapproxy.transport.connection_pool = (
+        self._connection_pool)
+
+  def _GetWsdlCacheKey(self):
+    """Returns the values identifying this service's WSDL in a WsdlCache.
+
+    Returns:
+      tuple The server, version, group and service name of this service.
+    """
+    return (self._op_config.get('server'), self._op_config.get('version'),
+            self._op_config.get('group'), self._service_name)
+
+  def _GetCachedWsdl(self, wsdl_url):
+    """Returns the source SOAPpy should load this service's WSDL from.
+
+    If a WSDL cache is configured, the WSDL is served from the cache, and is
+    downloaded into it first if it is missing or has expired.
+
+    Args:
+      wsdl_url: string The URL of this service's WSDL.
+
+    Returns:
+      string The path to the cached WSDL, or the given URL if WSDL caching is
+      disabled.
+    """
+    wsdl_cache = WsdlCache.GetWsdlCacheFromConfig(self._config)
+    if not wsdl_cache:
+      return wsdl_url
+    cache_key = self._GetWsdlCacheKey()
+    cached_path = wsdl_cache.Get(*cache_key)
+    if cached_path is None:
+      cached_path = wsdl_cache.Fetch(wsdl_url, *cache_key)
+    return cached_path
+
+  def _InvalidateCachedWsdl(self):
+    """Removes this service's WSDL from the WSDL cache, if one is configured.
+
+    Used when a cached WSDL fails to load, so that a bad download is not served
+    again on the next attempt.
+    """
+    wsdl_cache = WsdlCache.GetWsdlCacheFromConfig(self._config)
+    if wsdl_cache:
+      wsdl_cache.Invalidate(*self._GetWsdlCacheKey())
+
+  def _WithHeaders(self, headers):
+    """Returns a service that makes this service's calls with given headers.
+
+    Used by clients to hand out services kept in their ServiceRegistry. The
+    returned service shares this service's SOAPpy proxy, so no WSDL or schema
+    snapshot is loaded. Each call sends its own service's headers, so both
+    services can be used side by side.
+
+    Args:
+      headers: dict Dictionary object with populated authentication
+               credentials.
+
+    Returns:
+      GenericApiService This service if it already uses the given headers,
+      otherwise a copy of it using them.
+    """
+    if headers is self._headers or headers == self._headers:
+      return self
+    service = copy.copy(self)
+    service._headers = headers
+    service._method_proxies = {}
+    service._soap_headers_key = None
+    service._soap_headers = None
+    return service
 
   def _GetSoapConfig(self):
     """Creates a new SOAPpy.SOAPConfig for this service to use.
@@ -159,6 +271,17 @@ class GenericApiService(object):
     dir_list.extend(self._soappyservice.methods.keys())
     return dir_list
 
+  def _GetStream(self):
+    """Returns the streaming versions of this service's operations."""
+    return _StreamingOperations(self)
+
+  Stream = property(_GetStream, doc="""Streaming versions of the operations.
+
+  service.Stream.get(selector) makes the same call as service.get(selector),
+  but returns a StreamedResponse which yields the entries of the returned page
+  one at a time as the response is parsed, rather than the whole page.
+  """)
+
   def _WrapSoapCall(self, call_function):
     """Gives the service a chance to wrap a call in a product-specific function.
 
@@ -183,6 +306,63 @@ class GenericApiService(object):
     """
     raise NotImplementedError
 
+  def _ApplySoapHeaders(self, key, build_function):
+    """Sets this service's SOAP headers, reusing the previous ones if possible.
+
+    Building SOAPpy header structs is comparatively expensive, so extending
+    classes call this from _SetHeaders rather than building new headers for
+    every request. The headers are sent with each call rather than set on the
+    SOAPpy proxy, which services created by _WithHeaders share.
+
+    Args:
+      key: tuple Every value the headers are built from, such as header values
+           and auth tokens. The headers are rebuilt whenever it changes.
+      build_function: function Takes no arguments and returns a new
+                      SOAPpy.Types.headerType.
+    """
+    if self._soap_headers is None or key != self._soap_headers_key:
+      self._soap_headers = build_function()
+      self._soap_headers_key = key
+
+  def _GetConfigFlags(self):
+    """Returns the boolean configuration values used on every request.
+
+    The values are converted once and converted again only after the
+    configuration changes, as it does when a client's debug or strict
+    properties are set.
+
+    Returns:
+      _ConfigFlags The converted configuration values.
+    """
+    config = self._config
+    key = (config['strict'], config['pretty_xml'], config['raw_debug'],
+           config['debug'], config['raw_response'], config['wrap_in_tuple'],
+           config['compress'], config['xml_parser'],
+           config.get('response_parser'))
+    if self._config_flags is None or self._config_flags.key != key:
+      self._config_flags = _ConfigFlags(key)
+    return self._config_flags
+
+  def _GetCallPlan(self, method_name):
+    """Returns the call plan of an operation, compiling it on first use.
+
+    Args:
+      method_name: string The name of the SOAP operation.
+
+    Returns:
+      _CallPlan The operation's call plan.
+    """
+    try:
+      return self._call_plans[method_name]
+    except KeyError:
+      plan = _CallPlan(method_name, self._GetMethodInfo(method_name),
+                       self._namespace)
+      if len(plan.inputs) > 1:
+        self._ConfigureArgOrder(method_name,
+                                plan.method_info[MethodInfoKeys.INPUTS])
+      self._call_plans[method_name] = plan
+      return plan
+
   def _GetMethodInfo(self, method_name):
     """Pulls all of the relevant data about a method from a SOAPpy service.
 
@@ -271,157 +451,362 @@ class GenericApiService(object):
 
   def _ReadyCompression(self):
     """Sets whether the HTTP transport layer should use compression."""
-    compress = Utils.BoolTypeConvert(self._config['compress'])
+    compress = self._GetConfigFlags().compress
     self._soappyservice.soapproxy.config.send_compressed = compress
     self._soappyservice.soapproxy.config.accept_compressed = compress
 
-  def _CreateMethod(self, method_name):
-    """Create a method wrapping an invocation to the SOAP service."""
+  def _ResolveMethodName(self, method_name):
+    """Returns the name of a SOAP operation as the WSDL defines it.
+
+    Looking the method up checks that it exists and points the SOAPpy proxy at
+    its location.
+
+    Args:
+      method_name: string The name of the operation, which may start with an
+                   upper case letter where the WSDL's does not.
+
+    Returns:
+      string The name of the operation in the WSDL.
+
+    Raises:
+      AttributeError: if the service has no such operation.
+    """
     try:
-      soap_service_method = getattr(self._soappyservice, method_name)
+      getattr(self._soappyservice, method_name)
     except AttributeError:
       method_name = method_name[0].lower() + method_name[1:]
-      soap_service_method = getattr(self._soappyservice, method_name)
+      getattr(self._soappyservice, method_name)
+    return method_name
+
+  def _PrepareCall(self, method_name, args, timer=CallStats.NULL_TIMER):
+    """Readies the service for a call and packs the call's arguments.
+
+    Args:
+      method_name: string The name of the SOAP operation being called.
+      args: tuple The arguments passed into the SOAP operation.
+      [optional]
+      timer: CallTimer The timer of the call.
+
+    Returns:
+      tuple The call's _ConfigFlags, SOAP headers, _CallPlan and packed keyword
+      arguments.
+
+    Raises:
+      TypeError: if the number of arguments does not match the operation.
+    """
+    # Only state shared between calls, such as credentials and usage
+    # accounting, is touched under the lock. Packing, the round trip to the
+    # server and unpacking can run for several calls at the same time.
+    self._lock.acquire()
+    timer.Mark(CallStats.LOCK_WAIT)
+    try:
+      self._ReadyOAuth()
+      timer.Mark(CallStats.OAUTH_REFRESH)
+      self._ReadyCompression()
+      self._SetHeaders()
+      soap_headers = self._soap_headers
+      flags = self._GetConfigFlags()
+      timer.Mark(CallStats.HEADER_BUILD)
+    finally:
+      self._lock.release()
+
+    args = self._TakeActionOnSoapCall(method_name, args)
+    plan = self._GetCallPlan(method_name)
+
+    if len(args) != len(plan.inputs):
+      raise TypeError(''.join([
+          method_name + '() takes exactly ',
+          str(len(self._soappyservice.methods[method_name].inparams)),
+          ' argument(s). (', str(len(args)), ' given)']))
+
+    ksoap_args = {}
+    for i in range(len(plan.inputs)):
+      element_name, ns, type_name, max_occurs = plan.inputs[i]
+      if flags.strict:
+        SanityCheck.SoappySanityCheck(self._soappyservice, args[i], ns,
+                                      type_name, max_occurs)
+      timer.Mark(CallStats.VALIDATION)
+
+      ksoap_args[element_name] = RequestSerializer.PackForSoappy(
+          args[i], ns, type_name, self._soappyservice, self._wrap_lists,
+          self._namespace_extractor)
+      timer.Mark(CallStats.PACKING)
+
+    ksoap_args = self._TakeActionOnPackedArgs(method_name, ksoap_args)
+    timer.Mark(CallStats.PACKING)
+    return flags, soap_headers, plan, ksoap_args
+
+  def _FinishCall(self, buf, flags, start_time, stop_time, error,
+                  timer=CallStats.NULL_TIMER):
+    """Logs a call's messages and turns its errors into exceptions.
+
+    Args:
+      buf: SoapBuffer The SOAP buffer holding the call's messages.
+      flags: _ConfigFlags The configuration values of the call.
+      start_time: str Time before service call was invoked.
+      stop_time: str Time after service call was invoked.
+      error: dict Error, if any.
+      [optional]
+      timer: CallTimer The timer of the call.
+
+    Returns:
+      Error An Error describing a local failure, which happened before the
+      request could be completed, or None.
+    """
+    if not flags.raw_debug:
+      self._lock.acquire()
+      timer.Mark(CallStats.LOCK_WAIT)
+      try:
+        self._HandleLogsAndErrors(buf, start_time, stop_time, error)
+      finally:
+        self._lock.release()
+        timer.Mark(CallStats.LOGGING)
+
+    # When debugging mode is ON, fetch last traceback.
+    if flags.debug:
+      if Utils.LastStackTrace() and Utils.LastStackTrace() != 'None':
+        error['trace'] = Utils.LastStackTrace()
+
+    # Catch local errors prior to going down to the SOAP layer, which may
+    # not exist for this error instance.
+    if 'data' in error and not buf.IsHandshakeComplete():
+      # Check if buffer contains non-XML data, most likely an HTML page.
+      # This happens in the case of 502 errors (and similar). Otherwise,
+      # this is a local error and API request was never made.
+      html_error = Utils.GetErrorFromHtml(buf.GetBufferAsStr())
+      if html_error:
+        msg = html_error
+      else:
+        msg = str(error['data'])
+        if flags.debug:
+          msg += '\n%s' % error['trace']
+
+      # When debugging mode is ON, store the raw content of the buffer.
+      if flags.debug:
+        error['raw_data'] = buf.GetBufferAsStr()
+
+      # Catch errors from AuthToken and ValidationError levels, raised
+      # during try/except above.
+      if isinstance(error['data'], AuthTokenError):
+        raise AuthTokenError(msg)
+      elif isinstance(error['data'], ValidationError):
+        raise ValidationError(error['data'])
+      if 'raw_data' in error:
+        msg = '%s [RAW DATA: %s]' % (msg, error['raw_data'])
+      return Error(msg)
+    return None
+
+  def _CreateMethod(self, method_name):
+    """Create a method wrapping an invocation to the SOAP service."""
+    method_name = self._ResolveMethodName(method_name)
 
     def CallMethod(*args):
       """Perform a SOAP call."""
+      timer = self._StartCallTimer(method_name)
+      try:
+        flags, soap_headers, plan, ksoap_args = self._PrepareCall(
+            method_name, args, timer)
+      except:
+        self._RecordCall(timer, True)
+        raise
+      streaming = flags.response_parser == 'streaming'
+
+      buf = self._buffer_class(xml_parser=flags.xml_parser,
+                               pretty_xml=flags.pretty_xml)
+      error = {}
+      response = None
+      # The transport writes this call's messages into buf, and marks the
+      # network phase on timer. Only the current thread is affected, so calls
+      # on other threads are not held up.
+      previous_buf = CapturingTransport.SetCaptureBuffer(buf)
+      previous_timer = CallStats.SetCallTimer(timer)
       try:
-        self._lock.acquire()
-        self._ReadyOAuth()
-        self._ReadyCompression()
-        self._SetHeaders()
-
-        args = self._TakeActionOnSoapCall(method_name, args)
-        method_info = self._GetMethodInfo(method_name)
-        method_attrs_holder = None
-
-        if len(method_info[MethodInfoKeys.INPUTS]) > 1:
-          self._ConfigureArgOrder(method_name,
-                                  method_info[MethodInfoKeys.INPUTS])
-
-        if not method_info[MethodInfoKeys.INPUTS]:
-          # Don't put any namespaces other than this service's namespace on
-          # calls with no input params.
-          method_attrs_holder = self._soappyservice.soapproxy.methodattrs
-          self._soappyservice.soapproxy.methodattrs = {
-              'xmlns': self._namespace
-          }
-
-        if len(args) != len(method_info[MethodInfoKeys.INPUTS]):
-          raise TypeError(''.join([
-              method_name + '() takes exactly ',
-              str(len(self._soappyservice.methods[method_name].inparams)),
-              ' argument(s). (', str(len(args)), ' given)']))
-
-        ksoap_args = {}
-        for i in range(len(method_info[MethodInfoKeys.INPUTS])):
-          if Utils.BoolTypeConvert(self._config['strict']):
-            SanityCheck.SoappySanityCheck(
-                self._soappyservice, args[i],
-                method_info[MethodInfoKeys.INPUTS][i][MethodInfoKeys.NS],
-                method_info[MethodInfoKeys.INPUTS][i][MethodInfoKeys.TYPE],
-                method_info[MethodInfoKeys.INPUTS][i][
-                    MethodInfoKeys.MAX_OCCURS])
-
-          element_name = str(method_info[MethodInfoKeys.INPUTS][i][
-              MethodInfoKeys.ELEMENT_NAME])
-
-          ksoap_args[element_name] = MessageHandler.PackForSoappy(
-              args[i],
-              method_info[MethodInfoKeys.INPUTS][i][MethodInfoKeys.NS],
-              method_info[MethodInfoKeys.INPUTS][i][MethodInfoKeys.TYPE],
-              self._soappyservice,
-              self._wrap_lists,
-              self._namespace_extractor)
-
-        ksoap_args = self._TakeActionOnPackedArgs(method_name, ksoap_args)
-
-        buf = self._buffer_class(
-            xml_parser=self._config['xml_parser'],
-            pretty_xml=Utils.BoolTypeConvert(self._config['pretty_xml']))
-        sys_stdout_monkey_lock.acquire()
+        start_time = time.strftime('%Y-%m-%d %H:%M:%S')
+        start = time.time()
         try:
-            old_stdout = sys.stdout
-            sys.stdout = buf
-
-            error = {}
-            response = None
-            start_time = time.strftime('%Y-%m-%d %H:%M:%S')
-            try:
-              response = MessageHandler.UnpackResponseAsDict(
-                  soap_service_method(**ksoap_args))
-            except Exception, e:
-              error['data'] = e
-            stop_time = time.strftime('%Y-%m-%d %H:%M:%S')
-            # Restore stdout
-            sys.stdout = old_stdout
-        finally:
-            sys_stdout_monkey_lock.release()
-
-        if isinstance(response, Error):
-          error = response
-
-        if not Utils.BoolTypeConvert(self._config['raw_debug']):
-          self._HandleLogsAndErrors(buf, start_time, stop_time, error)
-
-        # When debugging mode is ON, fetch last traceback.
-        if Utils.BoolTypeConvert(self._config['debug']):
-          if Utils.LastStackTrace() and Utils.LastStackTrace() != 'None':
-            error['trace'] = Utils.LastStackTrace()
-
-        # Catch local errors prior to going down to the SOAP layer, which may
-        # not exist for this error instance.
-        if 'data' in error and not buf.IsHandshakeComplete():
-          # Check if buffer contains non-XML data, most likely an HTML page.
-          # This happens in the case of 502 errors (and similar). Otherwise,
-          # this is a local error and API request was never made.
-          html_error = Utils.GetErrorFromHtml(buf.GetBufferAsStr())
-          if html_error:
-            msg = html_error
+          if streaming:
+            # The response is turned into its final dictionaries and lists
+            # while it is parsed, without going through SOAPpy's objects.
+            response = ResponseParser.ParseResponse(
+                ResponseParser.SendRequest(
+                    self._soappyservice, method_name, ksoap_args,
+                    soap_headers, plan.method_attrs),
+                self._soappyservice, plan.output_types)
+            timer.Mark(CallStats.RESPONSE_PARSE)
           else:
-            msg = str(error['data'])
-            if Utils.BoolTypeConvert(self._config['debug']):
-              msg += '\n%s' % error['trace']
-
-          # When debugging mode is ON, store the raw content of the buffer.
-          if Utils.BoolTypeConvert(self._config['debug']):
-            error['raw_data'] = buf.GetBufferAsStr()
-
-          # Catch errors from AuthToken and ValidationError levels, raised
-          # during try/except above.
-          if isinstance(error['data'], AuthTokenError):
-            raise AuthTokenError(msg)
-          elif isinstance(error['data'], ValidationError):
-            raise ValidationError(error['data'])
-          if 'raw_data' in error:
-            msg = '%s [RAW DATA: %s]' % (msg, error['raw_data'])
-          return Error(msg)
-
-        if Utils.BoolTypeConvert(self._config['raw_response']):
-          response = buf.GetRawSoapIn()
-        elif error:
-          response = error
-        else:
-          output_types = [(out_param[MethodInfoKeys.NS],
-                           out_param[MethodInfoKeys.TYPE],
-                           out_param[MethodInfoKeys.MAX_OCCURS]) for out_param
-                          in method_info[MethodInfoKeys.OUTPUTS]]
-          response = MessageHandler.RestoreListTypeWithSoappy(
-              response, self._soappyservice, output_types)
-
-        if Utils.BoolTypeConvert(self._config['wrap_in_tuple']):
-          response = MessageHandler.WrapInTuple(response)
+            # The SOAP headers and, for calls with no input params, the
+            # method attributes go with this call only, not on the shared
+            # SOAPpy proxy.
+            soap_service_method = getattr(
+                self._soappyservice.soapproxy._hd(soap_headers)._ma(
+                    plan.method_attrs), method_name)
+            response = soap_service_method(**ksoap_args)
+            timer.Mark(CallStats.RESPONSE_PARSE)
+            response = MessageHandler.UnpackResponseAsDict(response)
+            timer.Mark(CallStats.UNPACK)
+        except Exception, e:
+          error['data'] = e
+          # Faults are raised while the response is parsed.
+          timer.Mark(CallStats.RESPONSE_PARSE)
+        stop_time = time.strftime('%Y-%m-%d %H:%M:%S')
+        buf.SetElapsedTime(time.time() - start)
+      finally:
+        CapturingTransport.SetCaptureBuffer(previous_buf)
+        CallStats.SetCallTimer(previous_timer)
 
-        # Restore method_attrs if they were over-ridden
-        if method_attrs_holder:
-          self._soappyservice.soapproxy.methodattrs = method_attrs_holder
+      if isinstance(response, Error):
+        error = response
 
-        return response
-      finally:
-        self._lock.release()
+      try:
+        local_error = self._FinishCall(buf, flags, start_time, stop_time,
+                                       error, timer)
+      except:
+        self._RecordCall(timer, True)
+        raise
+      if local_error is not None:
+        self._RecordCall(timer, True)
+        return local_error
+
+      if flags.raw_response:
+        response = buf.GetRawSoapIn()
+      elif error:
+        response = error
+      elif not streaming:
+        response = MessageHandler.RestoreListTypeWithSoappy(
+            response, self._soappyservice, plan.output_types)
+
+      if flags.wrap_in_tuple:
+        response = MessageHandler.WrapInTuple(response)
+      timer.Mark(CallStats.UNPACK)
+
+      self._RecordCall(timer, bool(error))
+      return response
 
     return CallMethod
 
+  def _StartCallTimer(self, method_name):
+    """Starts timing a call, if the client's call recorder is enabled.
+
+    Args:
+      method_name: string The name of the SOAP operation being called.
+
+    Returns:
+      CallTimer The timer of the call, NULL_TIMER if it is not timed.
+    """
+    recorder = self._call_recorder
+    if recorder is not None and recorder.IsEnabled():
+      return CallStats.CallTimer(self._service_name, method_name)
+    return CallStats.NULL_TIMER
+
+  def _RecordCall(self, timer, failed):
+    """Stops a call's timer and hands it to the client's call recorder.
+
+    Args:
+      timer: CallTimer The timer of the call, NULL_TIMER if it is not timed.
+      failed: bool Whether the call failed.
+    """
+    if timer is CallStats.NULL_TIMER:
+      return
+    timer.Stop(failed)
+    self._call_recorder.Record(timer)
+
+  def _StreamEntries(self, method_name, args, streamed_response):
+    """Perform a SOAP call, yielding the entries of its response.
+
+    Args:
+      method_name: string The name of the SOAP operation being called.
+      args: tuple The arguments passed into the SOAP operation.
+      streamed_response: StreamedResponse The object the rest of the response
+                         is stored in once all entries have been read.
+
+    Returns:
+      generator The entries of the response, in order.
+    """
+    timer = self._StartCallTimer(method_name)
+    try:
+      flags, soap_headers, plan, ksoap_args = self._PrepareCall(
+          method_name, args, timer)
+    except:
+      self._RecordCall(timer, True)
+      raise
+    buf = self._buffer_class(xml_parser=flags.xml_parser,
+                             pretty_xml=flags.pretty_xml)
+    error = {}
+    data = None
+    previous_buf = CapturingTransport.SetCaptureBuffer(buf)
+    previous_timer = CallStats.SetCallTimer(timer)
+    try:
+      start_time = time.strftime('%Y-%m-%d %H:%M:%S')
+      start = time.time()
+      try:
+        data = ResponseParser.SendRequest(
+            self._soappyservice, method_name, ksoap_args, soap_headers,
+            plan.method_attrs)
+      except Exception, e:
+        error['data'] = e
+      stop_time = time.strftime('%Y-%m-%d %H:%M:%S')
+    finally:
+      CapturingTransport.SetCaptureBuffer(previous_buf)
+      CallStats.SetCallTimer(previous_timer)
+
+    if not error:
+      stream = ResponseParser.ResponseStream(data, self._soappyservice,
+                                             plan.output_types)
+      data = None
+      try:
+        for entry in stream:
+          yield entry
+        streamed_response.page = stream.page
+      except Exception, e:
+        error['data'] = e
+      except:
+        # The caller stopped reading and the generator is being closed. This
+        # stands in for a finally clause, which can not hold a yield before
+        # Python 2.5.
+        self._EndStream(buf, flags, timer, start, start_time, stop_time, error)
+        raise
+
+    stream_error = self._EndStream(buf, flags, timer, start, start_time,
+                                   stop_time, error)
+    if stream_error is not None:
+      raise stream_error
+
+  def _EndStream(self, buf, flags, timer, start, start_time, stop_time, error):
+    """Logs and records a streamed call once its entries are no longer read.
+
+    Usage and logs are only handled once the whole response has been read, or
+    the caller stopped reading it.
+
+    Args:
+      buf: SoapBuffer The SOAP buffer holding the call's messages.
+      flags: _ConfigFlags The configuration values of the call.
+      timer: CallTimer The timer of the call.
+      start: float Time the request was sent at, in seconds since the epoch.
+      start_time: str Time before service call was invoked.
+      stop_time: str Time after service call was invoked.
+      error: dict Error, if any.
+
+    Returns:
+      Error The error to raise to the caller, None if the call succeeded.
+    """
+    # Includes the time the caller spent on each entry, as entries are only
+    # parsed when asked for.
+    timer.Mark(CallStats.RESPONSE_PARSE)
+    buf.SetElapsedTime(time.time() - start)
+    try:
+      local_error = self._FinishCall(buf, flags, start_time, stop_time, error,
+                                     timer)
+    except:
+      self._RecordCall(timer, True)
+      raise
+    timer.Mark(CallStats.UNPACK)
+    self._RecordCall(timer, local_error is not None or bool(error))
+    if local_error is not None:
+      return local_error
+    if error:
+      return Error(error['data'])
+    return None
+
   def _ConfigureArgOrder(self, method_name, inputs):
     """Ensure that SOAPpy knows what order in which to pack operation arguments.
 
@@ -476,34 +861,29 @@ class GenericApiService(object):
     #   target: Target/destination represented by this handler (i.e. FILE,
     #           CONSOLE, etc.). Initially, it should be set to Logger.NONE.
     #   name: Name of the log file to use.
-    #   data: Data to write.
-    for handler in log_handlers:
-      if handler['tag'] == 'xml_log':
-        handler['target'] = Logger.NONE
-        handler['data'] += ('StartTime: %s\n%s\n%s\n%s\n%s\nEndTime: %s'
-                            % (start_time, buf.GetHeadersOut(),
-                               buf.GetSoapOut(), buf.GetHeadersIn(),
-                               buf.GetSoapIn(), stop_time))
-      elif handler['tag'] == 'request_log':
-        handler['target'] = Logger.NONE
-        handler['data'] += ' isFault=%s' % is_fault
-      elif not handler['tag']:
-        handler['target'] = Logger.NONE
-        handler['data'] += 'DEBUG: %s' % error_msg
+    #   data: Data to write, or a function returning it. Data is only built
+    #         for handlers which will write it, by the logger's LogWriter if
+    #         it has one.
     for handler in log_handlers:
+      handler['target'] = Logger.NONE
+      # Only a sample of the calls may have their SOAP XML written to file.
       if (handler['tag'] and
-          Utils.BoolTypeConvert(self._config[handler['tag']])):
+          Utils.BoolTypeConvert(self._config[handler['tag']]) and
+          (handler['tag'] != 'xml_log' or
+           self._logger.IsCallSampled(is_fault, buf.GetElapsedTime()))):
         handler['target'] = Logger.FILE
       # If debugging is On, raise handler's target two levels,
       #   NONE -> CONSOLE
       #   FILE -> FILE_AND_CONSOLE.
       if Utils.BoolTypeConvert(self._config['debug']):
         handler['target'] += 2
+      if handler['target'] == Logger.NONE:
+        continue
 
-      if (handler['target'] != Logger.NONE and handler['data'] and
-          handler['data'] != 'None' and handler['data'] != 'DEBUG: '):
-        self._logger.Log(handler['name'], handler['data'],
-                         log_level=Logger.DEBUG, log_handler=handler['target'])
+      self._logger.Log(handler['name'],
+                       self.__GetLogMessage(handler, buf, start_time,
+                                            stop_time, is_fault, error_msg),
+                       log_level=Logger.DEBUG, log_handler=handler['target'])
 
     # If raw response is requested, no need to validate and throw appropriate
     # error. Up to the end user to handle successful or failed request.
@@ -526,6 +906,39 @@ class GenericApiService(object):
       return fault
     return None
 
+  def __GetLogMessage(self, handler, buf, start_time, stop_time, is_fault,
+                      error_msg):
+    """Return a function building a log handler's message.
+
+    Args:
+      handler: dict The log handler, as passed to _ManageSoap.
+      buf: SoapBuffer SOAP buffer.
+      start_time: str Time before service call was invoked.
+      stop_time: str Time after service call was invoked.
+      is_fault: bool Whether the call failed.
+      error_msg: str Trace of the call's error, if any.
+
+    Returns:
+      function Function returning the message, None if there is nothing to
+      log.
+    """
+    def GetMessage():
+      data = handler['data']
+      if callable(data):
+        data = data()
+      if handler['tag'] == 'xml_log':
+        data += ('StartTime: %s\n%s\n%s\n%s\n%s\nEndTime: %s'
+                 % (start_time, buf.GetHeadersOut(), buf.GetSoapOut(),
+                    buf.GetHeadersIn(), buf.GetSoapIn(), stop_time))
+      elif handler['tag'] == 'request_log':
+        data += ' isFault=%s' % is_fault
+      elif not handler['tag']:
+        data += 'DEBUG: %s' % error_msg
+      if data and data != 'None' and data != 'DEBUG: ':
+        return data
+      return None
+    return GetMessage
+
   def CallRawMethod(self, soap_message):
     """Makes an API call by POSTing a raw SOAP XML message to the server.
 
@@ -540,77 +953,85 @@ class GenericApiService(object):
       of the server sending back an HTTP error, such as a 502.
     """
 
-    self._lock.acquire()
-    try:
-      buf = self._buffer_class(
-          xml_parser=self._config['xml_parser'],
-          pretty_xml=Utils.BoolTypeConvert(self._config['pretty_xml']))
-
-      http_header = {
-          'post': self._service_url,
-          'host': Utils.GetNetLocFromUrl(self._op_config['server']),
-          'user_agent': '%s; CallRawMethod' % self.__class__.__name__,
-          'content_type': 'text/xml; charset=\"UTF-8\"',
-          'content_length': '%d' % len(soap_message),
-          'soap_action': ''
-      }
-
-      if self._headers.get('oauth2credentials'):
-        self._headers['oauth2credentials'].apply(http_header)
-
-      self._start_time = time.strftime('%Y-%m-%d %H:%M:%S')
-      buf.write('%s Outgoing HTTP headers %s\nPOST %s\nHost: %s\nUser-Agent: '
-                '%s\nContent-type: %s\nContent-length: %s\nSOAPAction: %s\n' %
-                ('*'*3, '*'*46, http_header['post'], http_header['host'],
-                 http_header['user_agent'], http_header['content_type'],
-                 http_header['content_length'], http_header['soap_action']))
-      if self._headers.get('oauth2credentials'):
-        buf.write('Authorization: ' + http_header['Authorization'] + '\n')
-      buf.write('%s\n%s Outgoing SOAP %s\n%s\n%s\n' %
-                ('*'*72, '*'*3, '*'*54, soap_message, '*'*72))
-
-      if self._op_config['http_proxy']:
-        real_address = self._op_config['http_proxy']
-      else:
-        real_address = http_header['host']
+    buf = self._buffer_class(
+        xml_parser=self._config['xml_parser'],
+        pretty_xml=Utils.BoolTypeConvert(self._config['pretty_xml']))
+
+    http_header = {
+        'post': self._service_url,
+        'host': Utils.GetNetLocFromUrl(self._op_config['server']),
+        'user_agent': '%s; CallRawMethod' % self.__class__.__name__,
+        'content_type': 'text/xml; charset=\"UTF-8\"',
+        'content_length': '%d' % len(soap_message),
+        'soap_action': ''
+    }
+
+    if self._headers.get('oauth2credentials'):
+      self._headers['oauth2credentials'].apply(http_header)
+
+    start_time = time.strftime('%Y-%m-%d %H:%M:%S')
+    start = time.time()
+    buf.write('%s Outgoing HTTP headers %s\nPOST %s\nHost: %s\nUser-Agent: '
+              '%s\nContent-type: %s\nContent-length: %s\nSOAPAction: %s\n' %
+              ('*'*3, '*'*46, http_header['post'], http_header['host'],
+               http_header['user_agent'], http_header['content_type'],
+               http_header['content_length'], http_header['soap_action']))
+    if self._headers.get('oauth2credentials'):
+      buf.write('Authorization: ' + http_header['Authorization'] + '\n')
+    buf.write('%s\n%s Outgoing SOAP %s\n%s\n%s\n' %
+              ('*'*72, '*'*3, '*'*54, soap_message, '*'*72))
+
+    if self._op_config['http_proxy']:
+      real_address = self._op_config['http_proxy']
+    else:
+      real_address = http_header['host']
 
-      # Construct header and send SOAP message.
+    # Construct header and send SOAP message.
+    if self._connection_pool is None:
       web_service = httplib.HTTPS(real_address)
-      web_service.putrequest('POST', http_header['post'])
-      web_service.putheader('Host', http_header['host'])
-      web_service.putheader('User-Agent', http_header['user_agent'])
-      web_service.putheader('Content-type', http_header['content_type'])
-      web_service.putheader('Content-length', http_header['content_length'])
-      web_service.putheader('SOAPAction', http_header['soap_action'])
-      if self._headers.get('oauth2credentials'):
-        web_service.putheader('Authorization', http_header['Authorization'])
-      web_service.endheaders()
-      web_service.send(soap_message)
-
-      # Get response.
-      status_code, status_message, header = web_service.getreply()
-      response = web_service.getfile().read()
-
-      header = str(header).replace('\r', '')
-      buf.write(('%s Incoming HTTP headers %s\n%s %s\n%s\n%s\n%s Incoming SOAP'
-                 ' %s\n%s\n%s\n' % ('*'*3, '*'*46, status_code, status_message,
-                                    header, '*'*72, '*'*3, '*'*54, response,
-                                    '*'*72)))
-      self._stop_time = time.strftime('%Y-%m-%d %H:%M:%S')
-
-      # Catch local errors prior to going down to the SOAP layer, which may not
-      # exist for this error instance.
-      if not buf.IsHandshakeComplete() or not buf.IsSoap():
-        # The buffer contains non-XML data, most likely an HTML page. This
-        # happens in the case of 502 errors.
-        html_error = Utils.GetErrorFromHtml(buf.GetBufferAsStr())
-        if html_error:
-          msg = html_error
-        else:
-          msg = 'Unknown error.'
-        raise Error(msg)
+    else:
+      web_service = self._connection_pool.Acquire(
+          'https', http_header['host'], self._op_config['http_proxy'])
+    web_service.putrequest('POST', http_header['post'])
+    web_service.putheader('Host', http_header['host'])
+    web_service.putheader('User-Agent', http_header['user_agent'])
+    web_service.putheader('Content-type', http_header['content_type'])
+    web_service.putheader('Content-length', http_header['content_length'])
+    web_service.putheader('SOAPAction', http_header['soap_action'])
+    if self._headers.get('oauth2credentials'):
+      web_service.putheader('Authorization', http_header['Authorization'])
+    web_service.endheaders()
+    web_service.send(soap_message)
+
+    # Get response.
+    status_code, status_message, header = web_service.getreply()
+    response = web_service.getfile().read()
+
+    header = str(header).replace('\r', '')
+    buf.write(('%s Incoming HTTP headers %s\n%s %s\n%s\n%s\n%s Incoming SOAP'
+               ' %s\n%s\n%s\n' % ('*'*3, '*'*46, status_code, status_message,
+                                  header, '*'*72, '*'*3, '*'*54, response,
+                                  '*'*72)))
+    stop_time = time.strftime('%Y-%m-%d %H:%M:%S')
+    buf.SetElapsedTime(time.time() - start)
+
+    # Catch local errors prior to going down to the SOAP layer, which may not
+    # exist for this error instance.
+    if not buf.IsHandshakeComplete() or not buf.IsSoap():
+      # The buffer contains non-XML data, most likely an HTML page. This
+      # happens in the case of 502 errors.
+      html_error = Utils.GetErrorFromHtml(buf.GetBufferAsStr())
+      if html_error:
+        msg = html_error
+      else:
+        msg = 'Unknown error.'
+      raise Error(msg)
 
-      self._HandleLogsAndErrors(buf, self._start_time, self._stop_time)
+    # Only logging and usage accounting need the lock, the request itself can
+    # run alongside other calls.
+    self._lock.acquire()
+    try:
+      self._HandleLogsAndErrors(buf, start_time, stop_time)
     finally:
       self._lock.release()
     if self._config['wrap_in_tuple']:
@@ -618,6 +1039,131 @@ class GenericApiService(object):
     return response
 
 
+class StreamedResponse(object):
+
+  """Entries of a call's response, parsed as they are iterated over.
+
+  The request is sent when the first entry is asked for. Only the entry being
+  read is turned into a dictionary, so responses with thousands of entries can
+  be processed without holding all of them. Usage counters and logs are updated
+  once the last entry has been read, or once the response is closed or
+  discarded before then.
+
+  Attributes:
+    page: dict The response's other fields, such as totalNumEntries, once all
+          entries have been read. None until then.
+  """
+
+  def __init__(self, service, method_name, args):
+    """Inits StreamedResponse.
+
+    Args:
+      service: GenericApiService The service to call.
+      method_name: string The name of the SOAP operation to call.
+      args: tuple The arguments to pass into the SOAP operation.
+    """
+    self.page = None
+    # The entries only get a proxy, so that dropping the response closes them.
+    self.__entries = service._StreamEntries(method_name, args,
+                                            weakref.proxy(self))
+
+  def __iter__(self):
+    return self
+
+  def next(self):
+    """Returns the next entry of the response."""
+    return self.__entries.next()
+
+  def close(self):
+    """Stops reading the response, updating usage counters and logs."""
+    self.__entries.close()
+
+
+class _StreamingOperations(object):
+
+  """Makes a service's calls return StreamedResponse objects."""
+
+  def __init__(self, service):
+    """Inits _StreamingOperations.
+
+    Args:
+      service: GenericApiService The service whose operations are called.
+    """
+    self.__service = service
+
+  def __getattr__(self, name):
+    """Returns a function making a streamed call to the given operation.
+
+    Args:
+      name: string The name of an operation in the service's WSDL.
+
+    Returns:
+      function A function which takes the operation's arguments and returns a
+      StreamedResponse.
+
+    Raises:
+      AttributeError: if the service has no such operation.
+    """
+    service = self.__service
+    method_name = service._ResolveMethodName(name)
+
+    def StreamMethod(*args):
+      """Perform a streamed SOAP call."""
+      return StreamedResponse(service, method_name, args)
+
+    return StreamMethod
+
+
+class _ConfigFlags(object):
+
+  """Configuration values a service reads on every request, converted once."""
+
+  def __init__(self, key):
+    """Inits _ConfigFlags.
+
+    Args:
+      key: tuple The raw strict, pretty_xml, raw_debug, debug, raw_response,
+           wrap_in_tuple, compress, xml_parser and response_parser
+           configuration values.
+    """
+    self.key = key
+    (self.strict, self.pretty_xml, self.raw_debug, self.debug,
+     self.raw_response, self.wrap_in_tuple, self.compress) = [
+         Utils.BoolTypeConvert(value) for value in key[:7]]
+    self.xml_parser = key[7]
+    self.response_parser = key[8] or 'soappy'
+
+
+class _CallPlan(object):
+
+  """Everything about a SOAP operation that stays the same between calls."""
+
+  def __init__(self, method_name, method_info, namespace):
+    """Inits _CallPlan.
+
+    Args:
+      method_name: string The name of the SOAP operation.
+      method_info: dict Information about the operation, as returned by
+                   GenericApiService._GetMethodInfo.
+      namespace: string The namespace of the service the operation belongs to.
+    """
+    self.method_name = method_name
+    self.method_info = method_info
+    # Tuples of (element name, namespace, type, maxOccurs), in order.
+    self.inputs = [
+        (str(param[MethodInfoKeys.ELEMENT_NAME]), param[MethodInfoKeys.NS],
+         param[MethodInfoKeys.TYPE], param[MethodInfoKeys.MAX_OCCURS])
+        for param in method_info[MethodInfoKeys.INPUTS]]
+    self.output_types = [
+        (param[MethodInfoKeys.NS], param[MethodInfoKeys.TYPE],
+         param[MethodInfoKeys.MAX_OCCURS])
+        for param in method_info[MethodInfoKeys.OUTPUTS]]
+    if self.inputs:
+      self.method_attrs = None
+    else:
+      self.method_attrs = {'xmlns': namespace}
+
+
 class MethodInfoKeys(object):
   """Static constants holder; keys used to pass method information around."""
 
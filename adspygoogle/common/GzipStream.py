@@ -0,0 +1,186 @@
+#!/usr/bin/python
+#
+# Copyright 2013 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Decompresses gzip streams as they are read.
+
+gzip.GzipFile needs to seek in the file it reads, so compressed downloads used
+to be read into memory in full before being decompressed. A GzipReader reads
+the compressed stream a chunk at a time and hands out its decompressed content
+as it goes, so downloads take the same memory whatever their size.
+CopyStream and IterLines likewise go through any stream a chunk at a time.
+"""
+
+__author__ = 'agent@local (agent)'
+
+import zlib
+
+
+# Number of bytes read from a stream at a time.
+CHUNK_SIZE = 65536
+# Window bits telling zlib to expect a gzip header and trailer.
+_GZIP_WBITS = 16 + zlib.MAX_WBITS
+_GZIP_MAGIC = '\037\213'
+# Byte fed to a decompressor at the end of the stream. It is left over as
+# unused data only if the member was complete.
+_SENTINEL = '\0'
+
+
+class GzipReader(object):
+
+  """File-like object reading the decompressed content of a gzip stream.
+
+  Streams made of several gzip members, as written by concatenating gzip
+  files, are read as a whole. Anything other than a gzip member following the
+  last one, such as padding, is ignored. A stream ending in the middle of a
+  member, as a cut off download does, raises an IOError.
+  """
+
+  def __init__(self, fileobj, chunk_size=CHUNK_SIZE):
+    """Inits GzipReader.
+
+    Args:
+      fileobj: file Object with a read(size) method returning the compressed
+               stream.
+      [optional]
+      chunk_size: int Number of compressed bytes to read at a time.
+    """
+    self.__fileobj = fileobj
+    self.__chunk_size = chunk_size
+    self.__decompressor = zlib.decompressobj(_GZIP_WBITS)
+    # Whether the current decompressor has been given any of the stream.
+    self.__started = False
+    self.__input = ''
+    self.__done = False
+
+  def read(self, size=-1):
+    """Reads decompressed content.
+
+    Args:
+      [optional]
+      size: int Maximum number of bytes to return, a negative number to read to
+            the end of the stream.
+
+    Returns:
+      str Up to size bytes of decompressed content, an empty string once the
+      end of the stream is reached.
+
+    Raises:
+      IOError: if the stream is not valid gzip, or ends in the middle of a
+               gzip member.
+    """
+    if size is not None and size >= 0:
+      return self.__Read(size)
+    chunks = []
+    while True:
+      chunk = self.__Read(self.__chunk_size)
+      if not chunk:
+        return ''.join(chunks)
+      chunks.append(chunk)
+
+  def close(self):
+    """Closes the compressed stream."""
+    if hasattr(self.__fileobj, 'close'):
+      self.__fileobj.close()
+
+  def __Read(self, size):
+    """Returns up to size decompressed bytes, an empty string at the end."""
+    while not self.__done and size:
+      if not self.__input:
+        self.__input = self.__fileobj.read(self.__chunk_size)
+        if not self.__input:
+          self.__done = True
+          return self.__Finish()
+      self.__started = True
+      try:
+        data = self.__decompressor.decompress(self.__input, size)
+      except zlib.error, e:
+        raise IOError('Not a valid gzip stream: %s' % e)
+      self.__input = self.__decompressor.unconsumed_tail
+      if self.__decompressor.unused_data:
+        # The member ended. Carry on with the next one, if any.
+        self.__input = self.__decompressor.unused_data
+        self.__decompressor = zlib.decompressobj(_GZIP_WBITS)
+        self.__started = False
+        if not self.__input.startswith(_GZIP_MAGIC[:len(self.__input)]):
+          self.__done = True
+      if data:
+        return data
+    return ''
+
+  def __Finish(self):
+    """Returns the last decompressed bytes, once the stream has been read.
+
+    Returns:
+      str Decompressed bytes still held by the decompressor.
+
+    Raises:
+      IOError: if the stream ended in the middle of a gzip member.
+    """
+    if not self.__started:
+      return ''
+    try:
+      data = self.__decompressor.decompress(_SENTINEL)
+      data += self.__decompressor.flush()
+    except zlib.error, e:
+      raise IOError('Truncated gzip stream: %s' % e)
+    if self.__decompressor.unused_data != _SENTINEL:
+      raise IOError('Truncated gzip stream: the last member is incomplete.')
+    return data
+
+
+def CopyStream(source, target, chunk_size=CHUNK_SIZE):
+  """Copies a stream to a file a chunk at a time.
+
+  Args:
+    source: file Object with a read(size) method.
+    target: file Object with a write(data) method.
+    [optional]
+    chunk_size: int Number of bytes to read at a time.
+
+  Returns:
+    int Number of bytes copied.
+  """
+  copied = 0
+  while True:
+    chunk = source.read(chunk_size)
+    if not chunk:
+      return copied
+    target.write(chunk)
+    copied += len(chunk)
+
+
+def IterLines(fileobj, chunk_size=CHUNK_SIZE):
+  """Yields the lines of a stream, reading it a chunk at a time.
+
+  Args:
+    fileobj: file Object with a read(size) method.
+    [optional]
+    chunk_size: int Number of bytes to read at a time.
+
+  Returns:
+    generator Each line, with its line ending.
+  """
+  pending = ''
+  while True:
+    chunk = fileobj.read(chunk_size)
+    if not chunk:
+      break
+    lines = (pending + chunk).split('\n')
+    pending = lines.pop()
+    for line in lines:
+      yield line + '\n'
+  if pending:
+    yield pending
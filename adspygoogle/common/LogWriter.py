@@ -0,0 +1,229 @@
+#!/usr/bin/python
+#
+# Copyright 2013 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Writes log records on a background thread.
+
+Formatting a SOAP log and writing it to disk can take longer than the call it
+describes, and used to happen on the calling thread while it held its client's
+lock. A LogWriter takes records from the calling threads through a bounded
+queue, and writes them one at a time on its own thread. When the queue is full,
+callers either wait for room (BLOCK) or have their record discarded (DROP).
+
+Writers are shared by the clients configured with the same queue settings, and
+every queued record is written before the interpreter exits.
+"""
+
+__author__ = 'agent@local (agent)'
+
+import atexit
+import collections
+import sys
+import threading
+import time
+import traceback
+
+from adspygoogle.common import Utils
+
+
+# Policies for a full queue.
+BLOCK = 'block'
+DROP = 'drop'
+# Number of records a queue holds when no size is given.
+DEFAULT_QUEUE_SIZE = 1000
+
+
+class LogWriter(object):
+
+  """Writes queued log records on a background thread."""
+
+  def __init__(self, max_queue_size=DEFAULT_QUEUE_SIZE, policy=BLOCK):
+    """Inits LogWriter.
+
+    Args:
+      [optional]
+      max_queue_size: int Number of records which can wait to be written.
+      policy: str What to do with a record when the queue is full, either
+              BLOCK or DROP.
+    """
+    if policy not in (BLOCK, DROP):
+      raise ValueError('Log queue policy must be \'%s\' or \'%s\', not \'%s\'.'
+                       % (BLOCK, DROP, policy))
+    self.__max_queue_size = max(1, max_queue_size)
+    self.__policy = policy
+    self.__records = collections.deque()
+    self.__lock = threading.Lock()
+    self.__not_empty = threading.Condition(self.__lock)
+    self.__not_full = threading.Condition(self.__lock)
+    self.__all_written = threading.Condition(self.__lock)
+    self.__pending = 0
+    self.__dropped = 0
+    self.__closed = False
+    self.__thread = None
+
+  def Put(self, function, args):
+    """Queues a record to be written.
+
+    Once the writer is closed, records are written on the calling thread.
+
+    Args:
+      function: callable Function writing the record.
+      args: tuple Arguments to call the function with.
+
+    Returns:
+      bool Whether the record was queued or written, False if it was dropped.
+    """
+    self.__lock.acquire()
+    try:
+      while not self.__closed and len(self.__records) >= self.__max_queue_size:
+        if self.__policy == DROP:
+          self.__dropped += 1
+          return False
+        self.__not_full.wait()
+      if not self.__closed:
+        self.__records.append((function, args))
+        self.__pending += 1
+        if self.__thread is None:
+          self.__thread = threading.Thread(target=self.__Run,
+                                           name='LogWriter')
+          self.__thread.setDaemon(True)
+          self.__thread.start()
+        self.__not_empty.notify()
+        return True
+    finally:
+      self.__lock.release()
+    function(*args)
+    return True
+
+  def __Run(self):
+    """Writes records until the writer is closed and its queue is empty."""
+    while True:
+      self.__lock.acquire()
+      try:
+        while not self.__records and not self.__closed:
+          self.__not_empty.wait()
+        if not self.__records:
+          return
+        function, args = self.__records.popleft()
+        self.__not_full.notify()
+      finally:
+        self.__lock.release()
+
+      try:
+        try:
+          function(*args)
+        except Exception:
+          # There is no caller left to raise to; report it the way the logging
+          # module reports failing handlers.
+          traceback.print_exc(None, sys.stderr)
+      finally:
+        self.__lock.acquire()
+        try:
+          self.__pending -= 1
+          if not self.__pending:
+            self.__all_written.notifyAll()
+        finally:
+          self.__lock.release()
+
+  def Flush(self, timeout=None):
+    """Waits for every queued record to be written.
+
+    Args:
+      [optional]
+      timeout: float Number of seconds to wait at most, None to wait for as
+               long as it takes.
+
+    Returns:
+      bool Whether every record was written.
+    """
+    if timeout is not None:
+      deadline = time.time() + timeout
+    self.__lock.acquire()
+    try:
+      while self.__pending:
+        if timeout is None:
+          self.__all_written.wait()
+        else:
+          remaining = deadline - time.time()
+          if remaining <= 0:
+            return False
+          self.__all_written.wait(remaining)
+      return True
+    finally:
+      self.__lock.release()
+
+  def Close(self):
+    """Writes every queued record and stops the background thread."""
+    self.__lock.acquire()
+    try:
+      self.__closed = True
+      self.__not_empty.notifyAll()
+      self.__not_full.notifyAll()
+      thread = self.__thread
+    finally:
+      self.__lock.release()
+    if thread is not None and thread is not threading.currentThread():
+      thread.join()
+
+  def GetDroppedCount(self):
+    """Returns the number of records dropped because the queue was full."""
+    self.__lock.acquire()
+    try:
+      return self.__dropped
+    finally:
+      self.__lock.release()
+
+
+_writers = {}
+_writers_lock = threading.Lock()
+
+
+def _CloseWriters():
+  """Writes the records still queued in every writer, at exit."""
+  _writers_lock.acquire()
+  try:
+    writers = _writers.values()
+  finally:
+    _writers_lock.release()
+  for writer in writers:
+    writer.Close()
+
+atexit.register(_CloseWriters)
+
+
+def GetLogWriterFromConfig(config):
+  """Return the shared log writer described by a configuration, if any.
+
+  Clients configured with the same queue size and policy share a writer.
+
+  Args:
+    config: dict Dictionary object with populated configuration values.
+
+  Returns:
+    LogWriter The writer to use, None if logs are written synchronously.
+  """
+  if not Utils.BoolTypeConvert(config.get('async_log', 'n')):
+    return None
+  key = (int(config.get('log_queue_size') or DEFAULT_QUEUE_SIZE),
+         config.get('log_queue_policy') or BLOCK)
+  _writers_lock.acquire()
+  try:
+    writer = _writers.get(key)
+    if writer is None:
+      writer = LogWriter(*key)
+      _writers[key] = writer
+    return writer
+  finally:
+    _writers_lock.release()
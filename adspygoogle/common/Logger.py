@@ -19,8 +19,13 @@
 __author__ = 'api.arogal@gmail.com (Adam Rogal)'
 
 import logging
+import logging.handlers
 import os
 import sys
+import threading
+import time
+
+from adspygoogle.common import LogWriter
 
 
 class Logger(object):
@@ -34,7 +39,10 @@ class Logger(object):
   derived from the original logging module with CRITCAL being the highest
   importance.
 
-  This class is a wrapper for the standard logging module.
+  This class is a wrapper for the standard logging module. Given a LogWriter,
+  messages are handed to its background thread instead of being written by the
+  calling thread. Given a CallSampler, it also decides which calls have their
+  SOAP XML logged.
   """
 
   # Handler constants.
@@ -51,17 +59,29 @@ class Logger(object):
   DEBUG = logging.DEBUG
   NOTSET = logging.NOTSET
 
-  def __init__(self, lib_sig, log_path=os.path.join(os.getcwd(), 'logs')):
+  def __init__(self, lib_sig, log_path=os.path.join(os.getcwd(), 'logs'),
+               writer=None, max_bytes=0, backup_count=0, sampler=None):
     """Inits Logger.
 
     Args:
       lib_sig: str Signature of the client library.
       [optional]
       log_path: str Absolute or relative path to the logs directory.
+      writer: LogWriter Writer to hand messages to, None to write them on the
+              calling thread.
+      max_bytes: int Size in bytes at which a log file is rotated, 0 to never
+                 rotate log files.
+      backup_count: int Number of rotated log files to keep.
+      sampler: CallSampler Sampler deciding which calls have their SOAP XML
+               logged, None to log every call.
     """
     self.__lib_sig = lib_sig
     self.__log_path = log_path
     self.__log_table = {}
+    self.__writer = writer
+    self.__max_bytes = max_bytes
+    self.__backup_count = backup_count
+    self.__sampler = sampler
 
   def __CreateLog(self, log_name, log_level=NOTSET, log_handler=FILE,
                   stream=sys.stderr):
@@ -102,8 +122,13 @@ class Logger(object):
           self.__log_table[log_name] != Logger.FILE):
         if not os.path.exists(self.__log_path):
           os.makedirs(self.__log_path)
-        fh = logging.FileHandler(os.path.join(self.__log_path,
-                                              '%s.log' % log_name))
+        file_name = os.path.join(self.__log_path, '%s.log' % log_name)
+        if self.__max_bytes:
+          fh = logging.handlers.RotatingFileHandler(
+              file_name, maxBytes=self.__max_bytes,
+              backupCount=self.__backup_count)
+        else:
+          fh = logging.FileHandler(file_name)
         fh.setLevel(log_level)
         fh.setFormatter(logging.Formatter(fmt))
         logger.addHandler(fh)
@@ -127,7 +152,9 @@ class Logger(object):
     Args:
       log_name: str Name of the log. If the log is handled by an external
                 file, this will be the file name appended by log.
-      message: str Message to log.
+      message: str or function Message to log, or a function returning it or
+               None to log nothing. With a LogWriter, the function is called
+               on the writer's thread.
       [optional]
       log_level: int Level of importance of the current message. Not
                  supplying this parameter will cause the logger to log at the
@@ -137,6 +164,27 @@ class Logger(object):
       log_handler: int Type of log handler. Should be one of NONE, FILE,
                    CONSOLE, or FILE_AND_CONSOLE.
     """
+    if self.__writer is not None:
+      self.__writer.Put(self.__Write, (log_name, message, log_level,
+                                       log_handler, time.time()))
+    else:
+      self.__Write(log_name, message, log_level, log_handler)
+
+  def __Write(self, log_name, message, log_level, log_handler, created=None):
+    """Writes a message to its log.
+
+    Args:
+      log_name: str Name of the log.
+      message: str or function Message to log, or a function returning it.
+      log_level: int Level of importance of the current message.
+      log_handler: int Type of log handler.
+      [optional]
+      created: float Time the message was logged at, if it was queued.
+    """
+    if callable(message):
+      message = message()
+      if message is None:
+        return
     logger = logging.getLogger(log_name)
 
     # Instantiate handlers for logger with default values if none exists.
@@ -144,6 +192,118 @@ class Logger(object):
       self.__CreateLog(log_name, log_level, log_handler)
 
     if log_level == Logger.NOTSET:
-      logger.log(logger.getEffectiveLevel(), message)
-    else:
+      log_level = logger.getEffectiveLevel()
+    if created is None:
       logger.log(log_level, message)
+    elif logger.isEnabledFor(log_level):
+      # Stamp the record with the time it was logged at, not written at.
+      record = logger.makeRecord(logger.name, log_level, '(unknown file)', 0,
+                                 message, (), None)
+      record.created = created
+      record.msecs = (created - long(created)) * 1000
+      logger.handle(record)
+
+  def Flush(self, timeout=None):
+    """Waits for the messages handed to the writer to be written.
+
+    Args:
+      [optional]
+      timeout: float Number of seconds to wait at most.
+
+    Returns:
+      bool Whether every message was written.
+    """
+    if self.__writer is None:
+      return True
+    return self.__writer.Flush(timeout)
+
+  def IsCallSampled(self, is_fault, elapsed_time=None):
+    """Returns whether a call's SOAP XML should be logged.
+
+    Args:
+      is_fault: bool Whether the call failed.
+      [optional]
+      elapsed_time: float Number of seconds the call took, if known.
+
+    Returns:
+      bool True if the call's SOAP XML should be logged, False otherwise.
+    """
+    if self.__sampler is None:
+      return True
+    return self.__sampler.IsSampled(is_fault, elapsed_time)
+
+
+class CallSampler(object):
+
+  """Picks the calls whose SOAP XML is logged.
+
+  Every call that failed, or took at least slow_call_time seconds, is picked.
+  Of the other calls, the first and every sample_rate-th one after it are. A
+  sample_rate of 0 picks none of them, leaving only faults and slow calls.
+  """
+
+  def __init__(self, sample_rate=1, slow_call_time=None):
+    """Inits CallSampler.
+
+    Args:
+      [optional]
+      sample_rate: int Log one in this many successful calls, 0 to log none
+                   of them by count.
+      slow_call_time: float Number of seconds after which a call is always
+                      logged, None to only sample by count.
+    """
+    self.__sample_rate = max(0, sample_rate)
+    self.__slow_call_time = slow_call_time
+    self.__calls = 0
+    self.__lock = threading.Lock()
+
+  def IsSampled(self, is_fault, elapsed_time=None):
+    """Returns whether a call's SOAP XML should be logged.
+
+    Args:
+      is_fault: bool Whether the call failed.
+      [optional]
+      elapsed_time: float Number of seconds the call took, if known.
+
+    Returns:
+      bool True if the call's SOAP XML should be logged, False otherwise.
+    """
+    if is_fault or self.__sample_rate == 1:
+      return True
+    if (self.__slow_call_time is not None and elapsed_time is not None and
+        elapsed_time >= self.__slow_call_time):
+      return True
+    if not self.__sample_rate:
+      return False
+    self.__lock.acquire()
+    try:
+      self.__calls += 1
+      return self.__calls % self.__sample_rate == 1
+    finally:
+      self.__lock.release()
+
+
+def GetLoggerFromConfig(lib_sig, config):
+  """Return a logger set up as described by a client configuration.
+
+  Args:
+    lib_sig: str Signature of the client library.
+    config: dict Dictionary object with populated configuration values.
+
+  Returns:
+    Logger The logger to use.
+  """
+  sampler = None
+  sample_rate = config.get('xml_log_sample_rate')
+  if sample_rate is None or sample_rate == '':
+    sample_rate = 1
+  sample_rate = int(sample_rate)
+  slow_call_time = config.get('xml_log_slow_call_time')
+  if sample_rate != 1 or slow_call_time is not None:
+    if slow_call_time is not None:
+      slow_call_time = float(slow_call_time)
+    sampler = CallSampler(sample_rate, slow_call_time)
+  return Logger(lib_sig, config['log_home'],
+                LogWriter.GetLogWriterFromConfig(config),
+                int(config.get('log_max_bytes') or 0),
+                int(config.get('log_backup_count') or 0), sampler)
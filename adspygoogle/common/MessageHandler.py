@@ -144,10 +144,10 @@ def _PackDictForSoappy(obj, xmlns, type_name, soappy_service, wrap_lists,
   for key in obj:
     if key == type_key or obj[key] is None:
       continue
-    ns_prefix = prefix_function(SoappyUtils.GetComplexFieldNamespaceByFieldName(
-        key, type_name, xmlns, soappy_service))
-    key_type = SoappyUtils.GetComplexFieldTypeByFieldName(
-        key, type_name, xmlns, soappy_service)
+    field = SoappyUtils.GetComplexFieldByFieldName(key, type_name, xmlns,
+                                                   soappy_service)
+    ns_prefix = prefix_function(field.namespace)
+    key_type = field.type
     packed_data[ns_prefix + key] = PackForSoappy(
         obj[key], key_type.getTargetNamespace(), key_type.getName(),
         soappy_service, wrap_lists, prefix_function)
@@ -156,8 +156,7 @@ def _PackDictForSoappy(obj, xmlns, type_name, soappy_service, wrap_lists,
   packed_object = SOAPpy.Types.structType(packed_data, typed=0, attrs=attrs)
   packed_object._typename = type_name
   packed_object._keyord = SoappyUtils.PruneKeyOrder(
-      [param['name'] for param in SoappyUtils.GenKeyOrderAttrs(
-          soappy_service, xmlns, type_name)], packed_object)
+      SoappyUtils.GenKeyOrder(soappy_service, xmlns, type_name), packed_object)
   return packed_object
 
 
@@ -23,6 +23,11 @@ from adspygoogle.common import PYXML
 from adspygoogle.common import Utils
 from adspygoogle.common.Errors import ValidationError
 from adspygoogle.common.soappy import SoappyUtils
+from adspygoogle.common.soappy.TypeIndex import GetTypeIndex
+
+
+# Name of the attribute a service's validators are stored in.
+_VALIDATORS_ATTRIBUTE = '_adspygoogle_validators'
 
 
 def ValidateRequiredHeaders(headers, required_headers):
@@ -119,134 +124,321 @@ def ValidateTypes(vars_tpl):
     raise ValidationError(msg)
 
 
-def _SoappySanityCheckComplexType(soappy_service, obj, ns, xsi_type):
-  """Validates a dict representing a complex type against its WSDL definition.
+def _IsList(max_occurs):
+  """Returns whether a maxOccurs attribute allows more than one value."""
+  return not max_occurs.isdigit() or int(max_occurs) > 1
+
+
+def _GetValidators(soappy_service):
+  """Returns a service's _Validators, creating them on first use.
 
   Args:
     soappy_service: SOAPpy.WSDL.Proxy The SOAPpy service object containing the
                     descriptions of all WSDL-defined types.
-    obj: A dict that should represent an instance of the given type.
-    ns: string The namespace the given type belongs to.
-    xsi_type: A string specifying the name of a complex type defined in the
-              WSDL.
 
-  Raises:
-    ValidationError: The given object is not an acceptable representation of the
-                     given WSDL-defined complex type.
+  Returns:
+    _Validators The validators of the given service.
   """
-  ValidateTypes(((obj, dict),))
-  obj_contained_type, type_key = SoappyUtils.GetExplicitType(obj, xsi_type, ns,
-                                                             soappy_service)
+  # Read through __dict__, as WSDL.Proxy resolves unknown attributes to SOAP
+  # methods.
+  validators = soappy_service.__dict__.get(_VALIDATORS_ATTRIBUTE)
+  if validators is None:
+    validators = _Validators(soappy_service)
+    setattr(soappy_service, _VALIDATORS_ATTRIBUTE, validators)
+  return validators
+
+
+class _Validators(object):
+
+  """The validators of one service, compiled once per type on first use."""
+
+  def __init__(self, soappy_service):
+    """Inits _Validators.
+
+    Args:
+      soappy_service: SOAPpy.WSDL.Proxy The SOAPpy service object containing
+                      the descriptions of all WSDL-defined types.
+    """
+    self.soappy_service = soappy_service
+    self.type_index = GetTypeIndex(soappy_service)
+    self.__validators = {}
+    self.__complex_types = {}
+
+  def Get(self, ns, type_name, is_list):
+    """Returns the function validating objects of a type.
+
+    Args:
+      ns: string The namespace the type belongs to.
+      type_name: string The name of the type.
+      is_list: bool Whether the objects are lists of the type.
+
+    Returns:
+      callable Takes an object and raises a ValidationError if it is not a
+      valid representation of the type.
+    """
+    key = (ns, type_name, is_list)
+    try:
+      return self.__validators[key]
+    except KeyError:
+      validator = self.__Compile(ns, type_name, is_list)
+      self.__validators[key] = validator
+      return validator
 
-  if obj_contained_type and not obj_contained_type == xsi_type:
+  def GetComplexType(self, ns, type_name):
+    """Returns the _ComplexTypeValidator of a complex type."""
+    key = (ns, type_name)
     try:
-      SoappyUtils.GetTypeFromSoappyService(obj_contained_type, ns,
-                                           soappy_service)
+      return self.__complex_types[key]
     except KeyError:
-      raise ValidationError('Object of class \'%s\' has an explicit type of '
-                            '\'%s\', but this explicit type is not defined in '
-                            'the WSDL.' % (xsi_type, obj_contained_type))
-    if not SoappyUtils.IsASuperType(soappy_service, obj_contained_type, ns,
-                                    xsi_type):
-      raise ValidationError('Expecting type of \'%s\' but given type of class '
-                            '\'%s\'.' % (xsi_type, obj_contained_type))
-    xsi_type = obj_contained_type
-
-  parameters = SoappyUtils.GenKeyOrderAttrs(soappy_service, ns, xsi_type)
-  for key in obj:
-    if obj[key] is None or key == type_key:
-      continue
-    found = False
-    for parameter, param_type, max_occurs in [
-        (param['name'], param['type'], param['maxOccurs']) for
-        param in parameters]:
-      if parameter == key:
-        found = True
-        if not max_occurs.isdigit() or int(max_occurs) > 1:
-          # This parameter should be a list.
-          if isinstance(obj[key], (list, tuple)):
-            for item in obj[key]:
-              SoappySanityCheck(soappy_service, item,
-                                param_type.getTargetNamespace(),
-                                param_type.getName())
-          else:
-            raise ValidationError('Field \'%s\' in complex type \'%s\' should '
-                                  'be a list but value \'%s\' is a \'%s\' '
-                                  'instead.'
-                                  % (key, xsi_type, obj[key], type(obj[key])))
-        else:
-          SoappySanityCheck(soappy_service, obj[key],
-                            param_type.getTargetNamespace(),
-                            param_type.getName())
-        break
-    if not found:
-      raise ValidationError('Field \'%s\' is not in type \'%s\'.'
-                            % (key, xsi_type))
+      validator = _ComplexTypeValidator(self, ns, type_name)
+      self.__complex_types[key] = validator
+      return validator
+
+  def __Compile(self, ns, type_name, is_list):
+    """Creates the function validating objects of a type."""
+    if Utils.IsBaseSoapType(type_name):
+      return _StringValidator(
+          'Objects of type \'%s\' should be a string but value \'%s\' is a '
+          '\'%s\' instead.', type_name).Validate
+    try:
+      soap_type = self.soappy_service.wsdl.types[ns].types[type_name].tag
+    except KeyError:
+      return _ErrorValidator('This type is not defined in the WSDL: \'%s\''
+                             % type_name).Validate
+    if soap_type == 'simpleType':
+      return _StringValidator(
+          'Simple type \'%s\' should be a string but value \'%s\' is a \'%s\' '
+          'instead.', type_name).Validate
+    elif soap_type == 'complexType':
+      if self.type_index.IsAnArrayType(type_name, ns) or is_list:
+        return _ArrayValidator(self, ns, type_name).Validate
+      return self.GetComplexType(ns, type_name).Validate
+    return _ErrorValidator('Unrecognized type definition tag in WSDL: \'%s\''
+                           % soap_type).Validate
+
+
+class _StringValidator(object):
+
+  """Validates objects of a base or simple type, which must be strings."""
+
+  def __init__(self, message, type_name):
+    """Inits _StringValidator.
+
+    Args:
+      message: string The format of the error message, taking the type name,
+               the object and the object's type.
+      type_name: string The name of the type.
+    """
+    self.__message = message
+    self.__type_name = type_name
+
+  def Validate(self, obj):
+    """Validates an object, raising a ValidationError if it is invalid."""
+    if obj in (None, '') or isinstance(obj, basestring):
+      return
+    raise ValidationError(self.__message % (self.__type_name, obj, type(obj)))
+
+
+class _ErrorValidator(object):
+
+  """Rejects every object of a type which cannot be validated."""
+
+  def __init__(self, message):
+    """Inits _ErrorValidator.
+
+    Args:
+      message: string The error message.
+    """
+    self.__message = message
+
+  def Validate(self, obj):
+    """Validates an object, raising a ValidationError if it is invalid."""
+    if obj in (None, ''):
+      return
+    raise ValidationError(self.__message)
+
+
+class _ArrayValidator(object):
+
+  """Validates lists of a type."""
+
+  def __init__(self, validators, ns, type_name):
+    """Inits _ArrayValidator.
+
+    Args:
+      validators: _Validators The validators of the service.
+      ns: string The namespace the type belongs to.
+      type_name: string The name of the array type, or of the item type for
+                 fields which may occur more than once.
+    """
+    self.__validators = validators
+    self.__ns = ns
+    self.__type_name = type_name
+    self.__validate_item = None
+
+  def Validate(self, obj):
+    """Validates an object, raising a ValidationError if it is invalid."""
+    if obj in (None, ''):
+      return
+    if not isinstance(obj, list):
+      raise ValidationError('Type \'%s\' should be a list but value \'%s\' is a '
+                            '\'%s\' instead.' % (self.__type_name, obj,
+                                                 type(obj)))
+    validate_item = self.__validate_item
+    if validate_item is None:
+      validate_item = self.__validators.Get(
+          self.__ns, self.__validators.type_index.GetArrayItemTypeName(
+              self.__type_name, self.__ns), False)
+      self.__validate_item = validate_item
+    for item in obj:
+      if item is not None:
+        validate_item(item)
 
 
-def _SoappySanityCheckSimpleType(obj, xsi_type):
-  """Validates a string representing a simple type against its WSDL definition.
+class _ComplexTypeValidator(object):
 
-  Args:
-    obj: String representing the given simple type.
-    xsi_type: A string specifying the simple type name defined in the WSDL.
+  """Validates dictionaries representing a complex type.
 
-  Raises:
-    ValidationError: The given object is not an acceptable representation of the
-                     given WSDL-defined simple type.
+  The fields of the type are looked up once, along with the validators of
+  their types. Explicit types given with xsi_type and the like are checked
+  against the type once, then validated with their own fields.
   """
-  try:
-    ValidateTypes(((obj, (str, unicode)),))
-  except ValidationError:
-    raise ValidationError('Simple type \'%s\' should be a string but value '
-                          '\'%s\' is a \'%s\' instead.' %
-                          (xsi_type, obj, type(obj)))
-
-
-def _SoappySanityCheckArray(soappy_service, obj, ns, type_name):
-  """Validates a list representing an array type against its WSDL definition.
-
-  Args:
-    soappy_service: SOAPpy.WSDL.Proxy The SOAPpy service object containing the
-                    descriptions of all WSDL-defined types.
-    obj: Object to be validated. Depending on the WSDL-defined type this object
-         represents, the data type will vary. It should always be either a
-         dictionary, list, or string no matter what WSDL-defined type it is.
-    ns: string The namespace the given type belongs to.
-    type_name: A string specifying the type name defined in the WSDL.
 
-  Raises:
-    ValidationError if the given object is not a valid representation of the
-    given list type.
-  """
-  try:
-    ValidateTypes(((obj, list),))
-  except ValidationError:
-    raise ValidationError('Type \'%s\' should be a list but value '
-                          '\'%s\' is a \'%s\' instead.' %
-                          (type_name, obj, type(obj)))
-  if Utils.IsBaseSoapType(type_name):
-    for item in obj:
-      if item is None: continue
+  def __init__(self, validators, ns, type_name):
+    """Inits _ComplexTypeValidator.
+
+    Args:
+      validators: _Validators The validators of the service.
+      ns: string The namespace the type belongs to.
+      type_name: string The name of the complex type.
+    """
+    self.__validators = validators
+    self.__ns = ns
+    self.__type_name = type_name
+    self.__has_type_field = None
+    self.__indexed = False
+    self.__subtypes = {}
+    self.__fields = {}
+
+  def Validate(self, obj):
+    """Validates an object, raising a ValidationError if it is invalid."""
+    if obj in (None, ''):
+      return
+    if not isinstance(obj, dict):
+      ValidateTypes(((obj, dict),))
+    try:
+      explicit_type, type_key = self.__GetExplicitType(obj)
+      validator = self
+      if explicit_type and not explicit_type == self.__type_name:
+        validator = self.__GetSubtype(explicit_type)
+      validator.ValidateFields(obj, type_key)
+    except KeyError:
+      raise ValidationError('This type is not defined in the WSDL: \'%s\''
+                            % self.__type_name)
+
+  def ValidateFields(self, obj, type_key):
+    """Validates the fields of a dictionary representing this type.
+
+    Args:
+      obj: dict The dictionary.
+      type_key: string The key the type was set with, or None.
+
+    Raises:
+      ValidationError: if a field is invalid.
+    """
+    if not self.__indexed:
+      # Fails for types which are not defined in the WSDL.
+      self.__validators.type_index.GenKeyOrderAttrs(self.__ns,
+                                                    self.__type_name)
+      self.__indexed = True
+    fields = self.__fields
+    for key in obj:
+      value = obj[key]
+      if value is None or key == type_key:
+        continue
       try:
-        ValidateTypes(((item, (str, unicode)),))
-      except ValidationError:
-        raise ValidationError('The items in array \'%s\' must all be strings. '
-                              'Value \'%s\' is of type \'%s\'.'
-                              % (type_name, item, type(item)))
-  else:
-    for item in obj:
-      if item is None: continue
-      SoappySanityCheck(soappy_service, item, ns,
-                        SoappyUtils.GetArrayItemTypeName(type_name, ns,
-                                                         soappy_service))
+        is_list, validate = fields[key]
+      except KeyError:
+        is_list, validate = self.__CompileField(key)
+      if not is_list:
+        validate(value)
+      elif isinstance(value, (list, tuple)):
+        for item in value:
+          validate(item)
+      else:
+        raise ValidationError('Field \'%s\' in complex type \'%s\' should '
+                              'be a list but value \'%s\' is a \'%s\' '
+                              'instead.'
+                              % (key, self.__type_name, value, type(value)))
+
+  def __CompileField(self, key):
+    """Looks up a field of the type and the validator of its values."""
+    try:
+      field = self.__validators.type_index.GetField(key, self.__type_name,
+                                                     self.__ns)
+    except TypeError:
+      raise ValidationError('Field \'%s\' is not in type \'%s\'.'
+                            % (key, self.__type_name))
+    spec = (_IsList(field.max_occurs), self.__validators.Get(
+        field.type.getTargetNamespace(), field.type.getName(), False))
+    self.__fields[key] = spec
+    return spec
+
+  def __GetExplicitType(self, obj):
+    """Returns the type set within a dictionary, as SoappyUtils does."""
+    if 'xsi_type' in obj:
+      return (obj['xsi_type'], 'xsi_type')
+    if 'type' in obj:
+      if self.__has_type_field is None:
+        self.__has_type_field = self.__validators.type_index.HasField(
+            'type', self.__type_name, self.__ns)
+      if not self.__has_type_field:
+        return (obj['type'], 'type')
+    for key in obj:
+      if '.Type' in key or '_Type' in key:
+        return (obj[key], key)
+    return (None, None)
+
+  def __GetSubtype(self, explicit_type):
+    """Returns the validator of an explicit type given for this type.
+
+    Args:
+      explicit_type: string The name of the explicit type.
+
+    Returns:
+      _ComplexTypeValidator The validator of the explicit type.
+
+    Raises:
+      ValidationError: if the explicit type is not defined, or does not extend
+      this type.
+    """
+    try:
+      return self.__subtypes[explicit_type]
+    except (KeyError, TypeError):
+      pass
+    try:
+      SoappyUtils.GetTypeFromSoappyService(
+          explicit_type, self.__ns, self.__validators.soappy_service)
+    except KeyError:
+      raise ValidationError('Object of class \'%s\' has an explicit type of '
+                            '\'%s\', but this explicit type is not defined in '
+                            'the WSDL.' % (self.__type_name, explicit_type))
+    if not self.__validators.type_index.IsASuperType(
+        explicit_type, self.__ns, self.__type_name):
+      raise ValidationError('Expecting type of \'%s\' but given type of class '
+                            '\'%s\'.' % (self.__type_name, explicit_type))
+    validator = self.__validators.GetComplexType(self.__ns, explicit_type)
+    if isinstance(explicit_type, basestring):
+      self.__subtypes[explicit_type] = validator
+    return validator
 
 
 def SoappySanityCheck(soappy_service, obj, ns, obj_type, max_occurs='1'):
   """Validates any given object against its WSDL definition.
 
   This method considers None and the empty string to be a valid representation
-  of any type.
+  of any type. The checks for each type are compiled on first use and kept on
+  the service.
 
   Args:
     soappy_service: SOAPpy.WSDL.Proxy An object encapsulating a SOAP service.
@@ -262,29 +454,4 @@ def SoappySanityCheck(soappy_service, obj, ns, obj_type, max_occurs='1'):
                      object is not a valid representation of the type defined in
                      the WSDL.
   """
-  if obj in (None, ''):
-    return
-  elif Utils.IsBaseSoapType(obj_type):
-    try:
-      ValidateTypes(((obj, (str, unicode)),))
-    except ValidationError:
-      raise ValidationError('Objects of type \'%s\' should be a string but '
-                            'value \'%s\' is a \'%s\' instead.' %
-                            (obj_type, obj, type(obj)))
-  else:
-    try:
-      soap_type = soappy_service.wsdl.types[ns].types[obj_type].tag
-      if soap_type == 'simpleType':
-        _SoappySanityCheckSimpleType(obj, obj_type)
-      elif soap_type == 'complexType':
-        if (SoappyUtils.IsAnArrayType(obj_type, ns, soappy_service) or
-            not max_occurs.isdigit() or int(max_occurs) > 1):
-          _SoappySanityCheckArray(soappy_service, obj, ns, obj_type)
-        else:
-          _SoappySanityCheckComplexType(soappy_service, obj, ns, obj_type)
-      else:
-        raise ValidationError('Unrecognized type definition tag in WSDL: \'%s\''
-                              % soap_type)
-    except KeyError:
-      raise ValidationError('This type is not defined in the WSDL: \'%s\''
-                            % obj_type)
+  _GetValidators(soappy_service).Get(ns, obj_type, _IsList(max_occurs))(obj)
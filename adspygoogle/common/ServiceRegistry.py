@@ -0,0 +1,130 @@
+#!/usr/bin/python
+#
+# Copyright 2013 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Bounded registry of the service objects created by a client."""
+
+__author__ = 'agent@local (agent)'
+
+import threading
+
+
+# Number of services a registry keeps when no size is configured.
+DEFAULT_MAX_SIZE = 64
+
+
+class ServiceRegistry(object):
+
+  """Keeps the most recently used service objects of a client.
+
+  Services are keyed by their name, server, version, group and HTTP proxy. Once
+  the registry holds max_size services, adding another one evicts the least
+  recently used.
+  """
+
+  def __init__(self, max_size=DEFAULT_MAX_SIZE):
+    """Inits ServiceRegistry.
+
+    Args:
+      [optional]
+      max_size: int Maximum number of services to keep. A size of 0 disables
+                the registry.
+    """
+    self.__max_size = max(int(max_size), 0)
+    self.__services = {}
+    # Keys ordered from least to most recently used.
+    self.__order = []
+    self.__lock = threading.Lock()
+
+  def GetKey(self, service_name, op_config):
+    """Return the registry key for a given service.
+
+    Args:
+      service_name: str Name of the service.
+      op_config: dict Dictionary object with additional configuration values for
+                 the service.
+
+    Returns:
+      tuple Key identifying the service in the registry.
+    """
+    return (service_name, op_config.get('server'), op_config.get('version'),
+            op_config.get('group'), op_config.get('http_proxy'))
+
+  def Get(self, key):
+    """Return the service stored under a given key, marking it recently used.
+
+    Args:
+      key: tuple Key as returned by GetKey.
+
+    Returns:
+      GenericApiService The stored service, None if there is none.
+    """
+    self.__lock.acquire()
+    try:
+      service = self.__services.get(key)
+      if service is not None:
+        self.__order.remove(key)
+        self.__order.append(key)
+      return service
+    finally:
+      self.__lock.release()
+
+  def Put(self, key, service):
+    """Store a service under a given key.
+
+    Args:
+      key: tuple Key as returned by GetKey.
+      service: GenericApiService The service to store.
+    """
+    if not self.__max_size:
+      return
+    self.__lock.acquire()
+    try:
+      if key in self.__services:
+        self.__order.remove(key)
+      self.__services[key] = service
+      self.__order.append(key)
+      while len(self.__order) > self.__max_size:
+        del self.__services[self.__order.pop(0)]
+    finally:
+      self.__lock.release()
+
+  def Evict(self, service_name=None):
+    """Remove services from the registry.
+
+    Args:
+      [optional]
+      service_name: str Name of the service to remove, for any server, version
+                    and HTTP proxy. If not given, all services are removed.
+
+    Returns:
+      int Number of services removed.
+    """
+    self.__lock.acquire()
+    try:
+      if service_name is None:
+        evicted = list(self.__order)
+      else:
+        evicted = [key for key in self.__order if key[0] == service_name]
+      for key in evicted:
+        del self.__services[key]
+        self.__order.remove(key)
+      return len(evicted)
+    finally:
+      self.__lock.release()
+
+  def __len__(self):
+    """Return the number of services in the registry."""
+    return len(self.__order)
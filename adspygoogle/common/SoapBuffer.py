@@ -20,6 +20,7 @@ __author__ = 'api.sgrinberg@gmail.com (Stan Grinberg)'
 
 import re
 import sys
+import threading
 
 from adspygoogle.common import ETREE
 from adspygoogle.common import ETREE_NAME
@@ -127,8 +128,15 @@ class SoapBuffer(Buffer):
     """
     super(SoapBuffer, self).__init__()
 
-    self._buffer = ''
+    # Banner and body of each dump, as split out of the buffer.
+    self.__raw_dump = {}
+    # Dumps as returned by the getters, formatted on first use.
     self.__dump = {}
+    self.__segmented = False
+    # Logs may be formatted on a LogWriter thread while the calling thread
+    # reads the fault, so only one of them splits the buffer.
+    self.__segment_lock = threading.Lock()
+    self.__ResetParsed()
     self.__xml_parser = xml_parser
     # Pick a default XML parser, if none was set.
     if not self.__xml_parser:
@@ -151,6 +159,7 @@ class SoapBuffer(Buffer):
     elif self.__xml_parser == ETREE:
       self.__xml_parser_sig = '%s v%s' % (ETREE_NAME, ETREE_VERSION)
     self.__pretty_xml = pretty_xml
+    self.__elapsed_time = None
 
   def write(self, str_in):
     """Append given string to a buffer.
@@ -159,10 +168,27 @@ class SoapBuffer(Buffer):
       str_in: str String to append to a buffer.
     """
     super(SoapBuffer, self).write(str_in)
+    self.__segmented = False
 
   def flush(self):
     super(SoapBuffer, self).flush()
 
+  def SetElapsedTime(self, elapsed_time):
+    """Record how long the call whose messages are buffered took.
+
+    Args:
+      elapsed_time: float Number of seconds the call took.
+    """
+    self.__elapsed_time = elapsed_time
+
+  def GetElapsedTime(self):
+    """Return how long the call whose messages are buffered took.
+
+    Returns:
+      float Number of seconds the call took, None if it was not recorded.
+    """
+    return self.__elapsed_time
+
   def GetBufferAsStr(self):
     """Return buffer as string.
 
@@ -181,16 +207,44 @@ class SoapBuffer(Buffer):
       bool True if successful handshake, False otherwise.
     """
     if (self.GetHeadersOut() and self.GetSoapOut() and self.GetHeadersIn() and
-        self.GetSoapIn() and not Utils.IsHtml(self.GetSoapIn())):
+        self.GetSoapIn() and not self.__IsSoapInHtml()):
       return True
     return False
 
-  def __GetBufferAsDict(self):
-    """Parse HTTP headers and SOAP data.
+  def __IsSoapInHtml(self):
+    """Return whether the incoming SOAP dump is an HTML page, checked once.
 
     Returns:
-      dict Request's HTTP headers and SOAP data.
+      bool True if the incoming SOAP dump is HTML, False otherwise.
+    """
+    self.__Segment()
+    if self.__is_html is None:
+      self.__is_html = Utils.IsHtml(self.__raw_dump.get('dumpSoapIn', ''))
+    return self.__is_html
+
+  def __ResetParsed(self):
+    """Drop everything computed from the dumps."""
+    self.__xml = {}
+    self.__soap_out = None
+    self.__is_html = None
+    self.__response_header = None
+
+  def __Segment(self):
+    """Split the buffer into HTTP header and SOAP dumps.
+
+    The buffer is only split again after it has been written to.
     """
+    if self.__segmented:
+      return
+    self.__segment_lock.acquire()
+    try:
+      if not self.__segmented:
+        self.__SplitDumps()
+    finally:
+      self.__segment_lock.release()
+
+  def __SplitDumps(self):
+    """Split the buffer into its dumps and drop what was parsed from them."""
     tags = (('Outgoing HTTP headers', 'dumpHeadersOut'),
             ('Outgoing SOAP', 'dumpSoapOut'),
             ('Incoming HTTP headers', 'dumpHeadersIn'),
@@ -199,29 +253,24 @@ class SoapBuffer(Buffer):
     xml_dumps = self.GetBufferAsStr().split('\n' + ('*' * 72) + '\n')
     for xml_part in xml_dumps:
       xml_part = xml_part.lstrip('\n').rstrip('\n')
+      # Only the banner names the dump, there is no need to search the body.
+      banner = xml_part.split('\n', 1)[0]
       for name, tag in tags:
-        if xml_part.find(name) > -1:
-          # Insert XML parser signature into the SOAP header.
-          trigger = xml_part[xml_part.lower().find('content-type'):
-                             xml_part.lower().find('content-type')+12]
-          if trigger and tag == 'dumpHeadersOut':
-            xml_part = xml_part.replace(
-                trigger,
-                'XML-parser: %s\n%s' % (self.__xml_parser_sig, trigger))
-          if self.__pretty_xml:
-            doc = []
-            banner = ''
-            for line in xml_part.split('\n'):
-              if line.rfind('SOAP %s' % ('*' * 46)) > -1:
-                banner = line
-                continue
-              doc.append(line)
-            if banner:
-              xml_part = '%s\n%s' % (banner,
-                                     self.__PrettyPrintXml('\n'.join(doc), 1))
-          self.__dump[tag] = (xml_part + '\n' + '*' * 72)
+        if banner.find(name) > -1:
+          if tag == 'dumpHeadersOut':
+            # Insert XML parser signature into the SOAP header.
+            trigger = xml_part[xml_part.lower().find('content-type'):
+                               xml_part.lower().find('content-type')+12]
+            if trigger:
+              xml_part = xml_part.replace(
+                  trigger,
+                  'XML-parser: %s\n%s' % (self.__xml_parser_sig, trigger))
+          self.__raw_dump[tag] = xml_part
+          if tag in self.__dump:
+            del self.__dump[tag]
           break
-    return self.__dump
+    self.__ResetParsed()
+    self.__segmented = True
 
   def __GetDumpValue(self, dump_type):
     """Return dump value given its type.
@@ -232,14 +281,25 @@ class SoapBuffer(Buffer):
     Returns:
       str Value of the dump.
     """
-    dump_value = None
-    try:
-      if dump_type in self.__dump:
-        dump_value = self.__dump[dump_type]
-      else:
-        dump_value = self.__GetBufferAsDict()[dump_type]
-    except KeyError:
-      dump_value = ''
+    self.__Segment()
+    if dump_type in self.__dump:
+      return self.__dump[dump_type]
+    if dump_type not in self.__raw_dump:
+      return ''
+    xml_part = self.__raw_dump[dump_type]
+    if self.__pretty_xml:
+      doc = []
+      banner = ''
+      for line in xml_part.split('\n'):
+        if line.rfind('SOAP %s' % ('*' * 46)) > -1:
+          banner = line
+          continue
+        doc.append(line)
+      if banner:
+        xml_part = '%s\n%s' % (banner,
+                               self.__PrettyPrintXml('\n'.join(doc), 1))
+    dump_value = xml_part + '\n' + '*' * 72
+    self.__dump[dump_type] = dump_value
     return dump_value
 
   def GetHeadersOut(self):
@@ -257,12 +317,15 @@ class SoapBuffer(Buffer):
       str Outgoing SOAP dump.
     """
     dump_value = self.__GetDumpValue('dumpSoapOut')
+    if self.__soap_out is not None:
+      return self.__soap_out
 
     # Mask out sensitive data, if present.
     dump_value = dump_value.replace('><', '>\n<')
     for mask in ['password', 'Password', 'authToken', 'ns1:authToken']:
       pattern = re.compile('>.*?</%s>' % mask)
       dump_value = pattern.sub('>xxxxxx</%s>' % mask, dump_value)
+    self.__soap_out = dump_value
     return dump_value
 
   def GetHeadersIn(self):
@@ -296,34 +359,7 @@ class SoapBuffer(Buffer):
     Returns:
       Document/Element object generated from string, representing XML message.
     """
-    # Remove banners.
-    xml_dump = self.GetSoapOut().lstrip('\n').rstrip('\n')
-    xml_parts = xml_dump.split('\n')
-
-    # While multiple threads are used, SoapBuffer gets too greedy and tries to
-    # capture all traffic that goes to sys.stdout. The parts that we don't need
-    # should be redirected back to sys.stdout.
-    banner = '%s Outgoing SOAP %s' % ('*' * 3, '*' * 54)
-    begin = 1
-    for index in range(len(xml_parts)):
-      if xml_parts[index] == banner:
-        begin = index + 1
-        break
-    non_xml = '\n'.join(xml_parts[:begin-1])
-    # Send data we don't need back to sys.stdout.
-    if non_xml: print non_xml
-
-    xml_dump = '\n'.join(xml_parts[begin:len(xml_parts)-1])
-
-    try:
-      if self.__xml_parser == PYXML:
-        xml_obj = minidom.parseString(xml_dump)
-      elif self.__xml_parser == ETREE:
-        xml_obj = etree.fromstring(xml_dump)
-    except (ExpatError, SyntaxError), e:
-      msg = 'Unable to parse SOAP buffer for outgoing messages. %s' % e
-      raise MalformedBufferError(msg)
-    return xml_obj
+    return self.__GetXml('dumpSoapOut', 'outgoing')
 
   def _GetXmlIn(self):
     """Remove banners from incoming SOAP XML and construct XML object.
@@ -331,20 +367,85 @@ class SoapBuffer(Buffer):
     Returns:
       Document/Element object generated from string, representing XML message.
     """
-    # Remove banners.
-    xml_dump = self.GetSoapIn().lstrip('\n').rstrip('\n')
-    xml_parts = xml_dump.split('\n')
-    xml_dump = '\n'.join(xml_parts[1:len(xml_parts)-1])
+    return self.__GetXml('dumpSoapIn', 'incoming')
 
-    try:
+  def __GetXml(self, dump_type, direction):
+    """Construct XML object from a SOAP dump, parsing it at most once.
+
+    The object is built from the dump as it was captured, before any
+    prettifying or masking.
+
+    Args:
+      dump_type: str Type of the dump.
+      direction: str Direction of the messages, for use in error messages.
+
+    Returns:
+      Document/Element object generated from string, representing XML message.
+
+    Raises:
+      MalformedBufferError: if the dump is not well formed XML.
+    """
+    self.__Segment()
+    if dump_type not in self.__xml:
+      # Remove banner.
+      xml_dump = self.__raw_dump.get(dump_type, '')
+      xml_dump = xml_dump[xml_dump.find('\n') + 1:]
+      try:
+        if self.__xml_parser == PYXML:
+          self.__xml[dump_type] = minidom.parseString(xml_dump)
+        elif self.__xml_parser == ETREE:
+          self.__xml[dump_type] = etree.fromstring(xml_dump)
+      except (ExpatError, SyntaxError), e:
+        msg = ('Unable to parse SOAP buffer for %s messages. %s'
+               % (direction, e))
+        self.__xml[dump_type] = MalformedBufferError(msg)
+    if isinstance(self.__xml[dump_type], MalformedBufferError):
+      raise self.__xml[dump_type]
+    return self.__xml[dump_type]
+
+  def _GetResponseHeader(self):
+    """Return the fields of the incoming ResponseHeader.
+
+    All fields are read in a single walk of the SOAP header, which is done at
+    most once per response.
+
+    Returns:
+      dict Text of each ResponseHeader field, keyed by its name without
+      namespace. Empty if the response has no ResponseHeader.
+    """
+    if self.__response_header is None:
+      fields = {}
+      xml_obj = self._GetXmlIn()
       if self.__xml_parser == PYXML:
-        xml_obj = minidom.parseString(xml_dump)
-      elif self.__xml_parser == ETREE:
-        xml_obj = etree.fromstring(xml_dump)
-    except (ExpatError, SyntaxError), e:
-      msg = 'Unable to parse SOAP buffer for incoming messages. %s' % e
-      raise MalformedBufferError(msg)
-    return xml_obj
+        xml_obj = xml_obj.documentElement
+      for header in self.__GetElementsByName(xml_obj, 'Header'):
+        for response_header in self.__GetElementsByName(header,
+                                                        'ResponseHeader'):
+          for field in self._GetChildren(response_header):
+            name = self._GetTagName(field)
+            if not name:
+              continue
+            name = self.__RemoveElemAttr(name)
+            if self.__xml_parser == PYXML and not field.hasChildNodes():
+              fields[name] = None
+            else:
+              fields[name] = self._GetText(field)
+      self.__response_header = fields
+    return self.__response_header
+
+  def __GetElementsByName(self, node, name):
+    """Return child elements of a node with a given name, ignoring namespace.
+
+    Args:
+      node: Element Parent XML node.
+      name: str Name of the child elements without namespace.
+
+    Returns:
+      list Matching child elements.
+    """
+    return [child for child in self._GetChildren(node)
+            if self._GetTagName(child) and
+            self.__RemoveElemAttr(self._GetTagName(child)) == name]
 
   def __RemoveElemAttr(self, elem):
     """Remove element's attribute, if any.
@@ -605,23 +706,35 @@ class SoapBuffer(Buffer):
       if req:
         # Rebuild original formatting of the string and dump it.
         req = req[0].replace('%newline%', '\n')
-        self.__dump['dumpSoapOut'] = (
+        self.__InjectDump('dumpSoapOut', (
             '%s Outgoing SOAP %s\n'
-            '<?xml version="1.0" encoding="UTF-8"?>\n%s\n'
-            '%s' % ('*' * 3, '*' * 54, req, '*' * 72))
+            '<?xml version="1.0" encoding="UTF-8"?>\n%s'
+            % ('*' * 3, '*' * 54, req)))
 
       # Do we have a SOAP XML response?
       if res:
         # Rebuild original formatting of the string and dump it.
         res = res[0].replace('%newline%', '\n')
-        self.__dump['dumpSoapIn'] = (
+        self.__InjectDump('dumpSoapIn', (
             '%s Incoming SOAP %s\n'
-            '<?xml version="1.0" encoding="UTF-8"?>\n%s\n'
-            '%s' % ('*' * 3, '*' * 54, res.lstrip('\n'), '*' * 72))
+            '<?xml version="1.0" encoding="UTF-8"?>\n%s'
+            % ('*' * 3, '*' * 54, res.lstrip('\n'))))
     except Exception:
       msg = 'Invalid input, expecting SOAP XML request, response, or both.'
       raise InvalidInputError(msg)
 
+  def __InjectDump(self, dump_type, xml_part):
+    """Replace a dump, leaving it unformatted.
+
+    Args:
+      dump_type: str Type of the dump.
+      xml_part: str Banner and body of the dump.
+    """
+    self.__Segment()
+    self.__raw_dump[dump_type] = xml_part
+    self.__dump[dump_type] = xml_part + '\n' + '*' * 72
+    self.__ResetParsed()
+
   def __Indent(self, elem, level=0):
     """Add whitespace to the tree, to get its pretty-printed version.
 
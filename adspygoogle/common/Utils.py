@@ -36,6 +36,11 @@ from adspygoogle.common.Errors import Error
 
 _BASE_SOAP_TYPES = ['long', 'string', 'dateTime', 'float', 'int', 'boolean',
                     'base64Binary', 'double']
+# Opening tag every HTML page passed to IsHtml() has.
+_HTML_TAG_PATTERN = re.compile('<html', re.I)
+# Characters HtmlEscape() replaces, in the order they are replaced.
+_HTML_ESCAPE_TABLE = (('&', '&amp;'), ('"', '&quot;'), ('\'', '&apos;'),
+                      ('>', '&gt;'), ('<', '&lt;'))
 
 
 def ReadFile(f_path):
@@ -185,6 +190,9 @@ def IsHtml(data):
   Returns:
     bool True if data is HTML, False otherwise.
   """
+  # Most data is not HTML, so rule it out before copying all of it.
+  if not _HTML_TAG_PATTERN.search(data):
+    return False
   # Remove banners and XML header. Convert to lower case for easy search.
   data = ''.join(data.split('\n')).lower()
   pattern = re.compile('<html>.*?<body.*?>.*?</body>.*?</html>')
@@ -423,19 +431,12 @@ def LastStackTrace():
   Returns:
     str Last stack traceback.
   """
-  # Temporarily redirect traceback from STDOUT into a buffer.
   trace_buf = Buffer()
-  old_stdout = sys.stdout
-  sys.stdout = trace_buf
-
   try:
-    traceback.print_exc(file=sys.stdout)
+    traceback.print_exc(file=trace_buf)
   except AttributeError:
     # No exception for traceback exist.
-    print ''
-
-  # Restore STDOUT.
-  sys.stdout = old_stdout
+    pass
   return trace_buf.GetBufferAsStr().strip()
 
 
@@ -484,14 +485,10 @@ def HtmlEscape(text):
   Returns:
     str HTML escaped string.
   """
-  html_escape_table = {
-      '&': '&amp;',
-      '"': '&quot;',
-      '\'': '&apos;',
-      '>': '&gt;',
-      '<': '&lt;'
-  }
-  return ''.join(html_escape_table.get(char, char) for char in text)
+  # Ampersands go first, so the other entities are not escaped again.
+  for char, entity in _HTML_ESCAPE_TABLE:
+    text = text.replace(char, entity)
+  return text
 
 
 def CsvEscape(text):
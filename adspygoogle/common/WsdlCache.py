@@ -0,0 +1,310 @@
+#!/usr/bin/python
+#
+# Copyright 2013 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Persistent on-disk cache of service WSDLs.
+
+Entries are keyed by a digest of the server, version, group and service name
+that the WSDL was requested for, so a cache directory can be safely shared by
+any number of clients, products and processes.
+"""
+
+__author__ = 'agent@local (agent)'
+
+import os
+import tempfile
+import time
+import urllib
+
+try:
+  from hashlib import sha1 as _NewDigest
+except ImportError:
+  from sha import new as _NewDigest
+
+from adspygoogle.common.Errors import Error
+
+
+# File extension used for every entry in the cache directory.
+WSDL_FILE_EXTENSION = '.wsdl'
+
+
+class WsdlCache(object):
+
+  """Stores and retrieves service WSDLs from a local directory.
+
+  Entries older than the configured time-to-live are treated as missing. A TTL
+  of None or 0 means cached WSDLs never expire and must be invalidated
+  explicitly.
+  """
+
+  def __init__(self, cache_dir, ttl=None):
+    """Inits WsdlCache.
+
+    Args:
+      cache_dir: str Path to the directory holding cached WSDLs. It is created
+                 if it does not exist yet.
+      [optional]
+      ttl: int Number of seconds a cached WSDL stays valid for.
+    """
+    self.__cache_dir = os.path.abspath(os.path.expanduser(cache_dir))
+    if ttl:
+      self.__ttl = int(ttl)
+    else:
+      self.__ttl = None
+    if not os.path.isdir(self.__cache_dir):
+      try:
+        os.makedirs(self.__cache_dir)
+      except OSError:
+        # Another process may have created it in the meantime.
+        if not os.path.isdir(self.__cache_dir):
+          raise Error('Unable to create WSDL cache directory \'%s\'.'
+                      % self.__cache_dir)
+
+  def GetCacheDir(self):
+    """Return the directory this cache stores its entries in.
+
+    Returns:
+      str Absolute path to the cache directory.
+    """
+    return self.__cache_dir
+
+  def GetKey(self, server, version, group, service_name):
+    """Return the cache key for a given service.
+
+    Args:
+      server: str Base URL of the API server.
+      version: str API version the WSDL belongs to.
+      group: str API group the service belongs to, None if not applicable.
+      service_name: str Name of the service.
+
+    Returns:
+      str Hex digest uniquely identifying the service's WSDL.
+    """
+    return GetServiceKey(server, version, group, service_name)
+
+  def GetPath(self, server, version, group, service_name):
+    """Return the path of the cache entry for a given service.
+
+    The entry at this path may or may not exist.
+
+    Args:
+      server: str Base URL of the API server.
+      version: str API version the WSDL belongs to.
+      group: str API group the service belongs to, None if not applicable.
+      service_name: str Name of the service.
+
+    Returns:
+      str Absolute path to the cache entry.
+    """
+    return os.path.join(
+        self.__cache_dir,
+        self.GetKey(server, version, group, service_name) + WSDL_FILE_EXTENSION)
+
+  def Get(self, server, version, group, service_name):
+    """Return the path of a valid cached WSDL for a given service.
+
+    Args:
+      server: str Base URL of the API server.
+      version: str API version the WSDL belongs to.
+      group: str API group the service belongs to, None if not applicable.
+      service_name: str Name of the service.
+
+    Returns:
+      str Absolute path to the cached WSDL, None if it is missing or expired.
+    """
+    path = self.GetPath(server, version, group, service_name)
+    try:
+      modified = os.path.getmtime(path)
+    except OSError:
+      return None
+    if self.__ttl and time.time() - modified > self.__ttl:
+      return None
+    return path
+
+  def Put(self, server, version, group, service_name, wsdl_xml):
+    """Store a WSDL for a given service.
+
+    The entry is written to a temporary file first and then renamed into
+    place, so concurrent readers never observe a partially written WSDL.
+
+    Args:
+      server: str Base URL of the API server.
+      version: str API version the WSDL belongs to.
+      group: str API group the service belongs to, None if not applicable.
+      service_name: str Name of the service.
+      wsdl_xml: str Contents of the WSDL.
+
+    Returns:
+      str Absolute path to the newly cached WSDL.
+    """
+    path = self.GetPath(server, version, group, service_name)
+    fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=self.__cache_dir)
+    try:
+      fh = os.fdopen(fd, 'wb')
+      try:
+        fh.write(wsdl_xml)
+      finally:
+        fh.close()
+      try:
+        os.rename(tmp_path, path)
+      except OSError:
+        # Windows does not allow renaming over an existing file.
+        if os.path.exists(path):
+          os.remove(path)
+        os.rename(tmp_path, path)
+    finally:
+      if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    return path
+
+  def Fetch(self, wsdl_url, server, version, group, service_name):
+    """Download a service's WSDL and store it in the cache.
+
+    Args:
+      wsdl_url: str URL to download the WSDL from.
+      server: str Base URL of the API server.
+      version: str API version the WSDL belongs to.
+      group: str API group the service belongs to, None if not applicable.
+      service_name: str Name of the service.
+
+    Returns:
+      str Absolute path to the newly cached WSDL.
+
+    Raises:
+      Error: if the WSDL could not be downloaded.
+    """
+    try:
+      stream = urllib.urlopen(wsdl_url)
+      try:
+        wsdl_xml = stream.read()
+      finally:
+        stream.close()
+    except IOError, e:
+      raise Error('Unable to download WSDL from \'%s\': %s' % (wsdl_url, e))
+    return self.Put(server, version, group, service_name, wsdl_xml)
+
+  def Seed(self, server, version, group, service_name, wsdl_path):
+    """Pre-seed the cache with a WSDL stored in a local file.
+
+    Args:
+      server: str Base URL of the API server.
+      version: str API version the WSDL belongs to.
+      group: str API group the service belongs to, None if not applicable.
+      service_name: str Name of the service.
+      wsdl_path: str Path to the file containing the WSDL.
+
+    Returns:
+      str Absolute path to the newly cached WSDL.
+    """
+    fh = open(wsdl_path, 'rb')
+    try:
+      wsdl_xml = fh.read()
+    finally:
+      fh.close()
+    return self.Put(server, version, group, service_name, wsdl_xml)
+
+  def SeedFromDirectory(self, directory, server, version, group=None):
+    """Pre-seed the cache with every WSDL found in a local directory.
+
+    Each file is expected to be named after the service it describes, e.g.
+    CampaignService.wsdl.
+
+    Args:
+      directory: str Path to the directory containing the WSDL files.
+      server: str Base URL of the API server.
+      version: str API version the WSDLs belong to.
+      [optional]
+      group: str API group the services belong to.
+
+    Returns:
+      list Names of the services that were seeded.
+    """
+    seeded = []
+    for filename in sorted(os.listdir(directory)):
+      service_name, extension = os.path.splitext(filename)
+      if extension != WSDL_FILE_EXTENSION:
+        continue
+      self.Seed(server, version, group, service_name,
+                os.path.join(directory, filename))
+      seeded.append(service_name)
+    return seeded
+
+  def Invalidate(self, server, version, group, service_name):
+    """Remove the cached WSDL for a given service, if there is one.
+
+    Args:
+      server: str Base URL of the API server.
+      version: str API version the WSDL belongs to.
+      group: str API group the service belongs to, None if not applicable.
+      service_name: str Name of the service.
+
+    Returns:
+      bool True if an entry was removed, False otherwise.
+    """
+    try:
+      os.remove(self.GetPath(server, version, group, service_name))
+    except OSError:
+      return False
+    return True
+
+  def Clear(self):
+    """Remove every cached WSDL from the cache directory.
+
+    Returns:
+      int Number of entries removed.
+    """
+    removed = 0
+    for filename in os.listdir(self.__cache_dir):
+      if not filename.endswith(WSDL_FILE_EXTENSION):
+        continue
+      try:
+        os.remove(os.path.join(self.__cache_dir, filename))
+        removed += 1
+      except OSError:
+        pass
+    return removed
+
+
+def GetServiceKey(server, version, group, service_name):
+  """Return a digest uniquely identifying a service's schema.
+
+  Args:
+    server: str Base URL of the API server.
+    version: str API version the service belongs to.
+    group: str API group the service belongs to, None if not applicable.
+    service_name: str Name of the service.
+
+  Returns:
+    str Hex digest of the given values.
+  """
+  digest = _NewDigest()
+  for part in (server, version, group, service_name):
+    digest.update('%s\0' % (part or ''))
+  return digest.hexdigest()
+
+
+def GetWsdlCacheFromConfig(config):
+  """Return the WSDL cache described by a client configuration, if any.
+
+  Args:
+    config: dict Dictionary object with populated configuration values.
+
+  Returns:
+    WsdlCache The cache to use, None if WSDL caching is disabled.
+  """
+  cache_dir = config.get('wsdl_cache_dir')
+  if not cache_dir:
+    return None
+  return WsdlCache(cache_dir, config.get('wsdl_cache_ttl'))
@@ -55,6 +55,25 @@ def GetCurrentCertsFile():
   return _ca_certs_file
 
 
+def CreateHttpsConnection(host, port=None, key_file=None, cert_file=None):
+  """Creates an HTTPS connection which honors the trusted certificates file.
+
+  Args:
+    host: string The host to connect to, optionally followed by ':port'.
+    [optional]
+    port: int The port to connect to.
+    key_file: string Path to a PEM file with the client's private key.
+    cert_file: string Path to a PEM file with the client's certificate chain.
+
+  Returns:
+    httplib.HTTPSConnection A connection which validates the server's SSL
+    certificate if a trusted certificates file is set.
+  """
+  if _ca_certs_file is None:
+    return httplib.HTTPSConnection(host, port, key_file, cert_file)
+  return _SslAwareHttpsConnection(host, port, key_file, cert_file)
+
+
 class _SslAwareHttps(httplib.HTTPS):
   """Overridden HTTPS class which can handle SSL certificate verification."""
 
@@ -0,0 +1,180 @@
+#!/usr/bin/python
+#
+# Copyright 2013 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""SOAPpy HTTP transport which captures messages into a per-thread buffer.
+
+SOAPpy dumps the HTTP headers and SOAP XML of every message through
+HTTPTransport.dump. CapturingHTTPTransport writes those dumps into the buffer
+the calling thread registered with SetCaptureBuffer, so concurrent calls on
+different threads each see only their own messages and nothing else written to
+sys.stdout.
+
+The transport also keeps the HTTP state SOAPpy changes on every request, its
+additional headers and cookies, separately for each thread. Threads can
+therefore make calls through the same transport at the same time. When given a
+ConnectionPool, it sends requests over pooled keep-alive connections.
+"""
+
+__author__ = 'agent@local (agent)'
+
+import Cookie
+import threading
+
+from adspygoogle.common import CallStats
+from adspygoogle.SOAPpy.Client import HTTPTransport
+from adspygoogle.SOAPpy.Config import Config
+
+
+# Width of the banners framing each dump, matching SOAPpy's debug output.
+_BANNER_WIDTH = 72
+
+_capture = threading.local()
+
+
+def SetCaptureBuffer(buf):
+  """Sets the buffer that receives the current thread's message dumps.
+
+  Args:
+    buf: Buffer The buffer to write dumps into, or None to stop capturing.
+
+  Returns:
+    Buffer The buffer previously set for the current thread, or None. Pass it
+    back in once done, so nested calls restore their caller's buffer.
+  """
+  previous = getattr(_capture, 'buffer', None)
+  _capture.buffer = buf
+  return previous
+
+
+def GetCaptureBuffer():
+  """Returns the buffer that receives the current thread's message dumps.
+
+  Returns:
+    Buffer The current thread's buffer, or None if it is not capturing.
+  """
+  return getattr(_capture, 'buffer', None)
+
+
+class CapturingHTTPTransport(HTTPTransport, object):
+
+  """HTTPTransport which hands message dumps to the calling thread's buffer.
+
+  Threads which have not set a capture buffer get SOAPpy's default behavior of
+  writing dumps to sys.stdout.
+
+  Attributes:
+    connection_pool: ConnectionPool Pool of keep-alive connections to send
+                     requests over, None to open a new connection for every
+                     request.
+  """
+
+  connection_pool = None
+
+  def __init__(self, additional_headers=None):
+    """Inits CapturingHTTPTransport.
+
+    Args:
+      [optional]
+      additional_headers: dict HTTP headers to send with every request. Each
+                          thread starts out with its own copy.
+    """
+    self.__local = threading.local()
+    self.__default_headers = dict(additional_headers or {})
+    HTTPTransport.__init__(self, additional_headers)
+
+  def __GetState(self):
+    """Returns the calling thread's HTTP state, creating it on first use."""
+    state = self.__local
+    if not hasattr(state, 'additional_headers'):
+      state.additional_headers = dict(self.__default_headers)
+      state.cookies = Cookie.SimpleCookie()
+    return state
+
+  def __GetAdditionalHeaders(self):
+    return self.__GetState().additional_headers
+
+  def __SetAdditionalHeaders(self, additional_headers):
+    self.__GetState().additional_headers = additional_headers
+
+  def __GetCookies(self):
+    return self.__GetState().cookies
+
+  def __SetCookies(self, cookies):
+    self.__GetState().cookies = cookies
+
+  additional_headers = property(
+      __GetAdditionalHeaders, __SetAdditionalHeaders,
+      doc='HTTP headers sent with the calling thread\'s requests.')
+  cookies = property(__GetCookies, __SetCookies,
+                     doc='Cookies received by the calling thread\'s requests.')
+
+  def dump(self, title, text):
+    """Writes a dump of an HTTP or SOAP message, framed by banners.
+
+    Args:
+      title: str Title of the dump, such as 'Outgoing SOAP'.
+      text: str The HTTP headers or SOAP XML of the message.
+    """
+    buf = GetCaptureBuffer()
+    if buf is None:
+      HTTPTransport.dump(self, title, text)
+      return
+    banner = '*** %s ' % title
+    if text and not text.endswith('\n'):
+      text += '\n'
+    buf.write('%s%s\n%s%s\n' % (banner,
+                                '*' * (_BANNER_WIDTH - len(banner)), text,
+                                '*' * _BANNER_WIDTH))
+
+  def call(self, *args, **kw):
+    """Sends a request and returns its response, as HTTPTransport.call does.
+
+    The time until the request is handed over is marked as the serialization
+    phase of the calling thread's call, and the time taken by the round trip
+    as its network phase.
+
+    Returns:
+      tuple The response data and its namespace.
+    """
+    timer = CallStats.GetCallTimer()
+    timer.Mark(CallStats.SERIALIZATION)
+    try:
+      return HTTPTransport.call(self, *args, **kw)
+    finally:
+      timer.Mark(CallStats.NETWORK)
+
+  def connect(self, addr, http_proxy=None, config=Config, timeout=None):
+    """Returns the connection a request is sent through.
+
+    Args:
+      addr: SOAPpy.Client.SOAPAddress Address the request is sent to.
+      [optional]
+      http_proxy: str Address of the HTTP proxy to send the request through.
+      config: SOAPpy.Config.SOAPConfig SOAPpy configuration of the request.
+      timeout: float Socket timeout, in seconds.
+
+    Returns:
+      mixed A connection with the interface of httplib.HTTP. Pooled
+      connections are used for HTTP and HTTPS requests which do not present a
+      client certificate.
+    """
+    if (self.connection_pool is None or
+        addr.proto not in ('http', 'https') or
+        (addr.proto == 'https' and
+         (config.SSL.key_file or config.SSL.cert_file))):
+      return HTTPTransport.connect(self, addr, http_proxy, config, timeout)
+    return self.connection_pool.Acquire(addr.proto, addr.host, http_proxy,
+                                        timeout)
@@ -0,0 +1,450 @@
+#!/usr/bin/python
+#
+# Copyright 2013 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Packs request arguments by writing their complex types straight to XML.
+
+MessageHandler.PackForSoappy turns every nested dictionary into a SOAPpy
+structType, looking each field up in the WSDL and working out the order of the
+fields with dir() on the struct, before SOAPpy walks the whole structure again
+to write it out. PackForSoappy in this module writes the XML SOAPpy would have
+written for a dictionary directly, using a serializer compiled once for every
+complex type of a service: the type's fields in schema order, with their
+element tags, types and xsi:type attribute worked out in advance. The result
+is handed to SOAPpy as a single pre-serialized value, which also declares the
+envelope namespaces SOAPpy would have declared while writing it, so requests
+stay byte-for-byte the same.
+
+Values SOAPpy would write in a way the serializers do not reproduce, such as
+None list items, lists mixing dictionaries and strings, numbers and SOAPpy
+objects, are packed by MessageHandler.PackForSoappy as before. So are all
+values of services whose SOAPpy config writes type information.
+"""
+
+__author__ = 'agent@local (agent)'
+
+import cgi
+import re
+
+from adspygoogle import SOAPpy
+from adspygoogle.common import MessageHandler
+from adspygoogle.common import Utils
+from adspygoogle.common.soappy.TypeIndex import GetTypeIndex
+from adspygoogle.SOAPpy.wstools.XMLname import toXMLname
+
+
+# Name of the attribute a service's serializers are stored in.
+_SERIALIZERS_ATTRIBUTE = '_adspygoogle_request_serializers'
+# Element name of the items of wrapped lists.
+_ITEM_TAG = 'item'
+# Kinds of values, as far as how SOAPpy writes lists of them is concerned.
+_STRUCT, _LIST, _STRING = range(3)
+# Characters Utils.HtmlEscape replaces.
+_ESCAPED_CHARS = re.compile('[&"\'<>]')
+
+
+class _UnsupportedValue(Exception):
+
+  """Raised for values which need MessageHandler.PackForSoappy."""
+
+
+class _SerializedElement(SOAPpy.Types.untypedType):
+
+  """The already written content of an element, for SOAPpy to write out."""
+
+  def __init__(self, data, namespaces, attrs=None):
+    """Inits _SerializedElement.
+
+    Args:
+      data: unicode The XML content of the element.
+      namespaces: list The envelope namespaces SOAPpy would have declared while
+                  writing the content, in order.
+      [optional]
+      attrs: dict The attributes of the element.
+    """
+    SOAPpy.Types.untypedType.__init__(self, data, attrs=attrs)
+    self._namespaces = namespaces
+
+  def _marshalAttrs(self, ns_map, builder):
+    """Writes the element's attributes and declares its namespaces."""
+    attributes = SOAPpy.Types.untypedType._marshalAttrs(self, ns_map, builder)
+    for namespace in self._namespaces:
+      builder.genns(ns_map, namespace)
+    return attributes
+
+
+def PackForSoappy(obj, xmlns, type_name, soappy_service, wrap_lists,
+                  prefix_function):
+  """Packs a given object for SOAPpy transport, serializing complex types.
+
+  Args:
+    obj: mixed The python object to pack for SOAPpy transport. May be a string,
+         list, or dictionary depending on what it represents.
+    xmlns: string The namespace that the given object's type belongs to.
+    type_name: string The name of the SOAP type this object represents.
+    soappy_service: SOAPpy.WSDL.Proxy The SOAPpy service object encapsulating
+                    this service/WSDL.
+    wrap_lists: boolean Whether or not to wrap lists in an additional layer.
+    prefix_function: callable Takes in an xml namespace and returns the prefix
+                     to use to represent it.
+
+  Returns:
+    mixed The given object ready for SOAPpy transport, which SOAPpy writes out
+    exactly as it would the result of MessageHandler.PackForSoappy. Depending on
+    the input, this will be either a list or a SOAPpy.Types.untypedType, or
+    whatever MessageHandler.PackForSoappy returns for it.
+  """
+  try:
+    return _GetSerializer(soappy_service, wrap_lists, prefix_function).Pack(
+        obj, xmlns, type_name)
+  except _UnsupportedValue:
+    return MessageHandler.PackForSoappy(obj, xmlns, type_name, soappy_service,
+                                        wrap_lists, prefix_function)
+
+
+def _Escape(text):
+  """Escapes a string the way Utils.HtmlEscape does, decoding it to unicode."""
+  if _ESCAPED_CHARS.search(text):
+    text = Utils.HtmlEscape(text)
+  if isinstance(text, str):
+    return text.decode('utf-8')
+  return text
+
+
+def _GetSerializer(soappy_service, wrap_lists, prefix_function):
+  """Returns a service's _Serializer, creating it on first use.
+
+  Args:
+    soappy_service: SOAPpy.WSDL.Proxy The SOAPpy service object encapsulating
+                    this service/WSDL.
+    wrap_lists: boolean Whether or not to wrap lists in an additional layer.
+    prefix_function: callable Takes in an xml namespace and returns the prefix
+                     to use to represent it.
+
+  Returns:
+    _Serializer The serializer for the given service and settings.
+  """
+  # Read through __dict__, as WSDL.Proxy resolves unknown attributes to SOAP
+  # methods.
+  serializers = soappy_service.__dict__.get(_SERIALIZERS_ATTRIBUTE)
+  if serializers is None:
+    serializers = {}
+    setattr(soappy_service, _SERIALIZERS_ATTRIBUTE, serializers)
+  key = (bool(wrap_lists), prefix_function)
+  serializer = serializers.get(key)
+  if serializer is None:
+    serializer = _Serializer(soappy_service, wrap_lists, prefix_function)
+    serializers[key] = serializer
+  return serializer
+
+
+class _StructSerializer(object):
+
+  """Everything needed to write the fields of one complex type.
+
+  Attributes:
+    type_name: string The name of the complex type.
+    ns: string The namespace the complex type belongs to.
+    type_attribute: string The xsi:type value of the type's elements.
+    attribute: string The xsi:type attribute of the type's elements, as written
+               in their start tag.
+    has_type_field: bool Whether the type has a field named 'type'.
+  """
+
+  def __init__(self, type_index, type_name, ns, prefix_function):
+    """Inits _StructSerializer.
+
+    Args:
+      type_index: TypeIndex The index of the service's types.
+      type_name: string The name of the complex type.
+      ns: string The namespace the complex type belongs to.
+      prefix_function: callable Takes in an xml namespace and returns the prefix
+                       to use to represent it.
+    """
+    self.type_name = type_name
+    self.ns = ns
+    self.type_attribute = prefix_function(ns) + type_name
+    self.attribute = ' %s:type="%s"' % (
+        SOAPpy.NS.XSI3_T, cgi.escape(str(self.type_attribute), 1))
+    self.has_type_field = type_index.HasField('type', type_name, ns)
+    self.__type_index = type_index
+    self.__prefix_function = prefix_function
+    self.__fields = {}
+    self.__positions = {}
+    self.__repeated = {}
+    for position, name in enumerate(
+        type_index.GetIndexedType(type_name, ns).key_names):
+      if name in self.__positions:
+        self.__repeated[name] = True
+      else:
+        self.__positions[name] = position
+
+  def GetField(self, name):
+    """Returns how to write a field of the type.
+
+    Args:
+      name: string The name of the field.
+
+    Returns:
+      tuple The field's position in the type's key order, its element tag, and
+      the namespace and name of its type.
+
+    Raises:
+      TypeError: if the type has no such field.
+      _UnsupportedValue: if the field is defined more than once.
+    """
+    try:
+      return self.__fields[name]
+    except KeyError:
+      pass
+    field = self.__type_index.GetField(name, self.type_name, self.ns)
+    if name in self.__repeated:
+      raise _UnsupportedValue(name)
+    spec = (self.__positions[name],
+            toXMLname(self.__prefix_function(field.namespace) + name),
+            field.type.getTargetNamespace(), field.type.getName())
+    self.__fields[name] = spec
+    return spec
+
+
+class _Serializer(object):
+
+  """Writes request arguments of one service as SOAPpy would."""
+
+  def __init__(self, soappy_service, wrap_lists, prefix_function):
+    """Inits _Serializer.
+
+    Args:
+      soappy_service: SOAPpy.WSDL.Proxy The SOAPpy service object encapsulating
+                      this service/WSDL.
+      wrap_lists: boolean Whether or not to wrap lists in an additional layer.
+      prefix_function: callable Takes in an xml namespace and returns the prefix
+                       to use to represent it.
+    """
+    config = soappy_service.soapproxy.config
+    self.__typed = config.typed
+    # Namespaces SOAPpy declares in the envelope when it writes lists, and
+    # when it writes lists of lists.
+    self.__list_namespaces = [SOAPpy.NS.ENC, config.schemaNamespaceURI]
+    self.__nested_list_namespaces = (
+        [config.typesNamespaceURI] + self.__list_namespaces)
+    self.__type_index = GetTypeIndex(soappy_service)
+    self.__wrap_lists = wrap_lists
+    self.__prefix_function = prefix_function
+    self.__structs = {}
+    self.__item_types = {}
+
+  def Pack(self, obj, xmlns, type_name):
+    """Packs a request argument.
+
+    Args:
+      obj: mixed The python object to pack for SOAPpy transport.
+      xmlns: string The namespace that the given object's type belongs to.
+      type_name: string The name of the SOAP type this object represents.
+
+    Returns:
+      mixed A list or a SOAPpy.Types.untypedType.
+
+    Raises:
+      _UnsupportedValue: if the object needs MessageHandler.PackForSoappy.
+    """
+    if self.__typed:
+      raise _UnsupportedValue(obj)
+    if isinstance(obj, dict):
+      struct, type_key = self.__GetStruct(obj, xmlns, type_name)
+      out = ['\n']
+      namespaces = [SOAPpy.NS.XSI3]
+      self.__WriteFields(out, namespaces, struct, obj, type_key)
+      return _SerializedElement(
+          u''.join(out), namespaces,
+          {(SOAPpy.NS.XSI3, 'type'): struct.type_attribute})
+    elif isinstance(obj, (list, tuple)):
+      item_type = self.__GetItemType(type_name, xmlns)
+      if self.__wrap_lists:
+        # A struct holding the items, as in MessageHandler._PackListForSoappy.
+        out = ['\n']
+        namespaces = []
+        self.__WriteWrappedItems(out, namespaces, obj, xmlns, item_type)
+        return _SerializedElement(u''.join(out), namespaces)
+      self.__CheckSameKind(obj)
+      return [self.Pack(item, xmlns, item_type) for item in obj]
+    elif isinstance(obj, basestring):
+      return SOAPpy.Types.untypedType(_Escape(obj))
+    raise _UnsupportedValue(obj)
+
+  def __GetStruct(self, obj, ns, type_name):
+    """Returns the serializer of the type a dictionary is written as.
+
+    The type is the given one, unless the dictionary sets its own with an
+    xsi_type, type or *.Type key, as in SoappyUtils.GetExplicitType.
+
+    Args:
+      obj: dict The python representation of an object of the given type.
+      ns: string The namespace the given type belongs to.
+      type_name: string The name of the type the object represents.
+
+    Returns:
+      tuple The _StructSerializer of the type, and the key the type was set
+      with or None.
+    """
+    struct = self.__GetStructByName(type_name, ns)
+    type_key = None
+    if 'xsi_type' in obj:
+      type_key = 'xsi_type'
+    elif 'type' in obj and not struct.has_type_field:
+      type_key = 'type'
+    else:
+      for key in obj:
+        if key.find('.Type') > -1 or key.find('_Type') > -1:
+          type_key = key
+          break
+    if type_key is not None:
+      struct = self.__GetStructByName(obj[type_key], ns)
+    return struct, type_key
+
+  def __GetStructByName(self, type_name, ns):
+    """Returns the _StructSerializer of a type, compiling it on first use."""
+    key = (ns, type_name)
+    try:
+      return self.__structs[key]
+    except KeyError:
+      struct = _StructSerializer(self.__type_index, type_name, ns,
+                                 self.__prefix_function)
+      self.__structs[key] = struct
+      return struct
+
+  def __GetItemType(self, type_name, ns):
+    """Returns the type of the items of a list of the given type."""
+    key = (ns, type_name)
+    try:
+      return self.__item_types[key]
+    except KeyError:
+      item_type = self.__type_index.GetArrayItemTypeName(type_name, ns)
+      self.__item_types[key] = item_type
+      return item_type
+
+  def __CheckSameKind(self, items):
+    """Checks that SOAPpy writes all items of a list without an xsi:type.
+
+    SOAPpy adds type information to lists whose packed items are not all of
+    the same class.
+
+    Args:
+      items: list The items of a list.
+
+    Raises:
+      _UnsupportedValue: if the items are not all dictionaries, all lists or all
+      strings.
+    """
+    kinds = {}
+    for item in items:
+      if isinstance(item, dict):
+        kinds[_STRUCT] = True
+      elif isinstance(item, (list, tuple)):
+        # Wrapped lists are packed into structs.
+        if self.__wrap_lists:
+          kinds[_STRUCT] = True
+        else:
+          kinds[_LIST] = True
+      elif isinstance(item, basestring):
+        kinds[_STRING] = True
+      else:
+        raise _UnsupportedValue(item)
+    if len(kinds) > 1:
+      raise _UnsupportedValue(items)
+
+  def __AddNamespaces(self, namespaces, added):
+    """Records envelope namespaces in the order SOAPpy first uses them."""
+    for namespace in added:
+      if namespace not in namespaces:
+        namespaces.append(namespace)
+
+  def __WriteFields(self, out, namespaces, struct, obj, type_key):
+    """Writes the fields of a dictionary, in schema order.
+
+    Args:
+      out: list The pieces of XML written so far.
+      namespaces: list The envelope namespaces used so far.
+      struct: _StructSerializer The serializer of the dictionary's type.
+      obj: dict The dictionary.
+      type_key: string The key the dictionary's type was set with, or None.
+    """
+    fields = []
+    for key in obj:
+      value = obj[key]
+      if key == type_key or value is None:
+        continue
+      position, tag, ns, type_name = struct.GetField(key)
+      fields.append((position, tag, ns, type_name, value))
+    fields.sort()
+    for unused_position, tag, ns, type_name, value in fields:
+      self.__WriteValue(out, namespaces, tag, value, ns, type_name)
+
+  def __WriteWrappedItems(self, out, namespaces, items, ns, item_type):
+    """Writes the items of a wrapped list.
+
+    Args:
+      out: list The pieces of XML written so far.
+      namespaces: list The envelope namespaces used so far.
+      items: list The items of the list.
+      ns: string The namespace that the items' type belongs to.
+      item_type: string The name of the SOAP type the items represent.
+    """
+    if len(items) > 1:
+      # A single item is written by SOAPpy as a plain field, several as a list.
+      self.__CheckSameKind(items)
+      self.__AddNamespaces(namespaces, self.__list_namespaces)
+    for item in items:
+      self.__WriteValue(out, namespaces, _ITEM_TAG, item, ns, item_type)
+
+  def __WriteValue(self, out, namespaces, tag, value, ns, type_name):
+    """Writes a value as one or more elements.
+
+    Args:
+      out: list The pieces of XML written so far.
+      namespaces: list The envelope namespaces used so far.
+      tag: string The name of the value's elements.
+      value: mixed The python value.
+      ns: string The namespace that the value's type belongs to.
+      type_name: string The name of the SOAP type the value represents.
+
+    Raises:
+      _UnsupportedValue: if the value needs MessageHandler.PackForSoappy.
+    """
+    if isinstance(value, basestring):
+      out.append(u'<%s>%s</%s>\n' % (tag, _Escape(value), tag))
+    elif isinstance(value, dict):
+      struct, type_key = self.__GetStruct(value, ns, type_name)
+      if SOAPpy.NS.XSI3 not in namespaces:
+        namespaces.append(SOAPpy.NS.XSI3)
+      out.append('<%s%s>\n' % (tag, struct.attribute))
+      self.__WriteFields(out, namespaces, struct, value, type_key)
+      out.append('</%s>\n' % tag)
+    elif isinstance(value, (list, tuple)):
+      item_type = self.__GetItemType(type_name, ns)
+      if self.__wrap_lists:
+        out.append('<%s>\n' % tag)
+        self.__WriteWrappedItems(out, namespaces, value, ns, item_type)
+        out.append('</%s>\n' % tag)
+      else:
+        self.__CheckSameKind(value)
+        if value and isinstance(value[0], (list, tuple)):
+          self.__AddNamespaces(namespaces, self.__nested_list_namespaces)
+        else:
+          self.__AddNamespaces(namespaces, self.__list_namespaces)
+        for item in value:
+          self.__WriteValue(out, namespaces, tag, item, ns, item_type)
+    else:
+      raise _UnsupportedValue(value)
@@ -0,0 +1,652 @@
+#!/usr/bin/python
+#
+# Copyright 2013 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Single pass parser turning SOAP responses into dictionaries and lists.
+
+The default response path has SOAPpy parse a response into its own objects,
+MessageHandler.UnpackResponseAsDict copy those into dictionaries, and
+MessageHandler.RestoreListTypeWithSoappy walk the result again against the WSDL
+to turn fields which may repeat into lists. ParseResponse produces the same
+result straight from the response XML: each element is converted as soon as it
+is closed, and its fields are made into lists from the service's TypeIndex.
+
+Elements are typed from their declared field types, or from their xsi:type
+attribute when they have one. Responses this parser does not handle, such as
+faults and SOAP-encoded ones, are passed on to SOAPpy as before.
+"""
+
+__author__ = 'agent@local (agent)'
+
+import re
+import socket
+from xml.parsers import expat
+
+from adspygoogle import SOAPpy
+from adspygoogle.common import MessageHandler
+from adspygoogle.common.soappy.TypeIndex import GetTypeIndex
+
+
+# Name of the attribute a service's field specs are stored in.
+_SPECS_ATTRIBUTE = '_adspygoogle_response_specs'
+_XSI_NAMESPACES = ('http://www.w3.org/2001/XMLSchema-instance',
+                   'http://www.w3.org/2000/10/XMLSchema-instance',
+                   'http://www.w3.org/1999/XMLSchema-instance')
+_SOAP_ENCODING_NS = 'http://schemas.xmlsoap.org/soap/encoding/'
+# Attributes which make a response SOAP-encoded, as ('namespace', 'name').
+_ENCODED_ATTRIBUTES = (('', 'href'), (_SOAP_ENCODING_NS, 'arrayType'))
+_NON_ASCII = re.compile('[\x80-\xff]')
+# Fields of a returned page whose items ResponseStream yields.
+STREAMED_FIELDS = ('entries', 'results')
+# Number of bytes of a response parsed at a time by ResponseStream.
+_CHUNK_SIZE = 16 * 1024
+
+
+class UnsupportedResponse(Exception):
+
+  """Raised for responses which need to be parsed by SOAPpy."""
+
+
+def SendRequest(soappy_service, method_name, kw, header=None,
+                method_attrs=None):
+  """Sends a SOAP request and returns the response without parsing it.
+
+  The request is built and sent the way SOAPpy.SOAPProxy does it, so it is
+  captured by the transport like any other call.
+
+  Args:
+    soappy_service: SOAPpy.WSDL.Proxy The SOAPpy service to call.
+    method_name: string The name of the SOAP operation.
+    kw: dict The packed keyword arguments of the operation.
+    [optional]
+    header: SOAPpy.Types.headerType The SOAP headers of the request.
+    method_attrs: dict Attributes of the operation's element.
+
+  Returns:
+    str The response XML.
+  """
+  proxy = soappy_service.soapproxy
+  message = SOAPpy.buildSOAP(
+      kw=kw, method=method_name, namespace=proxy.namespace,
+      header=header or proxy.header,
+      methodattrs=method_attrs or proxy.methodattrs, encoding=proxy.encoding,
+      config=proxy.config, noroot=proxy.noroot)
+  try:
+    data, unused_namespace = proxy.transport.call(
+        proxy.proxy, message, proxy.namespace,
+        proxy.soapaction or method_name, encoding=proxy.encoding,
+        http_proxy=proxy.http_proxy, config=proxy.config,
+        timeout=proxy.timeout)
+  except socket.timeout:
+    raise SOAPpy.SOAPTimeoutError
+  return data
+
+
+def ParseWithSoappy(soappy_service, data):
+  """Parses a response the way SOAPpy.SOAPProxy does.
+
+  Args:
+    soappy_service: SOAPpy.WSDL.Proxy The SOAPpy service which was called.
+    data: str The response XML.
+
+  Returns:
+    mixed The SOAPpy objects SOAPpy would have returned for the response.
+
+  Raises:
+    SOAPpy.Types.faultType: if the response is a SOAP fault.
+  """
+  proxy = soappy_service.soapproxy
+  response = SOAPpy.parseSOAPRPC(data)
+  if proxy.throw_faults and isinstance(response, SOAPpy.faultType):
+    raise response
+  if proxy.unwrap_results:
+    values = [value for key, value in response.__dict__.items()
+              if key[0] != '_']
+    if len(values) == 1:
+      response = values[0]
+  if proxy.simplify_objects:
+    response = SOAPpy.simplify(response)
+  return response
+
+
+def ParseResponse(data, soappy_service, operation_return_types):
+  """Parses a response into the dictionaries and lists an operation returns.
+
+  The result is the same as unpacking SOAPpy's objects with
+  MessageHandler.UnpackResponseAsDict and restoring list types with
+  MessageHandler.RestoreListTypeWithSoappy.
+
+  Args:
+    data: str The response XML.
+    soappy_service: SOAPpy.WSDL.Proxy The SOAPpy service which was called.
+    operation_return_types: list (namespace, type name, maxOccurs) tuples of
+                            the data types the operation returns, in order.
+
+  Returns:
+    mixed The response as a string, list or dictionary.
+
+  Raises:
+    SOAPpy.Types.faultType: if the response is a SOAP fault.
+  """
+  if len(operation_return_types) <= 1:
+    builder = _ResponseBuilder(soappy_service, operation_return_types)
+    try:
+      builder.Feed(data)
+      return builder.Close()
+    except (UnsupportedResponse, expat.ExpatError):
+      pass
+  return _ParseWithSoappyAsDict(data, soappy_service, operation_return_types)
+
+
+def _ParseWithSoappyAsDict(data, soappy_service, operation_return_types):
+  """Parses a response with SOAPpy into dictionaries and lists."""
+  return MessageHandler.RestoreListTypeWithSoappy(
+      MessageHandler.UnpackResponseAsDict(
+          ParseWithSoappy(soappy_service, data)),
+      soappy_service, operation_return_types)
+
+
+class ResponseStream(object):
+
+  """Yields the entries of a response one at a time as it is parsed.
+
+  The response is parsed a piece at a time. The items of the returned page's
+  entries or results field are yielded as soon as they have been parsed, and
+  are not kept afterwards. Responses which are lists are yielded item by item
+  once parsed.
+
+  Attributes:
+    page: mixed The response without the yielded entries once all of them have
+          been read, such as a page's totalNumEntries. None until then, and for
+          responses which are lists.
+  """
+
+  def __init__(self, data, soappy_service, operation_return_types,
+               fields=STREAMED_FIELDS):
+    """Inits ResponseStream.
+
+    Args:
+      data: str The response XML.
+      soappy_service: SOAPpy.WSDL.Proxy The SOAPpy service which was called.
+      operation_return_types: list (namespace, type name, maxOccurs) tuples of
+                              the data types the operation returns, in order.
+      [optional]
+      fields: tuple Names of the fields whose items are yielded.
+    """
+    self.page = None
+    self.__data = data
+    self.__service = soappy_service
+    self.__return_types = operation_return_types
+    self.__fields = fields
+
+  def __iter__(self):
+    """Yields the entries of the response, in order.
+
+    Raises:
+      SOAPpy.Types.faultType: if the response is a SOAP fault.
+    """
+    data = self.__data
+    self.__data = None
+    count = 0
+    response = None
+    parsed = False
+    if len(self.__return_types) <= 1:
+      builder = _ResponseBuilder(self.__service, self.__return_types,
+                                 self.__fields)
+      try:
+        for start in xrange(0, len(data), _CHUNK_SIZE):
+          builder.Feed(data[start:start + _CHUNK_SIZE])
+          for entry in builder.TakeEntries():
+            count += 1
+            yield entry
+        response = builder.Close()
+        parsed = True
+      except (UnsupportedResponse, expat.ExpatError):
+        pass
+    if not parsed:
+      # Entries already yielded are skipped in SOAPpy's result.
+      response = _ParseWithSoappyAsDict(data, self.__service,
+                                        self.__return_types)
+    data = None
+
+    page, entries = self.__SplitEntries(response)
+    if not parsed:
+      entries = entries[count:]
+    for entry in entries:
+      yield entry
+    self.page = page
+
+  def __SplitEntries(self, response):
+    """Separates the entries from the rest of a parsed response.
+
+    Args:
+      response: mixed The response as a string, list or dictionary.
+
+    Returns:
+      tuple The response without its entries, and a list of the entries.
+    """
+    if isinstance(response, list):
+      return None, response
+    entries = []
+    if isinstance(response, dict):
+      for field in self.__fields:
+        if field in response:
+          value = response.pop(field)
+          if isinstance(value, list):
+            entries.extend(value)
+          else:
+            entries.append(value)
+    return response, entries
+
+
+class _FieldSpecs(object):
+
+  """Caches how the fields of a service's types are turned into lists."""
+
+  def __init__(self, soappy_service):
+    """Inits _FieldSpecs.
+
+    Args:
+      soappy_service: SOAPpy.WSDL.Proxy The SOAPpy service object encapsulating
+                      the information stored in the WSDL.
+    """
+    self.__index = GetTypeIndex(soappy_service)
+    self.__specs = {}
+
+  def Get(self, type_name, ns):
+    """Returns the list handling of each field of a complex type.
+
+    Args:
+      type_name: string The name of the WSDL-defined type.
+      ns: string The namespace the type belongs to.
+
+    Returns:
+      dict Lists of (type name, namespace, is list, item type name) tuples
+      keyed by field name, one tuple for each definition of the field in the
+      type's key order.
+
+    Raises:
+      KeyError: if the type, or one of its base types, is not defined.
+      AttributeError: if the type is not a complex type.
+    """
+    key = (ns, type_name)
+    try:
+      return self.__specs[key]
+    except KeyError:
+      pass
+    index = self.__index
+    specs = {}
+    for attributes in index.GenKeyOrderAttrs(ns, type_name):
+      field_type = attributes['type']
+      field_type_name = field_type.getName()
+      field_ns = field_type.getTargetNamespace()
+      max_occurs = attributes.get('maxOccurs', '1')
+      is_list = (index.IsAnArrayType(field_type_name, field_ns) or
+                 not max_occurs.isdigit() or int(max_occurs) > 1)
+      specs.setdefault(attributes['name'], []).append(
+          (field_type_name, field_ns, is_list,
+           index.GetArrayItemTypeName(field_type_name, field_ns)))
+    self.__specs[key] = specs
+    return specs
+
+  def IsDefined(self, type_name, ns):
+    """Returns whether a complex type can be looked up."""
+    try:
+      self.Get(type_name, ns)
+      return True
+    except (KeyError, AttributeError):
+      return False
+
+
+def _GetFieldSpecs(soappy_service):
+  """Returns the _FieldSpecs of a SOAPpy service, creating it on first use."""
+  specs = soappy_service.__dict__.get(_SPECS_ATTRIBUTE)
+  if specs is None:
+    specs = _FieldSpecs(soappy_service)
+    setattr(soappy_service, _SPECS_ATTRIBUTE, specs)
+  return specs
+
+
+class _Element(object):
+
+  """An element being parsed."""
+
+  __slots__ = ('key', 'value', 'text', 'declared_type', 'start_type',
+               'child_types', 'nil', 'typed')
+
+  def __init__(self, key, declared_type, start_type):
+    # Name of the element, as used for dictionary keys.
+    self.key = key
+    # Dictionary of the element's fields, None until a child element starts.
+    self.value = None
+    self.text = []
+    # (type name, namespace) of the element's field, None if not known.
+    self.declared_type = declared_type
+    # (type name, namespace) its children are looked up in, None if not known.
+    self.start_type = start_type
+    # (type name, namespace) each child was converted with, keyed by name.
+    self.child_types = {}
+    self.nil = False
+    self.typed = False
+
+
+class _ResponseBuilder(object):
+
+  """Builds a response's dictionaries and lists from expat events."""
+
+  def __init__(self, soappy_service, operation_return_types,
+               stream_fields=()):
+    """Inits _ResponseBuilder.
+
+    Args:
+      soappy_service: SOAPpy.WSDL.Proxy The SOAPpy service which was called.
+      operation_return_types: list (namespace, type name, maxOccurs) tuples of
+                              the data types the operation returns, at most
+                              one.
+      [optional]
+      stream_fields: tuple Names of the fields of the returned object whose
+                     items are handed out by TakeEntries instead of being
+                     stored in the object. Only applies to operations
+                     returning a single object.
+    """
+    if (not operation_return_types or
+        operation_return_types[0][2] != '1'):
+      stream_fields = ()
+    self.__stream_fields = stream_fields
+    self.__entries = []
+    self.__service = soappy_service
+    self.__specs = _GetFieldSpecs(soappy_service)
+    self.__return_types = operation_return_types
+    self.__stack = []
+    self.__depth = 0
+    self.__in_header = False
+    self.__result = None
+    self.__done = False
+
+    parser = expat.ParserCreate(namespace_separator=' ')
+    parser.returns_unicode = False
+    parser.buffer_text = True
+    parser.StartElementHandler = self.__StartElement
+    parser.EndElementHandler = self.__EndElement
+    parser.CharacterDataHandler = self.__CharacterData
+    self.__parser = parser
+
+  def Feed(self, data):
+    """Parses a piece of the response XML."""
+    self.__parser.Parse(data, False)
+
+  def TakeEntries(self):
+    """Returns the streamed entries parsed since the last call, in order."""
+    entries = self.__entries
+    self.__entries = []
+    return entries
+
+  def Close(self):
+    """Finishes parsing and returns the response.
+
+    Returns:
+      mixed The response as a string, list or dictionary.
+
+    Raises:
+      UnsupportedResponse: if the response needs to be parsed by SOAPpy.
+    """
+    self.__parser.Parse('', True)
+    if not self.__done:
+      raise UnsupportedResponse('The response has no body.')
+    return self.__result
+
+  def __StartElement(self, name, attributes):
+    """Handles the start of an element."""
+    depth = self.__depth
+    self.__depth = depth + 1
+    if self.__in_header:
+      return
+    local_name = name[name.rfind(' ') + 1:]
+    if depth < 2:
+      if depth == 1 and local_name == 'Header':
+        self.__in_header = True
+      return
+    if depth == 2:
+      if self.__done or local_name == 'Fault':
+        raise UnsupportedResponse('Faults and multiple body elements are '
+                                  'parsed by SOAPpy.')
+      self.__stack.append(_Element(local_name, None, None))
+      return
+
+    parent = self.__stack[-1]
+    key = local_name.replace('.', '_')
+    if parent.value is None:
+      parent.value = {}
+    declared_type = parent.child_types.get(key)
+    if declared_type is None and key not in parent.child_types:
+      declared_type = self.__GetChildType(parent, key)
+      parent.child_types[key] = declared_type
+    element = _Element(key, declared_type, declared_type)
+    if attributes:
+      self.__ReadAttributes(element, attributes)
+    self.__stack.append(element)
+
+  def __GetChildType(self, parent, key):
+    """Returns the (type name, namespace) a new child is converted with."""
+    if len(self.__stack) == 1:
+      # Children of the body element hold the return value.
+      if not self.__return_types:
+        return None
+      ns, type_name, unused_max_occurs = self.__return_types[0]
+      return (type_name, ns)
+    if parent.start_type is None:
+      return None
+    specs = self.__specs.Get(*parent.start_type).get(key)
+    if not specs:
+      return None
+    type_name, ns, is_list, item_type_name = specs[0]
+    if is_list:
+      return (item_type_name, ns)
+    return (type_name, ns)
+
+  def __ReadAttributes(self, element, attributes):
+    """Applies the xsi attributes of an element."""
+    for name, value in attributes.iteritems():
+      separator = name.rfind(' ')
+      ns, local_name = name[:separator], name[separator + 1:]
+      if separator == -1:
+        ns = ''
+      if (ns, local_name) in _ENCODED_ATTRIBUTES:
+        raise UnsupportedResponse('SOAP-encoded responses are parsed by '
+                                  'SOAPpy.')
+      if ns not in _XSI_NAMESPACES:
+        continue
+      if local_name == 'nil':
+        element.nil = value in ('true', '1')
+      elif local_name == 'type':
+        element.typed = True
+        type_name = value[value.find(':') + 1:]
+        declared_type = element.declared_type
+        if (declared_type is not None and type_name != declared_type[0] and
+            self.__specs.IsDefined(type_name, declared_type[1])):
+          element.start_type = (type_name, declared_type[1])
+
+  def __CharacterData(self, data):
+    """Handles text within an element."""
+    if self.__stack:
+      element = self.__stack[-1]
+      if element.value is None:
+        element.text.append(data)
+
+  def __EndElement(self, unused_name):
+    """Handles the end of an element."""
+    self.__depth -= 1
+    if self.__in_header:
+      if self.__depth == 1:
+        self.__in_header = False
+      return
+    if self.__depth < 2:
+      return
+
+    element = self.__stack.pop()
+    if not self.__stack:
+      self.__result = self.__FinishBody(element)
+      self.__done = True
+      return
+
+    if element.value is not None:
+      value = self.__FinishFields(element)
+    elif element.nil:
+      value = None
+    elif element.typed:
+      # SOAPpy converts simple values by their xsi:type.
+      raise UnsupportedResponse('Typed simple values are parsed by SOAPpy.')
+    else:
+      value = ''.join(element.text)
+      if _NON_ASCII.search(value):
+        value = value.decode('utf-8')
+
+    if element.key[0] == '_':
+      return
+    if (len(self.__stack) == 2 and element.key in self.__stream_fields and
+        self.__StreamEntry(self.__stack[-1], element.key, value)):
+      return
+    fields = self.__stack[-1].value
+    if element.key in fields:
+      existing = fields[element.key]
+      if isinstance(existing, list):
+        existing.append(value)
+      else:
+        fields[element.key] = [existing, value]
+    else:
+      fields[element.key] = value
+
+  def __StreamEntry(self, parent, key, value):
+    """Hands out an item of a list field of the returned object.
+
+    Args:
+      parent: _Element The returned object.
+      key: string The name of the field.
+      value: mixed The parsed item.
+
+    Returns:
+      bool Whether the item was handed out, False if the field is not a list.
+    """
+    if parent.start_type is None:
+      return False
+    specs = self.__specs.Get(*parent.start_type).get(key)
+    if not specs or not specs[-1][2]:
+      return False
+    unused_type_name, ns, unused_is_list, item_type_name = specs[-1]
+    if value:
+      self.__entries.append(self.__Retype(
+          value, parent.child_types.get(key), (item_type_name, ns)))
+    return True
+
+  def __FinishFields(self, element):
+    """Turns the fields of a complex element which may repeat into lists.
+
+    Args:
+      element: _Element The closed element.
+
+    Returns:
+      dict The element's fields.
+    """
+    fields = element.value
+    declared_type = element.declared_type
+    if declared_type is None or not fields:
+      return fields
+    type_name = declared_type[0]
+    for key in fields:
+      if key.endswith('_Type'):
+        type_name = fields[key]
+    if type_name != element.start_type[0]:
+      # The element's children were typed before its actual type was known.
+      return MessageHandler.RestoreListTypeWithSoappy(
+          fields, self.__service, [(declared_type[1], declared_type[0], '1')])
+
+    specs = self.__specs.Get(type_name, declared_type[1])
+    for key in fields.keys():
+      field_specs = specs.get(key)
+      if field_specs:
+        fields[key] = self.__FinishField(
+            fields[key], field_specs, element.child_types.get(key))
+    return fields
+
+  def __FinishField(self, value, field_specs, child_type):
+    """Applies the definitions of a field to its value.
+
+    Args:
+      value: mixed The value of the field.
+      field_specs: list (type name, namespace, is list, item type name) tuples
+                   for each definition of the field.
+      child_type: tuple (type name, namespace) the value, or its items, were
+                  converted with.
+
+    Returns:
+      mixed The value, as a list if the field may repeat.
+    """
+    for type_name, ns, is_list, item_type_name in field_specs:
+      if is_list and not isinstance(value, list):
+        value = [value]
+      if isinstance(value, list):
+        child_type, old_type = (item_type_name, ns), child_type
+        value = [self.__Retype(item, old_type, child_type)
+                 for item in value if item]
+      else:
+        child_type, old_type = (type_name, ns), child_type
+        value = self.__Retype(value, old_type, child_type)
+    return value
+
+  def __Retype(self, value, converted_type, wanted_type):
+    """Converts a dictionary again if it was converted as another type."""
+    if isinstance(value, dict) and converted_type != wanted_type:
+      return MessageHandler.RestoreListTypeWithSoappy(
+          value, self.__service, [(wanted_type[1], wanted_type[0], '1')])
+    return value
+
+  def __FinishBody(self, element):
+    """Returns the return value held by the body element.
+
+    Args:
+      element: _Element The closed body element.
+
+    Returns:
+      mixed The response as a string, list or dictionary.
+
+    Raises:
+      UnsupportedResponse: if the body element holds more than one field.
+    """
+    fields = element.value or {}
+    if len(fields) > 1:
+      raise UnsupportedResponse('Responses with several fields are parsed by '
+                                'SOAPpy.')
+    if not self.__return_types:
+      # The operation does not return anything.
+      return None
+    child_type = None
+    if not fields:
+      response = fields
+    else:
+      key, response = fields.items()[0]
+      child_type = element.child_types[key]
+    ns, type_name, max_occurs = self.__return_types[0]
+
+    if not max_occurs.isdigit() or int(max_occurs) > 1:
+      if not response:
+        return []
+      elif not isinstance(response, list):
+        return [self.__Retype(response, child_type, (type_name, ns))]
+    if isinstance(response, list):
+      item_type = (GetTypeIndex(self.__service).GetArrayItemTypeName(
+          type_name, ns), ns)
+      return [self.__Retype(item, child_type, item_type)
+              for item in response if item]
+    return self.__Retype(response, child_type, (type_name, ns))
@@ -0,0 +1,134 @@
+#!/usr/bin/python
+#
+# Copyright 2013 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Process-wide registry of the schema definitions loaded by services.
+
+The WSDLs of one product version repeat the same common types in every
+service: each AdWords cm service defines Selector, Paging, Predicate, Money and
+every ApiError subclass. The schema definitions of services built from schema
+snapshots are taken from this registry, which hands out a single object for
+every identical definition of a type or element. Definitions are keyed by
+their namespace, which includes the API version, their name, and their full
+snapshot record, so services only share definitions that really are the same.
+
+The registry only holds weak references, so definitions are released once no
+service uses them.
+"""
+
+__author__ = 'agent@local (agent)'
+
+import threading
+import weakref
+
+
+# Kinds of schema definitions held by the registry.
+TYPE = 'type'
+ELEMENT = 'element'
+# Markers keeping frozen dictionaries and lists apart from plain tuples.
+_DICT = 'd'
+_LIST = 'l'
+
+
+def _Freeze(value):
+  """Converts a snapshot record into an equivalent hashable value.
+
+  Args:
+    value: mixed A snapshot record, made up of builtin Python types.
+
+  Returns:
+    mixed A hashable value, equal for equal records.
+  """
+  if isinstance(value, dict):
+    items = [(key, _Freeze(item)) for key, item in value.items()]
+    items.sort()
+    return (_DICT, tuple(items))
+  elif isinstance(value, list):
+    return (_LIST, tuple([_Freeze(item) for item in value]))
+  elif isinstance(value, tuple):
+    return tuple([_Freeze(item) for item in value])
+  return value
+
+
+class SchemaRegistry(object):
+
+  """Hands out one shared object for each distinct schema definition."""
+
+  def __init__(self):
+    """Inits SchemaRegistry."""
+    self.__lock = threading.Lock()
+    self.__definitions = weakref.WeakValueDictionary()
+    self.__requests = 0
+    self.__shared = 0
+
+  def Get(self, kind, ns, name, record, restore_function):
+    """Returns the shared definition for a snapshot record.
+
+    Args:
+      kind: string TYPE or ELEMENT.
+      ns: string The namespace the definition belongs to.
+      name: string The name of the type or element.
+      record: mixed The snapshot record describing the definition.
+      restore_function: callable Takes the record and returns a new
+                        definition, used the first time it is seen.
+
+    Returns:
+      object The definition shared by every service with the same record.
+    """
+    key = (kind, ns, name, _Freeze(record))
+    self.__lock.acquire()
+    try:
+      self.__requests += 1
+      definition = self.__definitions.get(key)
+      if definition is not None:
+        self.__shared += 1
+        return definition
+      definition = restore_function(record)
+      self.__definitions[key] = definition
+      return definition
+    finally:
+      self.__lock.release()
+
+  def GetStats(self):
+    """Returns how much the registry has deduplicated.
+
+    Returns:
+      dict The number of definitions requested, how many of them were served
+      from the registry, and how many distinct definitions are in use.
+    """
+    self.__lock.acquire()
+    try:
+      return {'requests': self.__requests, 'shared': self.__shared,
+              'definitions': len(self.__definitions)}
+    finally:
+      self.__lock.release()
+
+  def Clear(self):
+    """Forgets every definition; services keep the ones they already use."""
+    self.__lock.acquire()
+    try:
+      self.__definitions = weakref.WeakValueDictionary()
+      self.__requests = 0
+      self.__shared = 0
+    finally:
+      self.__lock.release()
+
+
+_registry = SchemaRegistry()
+
+
+def GetSchemaRegistry():
+  """Returns the process-wide SchemaRegistry."""
+  return _registry
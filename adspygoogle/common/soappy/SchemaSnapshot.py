@@ -0,0 +1,592 @@
+#!/usr/bin/python
+#
+# Copyright 2013 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Serialized snapshots of the schema parsed out of a service's WSDL.
+
+Building a SOAPpy.WSDL.Proxy spends most of its time constructing wstools
+XMLSchema object graphs, of which the library only ever reads a small part:
+type tags, derivations, field order and attributes, SOAP-encoded array item
+types and operation parameters. A snapshot stores exactly that part as plain
+Python data, so it can be written once per service and API version and loaded
+back with a single read.
+
+The proxy rebuilt from a snapshot exposes the same attributes SoappyUtils,
+SanityCheck and the product services walk on a regular SOAPpy.WSDL.Proxy. Its
+type and element definitions come from the process-wide SchemaRegistry, so
+services defining the same types share them.
+"""
+
+__author__ = 'agent@local (agent)'
+
+import cPickle
+import os
+import tempfile
+
+from adspygoogle import SOAPpy
+from adspygoogle.common import WsdlCache
+from adspygoogle.common.Errors import Error
+from adspygoogle.common.soappy import SchemaRegistry
+from adspygoogle.SOAPpy.wstools.WSDLTools import HeaderInfo
+from adspygoogle.SOAPpy.wstools.WSDLTools import ParameterInfo
+from adspygoogle.SOAPpy.wstools.WSDLTools import SOAPCallInfo
+from adspygoogle.SOAPpy.wstools.XMLSchema import TypeDescriptionComponent
+
+
+# Identifies files written by this module.
+SNAPSHOT_FORMAT = 'adspygoogle.schema_snapshot'
+# Incremented whenever the layout of a snapshot changes. Snapshots written with
+# a different version are ignored and rebuilt from the WSDL.
+SNAPSHOT_FORMAT_VERSION = 1
+# File extension used for every entry in a snapshot directory.
+SNAPSHOT_FILE_EXTENSION = '.snapshot'
+
+# Kinds of complex type content stored in a snapshot.
+_SEQUENCE = 's'
+_DERIVATION = 'd'
+# SOAPCallInfo attributes holding parameter lists, stored separately.
+_CALL_INFO_PARAMS = ('inparams', 'outparams', 'inheaders', 'outheaders',
+                     'retval')
+
+
+class _SchemaComponent(object):
+
+  """Minimal stand-in for a wstools XMLSchema component.
+
+  Only the attributes present in the original component are set, so that
+  hasattr() checks such as the one for 'derivation' behave the same.
+  """
+
+  def __init__(self, **kwargs):
+    self.__dict__.update(kwargs)
+
+
+class _Interner(object):
+
+  """Makes equal strings and tuples share a single object.
+
+  cPickle memoizes objects by identity, so interning repeated values such as
+  namespaces and type references keeps snapshot files small.
+  """
+
+  def __init__(self):
+    self.__values = {}
+
+  def __call__(self, value):
+    return self.__values.setdefault(value, value)
+
+
+def _PlainAttributes(attributes, intern):
+  """Converts a wstools attribute dictionary into plain Python data.
+
+  Args:
+    attributes: dict The attributes of a wstools component.
+    intern: _Interner Interner shared by the whole snapshot.
+
+  Returns:
+    dict The attributes with qualified names stored as plain tuples.
+  """
+  plain = {}
+  for key, value in attributes.items():
+    if isinstance(value, dict):
+      value = _PlainAttributes(value, intern)
+    elif isinstance(value, tuple):
+      value = intern(tuple([intern(item) for item in value]))
+    elif isinstance(value, basestring):
+      value = intern(value)
+    plain[intern(key)] = value
+  return plain
+
+
+def _RestoreAttributes(attributes):
+  """Converts snapshot attribute data back into wstools-style attributes.
+
+  Args:
+    attributes: dict Attributes as stored in a snapshot.
+
+  Returns:
+    dict The attributes with qualified names as TypeDescriptionComponents.
+  """
+  restored = {}
+  for key, value in attributes.items():
+    if isinstance(value, dict):
+      value = _RestoreAttributes(value)
+    elif isinstance(value, tuple) and len(value) == 2:
+      value = TypeDescriptionComponent(value)
+    restored[key] = value
+  return restored
+
+
+def _SnapshotFields(components, intern):
+  """Returns the attributes of a sequence of element declarations.
+
+  Args:
+    components: list The wstools components making up a sequence.
+    intern: _Interner Interner shared by the whole snapshot.
+
+  Returns:
+    list The attributes of each component, in order.
+  """
+  return [_PlainAttributes(component.attributes, intern)
+          for component in components]
+
+
+def _SnapshotType(type_def, intern):
+  """Returns the snapshot record for a wstools simple or complex type.
+
+  Args:
+    type_def: object The wstools XMLSchema type definition.
+    intern: _Interner Interner shared by the whole snapshot.
+
+  Returns:
+    dict The snapshot record describing the type.
+  """
+  record = {'tag': intern(type_def.tag)}
+  content = type_def.content
+  if content is None:
+    return record
+  if hasattr(content, 'derivation'):
+    derivation = content.derivation
+    fields = None
+    if hasattr(derivation.content, 'content'):
+      fields = _SnapshotFields(derivation.content.content, intern)
+    attr_content = None
+    if derivation.attr_content:
+      attr_content = _SnapshotFields(derivation.attr_content, intern)
+    record['content'] = (_DERIVATION, _PlainAttributes(
+        derivation.attributes, intern)['base'], fields, attr_content)
+  elif getattr(content, 'content', None) is not None:
+    record['content'] = (_SEQUENCE, _SnapshotFields(content.content, intern))
+  else:
+    record['content'] = (_SEQUENCE, None)
+  return record
+
+
+def _SnapshotElement(element, intern):
+  """Returns the snapshot record for a wstools global element declaration.
+
+  Args:
+    element: object The wstools XMLSchema element declaration.
+    intern: _Interner Interner shared by the whole snapshot.
+
+  Returns:
+    dict The snapshot record describing the element.
+  """
+  record = {'attributes': _PlainAttributes(element.attributes, intern)}
+  if element.content is not None:
+    fields = None
+    if getattr(element.content, 'content', None) is not None:
+      fields = _SnapshotFields(element.content.content.content, intern)
+    record['content'] = fields
+  return record
+
+
+def _SnapshotParameter(parameter, intern):
+  """Returns the snapshot record for a wstools ParameterInfo or HeaderInfo.
+
+  Args:
+    parameter: ParameterInfo The parameter description.
+    intern: _Interner Interner shared by the whole snapshot.
+
+  Returns:
+    tuple The parameter's class name and instance attributes.
+  """
+  return (parameter.__class__.__name__,
+          _PlainAttributes(parameter.__dict__, intern))
+
+
+def _SnapshotCallInfo(call_info, intern):
+  """Returns the snapshot record for a wstools SOAPCallInfo.
+
+  Args:
+    call_info: SOAPCallInfo The operation's binding information.
+    intern: _Interner Interner shared by the whole snapshot.
+
+  Returns:
+    dict The snapshot record describing the operation.
+  """
+  attributes = {}
+  for key, value in call_info.__dict__.items():
+    if key not in _CALL_INFO_PARAMS:
+      attributes[key] = value
+  record = {'attributes': _PlainAttributes(attributes, intern)}
+  for key in _CALL_INFO_PARAMS[:-1]:
+    record[key] = [_SnapshotParameter(param, intern)
+                   for param in getattr(call_info, key)]
+  if call_info.retval is not None:
+    record['retval'] = _SnapshotParameter(call_info.retval, intern)
+  return record
+
+
+def CreateSnapshot(soappy_service):
+  """Extracts a schema snapshot from a service proxy built from a WSDL.
+
+  Args:
+    soappy_service: SOAPpy.WSDL.Proxy The SOAPpy service object encapsulating
+                    the information stored in the WSDL.
+
+  Returns:
+    dict The snapshot, made up only of builtin Python types.
+  """
+  intern = _Interner()
+  namespaces = []
+  types = {}
+  elements = {}
+  for ns in soappy_service.wsdl.types.keys():
+    schema = soappy_service.wsdl.types[ns]
+    namespaces.append(intern(ns))
+    types[intern(ns)] = dict(
+        [(intern(name), _SnapshotType(schema.types[name], intern))
+         for name in schema.types.keys()])
+    elements[intern(ns)] = dict(
+        [(intern(name), _SnapshotElement(schema.elements[name], intern))
+         for name in schema.elements.keys()])
+
+  methods = {}
+  for name in soappy_service.methods:
+    methods[name] = _SnapshotCallInfo(soappy_service.methods[name], intern)
+
+  return {
+      'format': SNAPSHOT_FORMAT,
+      'format_version': SNAPSHOT_FORMAT_VERSION,
+      'namespaces': namespaces,
+      'types': types,
+      'elements': elements,
+      'methods': methods
+  }
+
+
+def _RestoreFields(fields):
+  """Rebuilds element declaration stand-ins from snapshot field records.
+
+  Args:
+    fields: list The attributes of each element declaration, in order.
+
+  Returns:
+    list Components exposing an 'attributes' dictionary, in order.
+  """
+  return [_SchemaComponent(attributes=_RestoreAttributes(field))
+          for field in fields]
+
+
+def _RestoreType(record):
+  """Rebuilds a type definition stand-in from its snapshot record.
+
+  Args:
+    record: dict The snapshot record describing the type.
+
+  Returns:
+    _SchemaComponent An object shaped like a wstools type definition.
+  """
+  content = None
+  if 'content' in record:
+    if record['content'][0] == _DERIVATION:
+      unused_kind, base, fields, attr_content = record['content']
+      derivation_content = _SchemaComponent()
+      if fields is not None:
+        derivation_content.content = _RestoreFields(fields)
+      if attr_content is not None:
+        attr_content = _RestoreFields(attr_content)
+      content = _SchemaComponent(derivation=_SchemaComponent(
+          attributes={'base': TypeDescriptionComponent(base)},
+          content=derivation_content, attr_content=attr_content))
+    elif record['content'][1] is None:
+      content = _SchemaComponent(content=None)
+    else:
+      content = _SchemaComponent(content=_RestoreFields(record['content'][1]))
+  return _SchemaComponent(tag=record['tag'], content=content)
+
+
+def _RestoreElement(record):
+  """Rebuilds a global element declaration stand-in from its snapshot record.
+
+  Args:
+    record: dict The snapshot record describing the element.
+
+  Returns:
+    _SchemaComponent An object shaped like a wstools element declaration.
+  """
+  content = None
+  if 'content' in record:
+    if record['content'] is None:
+      content = _SchemaComponent(content=None)
+    else:
+      content = _SchemaComponent(content=_SchemaComponent(
+          content=_RestoreFields(record['content'])))
+  return _SchemaComponent(
+      attributes=_RestoreAttributes(record['attributes']), content=content)
+
+
+def _RestoreParameter(record):
+  """Rebuilds a ParameterInfo or HeaderInfo from its snapshot record.
+
+  Args:
+    record: tuple The parameter's class name and instance attributes.
+
+  Returns:
+    ParameterInfo The rebuilt parameter description.
+  """
+  class_name, attributes = record
+  if class_name == HeaderInfo.__name__:
+    parameter = HeaderInfo(None, None, None)
+  else:
+    parameter = ParameterInfo(None, None)
+  parameter.__dict__.update(attributes)
+  return parameter
+
+
+def _RestoreCallInfo(record):
+  """Rebuilds a SOAPCallInfo from its snapshot record.
+
+  Args:
+    record: dict The snapshot record describing the operation.
+
+  Returns:
+    SOAPCallInfo The rebuilt binding information.
+  """
+  call_info = SOAPCallInfo(record['attributes']['methodName'])
+  call_info.__dict__.update(record['attributes'])
+  for key in _CALL_INFO_PARAMS[:-1]:
+    setattr(call_info, key,
+            [_RestoreParameter(param) for param in record[key]])
+  if 'retval' in record:
+    call_info.retval = _RestoreParameter(record['retval'])
+  return call_info
+
+
+class SnapshotProxy(SOAPpy.WSDL.Proxy):
+
+  """A SOAPpy.WSDL.Proxy rebuilt from a schema snapshot instead of a WSDL."""
+
+  def __init__(self, snapshot, config=SOAPpy.Config, **kw):
+    """Inits SnapshotProxy.
+
+    Args:
+      snapshot: dict A snapshot as returned by CreateSnapshot.
+      [optional]
+      config: SOAPpy.SOAPConfig The SOAPpy configuration to use.
+      **kw: dict Additional keyword arguments for the SOAPpy.SOAPProxy.
+
+    Raises:
+      Error: if the snapshot was written in an unsupported format.
+    """
+    if (snapshot.get('format') != SNAPSHOT_FORMAT or
+        snapshot.get('format_version') != SNAPSHOT_FORMAT_VERSION):
+      raise Error('Unsupported schema snapshot format.')
+
+    registry = SchemaRegistry.GetSchemaRegistry()
+    types = {}
+    for ns in snapshot['namespaces']:
+      schema_types = {}
+      for name, record in snapshot['types'][ns].items():
+        schema_types[name] = registry.Get(SchemaRegistry.TYPE, ns, name,
+                                          record, _RestoreType)
+      schema_elements = {}
+      for name, record in snapshot['elements'][ns].items():
+        schema_elements[name] = registry.Get(SchemaRegistry.ELEMENT, ns, name,
+                                             record, _RestoreElement)
+      types[ns] = _SchemaComponent(types=schema_types,
+                                   elements=schema_elements)
+    self.wsdl = _SchemaComponent(types=types)
+
+    self.methods = {}
+    for name, record in snapshot['methods'].items():
+      self.methods[name] = _RestoreCallInfo(record)
+
+    self.soapproxy = SOAPpy.SOAPProxy('http://localhost/dummy.webservice',
+                                      config=config, **kw)
+
+
+def SaveSnapshot(snapshot, path):
+  """Writes a snapshot to a file.
+
+  The snapshot is written to a temporary file first and then renamed into
+  place, so concurrent readers never observe a partially written snapshot.
+
+  Args:
+    snapshot: dict A snapshot as returned by CreateSnapshot.
+    path: str Path of the file to write.
+  """
+  directory = os.path.dirname(os.path.abspath(path))
+  fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=directory)
+  try:
+    fh = os.fdopen(fd, 'wb')
+    try:
+      cPickle.dump(snapshot, fh, cPickle.HIGHEST_PROTOCOL)
+    finally:
+      fh.close()
+    try:
+      os.rename(tmp_path, path)
+    except OSError:
+      # Windows does not allow renaming over an existing file.
+      if os.path.exists(path):
+        os.remove(path)
+      os.rename(tmp_path, path)
+  finally:
+    if os.path.exists(tmp_path):
+      os.remove(tmp_path)
+
+
+def LoadSnapshot(path):
+  """Reads a snapshot from a file.
+
+  Args:
+    path: str Path of the file to read.
+
+  Returns:
+    dict The snapshot, None if the file does not exist, cannot be read or was
+    written in an unsupported format.
+  """
+  try:
+    fh = open(path, 'rb')
+  except IOError:
+    return None
+  try:
+    try:
+      snapshot = cPickle.load(fh)
+    except (cPickle.UnpicklingError, EOFError, ValueError, TypeError,
+            AttributeError, ImportError, IndexError, KeyError):
+      return None
+  finally:
+    fh.close()
+  if (not isinstance(snapshot, dict) or
+      snapshot.get('format') != SNAPSHOT_FORMAT or
+      snapshot.get('format_version') != SNAPSHOT_FORMAT_VERSION):
+    return None
+  return snapshot
+
+
+class SchemaSnapshotStore(object):
+
+  """Directory of schema snapshots, one per server, version, group and service.
+
+  Files are named after the same digest WsdlCache uses, so a single directory
+  can hold snapshots for any number of products and API versions.
+  """
+
+  def __init__(self, snapshot_dir):
+    """Inits SchemaSnapshotStore.
+
+    Args:
+      snapshot_dir: str Path to the directory holding snapshots. It is created
+                    if it does not exist yet.
+    """
+    self.__snapshot_dir = os.path.abspath(os.path.expanduser(snapshot_dir))
+    if not os.path.isdir(self.__snapshot_dir):
+      try:
+        os.makedirs(self.__snapshot_dir)
+      except OSError:
+        # Another process may have created it in the meantime.
+        if not os.path.isdir(self.__snapshot_dir):
+          raise Error('Unable to create schema snapshot directory \'%s\'.'
+                      % self.__snapshot_dir)
+
+  def GetPath(self, server, version, group, service_name):
+    """Return the path of the snapshot for a given service.
+
+    Args:
+      server: str Base URL of the API server.
+      version: str API version the service belongs to.
+      group: str API group the service belongs to, None if not applicable.
+      service_name: str Name of the service.
+
+    Returns:
+      str Absolute path to the snapshot, which may or may not exist.
+    """
+    return os.path.join(
+        self.__snapshot_dir,
+        WsdlCache.GetServiceKey(server, version, group, service_name) +
+        SNAPSHOT_FILE_EXTENSION)
+
+  def Get(self, server, version, group, service_name):
+    """Return the snapshot for a given service.
+
+    Args:
+      server: str Base URL of the API server.
+      version: str API version the service belongs to.
+      group: str API group the service belongs to, None if not applicable.
+      service_name: str Name of the service.
+
+    Returns:
+      dict The snapshot, None if there is no usable snapshot for the service.
+    """
+    return LoadSnapshot(self.GetPath(server, version, group, service_name))
+
+  def Put(self, server, version, group, service_name, snapshot):
+    """Store the snapshot for a given service.
+
+    Args:
+      server: str Base URL of the API server.
+      version: str API version the service belongs to.
+      group: str API group the service belongs to, None if not applicable.
+      service_name: str Name of the service.
+      snapshot: dict A snapshot as returned by CreateSnapshot.
+
+    Returns:
+      str Absolute path to the newly written snapshot.
+    """
+    path = self.GetPath(server, version, group, service_name)
+    SaveSnapshot(snapshot, path)
+    return path
+
+  def Invalidate(self, server, version, group, service_name):
+    """Remove the snapshot for a given service, if there is one.
+
+    Args:
+      server: str Base URL of the API server.
+      version: str API version the service belongs to.
+      group: str API group the service belongs to, None if not applicable.
+      service_name: str Name of the service.
+
+    Returns:
+      bool True if a snapshot was removed, False otherwise.
+    """
+    try:
+      os.remove(self.GetPath(server, version, group, service_name))
+    except OSError:
+      return False
+    return True
+
+  def Clear(self):
+    """Remove every snapshot from the snapshot directory.
+
+    Returns:
+      int Number of snapshots removed.
+    """
+    removed = 0
+    for filename in os.listdir(self.__snapshot_dir):
+      if not filename.endswith(SNAPSHOT_FILE_EXTENSION):
+        continue
+      try:
+        os.remove(os.path.join(self.__snapshot_dir, filename))
+        removed += 1
+      except OSError:
+        pass
+    return removed
+
+
+def GetSnapshotStoreFromConfig(config):
+  """Return the schema snapshot store described by a client configuration.
+
+  Args:
+    config: dict Dictionary object with populated configuration values.
+
+  Returns:
+    SchemaSnapshotStore The store to use, None if snapshots are disabled.
+  """
+  snapshot_dir = config.get('schema_snapshot_dir')
+  if not snapshot_dir:
+    return None
+  return SchemaSnapshotStore(snapshot_dir)
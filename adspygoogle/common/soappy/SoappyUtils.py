@@ -18,6 +18,8 @@
 
 __author__ = 'api.jdilallo@gmail.com (Joseph DiLallo)'
 
+from adspygoogle.common.soappy.TypeIndex import GetTypeIndex
+
 
 def GetArrayItemTypeName(type_name, ns, soappy_service):
   """Returns the name of the SOAP type which the items in an array represent.
@@ -38,19 +40,7 @@ def GetArrayItemTypeName(type_name, ns, soappy_service):
   Returns:
     string The type name of the array's contents.
   """
-  try:
-    array_type = GetTypeFromSoappyService(type_name, ns, soappy_service)
-    attr_contents = array_type.content.derivation.attr_content
-    if attr_contents:
-      raw_type_name = attr_contents[0].attributes[
-          'http://schemas.xmlsoap.org/wsdl/']['arrayType']
-      return raw_type_name[raw_type_name.find(':') + 1:-2]
-    else:
-      return type_name
-  except KeyError:
-    return type_name
-  except AttributeError:
-    return type_name
+  return GetTypeIndex(soappy_service).GetArrayItemTypeName(type_name, ns)
 
 
 def IsASuperType(soappy_service, sub_type, ns, super_type):
@@ -69,20 +59,7 @@ def IsASuperType(soappy_service, sub_type, ns, super_type):
   Returns:
     bool Whether super_type is really a supertype of sub_type.
   """
-  if sub_type == super_type: return True
-
-  try:
-    if IsASubType(sub_type, ns, soappy_service):
-      complex_type = GetTypeFromSoappyService(sub_type, ns, soappy_service)
-      return IsASuperType(
-          soappy_service,
-          complex_type.content.derivation.attributes['base'].getName(), ns,
-          super_type)
-    else:
-      return False
-  except KeyError:
-    # The given sub_type does not exist in the WSDL definitions.
-    return False
+  return GetTypeIndex(soappy_service).IsASuperType(sub_type, ns, super_type)
 
 
 def IsASubType(type_name, ns, soappy_service):
@@ -97,8 +74,7 @@ def IsASubType(type_name, ns, soappy_service):
   Returns:
     boolean Whether the given type is extending another type.
   """
-  return hasattr(GetTypeFromSoappyService(
-      type_name, ns, soappy_service).content, 'derivation')
+  return GetTypeIndex(soappy_service).IsASubType(type_name, ns)
 
 
 def IsAnArrayType(type_name, ns, soappy_service):
@@ -113,20 +89,7 @@ def IsAnArrayType(type_name, ns, soappy_service):
   Returns:
     boolean Whether the given type represents an array.
   """
-  if type_name == 'Array':
-    return True
-  try:
-    wsdl_type_def = GetTypeFromSoappyService(type_name, ns, soappy_service)
-    if hasattr(wsdl_type_def.content, 'derivation'):
-      # This is an extension of another type.
-      return IsAnArrayType(
-          wsdl_type_def.content.derivation.attributes['base'].getName(),
-          wsdl_type_def.content.derivation.attributes[
-              'base'].getTargetNamespace(), soappy_service)
-    else:
-      return False
-  except KeyError:
-    return False
+  return GetTypeIndex(soappy_service).IsAnArrayType(type_name, ns)
 
 
 def GetTypeFromSoappyService(type_name, ns, soappy_service):
@@ -159,21 +122,22 @@ def GenKeyOrderAttrs(soappy_service, ns, type_name):
     list A list of dictionaries containing the attributes of keys within a
     complex type, in order.
   """
-  complex_type = soappy_service.wsdl.types[ns].types[type_name]
-
-  if IsASubType(type_name, ns, soappy_service):
-    # This is an extension of another type.
-    key_order = GenKeyOrderAttrs(
-        soappy_service,
-        complex_type.content.derivation.attributes['base'].getTargetNamespace(),
-        complex_type.content.derivation.attributes['base'].getName())
-    if hasattr(complex_type.content.derivation.content, 'content'):
-      key_order.extend([element.attributes for element in
-                        complex_type.content.derivation.content.content])
-    return key_order
-  else:
-    # This is a base type.
-    return [element.attributes for element in complex_type.content.content]
+  return GetTypeIndex(soappy_service).GenKeyOrderAttrs(ns, type_name)
+
+
+def GenKeyOrder(soappy_service, ns, type_name):
+  """Generates the order of keys in a complex type.
+
+  Args:
+    soappy_service: SOAPpy.WSDL.Proxy The SOAPpy service object encapsulating
+                    the information stored in the WSDL.
+    ns: string The namespace the given WSDL-defined type belongs to.
+    type_name: string The name of the WSDL-defined type to search for.
+
+  Returns:
+    list The names of the keys within a complex type, in order.
+  """
+  return GetTypeIndex(soappy_service).GetIndexedType(type_name, ns).key_names
 
 
 def PruneKeyOrder(key_order, soappy_struct_object):
@@ -212,6 +176,26 @@ def PruneKeyOrder(key_order, soappy_struct_object):
   return new_key_order
 
 
+def GetComplexFieldByFieldName(field, type_name, ns, soappy_service):
+  """Returns the description of a field within a complex type by its name.
+
+  Args:
+    field: string The name of the field within the given complex type.
+    type_name: string The name of the encapsulating complex type.
+    ns: string The namespace the encapsulating complex type belongs to.
+    soappy_service: SOAPpy.WSDL.Proxy The SOAPpy service object containing the
+                    descriptions of these types.
+
+  Returns:
+    FieldInfo The namespace defining the field, its type, its maxOccurs
+    attribute and its position in the complex type's key order.
+
+  Raises:
+    TypeError: if the given field is not within the given complex type.
+  """
+  return GetTypeIndex(soappy_service).GetField(field, type_name, ns)
+
+
 def GetComplexFieldTypeByFieldName(key, type_name, ns, soappy_service):
   """Returns the type of a field within a complex type by its key name.
 
@@ -230,11 +214,7 @@ def GetComplexFieldTypeByFieldName(key, type_name, ns, soappy_service):
   Raises:
     TypeError: if the given key is not within the given complex type.
   """
-  for param in GenKeyOrderAttrs(soappy_service, ns, type_name):
-    if param['name'] == key:
-      return param['type']
-  raise TypeError('There is no field with the name %s in complex type %s.'
-                  % (key, type_name))
+  return GetComplexFieldByFieldName(key, type_name, ns, soappy_service).type
 
 
 def GetComplexFieldNamespaceByFieldName(field, type_name, ns, soappy_service):
@@ -254,26 +234,8 @@ def GetComplexFieldNamespaceByFieldName(field, type_name, ns, soappy_service):
   Raises:
     TypeError: if the given field is not within the given complex type.
   """
-  type_obj = soappy_service.wsdl.types[ns].types[type_name]
-
-  if IsASubType(type_name, ns, soappy_service):
-    if hasattr(type_obj.content.derivation.content, 'content'):
-      for element in type_obj.content.derivation.content.content:
-        if element.attributes['name'] == field: return ns
-    try:
-      return GetComplexFieldNamespaceByFieldName(
-          field,
-          type_obj.content.derivation.attributes['base'].getName(),
-          type_obj.content.derivation.attributes['base'].getTargetNamespace(),
-          soappy_service)
-    except TypeError:
-      raise TypeError('There is no field with the name %s in complex type %s.'
-                      % (field, type_name))
-  else:
-    for element in type_obj.content.content:
-      if element.attributes['name'] == field: return ns
-    raise TypeError('There is no field with the name %s in complex type %s.'
-                    % (field, type_name))
+  return GetComplexFieldByFieldName(
+      field, type_name, ns, soappy_service).namespace
 
 
 def GetExplicitType(obj, type_name, ns, soappy_service):
@@ -314,7 +276,4 @@ def _HasNativeType(type_name, ns, soappy_service):
   Returns:
     bool Whether or not the given type has a field named 'type'.
   """
-  params = GenKeyOrderAttrs(soappy_service, ns, type_name)
-  for param in params:
-    if param['name'] == 'type': return True
-  return False
+  return GetTypeIndex(soappy_service).HasField('type', type_name, ns)
@@ -0,0 +1,347 @@
+#!/usr/bin/python
+#
+# Copyright 2013 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Index of the WSDL-defined types of a SOAPpy service.
+
+Answering questions such as "which namespace defines field X of type Y" from
+the wstools object graph means walking the type's whole derivation chain and
+scanning its element lists. A TypeIndex does that walk once per type and keeps
+the answers in dictionaries, so every later lookup is a dictionary hit.
+
+Every SOAPpy service has a single TypeIndex, created on first use by
+GetTypeIndex. The functions in SoappyUtils all go through it.
+"""
+
+__author__ = 'agent@local (agent)'
+
+
+# Name of the attribute a service's TypeIndex is stored in.
+_INDEX_ATTRIBUTE = '_adspygoogle_type_index'
+# Namespace of the wsdl:arrayType attribute of SOAP-encoded arrays.
+_WSDL_NS = 'http://schemas.xmlsoap.org/wsdl/'
+
+
+class FieldInfo(tuple):
+
+  """Description of a field within a complex type.
+
+  FieldInfo is a tuple of (namespace, type, max_occurs, position) with named
+  accessors for each item.
+  """
+
+  def __new__(cls, namespace, field_type, max_occurs, position):
+    return tuple.__new__(cls, (namespace, field_type, max_occurs, position))
+
+  namespace = property(lambda self: self[0],
+                       doc='The URL of the namespace defining the field.')
+  type = property(lambda self: self[1],
+                  doc='The TypeDescriptionComponent of the field\'s type.')
+  max_occurs = property(lambda self: self[2],
+                        doc='The maxOccurs attribute of the field.')
+  position = property(lambda self: self[3],
+                      doc='The index of the field in the type\'s key order.')
+
+
+class _IndexedType(object):
+
+  """Everything the index knows about a single complex type."""
+
+  def __init__(self, key_order, fields):
+    """Inits _IndexedType.
+
+    Args:
+      key_order: list The attributes of each field in the type, base type
+                 fields first.
+      fields: dict FieldInfo objects, keyed by field name.
+    """
+    self.key_order = key_order
+    self.key_names = [attributes['name'] for attributes in key_order]
+    self.fields = fields
+
+
+class TypeIndex(object):
+
+  """Caches the derivation chains and fields of a service's types.
+
+  Types are indexed lazily, the first time they are looked up. Lookups of types
+  that are not defined, or are not complex types, raise the same errors the
+  underlying wstools objects would.
+  """
+
+  def __init__(self, soappy_service):
+    """Inits TypeIndex.
+
+    Args:
+      soappy_service: SOAPpy.WSDL.Proxy The SOAPpy service object encapsulating
+                      the information stored in the WSDL.
+    """
+    self.__schemas = soappy_service.wsdl.types
+    self.__types = {}
+    self.__bases = {}
+    self.__arrays = {}
+    self.__array_items = {}
+
+  def GetTypeDefinition(self, type_name, ns):
+    """Returns the wstools object representing a type.
+
+    Args:
+      type_name: string The name of the WSDL-defined type.
+      ns: string The namespace the type belongs to.
+
+    Returns:
+      mixed The wstools SimpleType or ComplexType object.
+
+    Raises:
+      KeyError: if the type is not defined.
+    """
+    return self.__schemas[ns].types[type_name]
+
+  def GetBaseType(self, type_name, ns):
+    """Returns the type a WSDL-defined type extends.
+
+    Args:
+      type_name: string The name of the WSDL-defined type.
+      ns: string The namespace the type belongs to.
+
+    Returns:
+      tuple The name and namespace of the base type, None if the given type
+      does not extend another type.
+
+    Raises:
+      KeyError: if the type is not defined.
+    """
+    key = (ns, type_name)
+    try:
+      return self.__bases[key]
+    except KeyError:
+      content = self.GetTypeDefinition(type_name, ns).content
+      if hasattr(content, 'derivation'):
+        base = content.derivation.attributes['base']
+        base = (base.getName(), base.getTargetNamespace())
+      else:
+        base = None
+      self.__bases[key] = base
+      return base
+
+  def IsASubType(self, type_name, ns):
+    """Determines if a WSDL-defined type is extending another type.
+
+    Args:
+      type_name: string The name of the WSDL-defined type.
+      ns: string The namespace the type belongs to.
+
+    Returns:
+      boolean Whether the given type is extending another type.
+
+    Raises:
+      KeyError: if the type is not defined.
+    """
+    return self.GetBaseType(type_name, ns) is not None
+
+  def IsASuperType(self, sub_type, ns, super_type):
+    """Determines if one type is a supertype of another type.
+
+    Base types are looked up in the namespace of sub_type. Any case where
+    sub_type cannot be traced through to super_type is considered to be false.
+
+    Args:
+      sub_type: string A type that may be extending super_type.
+      ns: string The namespace sub_type belongs to.
+      super_type: string A type that may be extended by sub_type.
+
+    Returns:
+      bool Whether super_type is really a supertype of sub_type.
+    """
+    try:
+      while sub_type != super_type:
+        base = self.GetBaseType(sub_type, ns)
+        if base is None:
+          return False
+        sub_type = base[0]
+    except KeyError:
+      return False
+    return True
+
+  def IsAnArrayType(self, type_name, ns):
+    """Determines if a type is, or extends, a SOAP-encoded array.
+
+    Args:
+      type_name: string The name of the WSDL-defined type.
+      ns: string The namespace the type belongs to.
+
+    Returns:
+      boolean Whether the given type represents an array.
+    """
+    key = (ns, type_name)
+    try:
+      return self.__arrays[key]
+    except KeyError:
+      if type_name == 'Array':
+        is_array = True
+      else:
+        try:
+          base = self.GetBaseType(type_name, ns)
+        except KeyError:
+          base = None
+        is_array = base is not None and self.IsAnArrayType(*base)
+      self.__arrays[key] = is_array
+      return is_array
+
+  def GetArrayItemTypeName(self, type_name, ns):
+    """Returns the name of the type the items in an array represent.
+
+    Args:
+      type_name: string The name of the WSDL-defined type of the array.
+      ns: string The namespace the type belongs to.
+
+    Returns:
+      string The type name of the array's contents, or the given type name if
+      it is not a SOAP-encoded array.
+    """
+    key = (ns, type_name)
+    try:
+      return self.__array_items[key]
+    except KeyError:
+      item_type_name = type_name
+      try:
+        attr_contents = self.GetTypeDefinition(
+            type_name, ns).content.derivation.attr_content
+        if attr_contents:
+          raw_type_name = attr_contents[0].attributes[_WSDL_NS]['arrayType']
+          item_type_name = raw_type_name[raw_type_name.find(':') + 1:-2]
+      except (KeyError, AttributeError):
+        pass
+      self.__array_items[key] = item_type_name
+      return item_type_name
+
+  def GetIndexedType(self, type_name, ns):
+    """Returns the indexed fields of a complex type.
+
+    Args:
+      type_name: string The name of the WSDL-defined type.
+      ns: string The namespace the type belongs to.
+
+    Returns:
+      _IndexedType The type's key order and fields.
+
+    Raises:
+      KeyError: if the type, or one of its base types, is not defined.
+      AttributeError: if the type is not a complex type.
+    """
+    key = (ns, type_name)
+    try:
+      return self.__types[key]
+    except KeyError:
+      pass
+
+    content = self.GetTypeDefinition(type_name, ns).content
+    base = self.GetBaseType(type_name, ns)
+    if base is not None:
+      base_type = self.GetIndexedType(*base)
+      key_order = list(base_type.key_order)
+      fields = base_type.fields.copy()
+      if hasattr(content.derivation.content, 'content'):
+        elements = content.derivation.content.content
+      else:
+        elements = ()
+    else:
+      key_order = []
+      fields = {}
+      elements = content.content
+
+    for element in elements:
+      attributes = element.attributes
+      name = attributes['name']
+      if name in fields:
+        # The first definition of a field decides its type, the most derived
+        # one decides its namespace.
+        field = fields[name]
+        fields[name] = FieldInfo(ns, field.type, field.max_occurs,
+                                 field.position)
+      else:
+        fields[name] = FieldInfo(ns, attributes['type'],
+                                 attributes.get('maxOccurs', '1'),
+                                 len(key_order))
+      key_order.append(attributes)
+
+    indexed_type = _IndexedType(key_order, fields)
+    self.__types[key] = indexed_type
+    return indexed_type
+
+  def GenKeyOrderAttrs(self, ns, type_name):
+    """Returns the attributes of the fields in a complex type, in order.
+
+    Args:
+      ns: string The namespace the type belongs to.
+      type_name: string The name of the WSDL-defined type.
+
+    Returns:
+      list The attributes of each field. Callers must not modify it.
+    """
+    return self.GetIndexedType(type_name, ns).key_order
+
+  def GetField(self, field, type_name, ns):
+    """Returns the description of a field within a complex type.
+
+    Args:
+      field: string The name of the field.
+      type_name: string The name of the encapsulating complex type.
+      ns: string The namespace the encapsulating complex type belongs to.
+
+    Returns:
+      FieldInfo The description of the field.
+
+    Raises:
+      TypeError: if the given field is not within the given complex type.
+    """
+    fields = self.GetIndexedType(type_name, ns).fields
+    try:
+      return fields[field]
+    except KeyError:
+      raise TypeError('There is no field with the name %s in complex type %s.'
+                      % (field, type_name))
+
+  def HasField(self, field, type_name, ns):
+    """Checks whether a complex type has a field with a given name.
+
+    Args:
+      field: string The name of the field.
+      type_name: string The name of the complex type.
+      ns: string The namespace the complex type belongs to.
+
+    Returns:
+      bool Whether the type has a field with the given name.
+    """
+    return field in self.GetIndexedType(type_name, ns).fields
+
+
+def GetTypeIndex(soappy_service):
+  """Returns the TypeIndex of a SOAPpy service, creating it on first use.
+
+  Args:
+    soappy_service: SOAPpy.WSDL.Proxy The SOAPpy service object encapsulating
+                    the information stored in the WSDL.
+
+  Returns:
+    TypeIndex The service's type index.
+  """
+  # Read through __dict__, as WSDL.Proxy resolves unknown attributes to SOAP
+  # methods.
+  type_index = soappy_service.__dict__.get(_INDEX_ATTRIBUTE)
+  if type_index is None:
+    type_index = TypeIndex(soappy_service)
+    setattr(soappy_service, _INDEX_ATTRIBUTE, type_index)
+  return type_index
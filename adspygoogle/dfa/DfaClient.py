@@ -24,7 +24,7 @@ import threading
 from adspygoogle.common import SanityCheck
 from adspygoogle.common import Utils
 from adspygoogle.common.Client import Client
-from adspygoogle.common.Logger import Logger
+from adspygoogle.common.Logger import GetLoggerFromConfig
 from adspygoogle.dfa import DEFAULT_API_VERSION
 from adspygoogle.dfa import DfaSanityCheck
 from adspygoogle.dfa import DfaUtils
@@ -127,7 +127,7 @@ class DfaClient(Client):
       self._headers = headers
 
     # Initialize logger.
-    self.__logger = Logger(LIB_SIG, self._config['log_home'])
+    self.__logger = GetLoggerFromConfig(LIB_SIG, self._config)
 
   def __LoadAuthCredentials(self):
     """Load existing authentication credentials from dfa_api_auth.pkl.
@@ -230,8 +230,10 @@ class DfaClient(Client):
           'version': version,
           'http_proxy': http_proxy
       }
-    return GenericDfaService(self._headers, self._config, op_config,
-                             self.__lock, self.__logger, service_name)
+    return self._GetRegisteredService(
+        service_name, self._headers, op_config,
+        lambda: GenericDfaService(self._headers, self._config, op_config,
+                                  self.__lock, self.__logger, service_name))
 
   def GetAdService(self, server='https://advertisersapi.doubleclick.net',
                    version=None, http_proxy=None):
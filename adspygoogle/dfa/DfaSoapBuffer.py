@@ -37,42 +37,6 @@ class DfaSoapBuffer(SoapBuffer):
       pretty_xml: bool Indicator for whether to prettify XML.
     """
     super(DfaSoapBuffer, self).__init__(xml_parser, pretty_xml)
-    self.__xml_parser = xml_parser
-
-  def __GetXmlOut(self):
-    """Remove banners from outgoing SOAP XML and contstruct XML object.
-
-    Returns:
-      Document/Element Object generated from string, representing XML message.
-    """
-    return super(DfaSoapBuffer, self)._GetXmlOut()
-
-  def __GetXmlIn(self):
-    """Remove banners from incoming SOAP XML and construct XML object.
-
-    Returns:
-      Document/Element Object generated from string, representing XML message.
-    """
-    return super(DfaSoapBuffer, self)._GetXmlIn()
-
-  def __GetXmlValueByName(self, xml_obj, names, get_all=False):
-    """Get XML object value from a given tag name.
-
-    Args:
-      xml_obj: Document/Element object.
-      names: list List of tag names whose value to look up.
-      get_all: bool Whether to return all values that were found or just one.
-
-    Returns:
-      str XML object value, list if more than one value is found and if
-      explicitly requested, or None if name is not found in the XML object.
-    """
-    response = None
-    for name in names:
-      response = super(DfaSoapBuffer, self)._GetXmlValueByName(
-          xml_obj, name, get_all)
-      if response: break
-    return response
 
   def GetCallResponseTime(self):
     """Get value for responseTime header.
@@ -80,9 +44,7 @@ class DfaSoapBuffer(SoapBuffer):
     Returns:
       str responseTime header value.
     """
-    return self.__GetXmlValueByName(
-        self._GetXmlIn(), ['responseTime', 'Header/ResponseHeader/responseTime',
-                           'ns1:responseTime'])
+    return self._GetResponseHeader().get('responseTime')
 
   def GetCallRequestId(self):
     """Get value for requestId header.
@@ -90,6 +52,4 @@ class DfaSoapBuffer(SoapBuffer):
     Returns:
       str requestId header value.
     """
-    return self.__GetXmlValueByName(
-        self._GetXmlIn(), ['requestId', 'Header/ResponseHeader/requestId',
-                           'ns1:requestId'])
+    return self._GetResponseHeader().get('requestId')
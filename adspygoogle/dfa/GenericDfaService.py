@@ -111,10 +111,25 @@ class GenericDfaService(GenericApiService):
 
   def _SetHeaders(self):
     """Sets the SOAP headers for this service's requests."""
-    soap_headers = SOAPpy.Types.headerType()
     if self._service_name != 'login':
       if 'AuthToken' not in self._headers or not self._headers['AuthToken']:
         self._GenerateToken()
+      key = (self._headers['appName'], self._headers['Username'],
+             self._headers['AuthToken'])
+    else:
+      key = (self._headers['appName'],)
+    # Build the headers only if any of the values they depend on changed since
+    # the last request.
+    self._ApplySoapHeaders(key, self._BuildSoapHeaders)
+
+  def _BuildSoapHeaders(self):
+    """Builds the SOAP headers for this service's requests.
+
+    Returns:
+      SOAPpy.Types.headerType The SOAP headers.
+    """
+    soap_headers = SOAPpy.Types.headerType()
+    if self._service_name != 'login':
       wsse_header = SOAPpy.Types.structType(
           data={
               'UsernameToken': {
@@ -128,7 +143,7 @@ class GenericDfaService(GenericApiService):
         data={'applicationName': ''.join([self._headers['appName'], LIB_SIG])},
         name='RequestHeader', typed=0)
     soap_headers.RequestHeader = request_header
-    self._soappyservice.soapproxy.header = soap_headers
+    return soap_headers
 
   def _ReadyOAuth(self):
     """If OAuth is on, sets the transport handler to add OAuth2 HTTP header.
@@ -209,7 +224,7 @@ class GenericDfaService(GenericApiService):
     Overloaded for DFA because the DFA servers do not accept compressed
     messages. They do support returning compressed messages.
     """
-    compress = Utils.BoolTypeConvert(self._config['compress'])
+    compress = self._GetConfigFlags().compress
     self._soappyservice.soapproxy.config.send_compressed = False
     self._soappyservice.soapproxy.config.accept_compressed = compress
 
@@ -295,6 +310,14 @@ class GenericDfaService(GenericApiService):
     Returns:
       list Log handlers for the DFA library.
     """
+    def GetRequestInfo():
+      """Returns the request log message, built only if it is written."""
+      return str('host=%s service=%s method=%s responseTime=%s '
+                 'requestID=%s'
+                 % (Utils.GetNetLocFromUrl(self._service_url),
+                    self._service_name, buf.GetCallName(),
+                    buf.GetCallResponseTime(), buf.GetCallRequestId()))
+
     return [
         {
             'tag': 'xml_log',
@@ -304,11 +327,7 @@ class GenericDfaService(GenericApiService):
         {
             'tag': 'request_log',
             'name': 'request_info',
-            'data': str('host=%s service=%s method=%s responseTime=%s '
-                        'requestID=%s'
-                        % (Utils.GetNetLocFromUrl(self._service_url),
-                           self._service_name, buf.GetCallName(),
-                           buf.GetCallResponseTime(), buf.GetCallRequestId()))
+            'data': GetRequestInfo
         },
         {
             'tag': '',
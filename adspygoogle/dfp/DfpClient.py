@@ -27,7 +27,7 @@ from adspygoogle.common import Utils
 from adspygoogle.common.Client import Client
 from adspygoogle.common.Errors import AuthTokenError
 from adspygoogle.common.Errors import ValidationError
-from adspygoogle.common.Logger import Logger
+from adspygoogle.common.Logger import GetLoggerFromConfig
 from adspygoogle.dfp import AUTH_TOKEN_SERVICE
 from adspygoogle.dfp import DEFAULT_API_VERSION
 from adspygoogle.dfp import DfpSanityCheck
@@ -152,7 +152,7 @@ class DfpClient(Client):
       self._config['auth_token_epoch'] = 0
 
     # Initialize logger.
-    self.__logger = Logger(LIB_SIG, self._config['log_home'])
+    self.__logger = GetLoggerFromConfig(LIB_SIG, self._config)
 
   def __LoadAuthCredentials(self):
     """Load existing authentication credentials from dfp_api_auth.pkl.
@@ -248,8 +248,10 @@ class DfpClient(Client):
           'version': version,
           'http_proxy': http_proxy
       }
-    return GenericDfpService(self._headers, self._config, op_config,
-                             self.__lock, self.__logger, service_name)
+    return self._GetRegisteredService(
+        service_name, self._headers, op_config,
+        lambda: GenericDfpService(self._headers, self._config, op_config,
+                                  self.__lock, self.__logger, service_name))
 
   def GetCompanyService(self, server='https://www.google.com', version=None,
                         http_proxy=None):
@@ -38,34 +38,13 @@ class DfpSoapBuffer(SoapBuffer):
     """
     super(DfpSoapBuffer, self).__init__(xml_parser, pretty_xml)
 
-  def __GetXmlValueByName(self, xml_obj, names, get_all=False):
-    """Get XML object value from a given tag name.
-
-    Args:
-      xml_obj: Document/Element object.
-      names: list List of tag names whose value to look up.
-      get_all: bool Whether to return all values that were found or just one.
-
-    Returns:
-      str XML object value, list if more than one value is found and if
-      explicitly requested, or None if name is not found in the XML object.
-    """
-    response = None
-    for name in names:
-      response = super(DfpSoapBuffer, self)._GetXmlValueByName(
-          xml_obj, name, get_all)
-      if response: break
-    return response
-
   def GetCallResponseTime(self):
     """Get value for responseTime header.
 
     Returns:
       str responseTime header value.
     """
-    return self.__GetXmlValueByName(self._GetXmlIn(),
-        ['responseTime', 'Header/ResponseHeader/responseTime',
-         'ns2:responseTime'])
+    return self._GetResponseHeader().get('responseTime')
 
   def GetCallRequestId(self):
     """Get value for requestId header.
@@ -73,5 +52,4 @@ class DfpSoapBuffer(SoapBuffer):
     Returns:
       str requestId header value.
     """
-    return self.__GetXmlValueByName(self._GetXmlIn(),
-        ['requestId', 'Header/ResponseHeader/requestId', 'ns2:requestId'])
+    return self._GetResponseHeader().get('requestId')
@@ -20,12 +20,12 @@ __author__ = 'api.sgrinberg@gmail.com (Stan Grinberg)'
 
 import csv
 import datetime
-import gzip
 import os
-import StringIO
 import time
 import urllib
 
+from adspygoogle.common import ConnectionPool
+from adspygoogle.common import GzipStream
 from adspygoogle.common import SanityCheck
 from adspygoogle.common import Utils
 from adspygoogle.common.Errors import ValidationError
@@ -320,16 +320,25 @@ def _ConvertDateTimeToOffset(date_time_value):
     return date_time_str
 
 
-def DownloadReport(report_job_id, export_format, service):
+def DownloadReport(report_job_id, export_format, service, file_path=None,
+                   fileobj=None):
   """Download and return report data.
 
+  The report is decompressed as it arrives, so writing it to a file takes the
+  same memory whatever its size.
+
   Args:
     report_job_id: str ID of the report job.
     export_format: str Export format for the report file.
     service: GenericDfpService A service pointing to the ReportService.
+    [optional]
+    file_path: str File path to download to. A path ending in '.gz' gets the
+               report as served, gzip compressed.
+    fileobj: file An already-open file-like object that supports write().
 
   Returns:
-    str Report data or empty string if report failed.
+    str Report data if file_path and fileobj are None, None if fileobj is not
+    None and file_path otherwise. An empty string if the report failed.
   """
   SanityCheck.ValidateTypes(((report_job_id, (str, unicode)),))
 
@@ -353,6 +362,25 @@ def DownloadReport(report_job_id, export_format, service):
   report_url = service.GetReportDownloadURL(report_job_id, export_format)[0]
 
   # Download report.
-  data = urllib.urlopen(report_url).read()
-  data = gzip.GzipFile(fileobj=StringIO.StringIO(data)).read()
-  return data
+  connection_pool = ConnectionPool.GetConnectionPoolFromConfig(service._config)
+  if connection_pool is None:
+    response = urllib.urlopen(report_url)
+  else:
+    response = connection_pool.OpenUrl(report_url)
+  try:
+    if fileobj:
+      GzipStream.CopyStream(GzipStream.GzipReader(response), fileobj)
+    elif file_path:
+      output = open(file_path, 'wb')
+      try:
+        if file_path.endswith('.gz'):
+          GzipStream.CopyStream(response, output)
+        else:
+          GzipStream.CopyStream(GzipStream.GzipReader(response), output)
+      finally:
+        output.close()
+    else:
+      return GzipStream.GzipReader(response).read()
+  finally:
+    response.close()
+  return file_path
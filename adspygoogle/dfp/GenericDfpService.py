@@ -99,7 +99,20 @@ class GenericDfpService(GenericApiService):
           LIB_SIG, self._config['proxy'])
       self._config['auth_token_epoch'] = time.time()
 
-    # Apply headers to the SOAPpy service.
+    # Apply headers to the SOAPpy service, building them only if any of the
+    # values they depend on changed since the last request.
+    key = tuple(sorted([
+        (header, value) for header, value in self._headers.iteritems()
+        if header == 'authToken' or
+        header not in GenericDfpService._IGNORED_HEADER_VALUES]))
+    self._ApplySoapHeaders(key, self._BuildSoapHeaders)
+
+  def _BuildSoapHeaders(self):
+    """Builds the SOAP headers for this service's requests.
+
+    Returns:
+      SOAPpy.Types.headerType The SOAP headers.
+    """
     soap_headers = SOAPpy.Types.headerType(attrs={'xmlns': self._namespace})
     request_header_data = {}
     if 'authToken' in self._headers:
@@ -121,7 +134,7 @@ class GenericDfpService(GenericApiService):
     soap_headers.RequestHeader = request_header
     if 'authToken' in self._headers:
       soap_headers.RequestHeader._keyord = ['applicationName', 'authentication']
-    self._soappyservice.soapproxy.header = soap_headers
+    return soap_headers
 
   def _GetMethodInfo(self, method_name):
     """Pulls all of the relevant data about a method from a SOAPpy service.
@@ -215,6 +228,14 @@ class GenericDfpService(GenericApiService):
     Returns:
       list Log handlers for the DFP library.
     """
+    def GetRequestInfo():
+      """Returns the request log message, built only if it is written."""
+      return str('host=%s service=%s method=%s responseTime=%s '
+                 'requestId=%s'
+                 % (Utils.GetNetLocFromUrl(self._service_url),
+                    self._service_name, buf.GetCallName(),
+                    buf.GetCallResponseTime(), buf.GetCallRequestId()))
+
     return [
         {
             'tag': 'xml_log',
@@ -224,11 +245,7 @@ class GenericDfpService(GenericApiService):
         {
             'tag': 'request_log',
             'name': 'request_info',
-            'data': str('host=%s service=%s method=%s responseTime=%s '
-                        'requestId=%s'
-                        % (Utils.GetNetLocFromUrl(self._service_url),
-                           self._service_name, buf.GetCallName(),
-                           buf.GetCallResponseTime(), buf.GetCallRequestId()))
+            'data': GetRequestInfo
         },
         {
             'tag': '',
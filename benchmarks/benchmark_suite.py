@@ -0,0 +1,353 @@
+#!/usr/bin/python
+#
+# Copyright 2013 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Runs the offline benchmark suite and prints its results as JSON.
+
+An AdWordsClient is pointed at a StandInServer on localhost, so every
+measurement goes through the library's whole call path, sockets included,
+without reaching Google's servers. The suite measures:
+
+  construction     Getting a CampaignService from a new client: fetching and
+                   parsing its WSDL, from the WSDL cache, from a schema
+                   snapshot, and from the client's service registry.
+  call_overhead    A get call returning one campaign, with a new connection per
+                   call and with the connection pool.
+  get_entities     A get call returning the given number of campaigns, with the
+                   SOAPpy and the streaming response parsers.
+  mutate_entities  A mutate call sending and returning the given number of
+                   campaigns.
+  report_download  Downloading a CSV report of the given number of rows.
+  thread_scaling   Calls per second made through ExecuteBatch by 1 to the given
+                   number of threads, with the server answering after a delay.
+
+Call times are broken down into the phases reported by the client's call
+statistics. Results go to stdout, or to a file, as a single JSON object along
+with the commit and Python version they were measured with, so runs can be
+compared across commits.
+
+Usage: python benchmark_suite.py [options]
+"""
+
+__author__ = 'agent@local (agent)'
+
+import json
+import optparse
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+sys.path.insert(0, os.path.join('..'))
+
+from adspygoogle import AdWordsClient
+from adspygoogle.adwords import AdWordsSanityCheck
+from adspygoogle.common import CallStats
+
+import stand_in_server
+
+
+VERSION = stand_in_server.VERSION
+SELECTOR = {
+    'fields': ['Id', 'Name', 'Status'],
+    'paging': {
+        'startIndex': '0',
+        'numberResults': '100'
+    }
+}
+REPORT_DEFINITION_ID = '1234567'
+
+
+def GetOperations(count):
+  """Returns the given number of campaign operations."""
+  return [{
+      'operator': 'ADD',
+      'operand': {
+          'name': 'Campaign #%d' % i,
+          'status': 'PAUSED',
+          'budget': {'budgetId': str(i)},
+          'settings': [
+              {'xsi_type': 'KeywordMatchSetting', 'optIn': 'false'}
+          ],
+          'networkSetting': {'targetGoogleSearch': 'true',
+                             'targetSearchNetwork': 'true'},
+          'frequencyCap': {'impressions': '5', 'timeUnit': 'DAY'}
+      }
+  } for i in xrange(count)]
+
+
+def Summarize(times):
+  """Returns the mean, min, median and max of a list of seconds."""
+  times = sorted(times)
+  return {'runs': len(times), 'mean': sum(times) / len(times),
+          'min': times[0], 'p50': times[len(times) / 2], 'max': times[-1]}
+
+
+def SummarizePhases(client, service_name, method_name):
+  """Returns the mean seconds spent in each phase of the calls recorded."""
+  stats = client.GetCallStats().get(service_name, {}).get(method_name)
+  if not stats:
+    return {}
+  phases = {}
+  for phase in CallStats.PHASES:
+    if phase in stats['phases']:
+      phases[phase] = stats['phases'][phase]['mean']
+  return phases
+
+
+class Suite(object):
+
+  """Runs the benchmarks against a stand-in server."""
+
+  def __init__(self, server, work_dir, options):
+    """Inits Suite.
+
+    Args:
+      server: StandInServer The running server to point clients at.
+      work_dir: str Directory for logs and caches, removed afterwards.
+      options: optparse.Values The command line options.
+    """
+    self.server = server
+    self.work_dir = work_dir
+    self.options = options
+
+  def GetClient(self, **config):
+    """Returns a new client, with logging off and the given config values."""
+    client_config = {
+        'home': self.work_dir,
+        'log_home': self.work_dir,
+        'xml_log': 'n',
+        'request_log': 'n',
+        'compress': 'n',
+        'xml_parser': '2',
+        'call_stats': 'y'
+    }
+    client_config.update(config)
+    headers = {
+        'authToken': 'AUTH_TOKEN',
+        'developerToken': 'DEVELOPER_TOKEN',
+        'userAgent': 'Benchmark suite',
+        'clientCustomerId': '1234567890'
+    }
+    return AdWordsClient(headers=headers, config=client_config)
+
+  def GetService(self, client):
+    """Returns the client's CampaignService, served by the stand-in server."""
+    return client.GetCampaignService(self.server.GetUrl(), VERSION)
+
+  def TimeCalls(self, function, runs):
+    """Returns a summary of the seconds taken by each of a number of calls."""
+    times = []
+    for unused_i in xrange(runs):
+      start = time.time()
+      function()
+      times.append(time.time() - start)
+    return Summarize(times)
+
+  def RunConstruction(self):
+    """Measures getting a service from a new client, with and without caches."""
+    runs = self.options.construction_runs
+    wsdl_cache_dir = tempfile.mkdtemp(dir=self.work_dir)
+    snapshot_dir = tempfile.mkdtemp(dir=self.work_dir)
+    # Fill both caches.
+    self.GetService(self.GetClient(wsdl_cache_dir=wsdl_cache_dir))
+    self.GetService(self.GetClient(schema_snapshot_dir=snapshot_dir))
+    client = self.GetClient()
+    self.GetService(client)
+
+    requests = self.server.GetRequestCount()
+    results = {
+        'wsdl_fetch': self.TimeCalls(
+            lambda: self.GetService(self.GetClient()), runs),
+        'wsdl_cache': self.TimeCalls(
+            lambda: self.GetService(self.GetClient(
+                wsdl_cache_dir=wsdl_cache_dir)), runs),
+        'schema_snapshot': self.TimeCalls(
+            lambda: self.GetService(self.GetClient(
+                schema_snapshot_dir=snapshot_dir)), runs),
+        'service_registry': self.TimeCalls(
+            lambda: self.GetService(client), runs)
+    }
+    results['wsdl_requests'] = self.server.GetRequestCount() - requests
+    return results
+
+  def RunCallOverhead(self):
+    """Measures a get call returning one campaign."""
+    self.server.entities = 1
+    results = {}
+    for name, pool_size in (('new_connection', 0), ('pooled', 1)):
+      client = self.GetClient(connection_pool_size=pool_size)
+      service = self.GetService(client)
+      service.Get(SELECTOR)
+      client.SetCallStatsRegistry(CallStats.CallStatsRegistry())
+      results[name] = self.TimeCalls(lambda: service.Get(SELECTOR),
+                                     self.options.iterations)
+      results[name]['phases'] = SummarizePhases(client, 'CampaignService',
+                                                'get')
+    return results
+
+  def RunGetEntities(self):
+    """Measures a get call returning many campaigns, with each parser."""
+    self.server.entities = self.options.entities
+    results = {'entities': self.options.entities}
+    for response_parser in ('soappy', 'streaming'):
+      client = self.GetClient(response_parser=response_parser,
+                              connection_pool_size=1)
+      service = self.GetService(client)
+      service.Get(SELECTOR)
+      client.SetCallStatsRegistry(CallStats.CallStatsRegistry())
+      results[response_parser] = self.TimeCalls(lambda: service.Get(SELECTOR),
+                                                self.options.entity_runs)
+      results[response_parser]['phases'] = SummarizePhases(
+          client, 'CampaignService', 'get')
+    return results
+
+  def RunMutateEntities(self):
+    """Measures a mutate call sending and returning many campaigns."""
+    self.server.entities = self.options.entities
+    operations = GetOperations(self.options.entities)
+    client = self.GetClient(connection_pool_size=1)
+    service = self.GetService(client)
+    service.Mutate(operations[:1])
+    client.SetCallStatsRegistry(CallStats.CallStatsRegistry())
+    results = self.TimeCalls(lambda: service.Mutate(operations),
+                             self.options.entity_runs)
+    results['entities'] = self.options.entities
+    results['phases'] = SummarizePhases(client, 'CampaignService', 'mutate')
+    return results
+
+  def RunReportDownload(self):
+    """Measures downloading a CSV report."""
+    self.server.report_rows = self.options.report_rows
+    client = self.GetClient(connection_pool_size=1)
+    downloader = client.GetReportDownloader(self.server.GetUrl(), VERSION)
+    size = len(downloader.DownloadReport(REPORT_DEFINITION_ID))
+    results = self.TimeCalls(
+        lambda: downloader.DownloadReport(REPORT_DEFINITION_ID),
+        self.options.entity_runs)
+    results['rows'] = self.options.report_rows
+    results['bytes'] = size
+    results['mb_per_second'] = size / results['mean'] / (1024 * 1024)
+    return results
+
+  def RunThreadScaling(self):
+    """Measures calls per second made by a growing number of threads."""
+    self.server.entities = 1
+    self.server.latency = self.options.latency
+    client = self.GetClient(connection_pool_size=self.options.threads)
+    service = self.GetService(client)
+    items = [(service, 'Get', (SELECTOR,))] * self.options.scaling_calls
+    results = {'latency': self.options.latency,
+               'calls': self.options.scaling_calls}
+    threads = 1
+    try:
+      while threads <= self.options.threads:
+        start = time.time()
+        errors = client.ExecuteBatch(items, threads, threads).GetErrors()
+        elapsed = time.time() - start
+        results[str(threads)] = {
+            'seconds': elapsed,
+            'calls_per_second': len(items) / elapsed,
+            'errors': len(errors)
+        }
+        threads *= 2
+    finally:
+      self.server.latency = 0.0
+    return results
+
+  def Run(self):
+    """Runs every benchmark and returns the results."""
+    return {
+        'construction': self.RunConstruction(),
+        'call_overhead': self.RunCallOverhead(),
+        'get_entities': self.RunGetEntities(),
+        'mutate_entities': self.RunMutateEntities(),
+        'report_download': self.RunReportDownload(),
+        'thread_scaling': self.RunThreadScaling()
+    }
+
+
+def GetCommit():
+  """Returns the commit the library is checked out at, if known."""
+  try:
+    output = subprocess.Popen(['git', 'rev-parse', 'HEAD'],
+                              stdout=subprocess.PIPE,
+                              stderr=open(os.devnull, 'w')).communicate()[0]
+  except OSError:
+    return None
+  return output.strip() or None
+
+
+def GetOptions(argv):
+  """Returns the options parsed from the command line."""
+  parser = optparse.OptionParser(usage='python benchmark_suite.py [options]')
+  parser.add_option('--iterations', type='int', default=200,
+                    help='calls timed for the per-call overhead')
+  parser.add_option('--construction-runs', type='int', default=10,
+                    help='services built for each construction benchmark')
+  parser.add_option('--entities', type='int', default=1000,
+                    help='campaigns in the get and mutate benchmarks')
+  parser.add_option('--entity-runs', type='int', default=5,
+                    help='calls timed for the entity and report benchmarks')
+  parser.add_option('--report-rows', type='int', default=200000,
+                    help='rows in the downloaded report')
+  parser.add_option('--threads', type='int', default=8,
+                    help='largest number of threads for thread scaling')
+  parser.add_option('--scaling-calls', type='int', default=200,
+                    help='calls made at each number of threads')
+  parser.add_option('--latency', type='float', default=0.02,
+                    help='seconds the server waits before answering calls '
+                    'during thread scaling')
+  parser.add_option('--output', help='file to write the results to, instead '
+                    'of stdout')
+  return parser.parse_args(argv)[0]
+
+
+def main(argv):
+  options = GetOptions(argv)
+  warnings.simplefilter('ignore')
+  # The library only talks to Google's servers in strict mode, which the
+  # benchmarks keep on for its validation.
+  validate_server = AdWordsSanityCheck.ValidateServer
+  AdWordsSanityCheck.ValidateServer = lambda server, version: None
+  work_dir = tempfile.mkdtemp()
+  server = stand_in_server.StandInServer()
+  server.Start()
+  try:
+    results = Suite(server, work_dir, options).Run()
+  finally:
+    server.Stop()
+    shutil.rmtree(work_dir)
+    AdWordsSanityCheck.ValidateServer = validate_server
+
+  results['environment'] = {
+      'commit': GetCommit(),
+      'python': platform.python_version(),
+      'platform': platform.platform(),
+      'time': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+  }
+  results['options'] = options.__dict__
+  output = json.dumps(results, indent=2, sort_keys=True)
+  if options.output:
+    open(options.output, 'w').write(output + '\n')
+  else:
+    print output
+
+
+if __name__ == '__main__':
+  main(sys.argv[1:])
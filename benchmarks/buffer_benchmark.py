@@ -0,0 +1,84 @@
+#!/usr/bin/python
+#
+# Copyright 2013 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measures capturing a large response in a Buffer, the way SOAPpy writes it.
+
+A response of the given size is written in 4 KB pieces, then read back a few
+times as a request's logging and error handling do. This is timed for a buffer
+that concatenates strings on every write and for the chunked Buffer.
+
+Usage: python buffer_benchmark.py [megabytes]
+"""
+
+__author__ = 'agent@local (agent)'
+
+import os
+import sys
+import time
+sys.path.insert(0, os.path.join('..'))
+
+from adspygoogle.common.Buffer import Buffer
+
+
+DEFAULT_MEGABYTES = 20
+PIECE_SIZE = 4 * 1024
+READS = 4
+
+
+class ConcatenatingBuffer(object):
+
+  """Buffer which appends to a single string, copying it on every write."""
+
+  def __init__(self):
+    self._buffer = ''
+
+  def write(self, str_in):
+    self._buffer += str(str_in)
+
+  def GetBufferAsStr(self):
+    return str(self._buffer)
+
+
+def TimeCapture(buf, piece, pieces):
+  """Returns the seconds taken to fill a buffer and read it back."""
+  start = time.time()
+  for unused_i in xrange(pieces):
+    buf.write(piece)
+  for unused_i in xrange(READS):
+    buf.GetBufferAsStr()
+  return time.time() - start
+
+
+def main(megabytes):
+  piece = 'x' * PIECE_SIZE
+  pieces = megabytes * 1024 * 1024 / PIECE_SIZE
+
+  concatenating_time = TimeCapture(ConcatenatingBuffer(), piece, pieces)
+  chunked_time = TimeCapture(Buffer(), piece, pieces)
+
+  print 'Response size:        %d MB in %d writes of %d bytes' % (
+      megabytes, pieces, PIECE_SIZE)
+  print 'Reads:                %d' % READS
+  print 'Concatenating buffer: %.3f s' % concatenating_time
+  print 'Chunked Buffer:       %.3f s' % chunked_time
+  print 'Speedup:              %.1fx' % (concatenating_time / chunked_time)
+
+
+if __name__ == '__main__':
+  if len(sys.argv) > 1:
+    main(int(sys.argv[1]))
+  else:
+    main(DEFAULT_MEGABYTES)
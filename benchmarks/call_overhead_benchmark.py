@@ -0,0 +1,154 @@
+#!/usr/bin/python
+#
+# Copyright 2013 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measures the per-call overhead of a service, without network traffic.
+
+Requests are answered by an in-process stand-in for httplib.HTTPS that returns
+a canned CampaignService.get response, so the measured time is spent entirely
+in the library and SOAPpy. Calls are timed with the per-method call plans,
+config flags and SOAP headers cached, and again with those caches cleared
+before every call.
+
+Usage: python call_overhead_benchmark.py [iterations]
+"""
+
+__author__ = 'agent@local (agent)'
+
+import httplib
+import os
+import shutil
+import StringIO
+import sys
+import tempfile
+import time
+import warnings
+sys.path.insert(0, os.path.join('..'))
+
+from adspygoogle import AdWordsClient
+from adspygoogle.common.WsdlCache import WsdlCache
+
+
+DATA_DIR = os.path.join('..', 'tests', 'adspygoogle', 'adwords', 'data')
+WSDL_FILE_LOCATION = os.path.join(DATA_DIR, 'campaign_service.wsdl')
+RESPONSE_FILE_LOCATION = os.path.join(DATA_DIR, 'integration_test_response.xml')
+SERVER = 'https://adwords.google.com'
+VERSION = 'v201309'
+DEFAULT_ITERATIONS = 500
+SELECTOR = {
+    'fields': ['Id', 'Name', 'Status'],
+    'predicates': [{
+        'field': 'Status',
+        'operator': 'EQUALS',
+        'values': ['ACTIVE']
+    }],
+    'paging': {
+        'startIndex': '0',
+        'numberResults': '100'
+    }
+}
+
+
+class LoopbackHTTPS(object):
+
+  """Stand-in for httplib.HTTPS that answers every request locally."""
+
+  _http_vsn_str = 'HTTP/1.1'
+  response = ''
+
+  def __init__(self, unused_host, **unused_kwargs):
+    pass
+
+  def putrequest(self, unused_method, unused_path):
+    pass
+
+  def putheader(self, unused_header, *unused_values):
+    pass
+
+  def endheaders(self):
+    pass
+
+  def send(self, unused_data):
+    pass
+
+  def getreply(self):
+    headers = httplib.HTTPMessage(StringIO.StringIO(
+        'Content-Type: text/xml; charset=UTF-8\r\n\r\n'))
+    return 200, 'OK', headers
+
+  def getfile(self):
+    return StringIO.StringIO(LoopbackHTTPS.response)
+
+
+def TimeCalls(service, iterations, clear_caches):
+  """Returns the mean number of seconds a single get call takes."""
+  start = time.time()
+  for unused_i in xrange(iterations):
+    if clear_caches:
+      service._call_plans.clear()
+      service._config_flags = None
+      service._soap_headers = None
+    service.Get(SELECTOR)
+  return (time.time() - start) / iterations
+
+
+def main(iterations):
+  warnings.simplefilter('ignore')
+  LoopbackHTTPS.response = (open(RESPONSE_FILE_LOCATION).read() %
+                            {'version': VERSION})
+  work_dir = tempfile.mkdtemp()
+  original_https = httplib.HTTPS
+  httplib.HTTPS = LoopbackHTTPS
+  try:
+    WsdlCache(work_dir).Put(SERVER, VERSION, 'cm', 'CampaignService',
+                            open(WSDL_FILE_LOCATION).read() %
+                            {'version': VERSION})
+    headers = {
+        'authToken': 'AUTH_TOKEN',
+        'developerToken': 'DEVELOPER_TOKEN',
+        'userAgent': 'Call overhead benchmark',
+        'clientCustomerId': '1234567890'
+    }
+    config = {
+        'home': work_dir,
+        'log_home': work_dir,
+        'wsdl_cache_dir': work_dir,
+        'xml_log': 'n',
+        'request_log': 'n',
+        'compress': 'n',
+        'xml_parser': '2'
+    }
+    client = AdWordsClient(headers=headers, config=config)
+    service = client.GetCampaignService(SERVER, VERSION)
+    # Warm up, so both runs start with an indexed schema.
+    service.Get(SELECTOR)
+
+    uncached_time = TimeCalls(service, iterations, True)
+    cached_time = TimeCalls(service, iterations, False)
+  finally:
+    httplib.HTTPS = original_https
+    shutil.rmtree(work_dir)
+
+  print 'Iterations:          %d' % iterations
+  print 'Without call plans:  %.3f ms per call' % (uncached_time * 1000)
+  print 'With call plans:     %.3f ms per call' % (cached_time * 1000)
+  print 'Saved per call:      %.3f ms' % ((uncached_time - cached_time) * 1000)
+
+
+if __name__ == '__main__':
+  if len(sys.argv) > 1:
+    main(int(sys.argv[1]))
+  else:
+    main(DEFAULT_ITERATIONS)
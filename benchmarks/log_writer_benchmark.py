@@ -0,0 +1,82 @@
+#!/usr/bin/python
+#
+# Copyright 2013 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measures the time callers spend writing SOAP logs.
+
+Logs the given number of 50 KB messages, about the size of the SOAP log of a
+get() call returning a few hundred entries, once written by the calling thread
+and once handed to a LogWriter. Each message is flushed to disk with fsync,
+standing in for a slow or busy disk.
+
+Usage: python log_writer_benchmark.py [messages]
+"""
+
+__author__ = 'agent@local (agent)'
+
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+sys.path.insert(0, os.path.join('..'))
+
+from adspygoogle.common import LogWriter
+from adspygoogle.common.Logger import Logger
+
+
+DEFAULT_MESSAGES = 500
+MESSAGE = 'x' * 50 * 1024
+
+
+def TimeLogging(log_name, writer, count):
+  """Returns the seconds callers spent logging, and until all was written."""
+  log_home = tempfile.mkdtemp()
+  try:
+    logger = Logger('Benchmark', log_home, writer)
+    # Create the log's handlers up front, then make them sync every message.
+    logger.Log(log_name, '', log_level=Logger.DEBUG)
+    logger.Flush()
+    for handler in logging.getLogger(log_name).handlers:
+      handler.flush = lambda h=handler: (h.stream.flush(),
+                                         os.fsync(h.stream.fileno()))
+
+    start = time.time()
+    for unused_i in range(count):
+      logger.Log(log_name, MESSAGE, log_level=Logger.DEBUG)
+    caller_time = time.time() - start
+    logger.Flush()
+    return caller_time, time.time() - start
+  finally:
+    shutil.rmtree(log_home)
+
+
+def main(count):
+  sync_time = TimeLogging('benchmark_sync', None, count)[0]
+  async_time, written_time = TimeLogging(
+      'benchmark_async', LogWriter.LogWriter(count), count)
+
+  print 'Messages:              %d' % count
+  print 'Synchronous:           %.3f s' % sync_time
+  print 'Background, callers:   %.3f s' % async_time
+  print 'Background, written:   %.3f s' % written_time
+
+
+if __name__ == '__main__':
+  if len(sys.argv) > 1:
+    main(int(sys.argv[1]))
+  else:
+    main(DEFAULT_MESSAGES)
@@ -0,0 +1,110 @@
+#!/usr/bin/python
+#
+# Copyright 2013 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measures packing a large CampaignService mutate request.
+
+The given number of campaign operations are packed with
+MessageHandler.PackForSoappy and with RequestSerializer.PackForSoappy, then
+written out by SOAPpy. Both the time taken to pack the operations and the time
+taken to produce the whole request are reported, after checking that both
+requests are the same.
+
+Usage: python request_serializer_benchmark.py [operations]
+"""
+
+__author__ = 'agent@local (agent)'
+
+import os
+import sys
+import time
+sys.path.insert(0, os.path.join('..'))
+
+from adspygoogle import SOAPpy
+from adspygoogle.adwords.GenericAdWordsService import _DetermineNamespacePrefix
+from adspygoogle.common import MessageHandler
+from adspygoogle.common.GenericApiService import _SOAP_CONFIG
+from adspygoogle.common.soappy import RequestSerializer
+
+
+DEFAULT_OPERATIONS = 2000
+VERSION = 'v201309'
+NAMESPACE = 'https://adwords.google.com/api/adwords/cm/' + VERSION
+WSDL_FILE_LOCATION = os.path.join('..', 'tests', 'adspygoogle', 'adwords',
+                                  'data', 'campaign_service.wsdl')
+
+
+def GetOperations(count):
+  """Returns the given number of campaign operations."""
+  return [{
+      'operator': 'ADD',
+      'operand': {
+          'name': 'Campaign #%d & <co>' % i,
+          'status': 'PAUSED',
+          'budget': {'budgetId': str(i)},
+          'settings': [
+              {'xsi_type': 'KeywordMatchSetting', 'optIn': 'false'},
+              {'xsi_type': 'GeoTargetTypeSetting',
+               'positiveGeoTargetType': 'DONT_CARE'}
+          ],
+          'networkSetting': {'targetGoogleSearch': 'true',
+                             'targetSearchNetwork': 'true'},
+          'frequencyCap': {'impressions': '5', 'timeUnit': 'DAY'}
+      }
+  } for i in xrange(count)]
+
+
+def TimeRequest(pack_function, service, operations):
+  """Returns the request, and the seconds taken to pack and to write it."""
+  start = time.time()
+  packed = pack_function(operations, NAMESPACE, 'CampaignOperation', service,
+                         False, _DetermineNamespacePrefix)
+  pack_time = time.time() - start
+  request = SOAPpy.buildSOAP(kw={'operations': packed}, method='mutate',
+                             namespace=NAMESPACE, noroot=1,
+                             config=_SOAP_CONFIG,
+                             methodattrs={'xmlns': NAMESPACE})
+  return request, pack_time, time.time() - start
+
+
+def main(count):
+  wsdl = open(WSDL_FILE_LOCATION).read() % {'version': VERSION}
+  service = SOAPpy.WSDL.Proxy(wsdl, noroot=1, config=_SOAP_CONFIG)
+  operations = GetOperations(count)
+
+  # Warm up the type index and the compiled serializers.
+  TimeRequest(RequestSerializer.PackForSoappy, service, operations[:1])
+  old_request, old_pack_time, old_time = TimeRequest(
+      MessageHandler.PackForSoappy, service, operations)
+  new_request, new_pack_time, new_time = TimeRequest(
+      RequestSerializer.PackForSoappy, service, operations)
+  if old_request != new_request:
+    print 'The requests differ!'
+    sys.exit(1)
+
+  print 'Operations:            %d (%d bytes)' % (count, len(new_request))
+  print 'MessageHandler:        %.3f s packing, %.3f s in total' % (
+      old_pack_time, old_time)
+  print 'RequestSerializer:     %.3f s packing, %.3f s in total' % (
+      new_pack_time, new_time)
+  print 'Speedup:               %.1fx packing, %.1fx in total' % (
+      old_pack_time / new_pack_time, old_time / new_time)
+
+
+if __name__ == '__main__':
+  if len(sys.argv) > 1:
+    main(int(sys.argv[1]))
+  else:
+    main(DEFAULT_OPERATIONS)
@@ -0,0 +1,91 @@
+#!/usr/bin/python
+#
+# Copyright 2013 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compares the SOAPpy and streaming response parsers on a large response.
+
+A CampaignService.get response is built from the AdWords test data with the
+given number of campaigns, then parsed into the dictionaries and lists a call
+returns, once through SOAPpy and once with ResponseParser.
+
+Usage: python response_parser_benchmark.py [campaigns]
+"""
+
+__author__ = 'agent@local (agent)'
+
+import os
+import sys
+import time
+sys.path.insert(0, os.path.join('..'))
+
+from adspygoogle import SOAPpy
+from adspygoogle.common import MessageHandler
+from adspygoogle.common.soappy import ResponseParser
+
+
+DEFAULT_CAMPAIGNS = 2000
+VERSION = 'v201309'
+NS = 'https://adwords.google.com/api/adwords/cm/' + VERSION
+DATA_DIR = os.path.join('..', 'tests', 'adspygoogle', 'adwords', 'data')
+RETURN_TYPES = [(NS, 'CampaignPage', '1')]
+
+
+def ReadFile(file_name):
+  """Returns the content of an AdWords test data file."""
+  return open(os.path.join(DATA_DIR, file_name)).read() % {'version': VERSION}
+
+
+def BuildResponse(campaigns):
+  """Returns a get response holding the given number of campaigns."""
+  response = ReadFile('integration_test_response.xml')
+  start = response.index('<entries>')
+  end = response.index('</entries>') + len('</entries>')
+  return ''.join([response[:start], response[start:end] * campaigns,
+                  response[response.index('</rval>'):]])
+
+
+def ParseWithSoappy(service, data):
+  """Parses a response the way CallMethod does by default."""
+  return MessageHandler.RestoreListTypeWithSoappy(
+      MessageHandler.UnpackResponseAsDict(
+          ResponseParser.ParseWithSoappy(service, data)),
+      service, RETURN_TYPES)
+
+
+def main(campaigns):
+  service = SOAPpy.WSDL.Proxy(ReadFile('campaign_service.wsdl'), noroot=1)
+  data = BuildResponse(campaigns)
+  # Loads the service's type index, which both parsers share.
+  ResponseParser.ParseResponse(BuildResponse(1), service, RETURN_TYPES)
+
+  start = time.time()
+  expected = ParseWithSoappy(service, data)
+  soappy_time = time.time() - start
+  start = time.time()
+  response = ResponseParser.ParseResponse(data, service, RETURN_TYPES)
+  streaming_time = time.time() - start
+
+  print 'Response size:      %d campaigns, %d bytes' % (campaigns, len(data))
+  print 'Same result:        %s' % (response == expected)
+  print 'SOAPpy parser:      %.3f s' % soappy_time
+  print 'Streaming parser:   %.3f s' % streaming_time
+  print 'Speedup:            %.1fx' % (soappy_time / streaming_time)
+
+
+if __name__ == '__main__':
+  if len(sys.argv) > 1:
+    main(int(sys.argv[1]))
+  else:
+    main(DEFAULT_CAMPAIGNS)
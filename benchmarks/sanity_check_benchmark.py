@@ -0,0 +1,79 @@
+#!/usr/bin/python
+#
+# Copyright 2013 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measures strict mode validation of a large CampaignService mutate request.
+
+The given number of campaign operations are validated with
+SanityCheck.SoappySanityCheck, as GenericApiService does when strict mode is
+on, and packed with RequestSerializer.PackForSoappy. The first validation,
+which compiles the validators, is reported separately.
+
+Usage: python sanity_check_benchmark.py [operations]
+"""
+
+__author__ = 'agent@local (agent)'
+
+import os
+import sys
+import time
+sys.path.insert(0, os.path.join('..'))
+
+from adspygoogle import SOAPpy
+from adspygoogle.adwords.GenericAdWordsService import _DetermineNamespacePrefix
+from adspygoogle.common import SanityCheck
+from adspygoogle.common.GenericApiService import _SOAP_CONFIG
+from adspygoogle.common.soappy import RequestSerializer
+from request_serializer_benchmark import GetOperations
+from request_serializer_benchmark import NAMESPACE
+from request_serializer_benchmark import VERSION
+from request_serializer_benchmark import WSDL_FILE_LOCATION
+
+
+DEFAULT_OPERATIONS = 5000
+
+
+def TimeValidation(service, operations):
+  """Returns the seconds taken to validate the operations."""
+  start = time.time()
+  SanityCheck.SoappySanityCheck(service, operations, NAMESPACE,
+                                'CampaignOperation', 'unbounded')
+  return time.time() - start
+
+
+def main(count):
+  wsdl = open(WSDL_FILE_LOCATION).read() % {'version': VERSION}
+  service = SOAPpy.WSDL.Proxy(wsdl, noroot=1, config=_SOAP_CONFIG)
+  operations = GetOperations(count)
+
+  first_time = TimeValidation(service, operations[:1])
+  validation_time = TimeValidation(service, operations)
+  start = time.time()
+  RequestSerializer.PackForSoappy(operations, NAMESPACE, 'CampaignOperation',
+                                  service, False, _DetermineNamespacePrefix)
+  pack_time = time.time() - start
+
+  print 'Operations:            %d' % count
+  print 'First validation:      %.3f s (1 operation)' % first_time
+  print 'Validation:            %.3f s' % validation_time
+  print 'Packing:               %.3f s' % pack_time
+  print 'Validation / packing:  %.0f%%' % (100 * validation_time / pack_time)
+
+
+if __name__ == '__main__':
+  if len(sys.argv) > 1:
+    main(int(sys.argv[1]))
+  else:
+    main(DEFAULT_OPERATIONS)
@@ -0,0 +1,114 @@
+#!/usr/bin/python
+#
+# Copyright 2013 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measures the resident memory of a process holding many loaded services.
+
+Loads every WSDL in the given directory (for example the AdWords v201309 WSDLs,
+saved as <ServiceName>.wsdl) the way GenericApiService does, once keeping each
+service's parsed WSDL and once with shared_schema on, where services keep only
+the definitions they share through the SchemaRegistry. Each run happens in its
+own process, and reports how much that process's resident memory grew.
+
+Without a directory, the CampaignService test WSDL is loaded 30 times, standing
+in for the 30 cm services which define the same common types.
+
+Usage: python schema_registry_benchmark.py [wsdl_directory]
+"""
+
+__author__ = 'agent@local (agent)'
+
+import gc
+import glob
+import os
+import subprocess
+import sys
+sys.path.insert(0, os.path.join('..'))
+
+from adspygoogle import SOAPpy
+from adspygoogle.common.soappy import SchemaRegistry
+from adspygoogle.common.soappy import SchemaSnapshot
+
+
+DEFAULT_WSDL_FILE_LOCATION = os.path.join('..', 'tests', 'adspygoogle',
+                                          'adwords', 'data',
+                                          'campaign_service.wsdl')
+DEFAULT_SERVICES = 30
+VERSION = 'v201309'
+
+
+def GetResidentMemory():
+  """Returns the resident memory of this process in MB, on Linux."""
+  for line in open('/proc/self/status'):
+    if line.startswith('VmRSS:'):
+      return int(line.split()[1]) / 1024.0
+  return 0.0
+
+
+def GetWsdls(wsdl_dir):
+  """Returns the source of each WSDL to load."""
+  if wsdl_dir:
+    return [open(path).read()
+            for path in sorted(glob.glob(os.path.join(wsdl_dir, '*.wsdl')))]
+  wsdl = open(DEFAULT_WSDL_FILE_LOCATION).read() % {'version': VERSION}
+  return [wsdl] * DEFAULT_SERVICES
+
+
+def LoadServices(shared_schema, wsdl_dir):
+  """Loads the services and prints the growth of resident memory."""
+  wsdls = GetWsdls(wsdl_dir)
+  gc.collect()
+  start = GetResidentMemory()
+  services = []
+  for wsdl in wsdls:
+    service = SOAPpy.WSDL.Proxy(wsdl, noroot=1)
+    if shared_schema:
+      service = SchemaSnapshot.SnapshotProxy(
+          SchemaSnapshot.CreateSnapshot(service), noroot=1)
+    services.append(service)
+  gc.collect()
+  stats = SchemaRegistry.GetSchemaRegistry().GetStats()
+  print '%d %.1f %d %d' % (len(services), GetResidentMemory() - start,
+                           stats['requests'], stats['definitions'])
+
+
+def RunInProcess(mode, wsdl_dir):
+  """Runs LoadServices in a new process and returns its results."""
+  args = [sys.executable, __file__, '--' + mode]
+  if wsdl_dir:
+    args.append(wsdl_dir)
+  output = subprocess.Popen(args, stdout=subprocess.PIPE,
+                            stderr=open(os.devnull, 'w')).communicate()[0]
+  count, memory, requests, definitions = output.split()
+  return int(count), float(memory), int(requests), int(definitions)
+
+
+def main(wsdl_dir):
+  count, parsed_memory = RunInProcess('parsed', wsdl_dir)[:2]
+  unused_count, shared_memory, requests, definitions = RunInProcess(
+      'shared', wsdl_dir)
+
+  print 'Services:              %d' % count
+  print 'Parsed WSDLs:          %.1f MB' % parsed_memory
+  print 'Shared schema:         %.1f MB' % shared_memory
+  print 'Definitions:           %d requested, %d distinct' % (requests,
+                                                              definitions)
+
+
+if __name__ == '__main__':
+  if len(sys.argv) > 1 and sys.argv[1] in ('--parsed', '--shared'):
+    LoadServices(sys.argv[1] == '--shared', (sys.argv[2:] or [None])[0])
+  else:
+    main((sys.argv[1:] or [None])[0])
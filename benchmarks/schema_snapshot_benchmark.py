@@ -0,0 +1,86 @@
+#!/usr/bin/python
+#
+# Copyright 2013 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compares building a service proxy from a WSDL and from a schema snapshot.
+
+Usage: python schema_snapshot_benchmark.py [iterations]
+"""
+
+__author__ = 'agent@local (agent)'
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+import warnings
+sys.path.insert(0, os.path.join('..'))
+
+from adspygoogle import SOAPpy
+from adspygoogle.common.soappy import SchemaSnapshot
+
+
+WSDL_FILE_LOCATION = os.path.join('..', 'tests', 'adspygoogle', 'adwords',
+                                  'data', 'campaign_service.wsdl')
+VERSION = 'v201309'
+DEFAULT_ITERATIONS = 20
+
+
+def TimeIterations(function, iterations):
+  """Returns the mean number of seconds a single call to a function takes."""
+  start = time.time()
+  for unused_i in xrange(iterations):
+    function()
+  return (time.time() - start) / iterations
+
+
+def main(iterations):
+  warnings.simplefilter('ignore')
+  wsdl_path = os.path.abspath(WSDL_FILE_LOCATION)
+  wsdl_xml = open(wsdl_path).read() % {'version': VERSION}
+
+  def ParseWsdl():
+    return SOAPpy.WSDL.Proxy(wsdl_xml, noroot=1)
+
+  snapshot_dir = tempfile.mkdtemp()
+  try:
+    snapshot_path = os.path.join(snapshot_dir, 'CampaignService.snapshot')
+    SchemaSnapshot.SaveSnapshot(SchemaSnapshot.CreateSnapshot(ParseWsdl()),
+                                snapshot_path)
+
+    def LoadSnapshot():
+      return SchemaSnapshot.SnapshotProxy(
+          SchemaSnapshot.LoadSnapshot(snapshot_path), noroot=1)
+
+    parse_time = TimeIterations(ParseWsdl, iterations)
+    load_time = TimeIterations(LoadSnapshot, iterations)
+    snapshot_size = os.path.getsize(snapshot_path)
+  finally:
+    shutil.rmtree(snapshot_dir)
+
+  print 'Fixture:          %s (%d bytes)' % (wsdl_path, len(wsdl_xml))
+  print 'Snapshot size:    %d bytes' % snapshot_size
+  print 'Iterations:       %d' % iterations
+  print 'Cold WSDL parse:  %.2f ms' % (parse_time * 1000)
+  print 'Snapshot load:    %.2f ms' % (load_time * 1000)
+  print 'Speedup:          %.1fx' % (parse_time / load_time)
+
+
+if __name__ == '__main__':
+  if len(sys.argv) > 1:
+    main(int(sys.argv[1]))
+  else:
+    main(DEFAULT_ITERATIONS)
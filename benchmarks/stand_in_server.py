@@ -0,0 +1,269 @@
+#!/usr/bin/python
+#
+# Copyright 2013 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""A local HTTP server standing in for the AdWords API.
+
+The server answers the requests a client makes for CampaignService and for
+report downloads, so benchmarks exercise the library's whole call path,
+sockets included, without reaching Google's servers:
+
+  GET  .../CampaignService?wsdl             The CampaignService test WSDL.
+  GET  .../reportdownload/<v>/reportDefinition.xsd
+                                            A small report definition XSD.
+  GET  .../reportdownload/<v>?__rd=<id>     A CSV report of report_rows rows.
+  POST .../reportdownload/<v>               The same CSV report.
+  POST .../CampaignService                  A get or mutate response holding
+                                            the given number of campaigns.
+
+Responses are built from the AdWords test data, and each answer can be delayed
+by a set latency to stand in for the network. The number of campaigns and
+report rows, and the latency, can be changed while the server runs.
+
+Run on its own, the server listens until interrupted, which lets scripts and
+examples be pointed at it.
+
+Usage: python stand_in_server.py [port]
+"""
+
+__author__ = 'agent@local (agent)'
+
+import BaseHTTPServer
+import gzip
+import os
+import re
+import SocketServer
+import StringIO
+import sys
+import threading
+import time
+import urllib
+
+
+VERSION = 'v201309'
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..',
+                        'tests', 'adspygoogle', 'adwords', 'data')
+WSDL_FILE_LOCATION = os.path.join(DATA_DIR, 'campaign_service.wsdl')
+RESPONSE_FILE_LOCATION = os.path.join(DATA_DIR, 'integration_test_response.xml')
+REPORT_PATH = '/api/adwords/reportdownload/'
+REPORT_XSD = """<?xml version="1.0" encoding="UTF-8"?>
+<xsd:schema xmlns:xsd="http://www.w3.org/2001/XMLSchema"
+    targetNamespace="https://adwords.google.com/api/adwords/cm/%(version)s">
+  <xsd:element name="reportDefinition">
+    <xsd:complexType>
+      <xsd:sequence>
+        <xsd:element name="reportName" type="xsd:string"/>
+        <xsd:element name="reportType" type="xsd:string"/>
+        <xsd:element name="dateRangeType" type="xsd:string"/>
+        <xsd:element name="downloadFormat" type="xsd:string"/>
+      </xsd:sequence>
+    </xsd:complexType>
+  </xsd:element>
+</xsd:schema>
+"""
+REPORT_HEADER = 'Day,Campaign ID,Campaign,Impressions,Clicks,Cost\n'
+REPORT_ROW = '2013-10-%02d,%d,Campaign #%d,%d,%d,%d\n'
+MUTATE_REGEX = re.compile(r'<(\w+:)?mutate[ >]')
+
+
+def _ReadResponseParts():
+  """Returns the parts of the test get response campaigns are put between."""
+  response = open(RESPONSE_FILE_LOCATION).read() % {'version': VERSION}
+  body_start = response.index('<soap:Body>') + len('<soap:Body>')
+  entry_start = response.index('<entries>') + len('<entries>')
+  entry_end = response.index('</entries>')
+  return (response[:body_start], response[entry_start:entry_end],
+          response[response.index('</soap:Body>'):])
+
+
+class StandInHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+
+  """Answers a single request made to the stand-in server."""
+
+  protocol_version = 'HTTP/1.1'
+  # Send each response in as few packets as possible, and without waiting for
+  # acknowledgements, so the server's own TCP settings do not skew timings.
+  wbufsize = -1
+  disable_nagle_algorithm = True
+
+  def do_GET(self):
+    path, query = urllib.splitquery(self.path)
+    if query == 'wsdl' and path.endswith('/CampaignService'):
+      self.__Reply(self.server.GetWsdl())
+    elif path.startswith(REPORT_PATH) and path.endswith('.xsd'):
+      self.__Reply(REPORT_XSD % {'version': VERSION})
+    elif path.startswith(REPORT_PATH):
+      self.__ReplyLater(self.server.GetReport(), 'text/csv')
+    else:
+      self.__Reply('Not found: %s' % self.path, 'text/plain', 404)
+
+  def do_POST(self):
+    body = self.rfile.read(int(self.headers.getheader('Content-Length') or 0))
+    if self.headers.getheader('Content-Encoding') == 'gzip':
+      body = gzip.GzipFile(fileobj=StringIO.StringIO(body)).read()
+    if self.path.startswith(REPORT_PATH):
+      self.__ReplyLater(self.server.GetReport(), 'text/csv')
+    elif self.path.endswith('/CampaignService'):
+      self.__ReplyLater(self.server.GetSoapResponse(
+          bool(MUTATE_REGEX.search(body))))
+    else:
+      self.__Reply('Not found: %s' % self.path, 'text/plain', 404)
+
+  def log_message(self, *unused_args):
+    """Keeps the server quiet, as it answers thousands of requests."""
+    pass
+
+  def __ReplyLater(self, body, content_type='text/xml; charset=UTF-8'):
+    """Replies once the server's latency has passed."""
+    if self.server.latency:
+      time.sleep(self.server.latency)
+    self.__Reply(body, content_type)
+
+  def __Reply(self, body, content_type='text/xml; charset=UTF-8', code=200):
+    """Sends a complete response, keeping the connection open."""
+    self.server.CountRequest()
+    self.send_response(code)
+    self.send_header('Content-Type', content_type)
+    self.send_header('Content-Length', str(len(body)))
+    self.end_headers()
+    self.wfile.write(body)
+    self.wfile.flush()
+
+
+class StandInServer(SocketServer.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+
+  """Serves CampaignService and report downloads on a local port.
+
+  Attributes:
+    entities: int Number of campaigns in each get and mutate response.
+    report_rows: int Number of rows in each report.
+    latency: float Seconds to wait before answering calls and downloads.
+  """
+
+  daemon_threads = True
+  allow_reuse_address = True
+
+  def __init__(self, port=0, entities=1, report_rows=1000, latency=0.0):
+    """Inits StandInServer, binding it to a port on localhost.
+
+    Args:
+      [optional]
+      port: int Port to listen on, 0 for any free port.
+      entities: int Number of campaigns in each get and mutate response.
+      report_rows: int Number of rows in each report.
+      latency: float Seconds to wait before answering calls and downloads.
+    """
+    BaseHTTPServer.HTTPServer.__init__(self, ('127.0.0.1', port),
+                                       StandInHandler)
+    self.entities = entities
+    self.report_rows = report_rows
+    self.latency = latency
+    self.__wsdl = open(WSDL_FILE_LOCATION).read() % {'version': VERSION}
+    self.__head, self.__entry, self.__tail = _ReadResponseParts()
+    self.__responses = {}
+    self.__reports = {}
+    self.__requests = 0
+    self.__lock = threading.Lock()
+    self.__thread = None
+
+  def GetUrl(self):
+    """Returns the URL of the server, to use as the API server of a client."""
+    return 'http://%s:%d' % self.server_address
+
+  def Start(self):
+    """Starts answering requests on a background thread."""
+    self.__thread = threading.Thread(target=self.serve_forever,
+                                     name='StandInServer')
+    self.__thread.setDaemon(True)
+    self.__thread.start()
+
+  def Stop(self):
+    """Stops answering requests and closes the listening socket."""
+    self.shutdown()
+    self.__thread.join()
+    self.server_close()
+
+  def CountRequest(self):
+    """Counts a request answered."""
+    self.__lock.acquire()
+    try:
+      self.__requests += 1
+    finally:
+      self.__lock.release()
+
+  def GetRequestCount(self):
+    """Returns the number of requests answered so far."""
+    return self.__requests
+
+  def GetWsdl(self):
+    """Returns the CampaignService WSDL."""
+    return self.__wsdl
+
+  def GetSoapResponse(self, mutate):
+    """Returns a get or mutate response holding the current number of entities.
+
+    Args:
+      mutate: bool Whether to answer a mutate call rather than a get call.
+
+    Returns:
+      str The SOAP response.
+    """
+    key = (mutate, self.entities)
+    response = self.__responses.get(key)
+    if response is None:
+      if mutate:
+        body = ['<mutateResponse xmlns="https://adwords.google.com/api/adwords/'
+                'cm/%s"><rval><ListReturnValue.Type>CampaignReturnValue'
+                '</ListReturnValue.Type>' % VERSION]
+        body.extend(['<value>%s</value>' % self.__entry] * self.entities)
+        body.append('</rval></mutateResponse>')
+      else:
+        body = ['<getResponse xmlns="https://adwords.google.com/api/adwords/'
+                'cm/%s"><rval><totalNumEntries>%d</totalNumEntries>'
+                '<Page.Type>CampaignPage</Page.Type>'
+                % (VERSION, self.entities)]
+        body.extend(['<entries>%s</entries>' % self.__entry] * self.entities)
+        body.append('</rval></getResponse>')
+      response = ''.join([self.__head] + body + [self.__tail])
+      self.__responses[key] = response
+    return response
+
+  def GetReport(self):
+    """Returns a CSV report holding the current number of rows."""
+    report = self.__reports.get(self.report_rows)
+    if report is None:
+      rows = [REPORT_HEADER]
+      for i in xrange(self.report_rows):
+        rows.append(REPORT_ROW % (i % 28 + 1, 1000 + i % 50, i % 50, i * 7,
+                                  i % 13, i * 10000))
+      report = ''.join(rows)
+      self.__reports[self.report_rows] = report
+    return report
+
+
+def main(port):
+  server = StandInServer(port)
+  print 'Serving on %s' % server.GetUrl()
+  try:
+    server.serve_forever()
+  except KeyboardInterrupt:
+    server.server_close()
+
+
+if __name__ == '__main__':
+  if len(sys.argv) > 1:
+    main(int(sys.argv[1]))
+  else:
+    main(8080)
@@ -19,9 +19,13 @@
 __author__ = ('api.kwinter@gmail.com (Kevin Winter)',
               'api.jdilallo@gmail.com (Joseph DiLallo)')
 
+import httplib
 import os
+import shutil
 import StringIO
 import sys
+import tempfile
+import threading
 import unittest
 sys.path.insert(0, os.path.join('..', '..', '..'))
 
@@ -29,12 +33,17 @@ import mock
 
 from adspygoogle.adwords.AdWordsClient import AdWordsClient
 from adspygoogle.common.Errors import ValidationError
+from adspygoogle.common.WsdlCache import WsdlCache
 
 
 DEFAULT_HEADERS = {
     'userAgent': 'Foo Bar',
     'developerToken': 'devtoken'
 }
+SERVER = 'https://adwords.google.com'
+VERSION = 'v201309'
+WSDL_FILE_LOCATION = os.path.join('data', 'campaign_service.wsdl')
+RESPONSE_FILE_LOCATION = os.path.join('data', 'integration_test_response.xml')
 
 
 class AdWordsClientValidationTest(unittest.TestCase):
@@ -208,6 +217,173 @@ class AdWordsClientServiceTest(unittest.TestCase):
       service = self.client.GetOfflineConversionFeedService()
       self.assertEquals('OfflineConversionFeedService', service._service_name)
 
+  def testGetService_reusesRegisteredService(self):
+    """Tests that repeated lookups only load the WSDL once."""
+    with mock.patch('adspygoogle.SOAPpy.WSDL.Proxy') as mock_proxy:
+      service = self.client.GetCampaignService()
+      self.assertTrue(service is self.client.GetCampaignService())
+      self.assertFalse(service is self.client.GetCampaignService(
+          http_proxy='proxy.example.com:8080'))
+      self.assertEquals(2, mock_proxy.call_count)
+
+      self.assertEquals(2, self.client.EvictServices('CampaignService'))
+      self.assertFalse(service is self.client.GetCampaignService())
+      self.assertEquals(3, mock_proxy.call_count)
+
+  def testGetService_headersChange(self):
+    """Tests that registered services pick up changed headers."""
+    with mock.patch('adspygoogle.SOAPpy.WSDL.Proxy') as mock_proxy:
+      self.client.SetClientCustomerId('1234567890')
+      service = self.client.GetCampaignService()
+      self.client.SetClientCustomerId('0987654321')
+      other_service = self.client.GetCampaignService()
+      self.assertEquals(1, mock_proxy.call_count)
+
+    self.assertEquals('1234567890', service._headers['clientCustomerId'])
+    self.assertEquals('0987654321', other_service._headers['clientCustomerId'])
+    self.assertTrue(service._soappyservice is other_service._soappyservice)
+
+
+class AdWordsClientConcurrencyTest(unittest.TestCase):
+
+  """Tests making calls through one client from several threads."""
+
+  THREADS = 4
+
+  def setUp(self):
+    self.cache_dir = tempfile.mkdtemp()
+    WsdlCache(self.cache_dir).Put(
+        SERVER, VERSION, 'cm', 'CampaignService',
+        open(WSDL_FILE_LOCATION).read() % {'version': VERSION})
+    headers = DEFAULT_HEADERS.copy()
+    headers['authToken'] = 'token'
+    self.client = AdWordsClient(headers=headers, config={
+        'home': self.cache_dir,
+        'log_home': self.cache_dir,
+        'wsdl_cache_dir': self.cache_dir,
+        'xml_parser': '2',
+        'xml_log': 'n',
+        'request_log': 'n',
+        'compress': 'n'
+    })
+
+  def tearDown(self):
+    shutil.rmtree(self.cache_dir)
+
+  def testCallsRunConcurrently(self):
+    """Tests that calls through one service are in flight at the same time."""
+    response = open(RESPONSE_FILE_LOCATION).read() % {'version': VERSION}
+    state = {'in_flight': 0, 'max_in_flight': 0}
+    state_lock = threading.Lock()
+    all_in_flight = threading.Event()
+
+    class BlockingHTTPS(object):
+      """Holds each response back until every thread has sent its request."""
+
+      _http_vsn_str = 'HTTP/1.1'
+
+      def __init__(self, unused_host, **unused_kwargs):
+        pass
+
+      def putrequest(self, unused_method, unused_path):
+        pass
+
+      def putheader(self, unused_header, *unused_values):
+        pass
+
+      def endheaders(self):
+        pass
+
+      def send(self, unused_data):
+        pass
+
+      def getreply(self):
+        state_lock.acquire()
+        try:
+          state['in_flight'] += 1
+          state['max_in_flight'] = max(state['max_in_flight'],
+                                       state['in_flight'])
+          if state['in_flight'] == AdWordsClientConcurrencyTest.THREADS:
+            all_in_flight.set()
+        finally:
+          state_lock.release()
+        all_in_flight.wait(10)
+        state_lock.acquire()
+        try:
+          state['in_flight'] -= 1
+        finally:
+          state_lock.release()
+        return 200, 'OK', httplib.HTTPMessage(StringIO.StringIO(
+            'Content-Type: text/xml; charset=UTF-8\r\n\r\n'))
+
+      def getfile(self):
+        return StringIO.StringIO(response)
+
+    service = self.client.GetCampaignService(SERVER, VERSION)
+    results = []
+
+    def Call():
+      results.append(service.Get({'fields': ['Id', 'Name']}))
+
+    with mock.patch('httplib.HTTPS', BlockingHTTPS):
+      threads = [threading.Thread(target=Call)
+                 for unused_i in range(self.THREADS)]
+      for thread in threads:
+        thread.start()
+      for thread in threads:
+        thread.join()
+
+    self.assertEquals(self.THREADS, state['max_in_flight'])
+    self.assertEquals(self.THREADS, len(results))
+    for result in results:
+      self.assertEquals('5', result[0]['totalNumEntries'])
+    self.assertEquals(5 * self.THREADS, self.client.GetUnits())
+
+  def testExecuteBatch(self):
+    """Tests running a batch of calls, one of which fails."""
+    response = open(RESPONSE_FILE_LOCATION).read() % {'version': VERSION}
+
+    class CannedHTTPS(object):
+      """Answers every request with the same response."""
+
+      _http_vsn_str = 'HTTP/1.1'
+
+      def __init__(self, unused_host, **unused_kwargs):
+        pass
+
+      def putrequest(self, unused_method, unused_path):
+        pass
+
+      def putheader(self, unused_header, *unused_values):
+        pass
+
+      def endheaders(self):
+        pass
+
+      def send(self, unused_data):
+        pass
+
+      def getreply(self):
+        return 200, 'OK', httplib.HTTPMessage(StringIO.StringIO(
+            'Content-Type: text/xml; charset=UTF-8\r\n\r\n'))
+
+      def getfile(self):
+        return StringIO.StringIO(response)
+
+    service = self.client.GetCampaignService(SERVER, VERSION)
+    items = [(service, 'Get', ({'fields': ['Id', 'Name']},))
+             for unused_i in range(self.THREADS)]
+    items.insert(1, (service, 'NoSuchMethod', ()))
+    with mock.patch('httplib.HTTPS', CannedHTTPS):
+      results = self.client.ExecuteBatch(items)
+
+    self.assertEquals(self.THREADS + 1, len(results))
+    self.assertEquals([1], [index for index, unused_error
+                            in results.GetErrors()])
+    for index in (0, 2, 3, 4):
+      self.assertEquals('5', results[index].GetResult()[0]['totalNumEntries'])
+    self.assertEquals(self.THREADS + 1, results.GetTimings()['calls'])
+
 
 if __name__ == '__main__':
   unittest.main()
@@ -23,6 +23,8 @@ import sys
 sys.path.insert(0, os.path.join('..', '..', '..'))
 import unittest
 
+import mock
+
 from adspygoogle.adwords import AdWordsUtils
 from adspygoogle.adwords.AdWordsSoapBuffer import AdWordsSoapBuffer
 from adspygoogle.common import Utils
@@ -59,6 +61,21 @@ class AdWordsUtilsTest(unittest.TestCase):
 
     self.assertEqual(Utils.GetErrorFromHtml(data), self.__class__.TRIGGER_MSG)
 
+  def testGetClientCustomerIds(self):
+    """Test that client accounts are paged through, leaving out managers."""
+    service = mock.Mock()
+    service.Get.side_effect = [
+        [{'totalNumEntries': '3',
+          'entries': [{'customerId': '1', 'canManageClients': 'true'},
+                      {'customerId': '2', 'canManageClients': 'false'}]}],
+        [{'totalNumEntries': '3',
+          'entries': [{'customerId': '3', 'canManageClients': 'false'}]}]
+    ]
+    self.assertEqual(['2', '3'],
+                     AdWordsUtils.GetClientCustomerIds(service, page_size=2))
+    self.assertEqual('2',
+                     service.Get.call_args[0][0]['paging']['startIndex'])
+
   def testDataFileCurrencies(self):
     """Test whether csv data file with currencies is valid."""
     cols = 2
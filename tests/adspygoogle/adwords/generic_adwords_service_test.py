@@ -20,6 +20,7 @@ __author__ = 'api.jdilallo@gmail.com (Joseph DiLallo)'
 
 import os
 import sys
+import time
 import unittest
 sys.path.insert(0, os.path.join('..', '..', '..'))
 
@@ -73,6 +74,34 @@ class UtilsTest(unittest.TestCase):
     self.assertRaises(AdWordsError, service._HandleLogsAndErrors,
                       buffer_, '', '', {'data': 'datum'})
 
+  def testSetHeaders_reusesHeadersUntilValuesChange(self):
+    """Tests that SOAP headers are only built again when a header changes."""
+    headers = {'authToken': 'token', 'developerToken': 'dev',
+               'userAgent': 'agent', 'clientCustomerId': 1234567890}
+    with mock.patch('adspygoogle.SOAPpy.WSDL.Proxy'):
+      service = GenericAdWordsService(
+          headers, {'access': '', 'units': '0', 'xml_log': 'n',
+                    'request_log': 'n', 'debug': 'n', 'raw_response': 'n',
+                    'auth_token_epoch': time.time()},
+          {'group': 'cm', 'server': '', 'version': 'v201309',
+           'http_proxy': ''},
+          object(), object(), 'CampaignService')
+
+    service._SetHeaders()
+    soap_headers = service._soap_headers
+    self.assertEqual('1234567890',
+                     soap_headers.RequestHeader._getItemAsList(
+                         'cm:clientCustomerId')[0]._data)
+    service._SetHeaders()
+    self.assertTrue(soap_headers is service._soap_headers)
+
+    headers['clientCustomerId'] = 987654321
+    service._SetHeaders()
+    soap_headers = service._soap_headers
+    self.assertEqual('987654321',
+                     soap_headers.RequestHeader._getItemAsList(
+                         'cm:clientCustomerId')[0]._data)
+
 
 if __name__ == '__main__':
   unittest.main()
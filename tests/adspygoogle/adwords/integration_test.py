@@ -152,6 +152,26 @@ class AdWordsIntegrationTest(unittest.TestCase):
     finally:
       shutil.rmtree(directory)
 
+  def testStreamedRequest(self):
+    """Tests streaming the entries of a page returned by AdWords.
+
+    Since this library is tightly integrated with SOAPpy, this test mocks out
+    the HTTP level rather than the SOAPpy proxy level.
+    """
+    oauth2_credential = self._CreateOAuth2Credential()
+
+    client = self._CreateAdWordsClient(oauth2_credential)
+
+    campaign_service = self._CreateCampaignService(client)
+    campaign_service._config['compress'] = False
+
+    page = self._MakeSoapRequest(campaign_service, True)
+
+    # The entries are yielded one at a time, and the operations are counted
+    # once all of them have been read.
+    self.assertEquals(EXPECTED_PAGE, page)
+    self.assertEquals(8, client.GetOperations())
+
   def testWithInvalidUserAgent(self):
     """Tests instantiation of an AdWords client with an invalid user agent.
 
@@ -246,7 +266,7 @@ class AdWordsIntegrationTest(unittest.TestCase):
       mock_urlopen.return_value = StringIO.StringIO(wsdl_data)
       return client.GetCampaignService()
 
-  def _MakeSoapRequest(self, campaign_service):
+  def _MakeSoapRequest(self, campaign_service, stream=False):
     """Makes a "get" request against the AdWords CampaignService.
 
     All of the network interactions are mocked out.
@@ -255,6 +275,9 @@ class AdWordsIntegrationTest(unittest.TestCase):
       campaign_service:
           adspygoogle.adwords.GenericAdWordsService.GenericAdWordsService A
           service proxy for the AdWords CampaignService.
+      [optional]
+      stream: bool Whether to stream the page's entries, then put them back
+              into the page.
 
     Returns:
       dict A page object returned from the CampaignService.get operation.
@@ -294,7 +317,13 @@ class AdWordsIntegrationTest(unittest.TestCase):
       https_instance.getreply.return_value = expected_response
       https_instance.getfile.return_value = StringIO.StringIO(response_xml)
 
-      page = campaign_service.Get(selector)[0]
+      if stream:
+        streamed_response = campaign_service.Stream.Get(selector)
+        entries = list(streamed_response)
+        page = streamed_response.page
+        page['entries'] = entries
+      else:
+        page = campaign_service.Get(selector)[0]
 
       # Ensure that the SOAP request matches the expected output.
       https_instance.send.assert_called_with(_RequestMatcher(expected_request))
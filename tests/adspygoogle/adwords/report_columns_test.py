@@ -0,0 +1,191 @@
+#!/usr/bin/python
+#
+# Copyright 2013 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Unit tests to cover ReportColumns."""
+
+__author__ = 'agent@local (agent)'
+
+import gzip
+import httplib
+import os
+import shutil
+import StringIO
+import sys
+import tempfile
+import unittest
+import urllib
+import urllib2
+sys.path.insert(0, os.path.join('..', '..', '..'))
+
+import mock
+import numpy
+
+from adspygoogle import AdWordsClient
+from adspygoogle.adwords.ReportDownloader import ReportHeader
+from adspygoogle.adwords.util import ReportColumns
+
+
+REPORT_FIELDS = [
+    {'fieldName': 'Date', 'displayFieldName': 'Day', 'fieldType': 'Date'},
+    {'fieldName': 'CampaignId', 'displayFieldName': 'Campaign ID',
+     'fieldType': 'Long'},
+    {'fieldName': 'CampaignName', 'displayFieldName': 'Campaign',
+     'fieldType': 'String'},
+    {'fieldName': 'CampaignStatus', 'displayFieldName': 'Campaign state',
+     'fieldType': 'CampaignStatus',
+     'enumValues': ['ACTIVE', 'DELETED', 'PAUSED']},
+    {'fieldName': 'Cost', 'displayFieldName': 'Cost', 'fieldType': 'Money'},
+    {'fieldName': 'Clicks', 'displayFieldName': 'Clicks', 'fieldType': 'Long'},
+    {'fieldName': 'Ctr', 'displayFieldName': 'CTR', 'fieldType': 'Double'},
+    {'fieldName': 'IsNegative', 'displayFieldName': 'Is negative',
+     'fieldType': 'Boolean'}
+]
+QUERY = ('SELECT Date, CampaignId, CampaignName, CampaignStatus, Cost, Clicks,'
+         ' Ctr, IsNegative FROM CAMPAIGN_PERFORMANCE_REPORT DURING LAST_7_DAYS')
+COLUMNS = ('Day', 'Campaign ID', 'Campaign', 'Campaign state', 'Cost',
+           'Clicks', 'CTR', 'Is negative')
+
+
+def GetRows(count):
+  """Returns a ReportHeader followed by count rows, as strings."""
+  rows = [ReportHeader('REPORT', COLUMNS)]
+  for i in range(count):
+    rows.append(('2013-10-%02d' % (i % 28 + 1), str(1000 + i),
+                 'Campaign #%d' % i, ('enabled', 'paused')[i % 2],
+                 str(i * 10000), str(i), '%.2f%%' % (i / 10.0),
+                 ('false', 'true')[i % 3 == 0]))
+  return rows
+
+
+class ReportColumnsTest(unittest.TestCase):
+
+  """Tests for the adspygoogle.adwords.util.ReportColumns module."""
+
+  def testGetQueryFieldNames(self):
+    """Tests that the selected fields are read from AWQL."""
+    self.assertEqual(['Date', 'CampaignId', 'CampaignName', 'CampaignStatus',
+                      'Cost', 'Clicks', 'Ctr', 'IsNegative'],
+                     ReportColumns.GetQueryFieldNames(QUERY))
+    self.assertEqual([], ReportColumns.GetQueryFieldNames('Not AWQL'))
+
+  def testReadReport(self):
+    """Tests that columns are typed and read across chunks."""
+    report = ReportColumns.ReadReport(
+        iter(GetRows(10)), ReportColumns.GetQueryFieldNames(QUERY),
+        REPORT_FIELDS, True, 3)
+
+    self.assertEqual('REPORT', report.title)
+    self.assertEqual(list(COLUMNS), report.display_names)
+    self.assertEqual(10, len(report))
+    columns = report.columns
+    self.assertEqual(numpy.dtype('datetime64[D]'), columns['Date'].dtype)
+    self.assertEqual(numpy.datetime64('2013-10-03'), columns['Date'][2])
+    self.assertEqual(numpy.int64, columns['CampaignId'].dtype)
+    self.assertEqual(range(1000, 1010), columns['CampaignId'].tolist())
+    self.assertEqual('Campaign #9', columns['CampaignName'][9])
+    self.assertEqual(numpy.uint8, columns['CampaignStatus'].dtype)
+    self.assertEqual(['enabled', 'paused'], report.categories['CampaignStatus'])
+    self.assertEqual([0, 1] * 5, columns['CampaignStatus'].tolist())
+    self.assertEqual(['enabled', 'paused'] * 5,
+                     report.GetValues('CampaignStatus').tolist())
+    self.assertEqual(numpy.int64, columns['Cost'].dtype)
+    self.assertEqual(90000, columns['Cost'][9])
+    self.assertEqual(numpy.float64, columns['Ctr'].dtype)
+    self.assertAlmostEqual(0.9, columns['Ctr'][9])
+    self.assertEqual([True, False, False] * 3 + [True],
+                     columns['IsNegative'].tolist())
+
+  def testReadReport_missingValues(self):
+    """Tests that missing values become NaN and NaT."""
+    rows = [ReportHeader('REPORT', ('Day', 'Cost', 'Clicks')),
+            ('2013-10-01', '1.23', '5'),
+            ('--', ' --', '--')]
+    report = ReportColumns.ReadReport(iter(rows), None, REPORT_FIELDS)
+
+    self.assertEqual(['Day', 'Cost', 'Clicks'], report.names)
+    self.assertTrue(numpy.isnat(report.columns['Day'][1]))
+    self.assertEqual(1.23, report.columns['Cost'][0])
+    self.assertTrue(numpy.isnan(report.columns['Cost'][1]))
+    self.assertEqual(numpy.float64, report.columns['Clicks'].dtype)
+    self.assertEqual(5, report.columns['Clicks'][0])
+    self.assertTrue(numpy.isnan(report.columns['Clicks'][1]))
+
+  def testReadReport_noFields(self):
+    """Tests that columns of unknown type are read as strings, even if empty."""
+    report = ReportColumns.ReadReport(iter(GetRows(0)))
+    self.assertEqual(list(COLUMNS), report.names)
+    self.assertEqual(0, len(report))
+    self.assertEqual('S', report.columns['Clicks'].dtype.kind)
+
+  def testSave(self):
+    """Tests saving and loading reports, as .npz and as mapped columns."""
+    report = ReportColumns.ReadReport(
+        iter(GetRows(100)), ReportColumns.GetQueryFieldNames(QUERY),
+        REPORT_FIELDS)
+    work_dir = tempfile.mkdtemp()
+    try:
+      npz_path = os.path.join(work_dir, 'report.npz')
+      report.SaveNpz(npz_path)
+      columns_path = os.path.join(work_dir, 'columns')
+      report.SaveColumns(columns_path)
+
+      for loaded in (ReportColumns.Load(npz_path),
+                     ReportColumns.Load(columns_path)):
+        self.assertEqual(report.title, loaded.title)
+        self.assertEqual(report.names, loaded.names)
+        self.assertEqual(report.display_names, loaded.display_names)
+        self.assertEqual(report.categories, loaded.categories)
+        for name in report.names:
+          self.assertEqual(report.columns[name].dtype,
+                           loaded.columns[name].dtype)
+          self.assertEqual(report.columns[name].tolist(),
+                           loaded.columns[name].tolist())
+      self.assertTrue(isinstance(
+          ReportColumns.Load(columns_path).columns['Clicks'], numpy.memmap))
+    finally:
+      shutil.rmtree(work_dir)
+
+  def testDownloadReportColumnsWithAwql(self):
+    """Tests downloading a report straight into columns."""
+    with mock.patch('adspygoogle.adwords.util.XsdToWsdl.CreateWsdlFromXsdUrl'):
+      client = AdWordsClient(headers={'authToken': 'AUTH TOKEN',
+                                      'userAgent': 'USER AGENT',
+                                      'developerToken': 'DEV TOKEN'})
+      downloader = client.GetReportDownloader()
+    report = '"REPORT"\nCampaign ID,Clicks\n1,5\n2,7\nTotal,12\n'
+    buf = StringIO.StringIO()
+    gzip_file = gzip.GzipFile(mode='wb', fileobj=buf)
+    gzip_file.write(report)
+    gzip_file.close()
+    headers = httplib.HTTPMessage(StringIO.StringIO(
+        'Content-Type: text/csv\r\nContent-Encoding: gzip\r\n\r\n'))
+    response = urllib.addinfourl(StringIO.StringIO(buf.getvalue()), headers,
+                                 'url')
+    response.code = 200
+    downloader._CheckAuthentication = mock.Mock()
+
+    with mock.patch('urllib2.urlopen', return_value=response):
+      columns = downloader.DownloadReportColumnsWithAwql(
+          'SELECT CampaignId, Clicks FROM CAMPAIGN_PERFORMANCE_REPORT',
+          REPORT_FIELDS)
+
+    self.assertEqual(['CampaignId', 'Clicks'], columns.names)
+    self.assertEqual([1, 2], columns.columns['CampaignId'].tolist())
+    self.assertEqual([5, 7], columns.columns['Clicks'].tolist())
+
+
+if __name__ == '__main__':
+  unittest.main()
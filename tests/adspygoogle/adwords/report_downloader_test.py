@@ -18,12 +18,18 @@
 
 __author__ = 'api.jdilallo@gmail.com (Joseph DiLallo)'
 
+import cgi
 import datetime
+import gzip
+import httplib
 import os
+import shutil
 import StringIO
 import sys
+import tempfile
 sys.path.insert(0, os.path.join('..', '..', '..'))
 import unittest
+import urllib
 import urllib2
 
 import mock
@@ -32,6 +38,8 @@ from oauth2client.client import OAuth2Credentials
 from adspygoogle import AdWordsClient
 from adspygoogle.adwords.AdWordsErrors import AdWordsError
 from adspygoogle.adwords.AdWordsErrors import AdWordsReportError
+from adspygoogle.adwords.ReportDownloader import ParseReportDate
+from adspygoogle.common.Errors import ValidationError
 
 
 class ReportDownloaderTest(unittest.TestCase):
@@ -192,6 +200,261 @@ class ReportDownloaderTest(unittest.TestCase):
     except KeyError, e:
       self.assertIs(exception1, e)
 
+  def _MockCompressedResponse(self, report):
+    """Makes urllib2.urlopen return a report compressed with gzip."""
+    buf = StringIO.StringIO()
+    gzip_file = gzip.GzipFile(mode='wb', fileobj=buf)
+    gzip_file.write(report)
+    gzip_file.close()
+    headers = httplib.HTTPMessage(StringIO.StringIO(
+        'Content-Type: text/csv\r\nContent-Encoding: gzip\r\n\r\n'))
+    response = urllib.addinfourl(StringIO.StringIO(buf.getvalue()), headers,
+                                 'url')
+    response.code = 200
+    urllib2.urlopen = mock.Mock(return_value=response)
+    self.service._CheckAuthentication = mock.Mock()
+
+  def testDownloadReport_decompressesResponse(self):
+    """Tests that compressed reports are decompressed on the way."""
+    report = 'Campaign,Clicks\n' + 'Campaign #1,1\n' * 50000
+    work_dir = tempfile.mkdtemp()
+    try:
+      file_path = os.path.join(work_dir, 'report.csv')
+      self._MockCompressedResponse(report)
+      self.assertEqual(file_path,
+                       self.service.DownloadReport('123', file_path=file_path))
+      self.assertEqual(report, open(file_path).read())
+
+      self._MockCompressedResponse(report)
+      self.assertEqual(report, self.service.DownloadReport('123'))
+    finally:
+      shutil.rmtree(work_dir)
+
+  def testDownloadReport_keepsGzipOutput(self):
+    """Tests that reports saved to a .gz path are written compressed."""
+    report = 'Campaign,Clicks\n' + 'Campaign #1,1\n' * 50000
+    work_dir = tempfile.mkdtemp()
+    try:
+      file_path = os.path.join(work_dir, 'report.csv.gz')
+      self._MockCompressedResponse(report)
+      self.service.DownloadReportWithAwql('SELECT', 'CSV', file_path=file_path)
+      self.assertTrue(os.path.getsize(file_path) < len(report) / 10)
+      self.assertEqual(report, gzip.open(file_path).read())
+    finally:
+      shutil.rmtree(work_dir)
+
+  def testIterReportRowsWithAwql(self):
+    """Tests that rows are parsed and converted, leaving out the totals."""
+    self._MockCompressedResponse(
+        '"CAMPAIGN_PERFORMANCE_REPORT (Oct 1, 2013-Oct 31, 2013)"\n'
+        'Day,Campaign,Cost,Clicks\n'
+        '2013-10-01,"Campaign, ""the first""",1230000,5\n'
+        '2013-10-02,Campaign #2, --,0\n'
+        'Total,--,1230000,5\n')
+    rows = self.service.IterReportRowsWithAwql(
+        'SELECT Date, CampaignName, Cost, Clicks FROM '
+        'CAMPAIGN_PERFORMANCE_REPORT', return_micros=True,
+        converters={'Day': ParseReportDate, 'Cost': int, 3: int})
+
+    header = rows.next()
+    self.assertEqual('CAMPAIGN_PERFORMANCE_REPORT (Oct 1, 2013-Oct 31, 2013)',
+                     header.title)
+    self.assertEqual(('Day', 'Campaign', 'Cost', 'Clicks'), header.columns)
+    self.assertEqual([
+        (datetime.date(2013, 10, 1), 'Campaign, "the first"', 1230000, 5),
+        (datetime.date(2013, 10, 2), 'Campaign #2', None, 0)
+    ], list(rows))
+
+  def testIterReportRowsWithAwql_tsv(self):
+    """Tests reading the rows of a TSV report without converters."""
+    self._MockCompressedResponse('"REPORT"\nCampaign\tClicks\n'
+                                 'Campaign #1\t5\nTotal\t5\n\n')
+    rows = list(self.service.IterReportRowsWithAwql('SELECT', 'TSV'))
+    self.assertEqual(('Campaign', 'Clicks'), rows[0].columns)
+    self.assertEqual([('Campaign #1', '5')], rows[1:])
+    self.assertRaises(ValidationError, self.service.IterReportRowsWithAwql,
+                      'SELECT', 'XML')
+
+  def _MockAccountResponses(self, reports, failures, http_errors=None):
+    """Makes urllib2.urlopen answer with the report of each account.
+
+    Args:
+      reports: dict Report of each customer ID.
+      failures: dict Number of times each customer ID fails on the network
+                before succeeding, -1 for a report error.
+      http_errors: dict HTTP code each customer ID fails with, without a
+                   report error in the body, and the number of times it does.
+
+    Returns:
+      dict Number of requests for each customer ID.
+    """
+    requests = {}
+
+    def Respond(request):
+      customer_id = request.headers['Clientcustomerid']
+      requests[customer_id] = requests.get(customer_id, 0) + 1
+      if failures.get(customer_id) == -1:
+        raise urllib2.HTTPError(
+            'url', 400, 'Bad Request',
+            httplib.HTTPMessage(StringIO.StringIO('')),
+            StringIO.StringIO('<reportDownloadError><type>QueryError</type>'
+                              '</reportDownloadError>'))
+      if requests[customer_id] <= failures.get(customer_id, 0):
+        raise urllib2.URLError('Connection reset')
+      code, times = (http_errors or {}).get(customer_id, (None, 0))
+      if requests[customer_id] <= times:
+        raise urllib2.HTTPError('url', code, 'Error',
+                                httplib.HTTPMessage(StringIO.StringIO('')),
+                                StringIO.StringIO('<html>Error</html>'))
+      response = urllib.addinfourl(
+          StringIO.StringIO(reports[customer_id]),
+          httplib.HTTPMessage(StringIO.StringIO('')), 'url')
+      response.code = 200
+      return response
+
+    urllib2.urlopen = mock.Mock(side_effect=Respond)
+    self.service._CheckAuthentication = mock.Mock()
+    return requests
+
+  def testDownloadReportForAccountsWithAwql_files(self):
+    """Tests that failures are retried or isolated to their account."""
+    reports = {'1': '"R"\nClicks\n1\n', '3': '"R"\nClicks\n3\n'}
+    requests = self._MockAccountResponses(reports, {'2': -1, '3': 2})
+    work_dir = tempfile.mkdtemp()
+    try:
+      results = self.service.DownloadReportForAccountsWithAwql(
+          'SELECT Clicks FROM R', 'CSV', ['1', '2', '3'], output_dir=work_dir,
+          max_workers=2, backoff=0)
+
+      self.assertEqual(os.path.join(work_dir, '1.csv'), results[0].result)
+      self.assertTrue(isinstance(results[1].error, AdWordsReportError))
+      self.assertEqual(os.path.join(work_dir, '3.csv'), results[2].result)
+      self.assertEqual(reports['3'], open(results[2].result).read())
+      self.assertEqual({'1': 1, '2': 1, '3': 3}, requests)
+    finally:
+      shutil.rmtree(work_dir)
+
+  def testDownloadReportForAccountsWithAwql_httpErrors(self):
+    """Tests that only server errors are retried, not auth failures."""
+    reports = {'1': '"R"\nClicks\n1\n', '2': '"R"\nClicks\n2\n'}
+    requests = self._MockAccountResponses(
+        reports, {}, {'1': (401, 5), '2': (503, 1)})
+    results = self.service.DownloadReportForAccountsWithAwql(
+        'SELECT Clicks FROM R', 'CSV', ['1', '2'], attempts=3, backoff=0)
+
+    self.assertTrue(isinstance(results[0].error, AdWordsError))
+    self.assertEqual(401, results[0].error.http_code)
+    self.assertEqual(reports['2'], results[1].result)
+    self.assertEqual({'1': 1, '2': 2}, requests)
+
+  def testDownloadReportForAccountsWithAwql_merged(self):
+    """Tests writing the reports of all accounts as one."""
+    reports = {}
+    for customer_id in ('1', '2', '3'):
+      reports[customer_id] = ('"R (Oct 1, 2013-Oct 31, 2013)"\n'
+                              'Campaign,Clicks\nC%s,1\nC%s,2\nTotal,3\n'
+                              % ((customer_id,) * 2))
+    requests = self._MockAccountResponses(reports, {'2': 3})
+    output = StringIO.StringIO()
+    results = self.service.DownloadReportForAccountsWithAwql(
+        'SELECT CampaignName, Clicks FROM R', 'CSV', ['1', '2', '3'],
+        fileobj=output, attempts=3, backoff=0)
+
+    self.assertEqual(
+        '"R (Oct 1, 2013-Oct 31, 2013)"\nCampaign,Clicks\n'
+        'C1,1\nC1,2\nC3,1\nC3,2\n', output.getvalue())
+    self.assertEqual([(1, results[1].error)], results.GetErrors())
+    self.assertEqual(3, requests['2'])
+    self.assertRaises(ValidationError,
+                      self.service.DownloadReportForAccountsWithAwql,
+                      'SELECT', 'XML', ['1'], fileobj=output)
+
+  def _MockShardResponses(self, failures):
+    """Makes urllib2.urlopen answer with a report for the queried dates.
+
+    Args:
+      failures: dict Number of times the shard starting on each date fails on
+                the network before succeeding.
+
+    Returns:
+      list Start and end dates of every request, in the order they were made.
+    """
+    requests = []
+
+    def Respond(request):
+      query = cgi.parse_qs(gzip.GzipFile(
+          fileobj=StringIO.StringIO(request.data)).read())['__rdquery'][0]
+      start, end = query.split('DURING ')[1].split(' ')[0].split(',')
+      requests.append((start, end))
+      attempt = len([dates for dates in requests if dates[0] == start])
+      if attempt <= failures.get(start, 0):
+        raise urllib2.URLError('Connection reset')
+      response = urllib.addinfourl(StringIO.StringIO(
+          '"R (%s-%s)"\nDay,Clicks\n%s,1\n%s,2\nTotal,3\n'
+          % (start, end, start, end)),
+          httplib.HTTPMessage(StringIO.StringIO('')), 'url')
+      response.code = 200
+      return response
+
+    urllib2.urlopen = mock.Mock(side_effect=Respond)
+    self.service._CheckAuthentication = mock.Mock()
+    return requests
+
+  def testDownloadShardedReportWithAwql(self):
+    """Tests that shards are merged in date order, retrying failed ones."""
+    requests = self._MockShardResponses({'20130111': 1})
+    report = self.service.DownloadShardedReportWithAwql(
+        'SELECT Date, Clicks FROM R DURING 20130101,20130125 ORDER BY Date',
+        'CSV', shard_days=10, max_workers=3, backoff=0)
+
+    self.assertEqual(
+        '"R (20130101-20130125)"\nDay,Clicks\n'
+        '20130101,1\n20130110,2\n20130111,1\n20130120,2\n'
+        '20130121,1\n20130125,2\n', report)
+    self.assertEqual([('20130101', '20130110'), ('20130111', '20130120'),
+                      ('20130111', '20130120'), ('20130121', '20130125')],
+                     sorted(requests))
+
+  def testDownloadShardedReportWithAwql_failure(self):
+    """Tests that nothing is written if a shard keeps failing."""
+    self._MockShardResponses({'20130111': 5})
+    work_dir = tempfile.mkdtemp()
+    try:
+      file_path = os.path.join(work_dir, 'report.csv')
+      self.assertRaises(AdWordsError,
+                        self.service.DownloadShardedReportWithAwql,
+                        'SELECT Date, Clicks FROM R DURING 20130101,20130125',
+                        'CSV', shard_days=10, file_path=file_path, attempts=2,
+                        backoff=0)
+      self.assertFalse(os.path.exists(file_path))
+    finally:
+      shutil.rmtree(work_dir)
+    self.assertRaises(ValidationError,
+                      self.service.DownloadShardedReportWithAwql,
+                      'SELECT Date, Clicks FROM R DURING LAST_7_DAYS', 'CSV')
+
+  def testDownloadShardedReportWithAwql_dateSegments(self):
+    """Tests that shards keep rows apart by their date segment."""
+    requests = self._MockShardResponses({})
+    self.assertRaises(ValidationError,
+                      self.service.DownloadShardedReportWithAwql,
+                      'SELECT KeywordText, Clicks, Ctr FROM R '
+                      'DURING 20130101,20131231', 'CSV')
+    self.assertEqual([], requests)
+
+    self.service.DownloadShardedReportWithAwql(
+        'SELECT Week, Clicks FROM R DURING 20130101,20130131', 'CSV',
+        shard_days=10, backoff=0)
+    self.assertEqual([('20130101', '20130113'), ('20130114', '20130127'),
+                      ('20130128', '20130131')], sorted(requests))
+
+    del requests[:]
+    self.service.DownloadShardedReportWithAwql(
+        'select Month,Clicks from R during 20130115,20130410', 'CSV',
+        shard_days=31, backoff=0)
+    self.assertEqual([('20130115', '20130228'), ('20130301', '20130331'),
+                      ('20130401', '20130410')], sorted(requests))
+
 
 if __name__ == '__main__':
   unittest.main()
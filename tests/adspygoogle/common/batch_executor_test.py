@@ -0,0 +1,168 @@
+#!/usr/bin/python
+#
+# Copyright 2013 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Unit tests to cover BatchExecutor."""
+
+__author__ = 'agent@local (agent)'
+
+import os
+import sys
+import threading
+import time
+import unittest
+sys.path.insert(0, os.path.join('..', '..', '..'))
+
+from adspygoogle.common import BatchExecutor
+from adspygoogle.common.Errors import Error
+
+
+class FakeService(object):
+
+  """Stands in for a GenericApiService, tracking calls in flight."""
+
+  def __init__(self, server, tracker):
+    self._op_config = {'server': server}
+    self.__tracker = tracker
+
+  def Get(self, value, delay=0.01):
+    self.__tracker.Enter(self._op_config['server'])
+    try:
+      time.sleep(delay)
+      if value < 0:
+        raise Error('Negative value %d' % value)
+      return value * 2
+    finally:
+      self.__tracker.Exit(self._op_config['server'])
+
+  def Mutate(self, operations):
+    return len(operations)
+
+
+class InFlightTracker(object):
+
+  """Records the maximum number of calls in flight, overall and per server."""
+
+  def __init__(self):
+    self.lock = threading.Lock()
+    self.in_flight = {}
+    self.max_in_flight = {}
+    self.total = 0
+    self.max_total = 0
+
+  def Enter(self, server):
+    self.lock.acquire()
+    try:
+      self.in_flight[server] = self.in_flight.get(server, 0) + 1
+      self.max_in_flight[server] = max(self.max_in_flight.get(server, 0),
+                                       self.in_flight[server])
+      self.total += 1
+      self.max_total = max(self.max_total, self.total)
+    finally:
+      self.lock.release()
+
+  def Exit(self, server):
+    self.lock.acquire()
+    try:
+      self.in_flight[server] -= 1
+      self.total -= 1
+    finally:
+      self.lock.release()
+
+
+class BatchExecutorTest(unittest.TestCase):
+
+  """Tests for the adspygoogle.common.BatchExecutor module."""
+
+  def setUp(self):
+    self.tracker = InFlightTracker()
+    self.first = FakeService('https://first.example.com', self.tracker)
+    self.second = FakeService('https://second.example.com', self.tracker)
+
+  def testExecute_preservesOrder(self):
+    """Tests that results come back in item order."""
+    # Earlier items take longer, so they finish last.
+    items = [(self.first, 'Get', (i, 0.01 * (10 - i))) for i in range(10)]
+    results = BatchExecutor.BatchExecutor(10, 10).Execute(items)
+    self.assertEqual([i * 2 for i in range(10)],
+                     [result.GetResult() for result in results])
+
+  def testExecute_recordsErrorsWithoutAborting(self):
+    """Tests that failing items do not stop the rest of the batch."""
+    items = [(self.first, 'Get', (1,)), (self.first, 'Get', (-1,)),
+             (self.second, 'Get', 3)]
+    results = BatchExecutor.BatchExecutor().Execute(items)
+    self.assertTrue(results[0].Succeeded())
+    self.assertFalse(results[1].Succeeded())
+    self.assertTrue(isinstance(results[1].error, Error))
+    self.assertRaises(Error, results[1].GetResult)
+    self.assertEqual(6, results[2].GetResult())
+    self.assertEqual([(1, results[1].error)], results.GetErrors())
+
+  def testExecute_limitsConcurrency(self):
+    """Tests the overall and per server limits on calls in flight."""
+    items = ([(self.first, 'Get', (i, 0.05)) for i in range(8)] +
+             [(self.second, 'Get', (i, 0.05)) for i in range(8)])
+    BatchExecutor.BatchExecutor(6, 2).Execute(items)
+    self.assertEqual(2, self.tracker.max_in_flight[self.first._op_config[
+        'server']])
+    self.assertEqual(2, self.tracker.max_in_flight[self.second._op_config[
+        'server']])
+    self.assertEqual(4, self.tracker.max_total)
+
+    tracker = InFlightTracker()
+    services = [FakeService('https://%d.example.com' % i, tracker)
+                for i in range(8)]
+    BatchExecutor.BatchExecutor(3, 2).Execute(
+        [(service, 'Get', (1, 0.05)) for service in services])
+    self.assertEqual(3, tracker.max_total)
+
+  def testExecute_reportsTimings(self):
+    """Tests the aggregate timings of a batch."""
+    items = [(self.first, 'Get', (i, 0.05)) for i in range(4)]
+    results = BatchExecutor.BatchExecutor(4, 4).Execute(items)
+    timings = results.GetTimings()
+    self.assertEqual(4, timings['calls'])
+    self.assertEqual(0, timings['errors'])
+    self.assertTrue(timings['call_time'] >= 0.2)
+    self.assertTrue(timings['max_call_time'] >= 0.05)
+    self.assertAlmostEqual(timings['call_time'] / 4,
+                           timings['mean_call_time'])
+    # The calls ran side by side.
+    self.assertTrue(results.elapsed < timings['call_time'])
+
+  def testExecute_emptyBatch(self):
+    """Tests that an empty batch returns no results."""
+    results = BatchExecutor.BatchExecutor().Execute([])
+    self.assertEqual([], list(results))
+    self.assertEqual(0, results.GetTimings()['calls'])
+
+  def testExecute_passesNonTupleArgsWhole(self):
+    """Tests that only a tuple args is unpacked into positional arguments."""
+    operations = [{'operator': 'ADD'}, {'operator': 'SET'}]
+    results = BatchExecutor.BatchExecutor().Execute(
+        [(self.first, 'Mutate', operations),
+         (self.first, 'Mutate', (operations,)),
+         (self.first, 'Get', 3)])
+    self.assertEqual([2, 2, 6], [result.GetResult() for result in results])
+
+  def testExecute_rejectsMalformedItems(self):
+    """Tests that items must be (service, method_name, args) tuples."""
+    self.assertRaises(ValueError, BatchExecutor.BatchExecutor().Execute,
+                      [(self.first, 'Get')])
+
+
+if __name__ == '__main__':
+  unittest.main()
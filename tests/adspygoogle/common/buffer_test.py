@@ -47,6 +47,20 @@ class BufferTest(unittest.TestCase):
     my_buffer.flush()
     self.assertEqual(my_buffer.GetBufferAsStr(), ''.join([line_1, line_2]))
 
+  def testGetBufferAsStr_cachedUntilWrite(self):
+    """Tests that the joined content is reused until the next write."""
+    my_buffer = Buffer()
+    for i in range(100):
+      my_buffer.write(i)
+    content = my_buffer.GetBufferAsStr()
+    self.assertEqual(''.join([str(i) for i in range(100)]), content)
+    self.assertTrue(content is my_buffer.GetBufferAsStr())
+    self.assertEqual(190, my_buffer.GetSize())
+
+    my_buffer.write('end')
+    self.assertEqual(content + 'end', my_buffer.GetBufferAsStr())
+    self.assertEqual(193, my_buffer.GetSize())
+
 
 if __name__ == '__main__':
   unittest.main()
@@ -0,0 +1,265 @@
+#!/usr/bin/python
+#
+# Copyright 2013 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Unit tests to cover CallStats."""
+
+__author__ = 'agent@local (agent)'
+
+import os
+import StringIO
+import sys
+import time
+import unittest
+sys.path.insert(0, os.path.join('..', '..', '..'))
+
+import mock
+
+from adspygoogle import SOAPpy
+from adspygoogle.adwords.GenericAdWordsService import GenericAdWordsService
+from adspygoogle.common import CallStats
+
+
+SERVER = 'https://adwords.google.com'
+VERSION = 'v201309'
+NS = 'https://adwords.google.com/api/adwords/cm/' + VERSION
+WSDL_FILE_LOCATION = os.path.join('..', 'adwords', 'data',
+                                  'campaign_service.wsdl')
+RESPONSE = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<soap:Envelope '
+            'xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/">'
+            '<soap:Body><getResponse xmlns="%s"><rval>'
+            '<totalNumEntries>1</totalNumEntries>'
+            '<entries><id>1</id><name>Campaign #1</name></entries>'
+            '</rval></getResponse></soap:Body></soap:Envelope>' % NS)
+
+
+def FakeCall(transport, unused_addr, data, *unused_args, **unused_kw):
+  """Stands in for HTTPTransport.call, dumping the messages like it does."""
+  transport.dump('Outgoing HTTP headers', 'POST /api/adwords/cm HTTP/1.0')
+  transport.dump('Outgoing SOAP', data)
+  transport.dump('Incoming HTTP headers', 'HTTP/1.? 200 OK')
+  transport.dump('Incoming SOAP', RESPONSE)
+  return RESPONSE, NS
+
+
+class FakeTimer(object):
+
+  """A finished call, with set times."""
+
+  def __init__(self, service_name, method_name, elapsed, phases, failed=False):
+    self.service_name = service_name
+    self.method_name = method_name
+    self.elapsed = elapsed
+    self.phases = phases
+    self.failed = failed
+
+
+class CallStatsTest(unittest.TestCase):
+
+  """Tests for the adspygoogle.common.CallStats module."""
+
+  def testCallTimer(self):
+    """Tests that marks add up the time spent in each phase."""
+    with mock.patch('time.time') as mock_time:
+      mock_time.side_effect = [10.0, 10.5, 12.0, 12.25, 13.0]
+      timer = CallStats.CallTimer('CampaignService', 'get')
+      timer.Mark(CallStats.LOCK_WAIT)
+      timer.Mark(CallStats.NETWORK)
+      timer.Mark(CallStats.LOCK_WAIT)
+      timer.Stop(True)
+    self.assertEqual({CallStats.LOCK_WAIT: 0.75, CallStats.NETWORK: 1.5},
+                     timer.phases)
+    self.assertEqual(3.0, timer.elapsed)
+    self.assertTrue(timer.failed)
+
+  def testHistogram(self):
+    """Tests the summary and estimated percentiles of a histogram."""
+    histogram = CallStats.Histogram()
+    self.assertEqual(0, histogram.GetStats()['count'])
+    self.assertEqual(None, histogram.GetStats()['p50'])
+    for value in [0.01] * 90 + [0.1] * 9 + [1.0]:
+      histogram.Add(value)
+
+    stats = histogram.GetStats()
+    self.assertEqual(100, stats['count'])
+    self.assertAlmostEqual(2.8, stats['total'])
+    self.assertAlmostEqual(0.028, stats['mean'])
+    self.assertEqual(0.01, stats['min'])
+    self.assertEqual(1.0, stats['max'])
+    self.assertTrue(0.01 <= stats['p50'] < 0.02)
+    self.assertEqual(stats['p50'], stats['p90'])
+    self.assertTrue(0.1 <= stats['p99'] < 0.2)
+
+    histogram.Add(1000.0)
+    self.assertEqual(1000.0, histogram.GetStats()['max'])
+
+  def testCallStatsRegistry(self):
+    """Tests that calls are counted per service and method."""
+    registry = CallStats.CallStatsRegistry()
+    registry.Record(FakeTimer('CampaignService', 'get', 0.5,
+                              {CallStats.NETWORK: 0.4}))
+    registry.Record(FakeTimer('CampaignService', 'get', 1.5,
+                              {CallStats.NETWORK: 1.2}, True))
+    registry.Record(FakeTimer('AdGroupService', 'mutate', 0.1, {}))
+
+    stats = registry.GetStats()
+    self.assertEqual(['AdGroupService', 'CampaignService'], sorted(stats))
+    get_stats = stats['CampaignService']['get']
+    self.assertEqual(2, get_stats['calls'])
+    self.assertEqual(1, get_stats['errors'])
+    self.assertEqual(2.0, get_stats['elapsed']['total'])
+    self.assertEqual(1.2, get_stats['phases'][CallStats.NETWORK]['max'])
+    self.assertEqual(1, stats['AdGroupService']['mutate']['calls'])
+
+    registry.Clear()
+    self.assertEqual({}, registry.GetStats())
+
+  def testCallRecorder(self):
+    """Tests that a failing callback does not fail the call."""
+    registry = mock.Mock()
+    callback = mock.Mock()
+    callback.side_effect = ValueError('Broken callback')
+    recorder = CallStats.CallRecorder(registry, callback)
+    self.assertTrue(recorder.IsEnabled())
+    timer = FakeTimer('CampaignService', 'get', 0.5, {})
+
+    stderr = sys.stderr
+    sys.stderr = StringIO.StringIO()
+    try:
+      recorder.Record(timer)
+      self.assertTrue('Broken callback' in sys.stderr.getvalue())
+    finally:
+      sys.stderr = stderr
+    registry.Record.assert_called_once_with(timer)
+    callback.assert_called_once_with(timer)
+    self.assertFalse(CallStats.CallRecorder().IsEnabled())
+
+  def GetService(self, response_parser='soappy'):
+    """Returns a CampaignService built from the test WSDL."""
+    headers = {'authToken': 'AUTH_TOKEN', 'developerToken': 'DEV_TOKEN',
+               'userAgent': 'CallStatsTest'}
+    config = {'xml_parser': '2', 'pretty_xml': 'n', 'raw_debug': 'n',
+              'debug': 'n', 'raw_response': 'n', 'wrap_in_tuple': 'y',
+              'compress': 'n', 'strict': 'y', 'xml_log': 'n',
+              'request_log': 'n', 'access': '', 'shared_schema': 'n',
+              'auth_token_epoch': time.time(),
+              'response_parser': response_parser}
+    op_config = {'server': SERVER, 'version': VERSION, 'group': 'cm',
+                 'http_proxy': None}
+    wsdl_proxy = SOAPpy.WSDL.Proxy(
+        open(WSDL_FILE_LOCATION).read() % {'version': VERSION}, noroot=1)
+    with mock.patch('adspygoogle.SOAPpy.WSDL.Proxy') as mock_proxy:
+      mock_proxy.return_value = wsdl_proxy
+      return GenericAdWordsService(headers, config, op_config, mock.Mock(),
+                                   mock.Mock(), 'CampaignService')
+
+  def testCallMethod_recordsPhases(self):
+    """Tests that calls report the time spent in each of their phases."""
+    for response_parser in ('soappy', 'streaming'):
+      service = self.GetService(response_parser)
+      registry = CallStats.CallStatsRegistry()
+      timers = []
+      service._call_recorder = CallStats.CallRecorder(registry, timers.append)
+
+      with mock.patch('adspygoogle.SOAPpy.Client.HTTPTransport.call',
+                      FakeCall):
+        response = service.get({'fields': ['Id', 'Name']})
+      self.assertEqual('Campaign #1', response[0]['entries'][0]['name'])
+
+      self.assertEqual(1, len(timers))
+      timer = timers[0]
+      self.assertEqual(('CampaignService', 'get', False),
+                       (timer.service_name, timer.method_name, timer.failed))
+      self.assertEqual(sorted(CallStats.PHASES), sorted(timer.phases))
+      self.assertAlmostEqual(timer.elapsed, sum(timer.phases.values()), 2)
+      self.assertEqual(1, registry.GetStats()['CampaignService']['get'][
+          'calls'])
+
+  def testCallMethod_recordsFailures(self):
+    """Tests that calls which raise an exception are recorded as failed."""
+    service = self.GetService()
+    timers = []
+    service._call_recorder = CallStats.CallRecorder(None, timers.append)
+    self.assertRaises(TypeError, service.get)
+    self.assertEqual(1, len(timers))
+    self.assertTrue(timers[0].failed)
+
+  def testCallMethod_notTimedWithoutRecorder(self):
+    """Tests that calls are not timed when nothing records them."""
+    service = self.GetService()
+    service._call_recorder = CallStats.CallRecorder()
+    with mock.patch('adspygoogle.common.CallStats.CallTimer') as timer_class:
+      with mock.patch('adspygoogle.SOAPpy.Client.HTTPTransport.call',
+                      FakeCall):
+        service.get({'fields': ['Id']})
+    self.assertFalse(timer_class.called)
+
+  def testStream_recordsCall(self):
+    """Tests that streamed calls are recorded once their entries are read."""
+    service = self.GetService()
+    registry = CallStats.CallStatsRegistry()
+    timers = []
+    service._call_recorder = CallStats.CallRecorder(registry, timers.append)
+
+    with mock.patch('adspygoogle.SOAPpy.Client.HTTPTransport.call',
+                    FakeCall):
+      entries = iter(service.Stream.get({'fields': ['Id', 'Name']}))
+      self.assertEqual('Campaign #1', entries.next()['name'])
+      self.assertEqual([], timers)
+      self.assertEqual([], list(entries))
+
+    self.assertEqual(1, len(timers))
+    timer = timers[0]
+    self.assertEqual(('CampaignService', 'get', False),
+                     (timer.service_name, timer.method_name, timer.failed))
+    self.assertEqual(sorted(CallStats.PHASES), sorted(timer.phases))
+    self.assertEqual(1, registry.GetStats()['CampaignService']['get'][
+        'calls'])
+
+  def testStream_recordsClosedStreams(self):
+    """Tests that streams left before their end are still finished."""
+    service = self.GetService()
+    timers = []
+    service._call_recorder = CallStats.CallRecorder(None, timers.append)
+
+    with mock.patch('adspygoogle.SOAPpy.Client.HTTPTransport.call',
+                    FakeCall):
+      with mock.patch.object(service, '_HandleLogsAndErrors') as handle_logs:
+        response = service.Stream.get({'fields': ['Id', 'Name']})
+        self.assertEqual('Campaign #1', response.next()['name'])
+        response.close()
+        self.assertEqual(1, handle_logs.call_count)
+        self.assertEqual(1, len(timers))
+        self.assertFalse(timers[0].failed)
+
+        for entry in service.Stream.get({'fields': ['Id', 'Name']}):
+          break
+        self.assertEqual(2, handle_logs.call_count)
+        self.assertEqual(2, len(timers))
+        self.assertFalse(timers[1].failed)
+
+  def testStream_recordsFailures(self):
+    """Tests that streamed calls which raise an exception are recorded."""
+    service = self.GetService()
+    timers = []
+    service._call_recorder = CallStats.CallRecorder(None, timers.append)
+    self.assertRaises(TypeError, list, service.Stream.get())
+    self.assertEqual(1, len(timers))
+    self.assertTrue(timers[0].failed)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,124 @@
+#!/usr/bin/python
+#
+# Copyright 2013 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Unit tests to cover CapturingTransport."""
+
+__author__ = 'agent@local (agent)'
+
+import os
+import sys
+import threading
+import unittest
+sys.path.insert(0, os.path.join('..', '..', '..'))
+
+import mock
+
+from adspygoogle.common.Buffer import Buffer
+from adspygoogle.common.soappy import CapturingTransport
+from adspygoogle.SOAPpy.Client import HTTPTransport
+
+
+class CapturingTransportTest(unittest.TestCase):
+
+  """Tests for the adspygoogle.common.soappy.CapturingTransport module."""
+
+  def setUp(self):
+    self.transport = CapturingTransport.CapturingHTTPTransport()
+
+  def tearDown(self):
+    CapturingTransport.SetCaptureBuffer(None)
+
+  def testDump_matchesSoappyOutput(self):
+    """Tests that captured dumps look exactly like SOAPpy's stdout dumps."""
+    for text in ('POST /path HTTP/1.1\nHost:host', '<xml/>\n'):
+      stdout = Buffer()
+      with mock.patch('sys.stdout', stdout):
+        HTTPTransport().dump('Outgoing SOAP', text)
+      buf = Buffer()
+      CapturingTransport.SetCaptureBuffer(buf)
+      self.transport.dump('Outgoing SOAP', text)
+      self.assertEqual(stdout.GetBufferAsStr(), buf.GetBufferAsStr())
+
+  def testDump_withoutBufferWritesToStdout(self):
+    """Tests that threads which are not capturing keep SOAPpy's behavior."""
+    stdout = Buffer()
+    with mock.patch('sys.stdout', stdout):
+      self.transport.dump('Incoming SOAP', '<xml/>')
+    self.assertTrue('*** Incoming SOAP ***' in stdout.GetBufferAsStr())
+
+  def testSetCaptureBuffer_restoresPreviousBuffer(self):
+    """Tests that nested captures hand back their caller's buffer."""
+    outer = Buffer()
+    inner = Buffer()
+    self.assertEqual(None, CapturingTransport.SetCaptureBuffer(outer))
+    self.assertTrue(outer is CapturingTransport.SetCaptureBuffer(inner))
+    self.assertTrue(inner is CapturingTransport.GetCaptureBuffer())
+    CapturingTransport.SetCaptureBuffer(outer)
+    self.assertTrue(outer is CapturingTransport.GetCaptureBuffer())
+
+  def testDump_isolatesThreads(self):
+    """Tests that concurrent threads only capture their own messages."""
+    buffers = {}
+    barrier = threading.Semaphore(0)
+
+    def Call(name):
+      buf = Buffer()
+      buffers[name] = buf
+      CapturingTransport.SetCaptureBuffer(buf)
+      self.transport.dump('Outgoing SOAP', '<%s/>' % name)
+      # Make sure both threads are capturing at the same time.
+      barrier.release()
+      barrier.acquire()
+      self.transport.dump('Incoming SOAP', '<%sResponse/>' % name)
+
+    threads = [threading.Thread(target=Call, args=(name,))
+               for name in ('first', 'second')]
+    for thread in threads:
+      thread.start()
+    for thread in threads:
+      thread.join()
+
+    self.assertEqual(None, CapturingTransport.GetCaptureBuffer())
+    for name, other in (('first', 'second'), ('second', 'first')):
+      captured = buffers[name].GetBufferAsStr()
+      self.assertTrue('<%s/>' % name in captured)
+      self.assertTrue('<%sResponse/>' % name in captured)
+      self.assertFalse(other in captured)
+
+  def testAdditionalHeaders_perThread(self):
+    """Tests that each thread sends its own additional HTTP headers."""
+    transport = CapturingTransport.CapturingHTTPTransport({'Default': 'yes'})
+    transport.additional_headers['Authorization'] = 'Bearer main'
+    seen = {}
+
+    def Call():
+      seen['before'] = dict(transport.additional_headers)
+      transport.additional_headers['Authorization'] = 'Bearer other'
+      seen['after'] = dict(transport.additional_headers)
+
+    thread = threading.Thread(target=Call)
+    thread.start()
+    thread.join()
+
+    self.assertEqual({'Default': 'yes'}, seen['before'])
+    self.assertEqual({'Default': 'yes', 'Authorization': 'Bearer other'},
+                     seen['after'])
+    self.assertEqual({'Default': 'yes', 'Authorization': 'Bearer main'},
+                     transport.additional_headers)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -26,6 +26,7 @@ import unittest
 
 sys.path.insert(0, os.path.join('..', '..', '..'))
 
+import mock
 
 from adspygoogle.common.Client import _DEFAULT_CONFIG
 from adspygoogle.common.Client import Client
@@ -157,6 +158,24 @@ class ClientTest(unittest.TestCase):
     self.assertEqual(self.client._SetMissingDefaultConfigValues(partial_config),
                      expected_config)
 
+  def testGetCallStats(self):
+    """Tests that services get the client's call recorder."""
+    self.assertEqual({}, self.client.GetCallStats())
+    self.assertFalse(self.client._GetCallRecorder().IsEnabled())
+
+    client = Client(config={'call_stats': 'y'})
+    service = client._GetRegisteredService('CampaignService', {}, {},
+                                           mock.Mock)
+    self.assertTrue(service._call_recorder is client._GetCallRecorder())
+    self.assertTrue(service._call_recorder.IsEnabled())
+    self.assertEqual({}, client.GetCallStats())
+
+    callback = mock.Mock()
+    client.SetCallCallback(callback)
+    client.SetCallStatsRegistry(None)
+    self.assertTrue(service._call_recorder.callback is callback)
+    self.assertEqual({}, client.GetCallStats())
+
 
 if __name__ == '__main__':
   unittest.main()
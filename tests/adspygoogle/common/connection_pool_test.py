@@ -0,0 +1,235 @@
+#!/usr/bin/python
+#
+# Copyright 2013 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Unit tests to cover ConnectionPool."""
+
+__author__ = 'agent@local (agent)'
+
+import BaseHTTPServer
+import os
+import socket
+import SocketServer
+import sys
+import threading
+import time
+import unittest
+import urllib2
+sys.path.insert(0, os.path.join('..', '..', '..'))
+
+import mock
+
+from adspygoogle.common import ConnectionPool
+from adspygoogle.common.https import Https
+from adspygoogle.common.soappy import CapturingTransport
+from adspygoogle.SOAPpy.Client import SOAPAddress
+
+
+class KeepAliveHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+
+  """Answers every request with its path, keeping the connection open."""
+
+  protocol_version = 'HTTP/1.1'
+
+  def do_GET(self):
+    self.server.peers.append(self.client_address)
+    self.rfile.read(int(self.headers.get('Content-Length', 0)))
+    if self.path == '/slow':
+      time.sleep(0.5)
+    body = self.path
+    if self.path == '/missing':
+      self.send_response(404)
+    else:
+      self.send_response(200)
+    self.send_header('Content-Type', 'text/plain')
+    self.send_header('Content-Length', str(len(body)))
+    self.end_headers()
+    self.wfile.write(body)
+    if self.path == '/hangup':
+      # Drop the connection without telling the client it will be closed.
+      self.close_connection = 1
+
+  do_POST = do_GET
+
+  def log_message(self, *unused_args):
+    pass
+
+
+class KeepAliveServer(SocketServer.ThreadingMixIn,
+                      BaseHTTPServer.HTTPServer):
+
+  daemon_threads = True
+
+  def __init__(self):
+    BaseHTTPServer.HTTPServer.__init__(self, ('localhost', 0),
+                                       KeepAliveHandler)
+    self.peers = []
+
+
+class ConnectionPoolTest(unittest.TestCase):
+
+  """Tests for the adspygoogle.common.ConnectionPool module."""
+
+  def setUp(self):
+    self.server = KeepAliveServer()
+    self.address = 'localhost:%d' % self.server.server_address[1]
+    thread = threading.Thread(target=self.server.serve_forever)
+    thread.setDaemon(True)
+    thread.start()
+    self.pool = ConnectionPool.ConnectionPool(2, 60)
+
+  def tearDown(self):
+    self.pool.Clear()
+    self.server.shutdown()
+    self.server.server_close()
+
+  def Get(self, path, connection=None):
+    """Makes a GET request the way SOAPpy does, returning the reply."""
+    if connection is None:
+      connection = self.pool.Acquire('http', self.address)
+    connection.putrequest('GET', path)
+    connection.putheader('Host', self.address)
+    connection.endheaders()
+    status, unused_reason, unused_headers = connection.getreply()
+    return status, connection.getfile().read()
+
+  def testGetreply_reusesConnection(self):
+    """Tests that sequential requests share a single connection."""
+    self.assertEqual((200, '/first'), self.Get('/first'))
+    self.assertEqual(1, len(self.pool))
+    self.assertEqual((200, '/second'), self.Get('/second'))
+    self.assertEqual(1, len(self.pool))
+    self.assertEqual(2, len(self.server.peers))
+    self.assertEqual(self.server.peers[0], self.server.peers[1])
+
+  def testEndheaders_disablesNagle(self):
+    """Tests that request bodies are not held back until headers are acked."""
+    connection = self.pool.Acquire('http', self.address)
+    connection.putrequest('GET', '/first')
+    connection.putheader('Host', self.address)
+    connection.endheaders()
+    sock = connection._PooledConnection__connection.sock
+    self.assertTrue(sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY))
+    connection.getreply()
+
+  def testCheckIn_keepsAtMostMaxIdlePerHost(self):
+    """Tests that overflow connections are closed once done."""
+    connections = [self.pool.Acquire('http', self.address) for _ in range(3)]
+    for i, connection in enumerate(connections):
+      self.assertEqual((200, '/%d' % i), self.Get('/%d' % i, connection))
+    self.assertEqual(2, len(self.pool))
+    self.assertEqual(3, len(set(self.server.peers)))
+
+  def testCheckOut_evictsIdleConnections(self):
+    """Tests that connections idle for too long are not reused."""
+    self.Get('/first')
+    with mock.patch('time.time', return_value=time.time() + 61):
+      self.Get('/second')
+    self.assertEqual(2, len(set(self.server.peers)))
+
+  def testCheckOut_dropsConnectionsClosedByServer(self):
+    """Tests that the health check catches connections the server closed."""
+    self.Get('/hangup')
+    # Give the server time to close its end.
+    time.sleep(0.1)
+    self.assertEqual((200, '/second'), self.Get('/second'))
+    self.assertEqual(2, len(set(self.server.peers)))
+
+  def testGetreply_resendsOnStaleConnection(self):
+    """Tests that a request on a stale connection is sent again."""
+    self.Get('/hangup')
+    time.sleep(0.1)
+    with mock.patch('adspygoogle.common.ConnectionPool._IsAlive',
+                    return_value=True):
+      self.assertEqual((200, '/second'), self.Get('/second'))
+    self.assertEqual(2, len(set(self.server.peers)))
+    self.assertEqual(1, len(self.pool))
+
+  def testGetresponse_doesNotResendOnTimeout(self):
+    """Tests that a request the server may have acted on is not resent."""
+    self.Get('/first', self.pool.Acquire('http', self.address, timeout=0.1))
+    connection = self.pool.Acquire('http', self.address, timeout=0.1)
+    connection.putrequest('POST', '/slow')
+    connection.putheader('Host', self.address)
+    connection.putheader('Content-Length', '4')
+    connection.endheaders()
+    connection.send('data')
+    self.assertRaises(socket.timeout, connection.getresponse)
+    time.sleep(0.1)
+    self.assertEqual(2, len(self.server.peers))
+    self.assertEqual(1, len(set(self.server.peers)))
+    self.assertEqual(0, len(self.pool))
+
+  def testGetKey(self):
+    """Tests that keys tell servers, proxies and certificate settings apart."""
+    self.assertEqual(('https', 'example.com', 443, None, None),
+                     self.pool.GetKey('https', 'Example.com'))
+    self.assertEqual(('http', 'example.com', 8080, 'proxy:3128', None),
+                     self.pool.GetKey('http', 'example.com:8080',
+                                      'proxy:3128'))
+    Https.MonkeyPatchHttplib('certs.pem')
+    try:
+      self.assertEqual(('https', 'example.com', 443, None, 'certs.pem'),
+                       self.pool.GetKey('https', 'example.com'))
+      self.assertTrue(isinstance(Https.CreateHttpsConnection('example.com'),
+                                 Https._SslAwareHttpsConnection))
+    finally:
+      Https.MonkeyPatchHttplib(None)
+    self.assertFalse(isinstance(Https.CreateHttpsConnection('example.com'),
+                                Https._SslAwareHttpsConnection))
+
+  def testOpenUrl(self):
+    """Tests urllib2 requests over the pool."""
+    url = 'http://%s' % self.address
+    self.assertEqual('/report', self.pool.OpenUrl(url + '/report').read())
+    response = self.pool.OpenUrl(urllib2.Request(url + '/upload', 'data'))
+    self.assertEqual(200, response.code)
+    self.assertEqual('/up', response.read(3))
+    self.assertEqual(0, len(self.pool))
+    self.assertEqual('load', response.read())
+    self.assertEqual(1, len(self.pool))
+    try:
+      self.pool.OpenUrl(url + '/missing')
+      self.fail('Expected an HTTPError.')
+    except urllib2.HTTPError, e:
+      self.assertEqual(404, e.code)
+      self.assertEqual('/missing', e.read())
+    self.assertEqual(1, len(set(self.server.peers)))
+
+  def testGetConnectionPoolFromConfig(self):
+    """Tests that clients with the same settings share a pool."""
+    self.assertEqual(None, ConnectionPool.GetConnectionPoolFromConfig({}))
+    self.assertEqual(None, ConnectionPool.GetConnectionPoolFromConfig(
+        {'connection_pool_size': 0}))
+    pool = ConnectionPool.GetConnectionPoolFromConfig(
+        {'connection_pool_size': 3})
+    self.assertTrue(pool is ConnectionPool.GetConnectionPoolFromConfig(
+        {'connection_pool_size': '3', 'connection_idle_timeout': 30}))
+    self.assertFalse(pool is ConnectionPool.GetConnectionPoolFromConfig(
+        {'connection_pool_size': 3, 'connection_idle_timeout': 5}))
+
+  def testTransportConnect(self):
+    """Tests that the SOAPpy transport only pools requests it can."""
+    transport = CapturingTransport.CapturingHTTPTransport()
+    address = SOAPAddress('http://%s/api' % self.address)
+    self.assertFalse(isinstance(transport.connect(address),
+                                ConnectionPool.PooledConnection))
+    transport.connection_pool = self.pool
+    self.assertTrue(isinstance(transport.connect(address),
+                               ConnectionPool.PooledConnection))
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -28,6 +28,7 @@ import mock
 from oauth2client.client import OAuth2Credentials
 
 from adspygoogle.common.GenericApiService import GenericApiService
+from adspygoogle.common.GenericApiService import MethodInfoKeys
 from adspygoogle.common.SoapBuffer import SoapBuffer
 
 
@@ -193,6 +194,167 @@ class GenericApiServiceTest(unittest.TestCase):
 
     self.assertFalse(credentials.refresh.called)
 
+  def testGetCallPlan_compiledOnce(self):
+    """Tests that a method's call plan is only compiled on its first call."""
+    with mock.patch('adspygoogle.SOAPpy.WSDL.Proxy'):
+      service = ConcreteGenericApiService(
+          {}, {'xml_parser': '2', 'pretty_xml': 'y', 'wrap_in_tuple': 'y'},
+          {'http_proxy': None, 'server': 'www.myurl.com'}, mock.Mock(),
+          mock.Mock(), '', '', True, '', 'namespace', '')
+    service._soappyservice.soapproxy.config.argsOrdering = {}
+    method_info = {
+        MethodInfoKeys.INPUTS: [
+            {MethodInfoKeys.ELEMENT_NAME: u'selector', MethodInfoKeys.NS: 'ns',
+             MethodInfoKeys.TYPE: 'Selector', MethodInfoKeys.MAX_OCCURS: '1'},
+            {MethodInfoKeys.ELEMENT_NAME: u'paging', MethodInfoKeys.NS: 'ns',
+             MethodInfoKeys.TYPE: 'Paging', MethodInfoKeys.MAX_OCCURS: '1'}],
+        MethodInfoKeys.OUTPUTS: [
+            {MethodInfoKeys.ELEMENT_NAME: 'rval', MethodInfoKeys.NS: 'ns',
+             MethodInfoKeys.TYPE: 'Page', MethodInfoKeys.MAX_OCCURS: '1'}]
+    }
+
+    with mock.patch.object(service, '_GetMethodInfo') as get_method_info:
+      get_method_info.return_value = method_info
+      plan = service._GetCallPlan('get')
+      self.assertTrue(plan is service._GetCallPlan('get'))
+
+    get_method_info.assert_called_once_with('get')
+    self.assertEqual([('selector', 'ns', 'Selector', '1'),
+                      ('paging', 'ns', 'Paging', '1')], plan.inputs)
+    self.assertTrue(isinstance(plan.inputs[0][0], str))
+    self.assertEqual([('ns', 'Page', '1')], plan.output_types)
+    self.assertEqual(None, plan.method_attrs)
+    self.assertEqual({'get': [u'selector', u'paging']},
+                     service._soappyservice.soapproxy.config.argsOrdering)
+
+  def testGetConfigFlags_followsConfigChanges(self):
+    """Tests that config flags are converted again after the config changes."""
+    config = {'strict': 'y', 'pretty_xml': 'n', 'raw_debug': 'n', 'debug': 'n',
+              'raw_response': 'n', 'wrap_in_tuple': 'y', 'compress': 'y',
+              'xml_parser': '2'}
+    with mock.patch('adspygoogle.SOAPpy.WSDL.Proxy'):
+      service = ConcreteGenericApiService(
+          {}, config, {'http_proxy': None, 'server': 'www.myurl.com'},
+          mock.Mock(), mock.Mock(), '', '', True, '', '', '')
+
+    flags = service._GetConfigFlags()
+    self.assertTrue(flags is service._GetConfigFlags())
+    self.assertTrue(flags.strict)
+    self.assertFalse(flags.debug)
+    self.assertTrue(flags.compress)
+    self.assertEqual('2', flags.xml_parser)
+    self.assertEqual('soappy', flags.response_parser)
+
+    config['debug'] = 'y'
+    flags = service._GetConfigFlags()
+    self.assertTrue(flags.debug)
+    self.assertTrue(flags is service._GetConfigFlags())
+
+    config['response_parser'] = 'streaming'
+    self.assertEqual('streaming', service._GetConfigFlags().response_parser)
+
+  def testApplySoapHeaders_rebuildsOnlyWhenKeyChanges(self):
+    """Tests that SOAP headers are reused until the values they use change."""
+    with mock.patch('adspygoogle.SOAPpy.WSDL.Proxy'):
+      service = ConcreteGenericApiService(
+          {}, {'xml_parser': '2', 'pretty_xml': 'y', 'wrap_in_tuple': 'y'},
+          {'http_proxy': None, 'server': 'www.myurl.com'}, mock.Mock(),
+          mock.Mock(), '', '', True, '', '', '')
+    build_function = mock.Mock()
+    build_function.side_effect = lambda: object()
+
+    service._ApplySoapHeaders(('token', 1), build_function)
+    headers = service._soap_headers
+    service._ApplySoapHeaders(('token', 1), build_function)
+    self.assertTrue(headers is service._soap_headers)
+    self.assertEqual(1, build_function.call_count)
+
+    service._ApplySoapHeaders(('new token', 1), build_function)
+    self.assertFalse(headers is service._soap_headers)
+    self.assertEqual(2, build_function.call_count)
+
+    other_service = service._WithHeaders({'authToken': 'other'})
+    other_service._ApplySoapHeaders(('new token', 1), build_function)
+    self.assertEqual(3, build_function.call_count)
+
+  def GetLoggingService(self, xml_log, request_log, debug='n'):
+    """Returns a service with the given logging settings and a mock logger."""
+    config = {'xml_parser': '2', 'pretty_xml': 'y', 'wrap_in_tuple': 'y',
+              'xml_log': xml_log, 'request_log': request_log, 'debug': debug,
+              'raw_response': 'y'}
+    with mock.patch('adspygoogle.SOAPpy.WSDL.Proxy'):
+      return ConcreteGenericApiService(
+          {}, config, {'http_proxy': None, 'server': 'www.myurl.com'},
+          mock.Mock(), mock.Mock(), '', '', True, '', '', '')
+
+  def GetLogHandlers(self):
+    """Returns log handlers like the ones the products use."""
+    request_info = mock.Mock()
+    request_info.return_value = 'host=www.myurl.com'
+    return [{'tag': 'xml_log', 'name': 'soap_xml', 'data': ''},
+            {'tag': 'request_log', 'name': 'request_info',
+             'data': request_info},
+            {'tag': '', 'name': 'api_lib', 'data': ''}]
+
+  def testManageSoap_buildsOnlyWrittenLogs(self):
+    """Tests that log messages are not built when logging is off."""
+    service = self.GetLoggingService('n', 'n')
+    buf = mock.Mock()
+    handlers = self.GetLogHandlers()
+    service._ManageSoap(buf, handlers, '', 'start', 'stop')
+
+    self.assertFalse(handlers[1]['data'].called)
+    self.assertFalse(buf.GetSoapOut.called)
+    self.assertFalse(buf.GetSoapIn.called)
+    self.assertFalse(service._logger.Log.called)
+
+    service = self.GetLoggingService('n', 'y')
+    service._ManageSoap(buf, self.GetLogHandlers(), '', 'start', 'stop')
+    self.assertFalse(buf.GetSoapOut.called)
+    self.assertEqual(1, service._logger.Log.call_count)
+    args, kwargs = service._logger.Log.call_args
+    self.assertEqual('request_info', args[0])
+    self.assertEqual({'log_level': 10, 'log_handler': 1}, kwargs)
+    self.assertEqual('host=www.myurl.com isFault=False', args[1]())
+
+  def testManageSoap_leavesFormattingToLogger(self):
+    """Tests that the SOAP XML log is only formatted when the logger asks."""
+    service = self.GetLoggingService('y', 'n')
+    buf = mock.Mock()
+    for name in ('GetHeadersOut', 'GetSoapOut', 'GetHeadersIn', 'GetSoapIn'):
+      getattr(buf, name).return_value = name
+    service._ManageSoap(buf, self.GetLogHandlers(), '', 'start', 'stop')
+
+    self.assertFalse(buf.GetHeadersOut.called)
+    self.assertFalse(buf.GetSoapOut.called)
+    args = service._logger.Log.call_args[0]
+    self.assertEqual('soap_xml', args[0])
+    self.assertEqual('StartTime: start\nGetHeadersOut\nGetSoapOut\n'
+                     'GetHeadersIn\nGetSoapIn\nEndTime: stop', args[1]())
+
+  def testManageSoap_sampledXmlLog(self):
+    """Tests that the SOAP XML of calls left out of the sample is not logged."""
+    service = self.GetLoggingService('y', 'y')
+    service._logger.IsCallSampled.return_value = False
+    buf = mock.Mock()
+    buf.GetElapsedTime.return_value = 0.5
+    service._ManageSoap(buf, self.GetLogHandlers(), '', 'start', 'stop')
+
+    service._logger.IsCallSampled.assert_called_once_with(False, 0.5)
+    self.assertFalse(buf.GetSoapOut.called)
+    self.assertEqual(['request_info'],
+                     [args[0][0] for args in
+                      service._logger.Log.call_args_list])
+
+    service._logger.IsCallSampled.return_value = True
+    service._logger.Log.reset_mock()
+    service._ManageSoap(buf, self.GetLogHandlers(), '', 'start', 'stop',
+                        {'data': 'error'})
+    service._logger.IsCallSampled.assert_called_with(True, 0.5)
+    self.assertEqual(['soap_xml', 'request_info'],
+                     [args[0][0] for args in
+                      service._logger.Log.call_args_list])
+
 
 if __name__ == '__main__':
   unittest.main()
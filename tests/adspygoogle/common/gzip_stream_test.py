@@ -0,0 +1,119 @@
+#!/usr/bin/python
+#
+# Copyright 2013 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Unit tests to cover GzipStream."""
+
+__author__ = 'agent@local (agent)'
+
+import gzip
+import os
+import random
+import StringIO
+import sys
+import unittest
+sys.path.insert(0, os.path.join('..', '..', '..'))
+
+from adspygoogle.common import GzipStream
+
+
+def Compress(data):
+  """Returns data gzip compressed."""
+  buf = StringIO.StringIO()
+  gzip_file = gzip.GzipFile(mode='wb', fileobj=buf)
+  gzip_file.write(data)
+  gzip_file.close()
+  return buf.getvalue()
+
+
+class CountingFile(StringIO.StringIO):
+
+  """StringIO recording the size of the largest read made from it."""
+
+  largest_read = 0
+
+  def read(self, size=-1):
+    self.largest_read = max(self.largest_read, size)
+    return StringIO.StringIO.read(self, size)
+
+
+class GzipStreamTest(unittest.TestCase):
+
+  """Tests for the adspygoogle.common.GzipStream module."""
+
+  def setUp(self):
+    rows = ['%d,Campaign #%d,%d\n' % (i, random.randint(0, 1000), i * 7)
+            for i in range(20000)]
+    self.data = ''.join(rows)
+
+  def testRead_inChunks(self):
+    """Tests that the stream is read and handed out a chunk at a time."""
+    source = CountingFile(Compress(self.data))
+    reader = GzipStream.GzipReader(source, 1024)
+    chunks = []
+    while True:
+      chunk = reader.read(4096)
+      if not chunk:
+        break
+      self.assertTrue(len(chunk) <= 4096)
+      chunks.append(chunk)
+    self.assertEqual(self.data, ''.join(chunks))
+    self.assertEqual(1024, source.largest_read)
+    self.assertEqual('', reader.read())
+
+  def testRead_all(self):
+    """Tests reading the whole stream at once."""
+    reader = GzipStream.GzipReader(StringIO.StringIO(Compress(self.data)), 100)
+    self.assertEqual(self.data, reader.read())
+    self.assertEqual('', GzipStream.GzipReader(StringIO.StringIO('')).read())
+
+  def testRead_concatenatedMembers(self):
+    """Tests that concatenated gzip files are read as one, padding ignored."""
+    source = StringIO.StringIO(Compress('first,') + Compress('second') +
+                               '\0' * 10)
+    self.assertEqual('first,second', GzipStream.GzipReader(source, 7).read())
+
+  def testRead_invalidStream(self):
+    """Tests that data which is not gzip raises an IOError."""
+    reader = GzipStream.GzipReader(StringIO.StringIO('Not gzip at all'))
+    self.assertRaises(IOError, reader.read)
+
+  def testRead_truncatedStream(self):
+    """Tests that a stream cut off before the end of a member raises."""
+    compressed = Compress(self.data)
+    for cut in (5000, 4, 1):
+      reader = GzipStream.GzipReader(StringIO.StringIO(compressed[:-cut]), 1024)
+      self.assertRaises(IOError, reader.read)
+    reader = GzipStream.GzipReader(
+        StringIO.StringIO(Compress('first,') + Compress('second')[:15]))
+    self.assertRaises(IOError, reader.read)
+
+  def testCopyStream(self):
+    """Tests copying a decompressed stream to a file."""
+    target = StringIO.StringIO()
+    reader = GzipStream.GzipReader(StringIO.StringIO(Compress(self.data)))
+    self.assertEqual(len(self.data),
+                     GzipStream.CopyStream(reader, target, 1000))
+    self.assertEqual(self.data, target.getvalue())
+
+  def testIterLines(self):
+    """Tests that lines split across chunks are put back together."""
+    source = StringIO.StringIO(self.data + 'last line')
+    lines = list(GzipStream.IterLines(source, 100))
+    self.assertEqual(self.data.splitlines(True) + ['last line'], lines)
+
+
+if __name__ == '__main__':
+  unittest.main()
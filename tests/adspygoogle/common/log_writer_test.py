@@ -0,0 +1,259 @@
+#!/usr/bin/python
+#
+# Copyright 2013 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Unit tests to cover LogWriter and Logger."""
+
+__author__ = 'agent@local (agent)'
+
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+sys.path.insert(0, os.path.join('..', '..', '..'))
+
+from adspygoogle.common import LogWriter
+from adspygoogle.common.Logger import CallSampler
+from adspygoogle.common.Logger import GetLoggerFromConfig
+from adspygoogle.common.Logger import Logger
+
+
+class BlockingWrite(object):
+
+  """Records written values, holding the writer thread until released."""
+
+  def __init__(self):
+    self.written = []
+    self.started = threading.Event()
+    self.release = threading.Event()
+
+  def __call__(self, value):
+    self.started.set()
+    self.release.wait()
+    self.written.append(value)
+
+
+class LogWriterTest(unittest.TestCase):
+
+  """Tests for the adspygoogle.common.LogWriter module."""
+
+  def testPut_writesInOrderOnAnotherThread(self):
+    """Tests that records are written in order, off the calling thread."""
+    threads = []
+    written = []
+
+    def Write(value):
+      threads.append(threading.currentThread())
+      written.append(value)
+
+    writer = LogWriter.LogWriter(10)
+    for value in range(50):
+      self.assertTrue(writer.Put(Write, (value,)))
+    self.assertTrue(writer.Flush(5))
+    self.assertEqual(range(50), written)
+    self.assertFalse(threading.currentThread() in threads)
+    writer.Close()
+
+  def testPut_dropPolicy(self):
+    """Tests that records are dropped when the queue is full."""
+    write = BlockingWrite()
+    writer = LogWriter.LogWriter(2, LogWriter.DROP)
+    writer.Put(write, (0,))
+    write.started.wait(5)
+    self.assertTrue(writer.Put(write, (1,)))
+    self.assertTrue(writer.Put(write, (2,)))
+    self.assertFalse(writer.Put(write, (3,)))
+    self.assertEqual(1, writer.GetDroppedCount())
+    self.assertFalse(writer.Flush(0.05))
+
+    write.release.set()
+    self.assertTrue(writer.Flush(5))
+    self.assertEqual([0, 1, 2], write.written)
+    writer.Close()
+
+  def testPut_blockPolicy(self):
+    """Tests that callers wait for room when the queue is full."""
+    write = BlockingWrite()
+    writer = LogWriter.LogWriter(1, LogWriter.BLOCK)
+    writer.Put(write, (0,))
+    write.started.wait(5)
+    writer.Put(write, (1,))
+    putter = threading.Thread(target=writer.Put, args=(write, (2,)))
+    putter.start()
+    putter.join(0.05)
+    self.assertTrue(putter.isAlive())
+
+    write.release.set()
+    putter.join(5)
+    self.assertFalse(putter.isAlive())
+    self.assertTrue(writer.Flush(5))
+    self.assertEqual([0, 1, 2], write.written)
+    self.assertEqual(0, writer.GetDroppedCount())
+    writer.Close()
+
+  def testClose_writesQueuedRecords(self):
+    """Tests that closing writes every queued record, and later ones too."""
+    written = []
+
+    def Write(value):
+      time.sleep(0.001)
+      written.append(value)
+
+    writer = LogWriter.LogWriter()
+    for value in range(20):
+      writer.Put(Write, (value,))
+    writer.Close()
+    self.assertEqual(range(20), written)
+    writer.Put(Write, (20,))
+    self.assertEqual(range(21), written)
+
+  def testGetLogWriterFromConfig(self):
+    """Tests that clients with the same settings share a writer."""
+    self.assertEqual(None, LogWriter.GetLogWriterFromConfig({}))
+    self.assertEqual(None,
+                     LogWriter.GetLogWriterFromConfig({'async_log': 'n'}))
+    config = {'async_log': 'y', 'log_queue_size': 5,
+              'log_queue_policy': 'drop'}
+    writer = LogWriter.GetLogWriterFromConfig(config)
+    self.assertTrue(writer is LogWriter.GetLogWriterFromConfig(dict(config)))
+    config['log_queue_policy'] = 'block'
+    self.assertFalse(writer is LogWriter.GetLogWriterFromConfig(config))
+    config['log_queue_policy'] = 'sometimes'
+    self.assertRaises(ValueError, LogWriter.GetLogWriterFromConfig, config)
+
+
+class LoggerTest(unittest.TestCase):
+
+  """Tests for Logger writing through a LogWriter and rotating files."""
+
+  def setUp(self):
+    self.log_home = tempfile.mkdtemp()
+
+  def tearDown(self):
+    shutil.rmtree(self.log_home)
+
+  def testLog_async(self):
+    """Tests that queued messages are written with the time they were logged."""
+    logger = GetLoggerFromConfig('TestLib', {'log_home': self.log_home,
+                                             'async_log': 'y'})
+    start = time.time()
+    logger.Log('log_writer_test_async', 'first message',
+               log_level=Logger.DEBUG)
+    logger.Log('log_writer_test_async', 'second message',
+               log_level=Logger.DEBUG)
+    self.assertTrue(logger.Flush(5))
+
+    lines = open(os.path.join(self.log_home,
+                              'log_writer_test_async.log')).readlines()
+    self.assertEqual(2, len(lines))
+    self.assertTrue(lines[0].endswith('::DEBUG::TestLib] first message\n'))
+    self.assertTrue(lines[1].endswith('::DEBUG::TestLib] second message\n'))
+    logged = time.mktime(time.strptime(lines[0][1:20], '%Y-%m-%d %H:%M:%S'))
+    self.assertTrue(abs(logged - start) < 2)
+
+  def testLog_buildsMessagesOnWriterThread(self):
+    """Tests that messages given as functions are built by the writer."""
+    logger = GetLoggerFromConfig('TestLib', {'log_home': self.log_home,
+                                             'async_log': 'y'})
+    threads = []
+
+    def GetMessage():
+      threads.append(threading.currentThread())
+      return 'built message'
+
+    logger.Log('log_writer_test_build', GetMessage, log_level=Logger.DEBUG)
+    logger.Log('log_writer_test_build', lambda: None, log_level=Logger.DEBUG)
+    self.assertTrue(logger.Flush(5))
+
+    self.assertEqual(1, len(threads))
+    self.assertFalse(threads[0] is threading.currentThread())
+    lines = open(os.path.join(self.log_home,
+                              'log_writer_test_build.log')).readlines()
+    self.assertEqual(1, len(lines))
+    self.assertTrue(lines[0].endswith('::DEBUG::TestLib] built message\n'))
+
+  def testLog_rotatesBySize(self):
+    """Tests that log files are rotated once they reach their maximum size."""
+    logger = Logger('TestLib', self.log_home, max_bytes=1000, backup_count=2)
+    for unused_i in range(100):
+      logger.Log('log_writer_test_rotate', 'x' * 100, log_level=Logger.DEBUG)
+
+    self.assertEqual(['log_writer_test_rotate.log',
+                      'log_writer_test_rotate.log.1',
+                      'log_writer_test_rotate.log.2'],
+                     sorted(os.listdir(self.log_home)))
+    for name in os.listdir(self.log_home):
+      self.assertTrue(os.path.getsize(os.path.join(self.log_home, name)) <=
+                      1000)
+
+
+class CallSamplerTest(unittest.TestCase):
+
+  """Tests for picking the calls whose SOAP XML is logged."""
+
+  def testIsSampled(self):
+    """Tests that one in N calls, faults and slow calls are sampled."""
+    sampler = CallSampler(3, 2.0)
+    self.assertEqual([True, False, False, True, False, False, True],
+                     [sampler.IsSampled(False, 0.1) for unused_i in range(7)])
+    self.assertTrue(sampler.IsSampled(True, 0.1))
+    self.assertTrue(sampler.IsSampled(False, 2.5))
+    self.assertFalse(sampler.IsSampled(False))
+
+    sampler = CallSampler()
+    self.assertEqual([True] * 3,
+                     [sampler.IsSampled(False) for unused_i in range(3)])
+
+    sampler = CallSampler(0, 2.0)
+    self.assertEqual([False] * 3,
+                     [sampler.IsSampled(False, 0.1) for unused_i in range(3)])
+    self.assertTrue(sampler.IsSampled(True, 0.1))
+    self.assertTrue(sampler.IsSampled(False, 2.0))
+
+  def testGetLoggerFromConfig_sampling(self):
+    """Tests that the logger samples calls as configured."""
+    logger = GetLoggerFromConfig('TestLib', {'log_home': '.'})
+    self.assertTrue(logger.IsCallSampled(False))
+    self.assertTrue(logger.IsCallSampled(False))
+
+    logger = GetLoggerFromConfig('TestLib', {'log_home': '.',
+                                             'xml_log_sample_rate': 2,
+                                             'xml_log_slow_call_time': '1.5'})
+    self.assertEqual([True, False, True],
+                     [logger.IsCallSampled(False, 1.0) for unused_i in
+                      range(3)])
+    self.assertTrue(logger.IsCallSampled(False, 1.5))
+    self.assertTrue(logger.IsCallSampled(True, 1.0))
+
+    logger = GetLoggerFromConfig('TestLib', {'log_home': '.',
+                                             'xml_log_sample_rate': 0,
+                                             'xml_log_slow_call_time': 2})
+    self.assertFalse(logger.IsCallSampled(False, 1.0))
+    self.assertFalse(logger.IsCallSampled(False, 1.0))
+    self.assertTrue(logger.IsCallSampled(False, 2.5))
+    self.assertTrue(logger.IsCallSampled(True, 1.0))
+
+    # Calls at least as slow as the threshold are logged either way.
+    logger = GetLoggerFromConfig('TestLib', {'log_home': '.',
+                                             'xml_log_slow_call_time': 2})
+    self.assertTrue(logger.IsCallSampled(False, 1.0))
+    self.assertTrue(logger.IsCallSampled(False, 2.5))
+
+
+if __name__ == '__main__':
+  unittest.main()
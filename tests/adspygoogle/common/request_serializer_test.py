@@ -0,0 +1,244 @@
+#!/usr/bin/python
+#
+# Copyright 2013 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Unit tests to cover RequestSerializer."""
+
+__author__ = 'agent@local (agent)'
+
+import os
+import sys
+import unittest
+sys.path.insert(0, os.path.join('..', '..', '..'))
+
+from adspygoogle import SOAPpy
+from adspygoogle.adwords.GenericAdWordsService import _DetermineNamespacePrefix as AdWordsPrefix
+from adspygoogle.common import MessageHandler
+from adspygoogle.common.GenericApiService import _SOAP_CONFIG
+from adspygoogle.common.soappy import RequestSerializer
+from adspygoogle.dfa.GenericDfaService import _DetermineNamespacePrefix as DfaPrefix
+from adspygoogle.dfp.GenericDfpService import _DetermineNamespacePrefix as DfpPrefix
+
+
+ADWORDS_VERSION = 'v201309'
+ADWORDS_NS = 'https://adwords.google.com/api/adwords/cm/' + ADWORDS_VERSION
+DFA_VERSION = 'v1.20'
+DFA_NS = 'http://www.doubleclick.net/dfa-api/' + DFA_VERSION
+DFP_VERSION = 'v201311'
+DFP_NS = 'https://www.google.com/apis/ads/publisher/' + DFP_VERSION
+
+
+def LoadWsdlProxy(product, file_name, version, config=_SOAP_CONFIG):
+  """Returns a SOAPpy.WSDL.Proxy built from a test WSDL."""
+  wsdl_xml = open(os.path.join('..', product, 'data', file_name)).read() % {
+      'version': version}
+  return SOAPpy.WSDL.Proxy(wsdl_xml, noroot=1, config=config)
+
+
+def BuildRequest(method_name, ns, packed_args):
+  """Returns the request SOAPpy writes for the given packed arguments."""
+  return SOAPpy.buildSOAP(kw=packed_args, method=method_name, namespace=ns,
+                          noroot=1, config=_SOAP_CONFIG,
+                          methodattrs={'xmlns': ns})
+
+
+class RequestSerializerTest(unittest.TestCase):
+
+  """Tests for the adspygoogle.common.soappy.RequestSerializer module."""
+
+  adwords_service = None
+  dfa_service = None
+  dfp_service = None
+
+  def setUp(self):
+    if RequestSerializerTest.adwords_service is None:
+      RequestSerializerTest.adwords_service = LoadWsdlProxy(
+          'adwords', 'campaign_service.wsdl', ADWORDS_VERSION)
+      RequestSerializerTest.dfa_service = LoadWsdlProxy(
+          'dfa', 'placement_service.wsdl', DFA_VERSION)
+      RequestSerializerTest.dfp_service = LoadWsdlProxy(
+          'dfp', 'line_item_service.wsdl', DFP_VERSION)
+
+  def assertSameRequest(self, service, method_name, arg_name, obj, ns,
+                        type_name, wrap_lists, prefix_function):
+    """Asserts both packing paths produce the same request.
+
+    Returns:
+      mixed The object packed by RequestSerializer.PackForSoappy.
+    """
+    expected = MessageHandler.PackForSoappy(obj, ns, type_name, service,
+                                            wrap_lists, prefix_function)
+    packed = RequestSerializer.PackForSoappy(obj, ns, type_name, service,
+                                             wrap_lists, prefix_function)
+    self.assertEqual(BuildRequest(method_name, ns, {arg_name: expected}),
+                     BuildRequest(method_name, ns, {arg_name: packed}))
+    return packed
+
+  def assertSerialized(self, packed):
+    """Asserts a packed argument was written by the serializers."""
+    if isinstance(packed, list):
+      for item in packed:
+        self.assertSerialized(item)
+    else:
+      self.assertTrue(isinstance(packed, SOAPpy.Types.untypedType))
+
+  def testPackForSoappy_adwordsSelector(self):
+    """Tests packing a selector with nested lists and escaped strings."""
+    selector = {
+        'fields': ['Id', 'Name', 'Status'],
+        'predicates': [
+            {'field': 'Name', 'operator': 'IN',
+             'values': ['a&b', u'caf\xe9', 'caf\xc3\xa9', 'x<y>"\'']},
+            {'field': 'Status', 'operator': 'EQUALS', 'values': ['ACTIVE']}
+        ],
+        'dateRange': {'min': '20130101', 'max': '20131231'},
+        'ordering': [],
+        'paging': {'startIndex': '0', 'numberResults': '100'}
+    }
+    packed = self.assertSameRequest(
+        self.adwords_service, 'get', 'serviceSelector', selector, ADWORDS_NS,
+        'Selector', False, AdWordsPrefix)
+    self.assertSerialized(packed)
+
+  def testPackForSoappy_adwordsOperations(self):
+    """Tests packing operations whose values set their own types."""
+    operations = [{
+        'operator': 'ADD',
+        'operand': {
+            'name': 'Campaign #%d' % i,
+            'status': 'PAUSED',
+            'budget': {'budgetId': str(i)},
+            'settings': [
+                {'xsi_type': 'KeywordMatchSetting', 'optIn': 'false'},
+                {'xsi_type': 'GeoTargetTypeSetting',
+                 'positiveGeoTargetType': 'DONT_CARE'}
+            ],
+            'networkSetting': {'targetGoogleSearch': 'true'},
+            'startDate': None
+        }
+    } for i in range(3)]
+    packed = self.assertSameRequest(
+        self.adwords_service, 'mutate', 'operations', operations, ADWORDS_NS,
+        'CampaignOperation', False, AdWordsPrefix)
+    self.assertEqual(3, len(packed))
+    self.assertSerialized(packed)
+
+    packed = self.assertSameRequest(
+        self.adwords_service, 'mutate', 'operations', [], ADWORDS_NS,
+        'CampaignOperation', False, AdWordsPrefix)
+    self.assertEqual([], packed)
+
+  def testPackForSoappy_dfaWrappedLists(self):
+    """Tests packing DFA objects, which wrap their lists."""
+    criteria = {
+        'campaignIds': ['1', '2', '3'],
+        'siteIds': ['4'],
+        'sizeIds': [],
+        'startDateRange': {'startDate': '2013-01-01T00:00:00'},
+        'sortOrder': {'descending': 'false', 'fieldName': 'name & id'},
+        'pageNumber': '1',
+        'pageSize': '10'
+    }
+    packed = self.assertSameRequest(
+        self.dfa_service, 'getPlacementsByCriteria', 'searchCriteria',
+        criteria, DFA_NS, 'PlacementSearchCriteria', True, DfaPrefix)
+    self.assertSerialized(packed)
+
+    placement = {
+        'name': 'Placement',
+        'campaignId': '1',
+        'pricingSchedule': {
+            'pricingType': '1',
+            'pricingPeriods': [
+                {'startDate': '2013-01-01T00:00:00', 'units': '10'},
+                {'startDate': '2013-02-01T00:00:00', 'units': '20'}
+            ]
+        }
+    }
+    packed = self.assertSameRequest(
+        self.dfa_service, 'savePlacement', 'placement', placement, DFA_NS,
+        'Placement', True, DfaPrefix)
+    self.assertSerialized(packed)
+
+    packed = self.assertSameRequest(
+        self.dfa_service, 'getPlacementsByCriteria', 'searchCriteria',
+        [], DFA_NS, 'ArrayOf_xsd_long', True, DfaPrefix)
+    self.assertSerialized(packed)
+
+  def testPackForSoappy_dfpStatement(self):
+    """Tests packing DFP objects with polymorphic values."""
+    statement = {
+        'query': 'WHERE status = :status LIMIT 500',
+        'values': [{
+            'key': 'status',
+            'value': {'xsi_type': 'TextValue', 'value': 'DELIVERING'}
+        }]
+    }
+    packed = self.assertSameRequest(
+        self.dfp_service, 'getLineItemsByStatement', 'filterStatement',
+        statement, DFP_NS, 'Statement', False, DfpPrefix)
+    self.assertSerialized(packed)
+
+    line_items = [{
+        'name': 'Line item #%d' % i,
+        'orderId': '1',
+        'targeting': {
+            'inventoryTargeting': {
+                'targetedAdUnits': [{'adUnitId': '2',
+                                     'includeDescendants': 'true'}]
+            }
+        }
+    } for i in range(2)]
+    packed = self.assertSameRequest(
+        self.dfp_service, 'createLineItems', 'lineItems', line_items, DFP_NS,
+        'LineItem', False, DfpPrefix)
+    self.assertSerialized(packed)
+
+  def testPackForSoappy_fallback(self):
+    """Tests values the serializers leave to MessageHandler.PackForSoappy."""
+    for selector in ({'fields': ['Id', None]},
+                     {'predicates': [{'field': 'Id'}, 'Name']}):
+      packed = self.assertSameRequest(
+          self.adwords_service, 'get', 'serviceSelector', selector,
+          ADWORDS_NS, 'Selector', False, AdWordsPrefix)
+      self.assertTrue(isinstance(packed, SOAPpy.Types.structType))
+
+  def testPackForSoappy_typedConfig(self):
+    """Tests that services writing type information are not serialized."""
+    service = LoadWsdlProxy('adwords', 'campaign_service.wsdl',
+                            ADWORDS_VERSION, SOAPpy.Config)
+    packed = RequestSerializer.PackForSoappy(
+        {'fields': ['Id']}, ADWORDS_NS, 'Selector', service, False,
+        AdWordsPrefix)
+    self.assertTrue(isinstance(packed, SOAPpy.Types.structType))
+
+  def testPackForSoappy_unknownField(self):
+    """Tests that unknown fields raise the same error as before."""
+    self.assertRaises(TypeError, RequestSerializer.PackForSoappy,
+                      {'unknownField': 'x'}, ADWORDS_NS, 'Selector',
+                      self.adwords_service, False, AdWordsPrefix)
+
+  def testGetSerializer_memoized(self):
+    """Tests that serializers are compiled once per service and settings."""
+    serializer = RequestSerializer._GetSerializer(self.adwords_service, False,
+                                                  AdWordsPrefix)
+    self.assertTrue(serializer is RequestSerializer._GetSerializer(
+        self.adwords_service, False, AdWordsPrefix))
+    self.assertFalse(serializer is RequestSerializer._GetSerializer(
+        self.adwords_service, True, AdWordsPrefix))
+
+
+if __name__ == '__main__':
+  unittest.main()
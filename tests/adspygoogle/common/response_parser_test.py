@@ -0,0 +1,175 @@
+#!/usr/bin/python
+#
+# Copyright 2013 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Unit tests to cover ResponseParser."""
+
+__author__ = 'agent@local (agent)'
+
+import os
+import sys
+import unittest
+sys.path.insert(0, os.path.join('..', '..', '..'))
+
+import mock
+
+from adspygoogle import SOAPpy
+from adspygoogle.common import MessageHandler
+from adspygoogle.common.soappy import ResponseParser
+
+
+ADWORDS_VERSION = 'v201309'
+ADWORDS_NS = 'https://adwords.google.com/api/adwords/cm/' + ADWORDS_VERSION
+ADWORDS_DATA = os.path.join('..', 'adwords', 'data')
+RETURN_TYPES = [(ADWORDS_NS, 'CampaignPage', '1')]
+ENVELOPE = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<soap:Envelope '
+            'xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/" '
+            'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">'
+            '<soap:Body><getResponse xmlns="%s">%s</getResponse></soap:Body>'
+            '</soap:Envelope>')
+
+
+def ReadFile(file_name):
+  """Returns the content of an AdWords test data file."""
+  return open(os.path.join(ADWORDS_DATA, file_name)).read() % {
+      'version': ADWORDS_VERSION}
+
+
+def GetResponse(rval):
+  """Returns a CampaignService.get response holding the given XML."""
+  return ENVELOPE % (ADWORDS_NS, rval)
+
+
+class ResponseParserTest(unittest.TestCase):
+
+  """Tests for the adspygoogle.common.soappy.ResponseParser module."""
+
+  service = None
+
+  def setUp(self):
+    if ResponseParserTest.service is None:
+      ResponseParserTest.service = SOAPpy.WSDL.Proxy(
+          ReadFile('campaign_service.wsdl'), noroot=1)
+
+  def ParseWithSoappy(self, data, return_types=RETURN_TYPES):
+    """Returns a response as it is parsed when not streaming."""
+    return MessageHandler.RestoreListTypeWithSoappy(
+        MessageHandler.UnpackResponseAsDict(
+            ResponseParser.ParseWithSoappy(self.service, data)),
+        self.service, return_types)
+
+  def assertParsedLikeSoappy(self, data, return_types=RETURN_TYPES):
+    """Checks that a response is parsed without SOAPpy, to the same result."""
+    expected = self.ParseWithSoappy(data, return_types)
+    with mock.patch('adspygoogle.common.soappy.ResponseParser.'
+                    'ParseWithSoappy') as soappy_parser:
+      self.assertEqual(expected, ResponseParser.ParseResponse(
+          data, self.service, return_types))
+      self.assertFalse(soappy_parser.called)
+    return expected
+
+  def testParseResponse_page(self):
+    """Tests a page of campaigns with header, struct and list fields."""
+    response = self.assertParsedLikeSoappy(
+        ReadFile('integration_test_response.xml'))
+    self.assertEqual('5', response['totalNumEntries'])
+    self.assertEqual(5, len(response['entries']))
+    self.assertEqual({'network': 'ALL', 'Stats_Type': 'CampaignStats'},
+                     response['entries'][0]['campaignStats'])
+
+  def testParseResponse_singleEntry(self):
+    """Tests that a single entry of a repeated field is put in a list."""
+    response = self.assertParsedLikeSoappy(GetResponse(
+        '<rval><totalNumEntries>1</totalNumEntries>'
+        '<entries><id>1</id><name>caf\xc3\xa9</name></entries></rval>'))
+    self.assertEqual([{'id': '1', 'name': u'caf\xe9'}], response['entries'])
+
+  def testParseResponse_emptyAndNilValues(self):
+    """Tests empty responses, nil values and empty list items."""
+    self.assertParsedLikeSoappy(GetResponse(''))
+    self.assertParsedLikeSoappy(GetResponse('<rval/>'))
+    response = self.assertParsedLikeSoappy(GetResponse(
+        '<rval><entries><id>1</id><name xsi:nil="true"/></entries>'
+        '<entries/><entries><id>2</id></entries></rval>'))
+    self.assertEqual([{'id': '1', 'name': None}, {'id': '2'}],
+                     response['entries'])
+
+  def testParseResponse_subTypes(self):
+    """Tests that fields of sub types are typed from their Type field."""
+    response = self.assertParsedLikeSoappy(GetResponse(
+        '<rval><entries><id>1</id>'
+        '<settings><Setting.Type>GeoTargetTypeSetting</Setting.Type>'
+        '<positiveGeoTargetType>DONT_CARE</positiveGeoTargetType></settings>'
+        '<settings><Setting.Type>KeywordMatchSetting</Setting.Type>'
+        '<optIn>true</optIn></settings></entries></rval>'))
+    self.assertEqual(2, len(response['entries'][0]['settings']))
+
+  def testParseResponse_unknownFields(self):
+    """Tests that fields missing from the WSDL are kept as parsed."""
+    self.assertParsedLikeSoappy(GetResponse(
+        '<rval><_ignored>1</_ignored><entries><id> 1 </id>'
+        '<extra><a>1</a><a>2</a></extra></entries></rval>'))
+
+  def testParseResponse_typedValuesParsedBySoappy(self):
+    """Tests that values with an xsi:type are left to SOAPpy."""
+    data = GetResponse('<rval><entries><id xsi:type="xsd:long">1</id>'
+                       '</entries></rval>')
+    self.assertEqual(self.ParseWithSoappy(data), ResponseParser.ParseResponse(
+        data, self.service, RETURN_TYPES))
+
+  def testParseResponse_fault(self):
+    """Tests that faults are raised the way SOAPpy raises them."""
+    self.assertRaises(SOAPpy.faultType, ResponseParser.ParseResponse,
+                      ReadFile('response_fault.xml'), self.service,
+                      RETURN_TYPES)
+
+  def testResponseStream(self):
+    """Tests that a page's entries are yielded apart from its other fields."""
+    data = ReadFile('integration_test_response.xml')
+    page = self.ParseWithSoappy(data)
+    stream = ResponseParser.ResponseStream(data, self.service, RETURN_TYPES)
+    self.assertEqual(None, stream.page)
+
+    entries = iter(stream)
+    self.assertEqual(page['entries'][0], entries.next())
+    self.assertEqual(None, stream.page)
+    self.assertEqual(page.pop('entries')[1:], list(entries))
+    self.assertEqual(page, stream.page)
+
+  def testResponseStream_parsedBySoappyMidway(self):
+    """Tests that no entry is lost or repeated when SOAPpy takes over."""
+    data = GetResponse(''.join(
+        ['<rval><totalNumEntries>3</totalNumEntries>'] +
+        ['<entries><id>%s</id></entries>' % i for i in range(2)] +
+        ['<entries><id xsi:type="xsd:long">2</id></entries></rval>']))
+    stream = ResponseParser.ResponseStream(data, self.service, RETURN_TYPES)
+    # Parses a few elements at a time, so entries are yielded before the
+    # typed value is reached.
+    with mock.patch.object(ResponseParser, '_CHUNK_SIZE', 64):
+      entries = iter(stream)
+      self.assertEqual({'id': '0'}, entries.next())
+      self.assertEqual([{'id': '1'}, {'id': '2'}], list(entries))
+    self.assertEqual({'totalNumEntries': '3'}, stream.page)
+
+  def testResponseStream_fault(self):
+    """Tests that faults are raised when the stream is read."""
+    stream = ResponseParser.ResponseStream(ReadFile('response_fault.xml'),
+                                           self.service, RETURN_TYPES)
+    self.assertRaises(SOAPpy.faultType, list, stream)
+
+
+if __name__ == '__main__':
+  unittest.main()
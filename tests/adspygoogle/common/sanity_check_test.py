@@ -23,10 +23,17 @@ import sys
 import unittest
 sys.path.insert(0, os.path.join('..', '..', '..'))
 
+from adspygoogle import SOAPpy
 from adspygoogle.common import SanityCheck
 from adspygoogle.common.Errors import ValidationError
 
 
+ADWORDS_WSDL_FILE_LOCATION = os.path.join('..', 'adwords', 'data',
+                                          'campaign_service.wsdl')
+ADWORDS_VERSION = 'v201309'
+ADWORDS_NS = 'https://adwords.google.com/api/adwords/cm/' + ADWORDS_VERSION
+
+
 class SanityCheckTest(unittest.TestCase):
 
   """Tests for the adspygoogle.common.SanityCheck module."""
@@ -49,5 +56,92 @@ class SanityCheckTest(unittest.TestCase):
                       'False')
 
 
+class SoappySanityCheckTest(unittest.TestCase):
+
+  """Tests for the SoappySanityCheck function."""
+
+  service = None
+
+  def setUp(self):
+    if SoappySanityCheckTest.service is None:
+      wsdl_xml = open(ADWORDS_WSDL_FILE_LOCATION).read() % {
+          'version': ADWORDS_VERSION}
+      SoappySanityCheckTest.service = SOAPpy.WSDL.Proxy(wsdl_xml, noroot=1)
+
+  def assertInvalid(self, message, obj, obj_type, max_occurs='1'):
+    """Asserts an object fails validation with the given message."""
+    # The second check goes through the already compiled validators.
+    for unused_i in range(2):
+      try:
+        SanityCheck.SoappySanityCheck(self.service, obj, ADWORDS_NS, obj_type,
+                                      max_occurs)
+        self.fail('No ValidationError was raised.')
+      except ValidationError, e:
+        self.assertEqual(message, str(e))
+
+  def testSoappySanityCheck_valid(self):
+    """Tests that valid objects pass."""
+    operations = [{
+        'operator': 'ADD',
+        'operand': {
+            'name': 'Campaign',
+            'status': 'PAUSED',
+            'settings': [
+                {'xsi_type': 'KeywordMatchSetting', 'optIn': 'false'},
+                {'Setting.Type': 'GeoTargetTypeSetting',
+                 'positiveGeoTargetType': 'DONT_CARE'}
+            ],
+            'startDate': None
+        }
+    }, None, '']
+    for unused_i in range(2):
+      SanityCheck.SoappySanityCheck(self.service, operations, ADWORDS_NS,
+                                    'CampaignOperation', 'unbounded')
+    SanityCheck.SoappySanityCheck(self.service, None, ADWORDS_NS, 'Unknown')
+    SanityCheck.SoappySanityCheck(self.service, '', ADWORDS_NS, 'Selector')
+
+  def testSoappySanityCheck_invalid(self):
+    """Tests the messages of objects which fail validation."""
+    self.assertInvalid('Field \'fields\' in complex type \'Selector\' should '
+                       'be a list but value \'Id\' is a \'<type \'str\'>\' '
+                       'instead.', {'fields': 'Id'}, 'Selector')
+    self.assertInvalid('Objects of type \'string\' should be a string but '
+                       'value \'1\' is a \'<type \'int\'>\' instead.',
+                       {'fields': [1]}, 'Selector')
+    self.assertInvalid('Field \'bogus\' is not in type \'Selector\'.',
+                       {'bogus': 'x'}, 'Selector')
+    self.assertInvalid('The \'x\' is of type <type \'str\'>, expecting one '
+                       'of (<type \'dict\'>,).', 'x', 'Selector')
+    self.assertInvalid('This type is not defined in the WSDL: \'Unknown\'',
+                       {}, 'Unknown')
+    self.assertInvalid('Simple type \'Operator\' should be a string but value '
+                       '\'[\'ADD\']\' is a \'<type \'list\'>\' instead.',
+                       [{'operator': ['ADD']}], 'CampaignOperation',
+                       'unbounded')
+    self.assertInvalid('Type \'CampaignOperation\' should be a list but value '
+                       '\'({},)\' is a \'<type \'tuple\'>\' instead.',
+                       ({},), 'CampaignOperation', 'unbounded')
+
+  def testSoappySanityCheck_explicitTypes(self):
+    """Tests the messages of objects with invalid explicit types."""
+    self.assertInvalid('Object of class \'Setting\' has an explicit type of '
+                       '\'Bogus\', but this explicit type is not defined in '
+                       'the WSDL.', {'xsi_type': 'Bogus'}, 'Setting')
+    self.assertInvalid('Expecting type of \'Setting\' but given type of class '
+                       '\'Campaign\'.', {'xsi_type': 'Campaign'}, 'Setting')
+    self.assertInvalid('Field \'optIn\' is not in type '
+                       '\'GeoTargetTypeSetting\'.',
+                       {'xsi_type': 'GeoTargetTypeSetting', 'optIn': 'false'},
+                       'Setting')
+
+  def testSoappySanityCheck_memoized(self):
+    """Tests that validators are compiled once per service and type."""
+    validators = SanityCheck._GetValidators(self.service)
+    self.assertTrue(validators is SanityCheck._GetValidators(self.service))
+    validator = validators.Get(ADWORDS_NS, 'Selector', False)
+    self.assertTrue(validator == validators.Get(ADWORDS_NS, 'Selector', False))
+    self.assertFalse(validator == validators.Get(ADWORDS_NS, 'Selector', True))
+
+
 if __name__ == '__main__':
   unittest.main()
@@ -0,0 +1,138 @@
+#!/usr/bin/python
+#
+# Copyright 2013 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Unit tests to cover SchemaRegistry."""
+
+__author__ = 'agent@local (agent)'
+
+import copy
+import gc
+import os
+import sys
+import unittest
+sys.path.insert(0, os.path.join('..', '..', '..'))
+
+import mock
+
+from adspygoogle import SOAPpy
+from adspygoogle.common.GenericApiService import GenericApiService
+from adspygoogle.common.SoapBuffer import SoapBuffer
+from adspygoogle.common.soappy import SchemaRegistry
+from adspygoogle.common.soappy import SchemaSnapshot
+
+
+SERVER = 'https://adwords.google.com'
+VERSION = 'v201309'
+GROUP = 'cm'
+WSDL_FILE_LOCATION = os.path.join('..', 'adwords', 'data',
+                                  'campaign_service.wsdl')
+NS = 'https://adwords.google.com/api/adwords/cm/' + VERSION
+
+
+class ConcreteGenericApiService(GenericApiService):
+
+  """A subclass of the abstract GenericApiService class, used for testing."""
+
+  def _HandleLogsAndErrors(self, unused_buf, unused_start, unused_stop):
+    """Dummy implementation of an abstract method in GenericApiService."""
+    pass
+
+
+def LoadWsdlProxy(version=VERSION):
+  """Returns a SOAPpy.WSDL.Proxy built from the CampaignService test WSDL."""
+  wsdl_xml = open(WSDL_FILE_LOCATION).read() % {'version': version}
+  return SOAPpy.WSDL.Proxy(wsdl_xml, noroot=1)
+
+
+class SchemaRegistryTest(unittest.TestCase):
+
+  """Tests for the adspygoogle.common.soappy.SchemaRegistry module."""
+
+  snapshot = None
+
+  def setUp(self):
+    if SchemaRegistryTest.snapshot is None:
+      SchemaRegistryTest.snapshot = SchemaSnapshot.CreateSnapshot(
+          LoadWsdlProxy())
+    self.registry = SchemaRegistry.GetSchemaRegistry()
+    self.registry.Clear()
+
+  def testSnapshotProxy_sharesDefinitions(self):
+    """Tests that services with the same schema share its definitions."""
+    first = SchemaSnapshot.SnapshotProxy(self.snapshot)
+    second = SchemaSnapshot.SnapshotProxy(copy.deepcopy(self.snapshot))
+    for name in ('Selector', 'Campaign', 'ApiError'):
+      self.assertTrue(first.wsdl.types[NS].types[name] is
+                      second.wsdl.types[NS].types[name])
+    self.assertTrue(first.wsdl.types[NS].elements['get'] is
+                    second.wsdl.types[NS].elements['get'])
+
+    stats = self.registry.GetStats()
+    self.assertEqual(stats['requests'], 2 * stats['definitions'])
+    self.assertEqual(stats['shared'], stats['definitions'])
+
+  def testSnapshotProxy_keepsDifferentDefinitionsApart(self):
+    """Tests that only identical definitions are shared."""
+    snapshot = copy.deepcopy(self.snapshot)
+    del snapshot['types'][NS]['Selector']['content'][1][0]
+    first = SchemaSnapshot.SnapshotProxy(self.snapshot)
+    second = SchemaSnapshot.SnapshotProxy(snapshot)
+    self.assertFalse(first.wsdl.types[NS].types['Selector'] is
+                     second.wsdl.types[NS].types['Selector'])
+    self.assertTrue(first.wsdl.types[NS].types['Paging'] is
+                    second.wsdl.types[NS].types['Paging'])
+
+    other_version = SchemaSnapshot.SnapshotProxy(
+        SchemaSnapshot.CreateSnapshot(LoadWsdlProxy('v201306')))
+    other_ns = NS.replace(VERSION, 'v201306')
+    self.assertFalse(first.wsdl.types[NS].types['Paging'] is
+                     other_version.wsdl.types[other_ns].types['Paging'])
+
+  def testGetStats_releasesUnusedDefinitions(self):
+    """Tests that definitions are dropped once no service uses them."""
+    proxy = SchemaSnapshot.SnapshotProxy(self.snapshot)
+    self.assertTrue(self.registry.GetStats()['definitions'] > 0)
+    del proxy
+    gc.collect()
+    self.assertEqual(0, self.registry.GetStats()['definitions'])
+
+  def testGenericApiService_sharedSchema(self):
+    """Tests that services drop their parsed WSDL unless told otherwise."""
+    op_config = {
+        'http_proxy': None,
+        'server': SERVER,
+        'version': VERSION,
+        'group': GROUP
+    }
+    service_url = '/'.join([SERVER, 'api/adwords', GROUP, VERSION,
+                            'CampaignService'])
+
+    for shared_schema, uses_snapshot in (('y', True), ('n', False)):
+      wsdl_proxy = LoadWsdlProxy()
+      with mock.patch('adspygoogle.SOAPpy.WSDL.Proxy') as mock_proxy:
+        mock_proxy.return_value = wsdl_proxy
+        service = ConcreteGenericApiService(
+            {}, {'shared_schema': shared_schema}, op_config, mock.Mock(),
+            mock.Mock(), 'CampaignService', service_url, False, SoapBuffer,
+            NS, lambda x: x)
+      self.assertEqual(uses_snapshot, isinstance(service._soappyservice,
+                                                 SchemaSnapshot.SnapshotProxy))
+      for method in service._soappyservice.methods.values():
+        self.assertEqual(service_url, method.location)
+
+
+if __name__ == '__main__':
+  unittest.main()
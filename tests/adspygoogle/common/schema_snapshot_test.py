@@ -0,0 +1,197 @@
+#!/usr/bin/python
+#
+# Copyright 2013 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Unit tests to cover SchemaSnapshot."""
+
+__author__ = 'agent@local (agent)'
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+sys.path.insert(0, os.path.join('..', '..', '..'))
+
+import mock
+
+from adspygoogle import SOAPpy
+from adspygoogle.common.Errors import Error
+from adspygoogle.common.GenericApiService import GenericApiService
+from adspygoogle.common.SoapBuffer import SoapBuffer
+from adspygoogle.common.soappy import SchemaSnapshot
+from adspygoogle.common.soappy import SoappyUtils
+
+
+SERVER = 'https://adwords.google.com'
+VERSION = 'v201309'
+GROUP = 'cm'
+WSDL_FILE_LOCATION = os.path.join('..', 'adwords', 'data',
+                                  'campaign_service.wsdl')
+NS = 'https://adwords.google.com/api/adwords/cm/' + VERSION
+
+
+class ConcreteGenericApiService(GenericApiService):
+
+  """A subclass of the abstract GenericApiService class, used for testing."""
+
+  def _HandleLogsAndErrors(self, unused_buf, unused_start, unused_stop):
+    """Dummy implementation of an abstract method in GenericApiService."""
+    pass
+
+
+def LoadWsdlProxy():
+  """Returns a SOAPpy.WSDL.Proxy built from the CampaignService test WSDL."""
+  wsdl_xml = open(WSDL_FILE_LOCATION).read() % {'version': VERSION}
+  return SOAPpy.WSDL.Proxy(wsdl_xml, noroot=1)
+
+
+class SchemaSnapshotTest(unittest.TestCase):
+
+  """Tests for the adspygoogle.common.soappy.SchemaSnapshot module."""
+
+  wsdl_proxy = None
+
+  def setUp(self):
+    if SchemaSnapshotTest.wsdl_proxy is None:
+      SchemaSnapshotTest.wsdl_proxy = LoadWsdlProxy()
+    self.snapshot_dir = tempfile.mkdtemp()
+    self.store = SchemaSnapshot.SchemaSnapshotStore(self.snapshot_dir)
+
+  def tearDown(self):
+    shutil.rmtree(self.snapshot_dir)
+
+  def _SaveAndLoad(self, snapshot):
+    path = self.store.Put(SERVER, VERSION, GROUP, 'CampaignService', snapshot)
+    return SchemaSnapshot.LoadSnapshot(path)
+
+  def testSnapshotProxy_matchesWsdlProxy(self):
+    """Tests that a snapshot answers schema queries like the parsed WSDL."""
+    wsdl_proxy = self.wsdl_proxy
+    snapshot_proxy = SchemaSnapshot.SnapshotProxy(
+        self._SaveAndLoad(SchemaSnapshot.CreateSnapshot(wsdl_proxy)), noroot=1)
+
+    def Describe(service, name):
+      description = [
+          service.wsdl.types[NS].types[name].tag,
+          SoappyUtils.IsASubType(name, NS, service),
+          SoappyUtils.IsAnArrayType(name, NS, service),
+          SoappyUtils.IsASuperType(service, name, NS, 'ApiError')]
+      if description[2]:
+        description.append(SoappyUtils.GetArrayItemTypeName(name, NS, service))
+      for attributes in SoappyUtils.GenKeyOrderAttrs(service, NS, name):
+        description.append((
+            attributes['name'], tuple(attributes['type']),
+            attributes.get('maxOccurs'),
+            SoappyUtils.GetComplexFieldNamespaceByFieldName(
+                attributes['name'], name, NS, service)))
+      return description
+
+    type_names = wsdl_proxy.wsdl.types[NS].types.keys()
+    self.assertEqual(sorted(type_names),
+                     sorted(snapshot_proxy.wsdl.types[NS].types.keys()))
+    for name in type_names:
+      self.assertEqual(Describe(wsdl_proxy, name),
+                       Describe(snapshot_proxy, name))
+
+    self.assertEqual(sorted(wsdl_proxy.methods.keys()),
+                     sorted(snapshot_proxy.methods.keys()))
+    for name in wsdl_proxy.methods:
+      expected = wsdl_proxy.methods[name]
+      actual = snapshot_proxy.methods[name]
+      self.assertEqual(expected.namespace, actual.namespace)
+      self.assertEqual(expected.soapAction, actual.soapAction)
+      for key in ('inparams', 'outparams', 'inheaders', 'outheaders'):
+        self.assertEqual(
+            [(param.__class__, param.__dict__)
+             for param in getattr(expected, key)],
+            [(param.__class__, param.__dict__)
+             for param in getattr(actual, key)])
+
+    element = snapshot_proxy.wsdl.types[NS].elements['get']
+    self.assertEqual(
+        [field.attributes for field in
+         wsdl_proxy.wsdl.types[NS].elements['get'].content.content.content],
+        [field.attributes for field in element.content.content.content])
+
+  def testStore(self):
+    """Tests storing, retrieving and removing snapshots."""
+    self.assertEqual(
+        None, self.store.Get(SERVER, VERSION, GROUP, 'CampaignService'))
+    snapshot = SchemaSnapshot.CreateSnapshot(self.wsdl_proxy)
+    self.store.Put(SERVER, VERSION, GROUP, 'CampaignService', snapshot)
+    self.assertEqual(
+        snapshot, self.store.Get(SERVER, VERSION, GROUP, 'CampaignService'))
+    self.assertEqual(
+        None, self.store.Get(SERVER, 'v201306', GROUP, 'CampaignService'))
+
+    self.assertTrue(
+        self.store.Invalidate(SERVER, VERSION, GROUP, 'CampaignService'))
+    self.assertFalse(
+        self.store.Invalidate(SERVER, VERSION, GROUP, 'CampaignService'))
+    self.store.Put(SERVER, VERSION, GROUP, 'CampaignService', snapshot)
+    self.assertEqual(1, self.store.Clear())
+    self.assertEqual([], os.listdir(self.snapshot_dir))
+
+  def testLoadSnapshot_rejectsUnusableFiles(self):
+    """Tests that corrupt and outdated snapshots are ignored."""
+    snapshot = SchemaSnapshot.CreateSnapshot(self.wsdl_proxy)
+    snapshot['format_version'] = SchemaSnapshot.SNAPSHOT_FORMAT_VERSION + 1
+    self.assertEqual(None, self._SaveAndLoad(snapshot))
+    self.assertRaises(Error, SchemaSnapshot.SnapshotProxy, snapshot)
+
+    path = self.store.GetPath(SERVER, VERSION, GROUP, 'CampaignService')
+    fh = open(path, 'wb')
+    fh.write('not a snapshot')
+    fh.close()
+    self.assertEqual(None, SchemaSnapshot.LoadSnapshot(path))
+    self.assertEqual(None, SchemaSnapshot.LoadSnapshot(path + '.missing'))
+
+  def testGetSnapshotStoreFromConfig(self):
+    """Tests that snapshots are only enabled when a directory is configured."""
+    self.assertEqual(None, SchemaSnapshot.GetSnapshotStoreFromConfig({}))
+    self.assertTrue(isinstance(
+        SchemaSnapshot.GetSnapshotStoreFromConfig(
+            {'schema_snapshot_dir': self.snapshot_dir}),
+        SchemaSnapshot.SchemaSnapshotStore))
+
+  def testGenericApiService_usesSnapshot(self):
+    """Tests that services only parse their WSDL when no snapshot exists."""
+    config = {'schema_snapshot_dir': self.snapshot_dir}
+    op_config = {
+        'http_proxy': None,
+        'server': SERVER,
+        'version': VERSION,
+        'group': GROUP
+    }
+    service_url = '/'.join([SERVER, 'api/adwords', GROUP, VERSION,
+                            'CampaignService'])
+
+    with mock.patch('adspygoogle.SOAPpy.WSDL.Proxy') as mock_proxy:
+      mock_proxy.return_value = self.wsdl_proxy
+      for unused_i in range(2):
+        service = ConcreteGenericApiService(
+            {}, config, op_config, mock.Mock(), mock.Mock(), 'CampaignService',
+            service_url, False, SoapBuffer, NS, lambda x: x)
+
+    self.assertEqual(1, mock_proxy.call_count)
+    self.assertTrue(isinstance(service._soappyservice,
+                               SchemaSnapshot.SnapshotProxy))
+    for method in service._soappyservice.methods.values():
+      self.assertEqual(service_url, method.location)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,91 @@
+#!/usr/bin/python
+#
+# Copyright 2013 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Unit tests to cover ServiceRegistry."""
+
+__author__ = 'agent@local (agent)'
+
+import os
+import sys
+import unittest
+sys.path.insert(0, os.path.join('..', '..', '..'))
+
+from adspygoogle.common.ServiceRegistry import ServiceRegistry
+
+
+OP_CONFIG = {
+    'server': 'https://adwords.google.com',
+    'version': 'v201309',
+    'group': 'cm',
+    'http_proxy': None
+}
+
+
+class ServiceRegistryTest(unittest.TestCase):
+
+  """Tests for the adspygoogle.common.ServiceRegistry module."""
+
+  def setUp(self):
+    self.registry = ServiceRegistry(max_size=2)
+
+  def testGetKey(self):
+    """Tests that services differing in any identifying value get new keys."""
+    key = self.registry.GetKey('CampaignService', OP_CONFIG)
+    self.assertEqual(key, self.registry.GetKey('CampaignService',
+                                               OP_CONFIG.copy()))
+    for name, value in (('server', 'https://adwords-sandbox.google.com'),
+                        ('version', 'v201306'), ('group', 'mcm'),
+                        ('http_proxy', 'proxy.example.com:8080')):
+      op_config = OP_CONFIG.copy()
+      op_config[name] = value
+      self.assertNotEqual(key, self.registry.GetKey('CampaignService',
+                                                    op_config))
+    self.assertNotEqual(key, self.registry.GetKey('AdGroupService', OP_CONFIG))
+
+  def testPutAndGet_evictsLeastRecentlyUsed(self):
+    """Tests that the registry never grows past its maximum size."""
+    self.registry.Put('a', 'service a')
+    self.registry.Put('b', 'service b')
+    self.assertEqual('service a', self.registry.Get('a'))
+    self.registry.Put('c', 'service c')
+
+    self.assertEqual(2, len(self.registry))
+    self.assertEqual(None, self.registry.Get('b'))
+    self.assertEqual('service a', self.registry.Get('a'))
+    self.assertEqual('service c', self.registry.Get('c'))
+
+  def testEvict(self):
+    """Tests explicit eviction by service name and of all services."""
+    campaign_key = self.registry.GetKey('CampaignService', OP_CONFIG)
+    ad_group_key = self.registry.GetKey('AdGroupService', OP_CONFIG)
+    self.registry.Put(campaign_key, 'campaign service')
+    self.registry.Put(ad_group_key, 'ad group service')
+
+    self.assertEqual(1, self.registry.Evict('CampaignService'))
+    self.assertEqual(None, self.registry.Get(campaign_key))
+    self.assertEqual('ad group service', self.registry.Get(ad_group_key))
+    self.assertEqual(1, self.registry.Evict())
+    self.assertEqual(0, len(self.registry))
+
+  def testDisabled(self):
+    """Tests that a registry of size 0 never keeps services."""
+    registry = ServiceRegistry(max_size=0)
+    registry.Put('a', 'service a')
+    self.assertEqual(None, registry.Get('a'))
+
+
+if __name__ == '__main__':
+  unittest.main()
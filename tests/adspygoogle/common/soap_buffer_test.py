@@ -23,6 +23,10 @@ import sys
 import unittest
 sys.path.insert(0, os.path.join('..', '..', '..'))
 
+import mock
+
+from adspygoogle.common import SoapBuffer as soap_buffer_module
+from adspygoogle.common.Errors import MalformedBufferError
 from adspygoogle.common.SoapBuffer import SoapBuffer
 
 
@@ -106,6 +110,48 @@ class SoapBufferTest(unittest.TestCase):
 
     self.assertEqual(expected_output, buffer_.GetFaultAsDict())
 
+  def testGetResponseHeader(self):
+    """Tests that all ResponseHeader fields are read."""
+    buffer_ = SoapBuffer('2', True)
+    buffer_.write(TEST_BUFFER)
+    self.assertEqual({'requestId': '0004d4ff4049f7c80a34b08200004b1d',
+                      'serviceName': 'AdGroupAdService',
+                      'methodName': 'mutate',
+                      'operations': '1',
+                      'responseTime': '358',
+                      'units': '40'}, buffer_._GetResponseHeader())
+
+  def testXmlIsParsedOnce(self):
+    """Tests that each SOAP message is parsed once until the next write."""
+    buffer_ = SoapBuffer('2', False)
+    buffer_.write(TEST_BUFFER)
+    fromstring = mock.Mock(wraps=soap_buffer_module.etree.fromstring)
+    with mock.patch.object(soap_buffer_module.etree, 'fromstring', fromstring):
+      self.assertTrue(buffer_.IsHandshakeComplete())
+      self.assertTrue(buffer_.IsSoap())
+      buffer_.GetFaultAsDict()
+      buffer_._GetResponseHeader()
+      self.assertEqual('mutate', buffer_.GetCallName())
+      buffer_.GetFaultAsDict()
+      self.assertEqual(2, fromstring.call_count)
+
+      buffer_.write('\n')
+      buffer_.GetFaultAsDict()
+      self.assertEqual(3, fromstring.call_count)
+
+  def testWrite_dropsCachedDumps(self):
+    """Tests that dumps reflect data written after they were read."""
+    buffer_ = SoapBuffer('2', False)
+    head, tail = TEST_BUFFER.split('*** Incoming SOAP')
+    buffer_.write(head)
+    self.assertEqual('', buffer_.GetSoapIn())
+    self.assertFalse(buffer_.IsHandshakeComplete())
+    self.assertRaises(MalformedBufferError, buffer_._GetXmlIn)
+    buffer_.write('*** Incoming SOAP' + tail)
+    self.assertTrue(buffer_.GetSoapIn().startswith('*** Incoming SOAP'))
+    self.assertTrue(buffer_.IsHandshakeComplete())
+    self.assertEqual('358', buffer_._GetResponseHeader()['responseTime'])
+
 
 if __name__ == '__main__':
   unittest.main()
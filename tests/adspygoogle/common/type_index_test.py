@@ -0,0 +1,129 @@
+#!/usr/bin/python
+#
+# Copyright 2013 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Unit tests to cover TypeIndex."""
+
+__author__ = 'agent@local (agent)'
+
+import os
+import sys
+import unittest
+sys.path.insert(0, os.path.join('..', '..', '..'))
+
+from adspygoogle import SOAPpy
+from adspygoogle.common.soappy import SoappyUtils
+from adspygoogle.common.soappy import TypeIndex
+
+
+ADWORDS_WSDL_FILE_LOCATION = os.path.join('..', 'adwords', 'data',
+                                          'campaign_service.wsdl')
+ADWORDS_VERSION = 'v201309'
+ADWORDS_NS = 'https://adwords.google.com/api/adwords/cm/' + ADWORDS_VERSION
+DFA_WSDL_FILE_LOCATION = os.path.join('..', 'dfa', 'data',
+                                      'placement_service.wsdl')
+DFA_VERSION = 'v1.20'
+DFA_NS = 'http://www.doubleclick.net/dfa-api/' + DFA_VERSION
+XSD_NS = 'http://www.w3.org/2001/XMLSchema'
+
+
+def LoadWsdlProxy(wsdl_file_location, version):
+  """Returns a SOAPpy.WSDL.Proxy built from a test WSDL."""
+  wsdl_xml = open(wsdl_file_location).read() % {'version': version}
+  return SOAPpy.WSDL.Proxy(wsdl_xml, noroot=1)
+
+
+class TypeIndexTest(unittest.TestCase):
+
+  """Tests for the adspygoogle.common.soappy.TypeIndex module."""
+
+  adwords_service = None
+  dfa_service = None
+
+  def setUp(self):
+    if TypeIndexTest.adwords_service is None:
+      TypeIndexTest.adwords_service = LoadWsdlProxy(
+          ADWORDS_WSDL_FILE_LOCATION, ADWORDS_VERSION)
+      TypeIndexTest.dfa_service = LoadWsdlProxy(DFA_WSDL_FILE_LOCATION,
+                                                DFA_VERSION)
+    self.index = TypeIndex.GetTypeIndex(self.adwords_service)
+
+  def testGetTypeIndex_memoized(self):
+    """Tests that each service has a single index."""
+    self.assertTrue(self.index is
+                    TypeIndex.GetTypeIndex(self.adwords_service))
+    self.assertFalse(self.index is TypeIndex.GetTypeIndex(self.dfa_service))
+
+  def testGetField(self):
+    """Tests field lookups through a type's derivation chain."""
+    field = self.index.GetField('entries', 'CampaignPage', ADWORDS_NS)
+    self.assertEqual(ADWORDS_NS, field.namespace)
+    self.assertEqual((ADWORDS_NS, 'Campaign'), tuple(field.type))
+    self.assertEqual('unbounded', field.max_occurs)
+    self.assertEqual(3, field.position)
+
+    field = self.index.GetField('totalNumEntries', 'CampaignPage', ADWORDS_NS)
+    self.assertEqual((XSD_NS, 'int'), tuple(field.type))
+    self.assertEqual('1', field.max_occurs)
+    self.assertEqual(0, field.position)
+
+    self.assertRaises(TypeError, self.index.GetField, 'optIn', 'Setting',
+                      ADWORDS_NS)
+    self.assertRaises(KeyError, self.index.GetField, 'optIn', 'NoSuchType',
+                      ADWORDS_NS)
+
+  def testGenKeyOrderAttrs(self):
+    """Tests that base type fields come first in the key order."""
+    self.assertEqual(
+        ['operator', 'Operation.Type', 'biddingTransition', 'operand'],
+        SoappyUtils.GenKeyOrder(self.adwords_service, ADWORDS_NS,
+                                'CampaignOperation'))
+    self.assertEqual(
+        ['operator', 'Operation.Type', 'biddingTransition', 'operand'],
+        [attributes['name'] for attributes in self.index.GenKeyOrderAttrs(
+            ADWORDS_NS, 'CampaignOperation')])
+
+  def testSubTypes(self):
+    """Tests subtype and supertype checks."""
+    self.assertTrue(self.index.IsASubType('KeywordMatchSetting', ADWORDS_NS))
+    self.assertFalse(self.index.IsASubType('Setting', ADWORDS_NS))
+    self.assertRaises(KeyError, self.index.IsASubType, 'NoSuchType',
+                      ADWORDS_NS)
+    self.assertTrue(self.index.IsASuperType('KeywordMatchSetting', ADWORDS_NS,
+                                            'Setting'))
+    self.assertTrue(self.index.IsASuperType('NoSuchType', ADWORDS_NS,
+                                            'NoSuchType'))
+    self.assertFalse(self.index.IsASuperType('Setting', ADWORDS_NS,
+                                             'KeywordMatchSetting'))
+    self.assertFalse(self.index.IsASuperType('NoSuchType', ADWORDS_NS,
+                                             'Setting'))
+
+  def testArrayTypes(self):
+    """Tests the handling of SOAP-encoded arrays."""
+    index = TypeIndex.GetTypeIndex(self.dfa_service)
+    self.assertTrue(index.IsAnArrayType('ArrayOfPricingPeriod', DFA_NS))
+    self.assertEqual('PricingPeriod',
+                     index.GetArrayItemTypeName('ArrayOfPricingPeriod', DFA_NS))
+    self.assertEqual('long',
+                     index.GetArrayItemTypeName('ArrayOf_xsd_long', DFA_NS))
+    self.assertTrue(index.IsAnArrayType('Array', DFA_NS))
+    self.assertFalse(index.IsAnArrayType('NoSuchType', DFA_NS))
+    self.assertEqual('NoSuchType',
+                     index.GetArrayItemTypeName('NoSuchType', DFA_NS))
+    self.assertFalse(self.index.IsAnArrayType('CampaignPage', ADWORDS_NS))
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,193 @@
+#!/usr/bin/python
+#
+# Copyright 2013 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Unit tests to cover WsdlCache."""
+
+__author__ = 'agent@local (agent)'
+
+import os
+import shutil
+import StringIO
+import sys
+import tempfile
+import time
+import unittest
+sys.path.insert(0, os.path.join('..', '..', '..'))
+
+import mock
+
+from adspygoogle.common import WsdlCache
+from adspygoogle.common.GenericApiService import GenericApiService
+from adspygoogle.common.SoapBuffer import SoapBuffer
+
+
+SERVER = 'https://adwords.google.com'
+VERSION = 'v201309'
+GROUP = 'cm'
+WSDL = '<wsdl:definitions/>'
+
+
+class ConcreteGenericApiService(GenericApiService):
+
+  """A subclass of the abstract GenericApiService class, used for testing."""
+
+  def _HandleLogsAndErrors(self, unused_buf, unused_start, unused_stop):
+    """Dummy implementation of an abstract method in GenericApiService."""
+    pass
+
+
+class WsdlCacheTest(unittest.TestCase):
+
+  """Tests for the adspygoogle.common.WsdlCache module."""
+
+  def setUp(self):
+    self.cache_dir = tempfile.mkdtemp()
+    self.cache = WsdlCache.WsdlCache(self.cache_dir, ttl=60)
+
+  def tearDown(self):
+    shutil.rmtree(self.cache_dir)
+
+  def testGetKey(self):
+    """Tests that every part of the service identity affects the cache key."""
+    key = self.cache.GetKey(SERVER, VERSION, GROUP, 'CampaignService')
+    self.assertEqual(
+        key, self.cache.GetKey(SERVER, VERSION, GROUP, 'CampaignService'))
+    self.assertNotEqual(
+        key, self.cache.GetKey(SERVER, 'v201306', GROUP, 'CampaignService'))
+    self.assertNotEqual(
+        key, self.cache.GetKey(SERVER, VERSION, 'mcm', 'CampaignService'))
+    self.assertNotEqual(
+        key, self.cache.GetKey(SERVER, VERSION, GROUP, 'AdGroupService'))
+    self.assertNotEqual(
+        key, self.cache.GetKey('https://adwords-sandbox.google.com', VERSION,
+                               GROUP, 'CampaignService'))
+
+  def testPutAndGet(self):
+    """Tests that a stored WSDL can be retrieved."""
+    self.assertEqual(
+        None, self.cache.Get(SERVER, VERSION, GROUP, 'CampaignService'))
+    path = self.cache.Put(SERVER, VERSION, GROUP, 'CampaignService', WSDL)
+    self.assertEqual(
+        path, self.cache.Get(SERVER, VERSION, GROUP, 'CampaignService'))
+    self.assertEqual(WSDL, open(path).read())
+    self.assertEqual([os.path.basename(path)], os.listdir(self.cache_dir))
+
+  def testGet_expired(self):
+    """Tests that entries older than the TTL are treated as missing."""
+    path = self.cache.Put(SERVER, VERSION, GROUP, 'CampaignService', WSDL)
+    stale = time.time() - 120
+    os.utime(path, (stale, stale))
+    self.assertEqual(
+        None, self.cache.Get(SERVER, VERSION, GROUP, 'CampaignService'))
+
+    no_ttl_cache = WsdlCache.WsdlCache(self.cache_dir)
+    self.assertEqual(
+        path, no_ttl_cache.Get(SERVER, VERSION, GROUP, 'CampaignService'))
+
+  def testInvalidateAndClear(self):
+    """Tests explicit removal of cache entries."""
+    self.cache.Put(SERVER, VERSION, GROUP, 'CampaignService', WSDL)
+    self.cache.Put(SERVER, VERSION, GROUP, 'AdGroupService', WSDL)
+
+    self.assertTrue(
+        self.cache.Invalidate(SERVER, VERSION, GROUP, 'CampaignService'))
+    self.assertFalse(
+        self.cache.Invalidate(SERVER, VERSION, GROUP, 'CampaignService'))
+    self.assertEqual(
+        None, self.cache.Get(SERVER, VERSION, GROUP, 'CampaignService'))
+    self.assertNotEqual(
+        None, self.cache.Get(SERVER, VERSION, GROUP, 'AdGroupService'))
+
+    self.assertEqual(1, self.cache.Clear())
+    self.assertEqual([], os.listdir(self.cache_dir))
+
+  def testSeedFromDirectory(self):
+    """Tests pre-seeding the cache from a directory of WSDL files."""
+    seed_dir = tempfile.mkdtemp()
+    try:
+      for filename in ('CampaignService.wsdl', 'AdGroupService.wsdl',
+                       'README'):
+        fh = open(os.path.join(seed_dir, filename), 'w')
+        fh.write(filename)
+        fh.close()
+
+      seeded = self.cache.SeedFromDirectory(seed_dir, SERVER, VERSION, GROUP)
+    finally:
+      shutil.rmtree(seed_dir)
+
+    self.assertEqual(['AdGroupService', 'CampaignService'], seeded)
+    path = self.cache.Get(SERVER, VERSION, GROUP, 'CampaignService')
+    self.assertEqual('CampaignService.wsdl', open(path).read())
+
+  def testGetWsdlCacheFromConfig(self):
+    """Tests that caching is only enabled when a directory is configured."""
+    self.assertEqual(None, WsdlCache.GetWsdlCacheFromConfig({}))
+    self.assertEqual(
+        None, WsdlCache.GetWsdlCacheFromConfig({'wsdl_cache_dir': None}))
+    cache = WsdlCache.GetWsdlCacheFromConfig({'wsdl_cache_dir': self.cache_dir})
+    self.assertEqual(self.cache_dir, cache.GetCacheDir())
+
+  def testGenericApiService_usesCache(self):
+    """Tests that services only download their WSDL on a cache miss."""
+    config = {
+        'xml_parser': '2',
+        'pretty_xml': 'y',
+        'wrap_in_tuple': 'y',
+        'wsdl_cache_dir': self.cache_dir,
+        'wsdl_cache_ttl': 60
+    }
+    op_config = {
+        'http_proxy': None,
+        'server': SERVER,
+        'version': VERSION,
+        'group': GROUP
+    }
+    service_url = '/'.join([SERVER, 'api/adwords', GROUP, VERSION,
+                            'CampaignService'])
+    with mock.patch('urllib.urlopen') as mock_urlopen:
+      mock_urlopen.return_value = StringIO.StringIO(WSDL)
+      with mock.patch('adspygoogle.SOAPpy.WSDL.Proxy') as mock_proxy:
+        for unused_i in range(2):
+          ConcreteGenericApiService(
+              {}, config, op_config, mock.Mock(), mock.Mock(),
+              'CampaignService', service_url, False, SoapBuffer, '',
+              lambda x: x)
+
+    mock_urlopen.assert_called_once_with(service_url + '?wsdl')
+    cached_path = self.cache.Get(SERVER, VERSION, GROUP, 'CampaignService')
+    self.assertEqual(WSDL, open(cached_path).read())
+    self.assertEqual(2, mock_proxy.call_count)
+    for call in mock_proxy.call_args_list:
+      self.assertEqual(cached_path, call[0][0])
+
+  def testGenericApiService_invalidatesUnparsableWsdl(self):
+    """Tests that a cached WSDL which fails to load is removed."""
+    config = {'wsdl_cache_dir': self.cache_dir}
+    op_config = {'http_proxy': None, 'server': SERVER, 'version': VERSION}
+    self.cache.Put(SERVER, VERSION, None, 'UserService', 'not a wsdl')
+
+    with mock.patch('adspygoogle.SOAPpy.WSDL.Proxy') as mock_proxy:
+      mock_proxy.side_effect = ValueError
+      self.assertRaises(
+          ValueError, ConcreteGenericApiService, {}, config, op_config,
+          mock.Mock(), mock.Mock(), 'UserService', SERVER + '/UserService',
+          False, SoapBuffer, '', lambda x: x)
+
+    self.assertEqual(None, self.cache.Get(SERVER, VERSION, None, 'UserService'))
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -18,7 +18,10 @@
 
 __author__ = 'api.jdilallo@gmail.com (Joseph DiLallo)'
 
+import gzip
 import os
+import shutil
+import StringIO
 import sys
 import tempfile
 import unittest
@@ -241,6 +244,41 @@ class DfpUtilsTest(unittest.TestCase):
                                ':test_key LIMIT 300 OFFSET 20',
                       'values': values})
 
+  def testDownloadReport(self):
+    """Tests that reports are decompressed, unless saved to a .gz file."""
+    report = 'Line item,Impressions\n' + 'Line item #1,1\n' * 50000
+    buf = StringIO.StringIO()
+    gzip_file = gzip.GzipFile(mode='wb', fileobj=buf)
+    gzip_file.write(report)
+    gzip_file.close()
+    service = mock.Mock()
+    service._config = {'debug': 'n'}
+    service.GetReportJob.return_value = [{'reportJobStatus': 'COMPLETED'}]
+    service.GetReportDownloadURL.return_value = ['https://example.com/report']
+
+    work_dir = tempfile.mkdtemp()
+    try:
+      with mock.patch('urllib.urlopen') as mock_urlopen:
+        mock_urlopen.side_effect = (
+            lambda unused_url: StringIO.StringIO(buf.getvalue()))
+        self.assertEqual(report, DfpUtils.DownloadReport('1', 'CSV', service))
+
+        fileobj = StringIO.StringIO()
+        self.assertEqual(None, DfpUtils.DownloadReport('1', 'CSV', service,
+                                                       fileobj=fileobj))
+        self.assertEqual(report, fileobj.getvalue())
+
+        file_path = os.path.join(work_dir, 'report.csv')
+        self.assertEqual(file_path, DfpUtils.DownloadReport(
+            '1', 'CSV', service, file_path=file_path))
+        self.assertEqual(report, open(file_path).read())
+
+        file_path = os.path.join(work_dir, 'report.csv.gz')
+        DfpUtils.DownloadReport('1', 'CSV', service, file_path=file_path)
+        self.assertEqual(buf.getvalue(), open(file_path, 'rb').read())
+    finally:
+      shutil.rmtree(work_dir)
+
 
 if __name__ == '__main__':
   unittest.main()